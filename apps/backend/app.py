@@ -19,7 +19,7 @@ import logging
 from contextlib import asynccontextmanager
 from urllib.parse import quote
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Depends, Request, BackgroundTasks, Response
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
 from typing import Annotated, Optional, List, Any, Dict
@@ -46,7 +46,7 @@ from services.search_service import generate_answer, get_rag_context
 from services.dual_ai_orchestrator import generate_evaluated_answer
 from services.ingestion_service import ingest_book, ingest_text_item, process_bulk_items_logic, sync_highlights_for_item, sync_personal_note_for_item, purge_item_content
 from services.library_service import (
-    list_library_items,
+    list_library_items_async,
     upsert_library_item,
     patch_library_item,
     delete_library_item,
@@ -77,7 +77,7 @@ from services.ai_service import (
 from services.api_route_support_service import (
     execute_chat_request,
     execute_search_request,
-    fetch_realtime_poll_payload,
+    fetch_realtime_poll_payload_async,
 )
 from services.search_diagnostics_service import (
     append_search_log_diagnostics,
@@ -94,7 +94,19 @@ from slowapi.errors import RateLimitExceeded
 
 from config import settings
 from infrastructure.db_manager import DatabaseManager
+from infrastructure.schema_registry import schema_registry
+from services.bulkhead_service import WORKLOAD_DB_LIGHT, WORKLOAD_LLM, WORKLOAD_RETRIEVAL, run_in_bulkhead
 from services.cache_service import get_cache, generate_cache_key
+from services.chat_session_cache_service import chat_write_behind
+from services.search_log_writer_service import purge_expired_search_logs, search_log_writer
+from services.nlp_process_pool_service import nlp_process_pool
+from services.sampling_profiler_service import (
+    FORMAT_COLLAPSED,
+    FORMATS as PROFILE_FORMATS,
+    ProfilerBusyError,
+    build_route_index,
+    sampling_profiler,
+)
 from services.monitoring import DB_POOL_UTILIZATION, CIRCUIT_BREAKER_STATE, REDIS_AVAILABLE
 from services.memory_monitor_service import MemoryMonitor
 from services.embedding_service import get_circuit_breaker_status
@@ -267,6 +279,12 @@ async def lifespan(app: FastAPI):
     logger.info("Starting up: Initializing DB Pool...")
     DatabaseManager.init_pool()
     logger.info(f"✓ Database pools initialized (Read Max={settings.DB_READ_POOL_MAX}, Write Max={settings.DB_WRITE_POOL_MAX})")
+    if settings.DB_ASYNC_ENABLED:
+        DatabaseManager.init_async_pool()
+    if schema_registry.refresh():
+        logger.info("✓ Schema capability registry loaded")
+    else:
+        logger.warning("⚠️ Schema capability registry not loaded; retrying on first use")
     
     # 3. Initialize Cache
     if settings.CACHE_ENABLED:
@@ -283,6 +301,17 @@ async def lifespan(app: FastAPI):
         logger.info("Cache disabled (CACHE_ENABLED=false)")
         app.state.cache = None
     
+    # Start ingest NLP workers in the background so the first book does not pay for Zeyrek loading.
+    if nlp_process_pool.enabled:
+        async def _warm_nlp_process_pool():
+            try:
+                await asyncio.to_thread(nlp_process_pool.warm)
+                logger.info("✓ NLP process pool warmed", extra={"workers": nlp_process_pool.workers})
+            except Exception as e:
+                logger.error(f"NLP process pool warm-up failed; ingest will start workers on demand: {e}")
+
+        app.state.nlp_pool_warm_task = asyncio.create_task(_warm_nlp_process_pool())
+
     # 4. Start Memory Monitor (Task A2)
     logger.info("Starting up: Initializing Memory Monitor...")
     from services.auto_restart_service import auto_restart_manager
@@ -298,8 +327,10 @@ async def lifespan(app: FastAPI):
             try:
                 # DB Pool Stats
                 stats = DatabaseManager.get_pool_stats()
-                for pool_type in ["read", "write"]:
-                    pool = stats[pool_type]
+                for pool_type in ["read", "write", "async_read"]:
+                    pool = stats.get(pool_type)
+                    if pool is None:
+                        continue
                     DB_POOL_UTILIZATION.labels(pool_type=pool_type, metric_type="active").set(pool["active"])
                     DB_POOL_UTILIZATION.labels(pool_type=pool_type, metric_type="opened").set(pool["opened"])
                     DB_POOL_UTILIZATION.labels(pool_type=pool_type, metric_type="max").set(pool["max"])
@@ -330,6 +361,22 @@ async def lifespan(app: FastAPI):
     metrics_task = asyncio.create_task(metrics_background_updater())
     app.state.metrics_task = metrics_task
     logger.info("✓ Metrics updater started (10s interval)")
+
+    # 6. Search log retention (was an hourly DELETE inside a search request)
+    async def search_log_retention_job():
+        while True:
+            try:
+                await asyncio.sleep(settings.SEARCH_LOG_RETENTION_INTERVAL_SEC)
+                deleted = await asyncio.to_thread(purge_expired_search_logs)
+                if deleted:
+                    logger.info(f"Search log retention removed {deleted} row(s)")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Search log retention failed: {e}")
+
+    retention_task = asyncio.create_task(search_log_retention_job())
+    app.state.retention_task = retention_task
     
     try:
         await pdf_async_ingestion_manager.startup()
@@ -342,8 +389,9 @@ async def lifespan(app: FastAPI):
     logger.info("🛑 Shutdown: Cancelling background tasks...")
     memory_task.cancel()
     metrics_task.cancel()
+    retention_task.cancel()
     try:
-        await asyncio.gather(memory_task, metrics_task, return_exceptions=True)
+        await asyncio.gather(memory_task, metrics_task, retention_task, return_exceptions=True)
     except asyncio.CancelledError:
         raise
     
@@ -352,7 +400,32 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to shutdown async PDF ingestion manager cleanly: {e}")
 
+    try:
+        from services.chat_history_service import drain_session_maintenance
+        await asyncio.to_thread(drain_session_maintenance)
+    except Exception as e:
+        logger.error(f"Failed to drain session maintenance queue: {e}")
+
+    try:
+        await asyncio.to_thread(chat_write_behind.stop)
+    except Exception as e:
+        logger.error(f"Failed to drain chat write-behind queue: {e}")
+
+    try:
+        await asyncio.to_thread(search_log_writer.stop)
+    except Exception as e:
+        logger.error(f"Failed to drain search log writer: {e}")
+
+    try:
+        await asyncio.to_thread(nlp_process_pool.shutdown)
+    except Exception as e:
+        logger.error(f"Failed to stop NLP process pool cleanly: {e}")
+
     logger.info("🛑 Shutdown: Closing DB Pool...")
+    try:
+        await DatabaseManager.close_async_pool()
+    except Exception as e:
+        logger.error(f"Failed to close async DB pool cleanly: {e}")
     DatabaseManager.close_pool()
 
 # Initialize FastAPI
@@ -459,7 +532,7 @@ async def realtime_poll(
     """
     verified_uid = get_verified_uid(firebase_uid_from_jwt)
     compact_poll = request.headers.get("x-th-compact-poll") == "1"
-    payload = fetch_realtime_poll_payload(
+    payload = await fetch_realtime_poll_payload_async(
         firebase_uid=verified_uid,
         since_ms=since_ms,
         limit=limit,
@@ -531,7 +604,7 @@ async def chat_endpoint(
     
     try:
         from services.chat_history_service import (
-            create_session, add_message, get_session_context, summarize_session_history
+            create_session, add_message, get_session_context_async, summarize_session_history
         )
         from services.memory_profile_service import get_memory_context_snippet, refresh_memory_profile
         return await execute_chat_request(
@@ -543,7 +616,7 @@ async def chat_endpoint(
             generate_evaluated_answer_fn=generate_evaluated_answer,
             create_session_fn=create_session,
             add_message_fn=add_message,
-            get_session_context_fn=get_session_context,
+            get_session_context_fn=get_session_context_async,
             summarize_session_history_fn=summarize_session_history,
             get_memory_context_snippet_fn=get_memory_context_snippet,
             refresh_memory_profile_fn=refresh_memory_profile,
@@ -568,11 +641,9 @@ async def get_ingested_books(
 
     try:
         from services.analytics_service import resolve_ingested_book_ids
-        import asyncio
 
-        loop = asyncio.get_running_loop()
-        book_ids = await loop.run_in_executor(
-            None,
+        book_ids = await run_in_bulkhead(
+            WORKLOAD_RETRIEVAL,
             resolve_ingested_book_ids,
             firebase_uid,
             "pdf"
@@ -583,6 +654,8 @@ async def get_ingested_books(
             "book_ids": book_ids,
             "count": len(book_ids)
         }
+    except HTTPException:
+        raise
     except Exception as e:
         _raise_internal_server_error("Ingested books endpoint failed", e, detail="Failed to fetch ingested books")
 
@@ -597,9 +670,8 @@ async def get_epistemic_distribution_endpoint(
 ):
     firebase_uid = get_verified_uid(firebase_uid_from_jwt)
 
-    loop = asyncio.get_running_loop()
-    result = await loop.run_in_executor(
-        None,
+    result = await run_in_bulkhead(
+        WORKLOAD_RETRIEVAL,
         lambda: get_epistemic_distribution(firebase_uid=firebase_uid, book_id=book_id, limit=limit),
     )
     return result
@@ -622,11 +694,9 @@ async def get_concordance(
 
     try:
         from services.analytics_service import get_keyword_contexts
-        import asyncio
-        
-        loop = asyncio.get_running_loop()
-        contexts = await loop.run_in_executor(
-            None, 
+
+        contexts = await run_in_bulkhead(
+            WORKLOAD_RETRIEVAL,
             get_keyword_contexts, 
             firebase_uid_from_jwt, 
             book_id, 
@@ -643,6 +713,8 @@ async def get_concordance(
             "offset": offset,
             "count": len(contexts)
         }
+    except HTTPException:
+        raise
     except Exception as e:
         _raise_internal_server_error("Concordance endpoint failed", e, detail="Failed to fetch concordance")
 
@@ -663,11 +735,9 @@ async def get_distribution(
 
     try:
         from services.analytics_service import get_keyword_distribution
-        import asyncio
-        
-        loop = asyncio.get_running_loop()
-        distribution = await loop.run_in_executor(
-            None, 
+
+        distribution = await run_in_bulkhead(
+            WORKLOAD_RETRIEVAL,
             get_keyword_distribution, 
             firebase_uid_from_jwt, 
             book_id, 
@@ -679,6 +749,8 @@ async def get_distribution(
             "term": term,
             "distribution": distribution
         }
+    except HTTPException:
+        raise
     except Exception as e:
         _raise_internal_server_error("Distribution endpoint failed", e, detail="Failed to fetch distribution")
 
@@ -698,11 +770,9 @@ async def get_comparative_stats_endpoint(
 
     try:
         from services.analytics_service import get_comparative_stats
-        import asyncio
-        
-        loop = asyncio.get_running_loop()
-        stats = await loop.run_in_executor(
-            None, 
+
+        stats = await run_in_bulkhead(
+            WORKLOAD_RETRIEVAL,
             get_comparative_stats, 
             firebase_uid_from_jwt, 
             request.target_book_ids, 
@@ -713,6 +783,8 @@ async def get_comparative_stats_endpoint(
             "term": request.term,
             "comparison": stats
         }
+    except HTTPException:
+        raise
     except Exception as e:
         _raise_internal_server_error("Comparison endpoint failed", e, detail="Failed to compare analytics")
 
@@ -742,9 +814,8 @@ async def perform_search(
             default_policy=settings.SEARCH_DEFAULT_RESULT_MIX_POLICY,
         )
 
-        loop = asyncio.get_running_loop()
-        results, metadata = await loop.run_in_executor(
-            None,
+        results, metadata = await run_in_bulkhead(
+            WORKLOAD_RETRIEVAL,
             partial(
                 perform_search,
                 request.question, 
@@ -822,8 +893,7 @@ async def feedback(
         data = request.model_dump()
         data['firebase_uid'] = firebase_uid  # Ensure verified UID is used
         
-        loop = asyncio.get_running_loop()
-        success = await loop.run_in_executor(None, submit_feedback, data)
+        success = await run_in_bulkhead(WORKLOAD_DB_LIGHT, submit_feedback, data)
 
         if success:
             return {"success": True}
@@ -876,8 +946,7 @@ async def search_reports(
 ):
     uid = get_verified_uid(firebase_uid_from_jwt)
 
-    loop = asyncio.get_running_loop()
-    results = await loop.run_in_executor(None, search_reports_by_topic, uid, topic, limit)
+    results = await run_in_bulkhead(WORKLOAD_DB_LIGHT, search_reports_by_topic, uid, topic, limit)
     return {"topic": topic, "count": len(results), "results": results}
 
 from services.report_service import generate_file_report, search_reports_by_topic
@@ -1904,6 +1973,65 @@ async def start_external_kb_backfill(
     return {"success": True, "status": status}
 
 
+@app.post("/api/admin/schema/refresh")
+async def refresh_schema_registry_endpoint(
+    request: Request,
+    admin_uid: str = Depends(require_admin),
+):
+    """Reload the schema capability registry after out-of-band DDL."""
+    _ = admin_uid
+    loaded = await run_in_bulkhead(WORKLOAD_DB_LIGHT, schema_registry.refresh)
+    if not loaded:
+        raise HTTPException(status_code=503, detail="Schema registry refresh failed")
+    return {"success": True, "schema": schema_registry.describe()}
+
+
+@app.post("/api/admin/profile")
+async def profile_process_endpoint(
+    request: Request,
+    duration_sec: float = 10.0,
+    interval_ms: float = 10.0,
+    format: str = FORMAT_COLLAPSED,
+    include_idle: bool = False,
+    admin_uid: str = Depends(require_admin),
+):
+    """
+    Sample this worker's Python stacks for a bounded window and return them
+    per route, as collapsed stacks or a speedscope JSON file.
+    """
+    _ = admin_uid
+    if not bool(getattr(settings, "PROFILER_ENABLED", True)):
+        raise HTTPException(status_code=404, detail="Profiler disabled")
+    fmt = str(format or "").strip().lower()
+    if fmt not in PROFILE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(PROFILE_FORMATS)}")
+
+    try:
+        # Own thread, not a bulkhead slot: the session must not compete with the traffic it measures.
+        result = await asyncio.to_thread(
+            sampling_profiler.profile,
+            duration_sec,
+            interval_ms=interval_ms,
+            route_index=build_route_index(request.app),
+            include_idle=include_idle,
+        )
+    except ProfilerBusyError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+    headers = {
+        "X-Profile-Samples": str(result.sample_count),
+        "X-Profile-Ticks": str(result.ticks),
+        "X-Profile-Duration-Sec": f"{result.duration_sec:.3f}",
+        "X-Profile-Pid": str(os.getpid()),
+    }
+    if fmt == FORMAT_COLLAPSED:
+        headers["Content-Disposition"] = f'attachment; filename="tomehub-{os.getpid()}-{stamp}.collapsed.txt"'
+        return PlainTextResponse(result.to_collapsed(), headers=headers)
+    headers["Content-Disposition"] = f'attachment; filename="tomehub-{os.getpid()}-{stamp}.speedscope.json"'
+    return JSONResponse(result.to_speedscope(name=f"tomehub pid {os.getpid()} {stamp}"), headers=headers)
+
+
 @app.get("/api/admin/external-kb/backfill/status")
 async def external_kb_backfill_status(
     request: Request,
@@ -1929,7 +2057,7 @@ async def list_library_items_endpoint(
         parsed_types = [t.strip() for t in str(types or "").split(",") if t.strip()] if types else None
         
         start_time = time.time()
-        result = list_library_items(
+        result = await list_library_items_async(
             verified_uid,
             limit=limit,
             cursor=cursor,
@@ -2342,11 +2470,10 @@ async def get_memory_profile_endpoint(
         from functools import partial
         from services.memory_profile_service import get_memory_profile, refresh_memory_profile
 
-        loop = asyncio.get_running_loop()
-        profile = await loop.run_in_executor(None, get_memory_profile, firebase_uid)
+        profile = await run_in_bulkhead(WORKLOAD_DB_LIGHT, get_memory_profile, firebase_uid)
         if not profile:
-            profile = await loop.run_in_executor(
-                None,
+            profile = await run_in_bulkhead(
+                WORKLOAD_LLM,
                 partial(refresh_memory_profile, firebase_uid, force=False),
             )
         if not profile:
@@ -2376,9 +2503,8 @@ async def refresh_memory_profile_endpoint(
         from functools import partial
         from services.memory_profile_service import refresh_memory_profile
 
-        loop = asyncio.get_running_loop()
-        profile = await loop.run_in_executor(
-            None,
+        profile = await run_in_bulkhead(
+            WORKLOAD_LLM,
             partial(refresh_memory_profile, firebase_uid, force=bool(payload.force)),
         )
         return profile
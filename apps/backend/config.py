@@ -46,6 +46,38 @@ class Settings:
         self.DB_READ_POOL_MAX = int(os.getenv("DB_READ_POOL_MAX", str(int(self.DB_POOL_MAX * 0.75))))
         self.DB_WRITE_POOL_MAX = int(os.getenv("DB_WRITE_POOL_MAX", str(int(self.DB_POOL_MAX * 0.25))))
 
+        # Oracle client tuning per query class (infrastructure/cursor_profiles.py)
+        self.DB_STMT_CACHE_SIZE = max(0, int(os.getenv("DB_STMT_CACHE_SIZE", "60")))
+        self.DB_CURSOR_PROFILES_ENABLED = (
+            os.getenv("DB_CURSOR_PROFILES_ENABLED", "true").strip().lower() == "true"
+        )
+        # Native asyncio read pool for the hot request paths (infrastructure/async_db.py)
+        self.DB_ASYNC_ENABLED = os.getenv("DB_ASYNC_ENABLED", "false").strip().lower() == "true"
+        self.DB_ASYNC_READ_POOL_MIN = max(1, int(os.getenv("DB_ASYNC_READ_POOL_MIN", "2")))
+        self.DB_ASYNC_READ_POOL_MAX = max(
+            self.DB_ASYNC_READ_POOL_MIN, int(os.getenv("DB_ASYNC_READ_POOL_MAX", "12"))
+        )
+        self.DB_ASYNC_ACQUIRE_TIMEOUT_MS = max(100, int(os.getenv("DB_ASYNC_ACQUIRE_TIMEOUT_MS", "5000")))
+        self.DB_CURSOR_PROFILES = {
+            "point_lookup": {
+                "arraysize": int(os.getenv("DB_CURSOR_POINT_ARRAYSIZE", "10")),
+                "prefetchrows": int(os.getenv("DB_CURSOR_POINT_PREFETCH", "2")),
+            },
+            "candidate_scan": {
+                "arraysize": int(os.getenv("DB_CURSOR_SCAN_ARRAYSIZE", "250")),
+                "prefetchrows": int(os.getenv("DB_CURSOR_SCAN_PREFETCH", "251")),
+            },
+            "bulk_export": {
+                "arraysize": int(os.getenv("DB_CURSOR_EXPORT_ARRAYSIZE", "2000")),
+                "prefetchrows": int(os.getenv("DB_CURSOR_EXPORT_PREFETCH", "2001")),
+                "cache_statement": False,
+            },
+            "bulk_insert": {
+                "arraysize": 100,
+                "prefetchrows": 2,
+            },
+        }
+
         # OCI PDF storage / parsing
         self.OCI_TENANCY_OCID = os.getenv("OCI_TENANCY_OCID", "").strip()
         self.OCI_COMPARTMENT_OCID = os.getenv("OCI_COMPARTMENT_OCID", "").strip() or self.OCI_TENANCY_OCID
@@ -205,6 +237,8 @@ class Settings:
         self.LLM_MODEL_FLASH = os.getenv("LLM_MODEL_FLASH", "gemini-2.5-flash-lite")
         self.LLM_MODEL_PRO = os.getenv("LLM_MODEL_PRO", "gemini-2.5-flash-lite")
         self.EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "gemini-embedding-2-preview")
+        # Recently embedded texts kept per process (question reuse by the judge, repeated evaluations).
+        self.EMBEDDING_MEMO_SIZE = max(0, int(os.getenv("EMBEDDING_MEMO_SIZE", "2048")))
         self.LLM_PRO_FALLBACK_ENABLED = os.getenv("LLM_PRO_FALLBACK_ENABLED", "false").strip().lower() == "true"
         self.LLM_PRO_FALLBACK_MAX_PER_REQUEST = int(os.getenv("LLM_PRO_FALLBACK_MAX_PER_REQUEST", "1"))
         if self.LLM_PRO_FALLBACK_MAX_PER_REQUEST < 0:
@@ -274,6 +308,26 @@ class Settings:
         )
         if self.INGESTION_DATA_CLEANER_CACHE_SIZE < 0:
             self.INGESTION_DATA_CLEANER_CACHE_SIZE = 0
+        # Per-chunk NLP (Zeyrek lemmas, normalization, classification) on worker processes
+        # for pre-extracted book ingests; 0 keeps it on the ingest threads.
+        self.INGESTION_NLP_PROCESS_WORKERS = max(0, int(os.getenv("INGESTION_NLP_PROCESS_WORKERS", "0")))
+        self.INGESTION_NLP_PROCESS_BATCH_SIZE = max(1, int(os.getenv("INGESTION_NLP_PROCESS_BATCH_SIZE", "8")))
+        self.INGESTION_NLP_PROCESS_START_METHOD = (
+            os.getenv("INGESTION_NLP_PROCESS_START_METHOD", "spawn").strip().lower() or "spawn"
+        )
+        if self.INGESTION_NLP_PROCESS_START_METHOD not in {"spawn", "forkserver", "fork"}:
+            self.INGESTION_NLP_PROCESS_START_METHOD = "spawn"
+        # Word-level repair of OCR'd (IMAGE_SCAN) PDFs against a dictionary built from the
+        # user's own non-OCR chunks; words seen fewer than MIN_COUNT times are left out.
+        self.OCR_DICTIONARY_ENABLED = os.getenv("OCR_DICTIONARY_ENABLED", "false").strip().lower() == "true"
+        self.OCR_DICTIONARY_MAX_CHUNKS = max(100, int(os.getenv("OCR_DICTIONARY_MAX_CHUNKS", "20000")))
+        self.OCR_DICTIONARY_MIN_COUNT = max(1, int(os.getenv("OCR_DICTIONARY_MIN_COUNT", "3")))
+        self.OCR_DICTIONARY_MIN_WORDS = max(0, int(os.getenv("OCR_DICTIONARY_MIN_WORDS", "500")))
+        self.OCR_DICTIONARY_MAX_EDIT_DISTANCE = min(
+            3, max(1, int(os.getenv("OCR_DICTIONARY_MAX_EDIT_DISTANCE", "2")))
+        )
+        self.OCR_DICTIONARY_TTL_SEC = max(60, int(os.getenv("OCR_DICTIONARY_TTL_SEC", "3600")))
+        self.OCR_DICTIONARY_MAX_USERS = max(1, int(os.getenv("OCR_DICTIONARY_MAX_USERS", "8")))
 
         # Backward compatibility: ANSWER_MODEL_NAME still supported but deprecated.
         answer_model_env = os.getenv("ANSWER_MODEL_NAME")
@@ -360,6 +414,14 @@ class Settings:
             self.SEARCH_GRAPH_BRIDGE_EXPLORER_TIMEOUT_MS = 950
         self.SEARCH_GRAPH_DIRECT_SKIP = os.getenv("SEARCH_GRAPH_DIRECT_SKIP", "true").strip().lower() == "true"
         self.SEARCH_NOISE_GUARD_ENABLED = os.getenv("SEARCH_NOISE_GUARD_ENABLED", "true").strip().lower() == "true"
+        # Exact/lemma lanes: scan light columns first, read CLOB text/metadata only for kept rows.
+        self.SEARCH_LEXICAL_LATE_MATERIALIZATION = (
+            os.getenv("SEARCH_LEXICAL_LATE_MATERIALIZATION", "true").strip().lower() == "true"
+        )
+        # Lemma lane ranks top-k from TOMEHUB_LEMMA_POSTINGS for backfilled users (LIKE scan otherwise).
+        self.SEARCH_LEMMA_POSTINGS_ENABLED = (
+            os.getenv("SEARCH_LEMMA_POSTINGS_ENABLED", "true").strip().lower() == "true"
+        )
         self.SEARCH_SMART_SEMANTIC_TAIL_CAP = int(os.getenv("SEARCH_SMART_SEMANTIC_TAIL_CAP", "6"))
         if self.SEARCH_SMART_SEMANTIC_TAIL_CAP <= 0:
             self.SEARCH_SMART_SEMANTIC_TAIL_CAP = 6
@@ -698,6 +760,11 @@ class Settings:
             self.L3_PHASE4_PARENT_SCORE_DECAY = 0.88
         if self.L3_PHASE4_PARENT_SCORE_DECAY > 1.0:
             self.L3_PHASE4_PARENT_SCORE_DECAY = 1.0
+        # Per-book parent-context neighbourhood cache (per process, dropped on ingest/purge;
+        # other workers see changes through TOMEHUB_CHANGE_EVENTS within the poll interval).
+        self.PARENT_CONTEXT_CACHE_TTL_SEC = max(1, int(os.getenv("PARENT_CONTEXT_CACHE_TTL_SEC", "300")))
+        self.PARENT_CONTEXT_CACHE_MAX_BOOKS = max(0, int(os.getenv("PARENT_CONTEXT_CACHE_MAX_BOOKS", "512")))
+        self.PARENT_CONTEXT_CACHE_EVENT_POLL_SEC = max(1, int(os.getenv("PARENT_CONTEXT_CACHE_EVENT_POLL_SEC", "10")))
 
         self.L3_PHASE4_DUP_SUPPRESS_ENABLED = (
             os.getenv("L3_PHASE4_DUP_SUPPRESS_ENABLED", "false").strip().lower() == "true"
@@ -743,7 +810,78 @@ class Settings:
         self.SEARCH_LOG_RETENTION_CLEANUP_ENABLED = (
             os.getenv("SEARCH_LOG_RETENTION_CLEANUP_ENABLED", "false").strip().lower() == "true"
         )
-        
+        self.SEARCH_LOG_RETENTION_INTERVAL_SEC = max(60, int(os.getenv("SEARCH_LOG_RETENTION_INTERVAL_SEC", "3600")))
+        # Search logs go through a bounded in-process queue and are flushed with executemany
+        # (services/search_log_writer_service.py); ids are pre-allocated from the identity sequence.
+        self.SEARCH_LOG_WRITE_BEHIND_ENABLED = (
+            os.getenv("SEARCH_LOG_WRITE_BEHIND_ENABLED", "false").strip().lower() == "true"
+        )
+        self.SEARCH_LOG_WRITE_BEHIND_FLUSH_MS = max(10, int(os.getenv("SEARCH_LOG_WRITE_BEHIND_FLUSH_MS", "500")))
+        self.SEARCH_LOG_WRITE_BEHIND_BATCH_SIZE = max(1, int(os.getenv("SEARCH_LOG_WRITE_BEHIND_BATCH_SIZE", "100")))
+        self.SEARCH_LOG_WRITE_BEHIND_MAX_QUEUE = max(1, int(os.getenv("SEARCH_LOG_WRITE_BEHIND_MAX_QUEUE", "5000")))
+        self.SEARCH_LOG_ID_BLOCK_SIZE = max(1, int(os.getenv("SEARCH_LOG_ID_BLOCK_SIZE", "200")))
+        # Per-workload executor bulkheads for blocking work behind async routes.
+        self.BULKHEAD_ENABLED = os.getenv("BULKHEAD_ENABLED", "true").strip().lower() == "true"
+        self.BULKHEAD_RETRY_AFTER_SEC = max(1, int(os.getenv("BULKHEAD_RETRY_AFTER_SEC", "2")))
+        self.BULKHEAD_DB_LIGHT_WORKERS = max(1, int(os.getenv("BULKHEAD_DB_LIGHT_WORKERS", "8")))
+        self.BULKHEAD_DB_LIGHT_QUEUE = max(0, int(os.getenv("BULKHEAD_DB_LIGHT_QUEUE", "64")))
+        self.BULKHEAD_RETRIEVAL_WORKERS = max(1, int(os.getenv("BULKHEAD_RETRIEVAL_WORKERS", "8")))
+        self.BULKHEAD_RETRIEVAL_QUEUE = max(0, int(os.getenv("BULKHEAD_RETRIEVAL_QUEUE", "32")))
+        self.BULKHEAD_LLM_WORKERS = max(1, int(os.getenv("BULKHEAD_LLM_WORKERS", "16")))
+        self.BULKHEAD_LLM_QUEUE = max(0, int(os.getenv("BULKHEAD_LLM_QUEUE", "32")))
+        self.BULKHEAD_PARSING_WORKERS = max(1, int(os.getenv("BULKHEAD_PARSING_WORKERS", "2")))
+        self.BULKHEAD_PARSING_QUEUE = max(0, int(os.getenv("BULKHEAD_PARSING_QUEUE", "8")))
+        # Schema capability registry: minimum gap between refreshes triggered by ORA-00904/00942.
+        self.SCHEMA_REGISTRY_ERROR_REFRESH_SEC = max(1, int(os.getenv("SCHEMA_REGISTRY_ERROR_REFRESH_SEC", "30")))
+        # Admin sampling profiler (POST /api/admin/profile): session cap and fastest tick.
+        self.PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "true").strip().lower() == "true"
+        self.PROFILER_MAX_DURATION_SEC = min(300, max(1, int(os.getenv("PROFILER_MAX_DURATION_SEC", "60"))))
+        self.PROFILER_MIN_INTERVAL_MS = min(100, max(1, int(os.getenv("PROFILER_MIN_INTERVAL_MS", "2"))))
+
+        # Approximate vector search on TOMEHUB_CONTENT_V2 (IDX_CNT_VEC_V2). Off until
+        # scripts/benchmark_vector_recall.py shows acceptable recall per lane; a short
+        # approximate result falls back to the exact scan.
+        self.VECTOR_APPROX_ENABLED = os.getenv("VECTOR_APPROX_ENABLED", "false").strip().lower() == "true"
+        self.VECTOR_APPROX_ACCURACY_SEMANTIC = min(100, max(1, int(os.getenv("VECTOR_APPROX_ACCURACY_SEMANTIC", "90"))))
+        self.VECTOR_APPROX_ACCURACY_FLOW = min(100, max(1, int(os.getenv("VECTOR_APPROX_ACCURACY_FLOW", "80"))))
+        self.VECTOR_APPROX_ACCURACY_BOOK_CONTEXT = min(
+            100, max(1, int(os.getenv("VECTOR_APPROX_ACCURACY_BOOK_CONTEXT", "95")))
+        )
+        # Candidates fetched per requested row when the final order re-weights the distance.
+        self.VECTOR_APPROX_OVERFETCH = min(10, max(1, int(os.getenv("VECTOR_APPROX_OVERFETCH", "3"))))
+
+        # Optional in-process per-user vector tier in front of Oracle vector search.
+        self.VECTOR_CACHE_ENABLED = os.getenv("VECTOR_CACHE_ENABLED", "false").strip().lower() == "true"
+        self.VECTOR_CACHE_MAX_MB = max(16, int(os.getenv("VECTOR_CACHE_MAX_MB", "512")))
+        self.VECTOR_CACHE_MAX_ROWS_PER_USER = max(1000, int(os.getenv("VECTOR_CACHE_MAX_ROWS_PER_USER", "200000")))
+        self.VECTOR_CACHE_EVENT_POLL_SEC = max(1, int(os.getenv("VECTOR_CACHE_EVENT_POLL_SEC", "30")))
+        self.VECTOR_CACHE_CANDIDATE_MULTIPLIER = min(
+            10, max(1, int(os.getenv("VECTOR_CACHE_CANDIDATE_MULTIPLIER", "4")))
+        )
+
+        # Optional in-process per-user trigram index for the exact lane's LIKE path.
+        self.TRIGRAM_INDEX_ENABLED = os.getenv("TRIGRAM_INDEX_ENABLED", "false").strip().lower() == "true"
+        self.TRIGRAM_INDEX_MAX_MB = max(16, int(os.getenv("TRIGRAM_INDEX_MAX_MB", "256")))
+        self.TRIGRAM_INDEX_MAX_ROWS_PER_USER = max(1000, int(os.getenv("TRIGRAM_INDEX_MAX_ROWS_PER_USER", "100000")))
+        self.TRIGRAM_INDEX_EVENT_POLL_SEC = max(1, int(os.getenv("TRIGRAM_INDEX_EVENT_POLL_SEC", "30")))
+        # Candidate ids verified per LIKE statement, and statements before the rest is scanned.
+        self.TRIGRAM_INDEX_VERIFY_BATCH = min(900, max(50, int(os.getenv("TRIGRAM_INDEX_VERIFY_BATCH", "500"))))
+        self.TRIGRAM_INDEX_MAX_VERIFY_BATCHES = min(
+            20, max(1, int(os.getenv("TRIGRAM_INDEX_MAX_VERIFY_BATCHES", "4")))
+        )
+
+        # Optional in-process cache of generated RAG answers, invalidated on library changes.
+        self.ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "false").strip().lower() == "true"
+        self.ANSWER_CACHE_TTL_SEC = max(1, int(os.getenv("ANSWER_CACHE_TTL_SEC", "3600")))
+        self.ANSWER_CACHE_MAX_ENTRIES = max(0, int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "2000")))
+        self.ANSWER_CACHE_EVENT_POLL_SEC = max(1, int(os.getenv("ANSWER_CACHE_EVENT_POLL_SEC", "30")))
+
+        # Layer-3 analytics: read counts/distribution/concordance from TOMEHUB_LEMMA_INDEX
+        # (written at ingest) and fall back to CLOB scans for books without postings.
+        self.ANALYTICS_LEMMA_INDEX_ENABLED = (
+            os.getenv("ANALYTICS_LEMMA_INDEX_ENABLED", "true").strip().lower() == "true"
+        )
+
         # Model Versions (for cache invalidation)
         self.EMBEDDING_MODEL_VERSION = os.getenv("EMBEDDING_MODEL_VERSION", "v4")
         self.LLM_MODEL_VERSION = os.getenv("LLM_MODEL_VERSION", "v2")
@@ -776,6 +914,22 @@ class Settings:
         self.CHAT_RETENTION_DAYS = int(os.getenv("CHAT_RETENTION_DAYS", "90"))
         self.CHAT_TITLE_MIN_MESSAGES = int(os.getenv("CHAT_TITLE_MIN_MESSAGES", "3"))
         self.CHAT_TITLE_MAX_LENGTH = int(os.getenv("CHAT_TITLE_MAX_LENGTH", "60"))
+        # Hot per-session context (summary, state, last messages) kept in Redis between turns.
+        self.CHAT_HOT_CONTEXT_ENABLED = os.getenv("CHAT_HOT_CONTEXT_ENABLED", "true").strip().lower() == "true"
+        self.CHAT_HOT_CONTEXT_TTL_SEC = max(60, int(os.getenv("CHAT_HOT_CONTEXT_TTL_SEC", "1800")))
+        # In-process store when Redis is down: only coherent with a single worker process.
+        self.CHAT_HOT_CONTEXT_LOCAL_FALLBACK = (
+            os.getenv("CHAT_HOT_CONTEXT_LOCAL_FALLBACK", "false").strip().lower() == "true"
+        )
+        # Batch message INSERTs / UPDATED_AT touches off the request path (drained on shutdown).
+        self.CHAT_WRITE_BEHIND_ENABLED = os.getenv("CHAT_WRITE_BEHIND_ENABLED", "false").strip().lower() == "true"
+        self.CHAT_WRITE_BEHIND_FLUSH_MS = max(10, int(os.getenv("CHAT_WRITE_BEHIND_FLUSH_MS", "250")))
+        self.CHAT_WRITE_BEHIND_BATCH_SIZE = max(1, int(os.getenv("CHAT_WRITE_BEHIND_BATCH_SIZE", "50")))
+        self.CHAT_WRITE_BEHIND_MAX_ATTEMPTS = max(1, int(os.getenv("CHAT_WRITE_BEHIND_MAX_ATTEMPTS", "5")))
+        # Post-turn state/title/tags refresh: coalesced per session, run on a small pool.
+        self.CHAT_MAINTENANCE_DEBOUNCE_SEC = max(0, int(os.getenv("CHAT_MAINTENANCE_DEBOUNCE_SEC", "20")))
+        self.CHAT_MAINTENANCE_WORKERS = max(1, int(os.getenv("CHAT_MAINTENANCE_WORKERS", "2")))
+        self.MEMORY_SNIPPET_CACHE_TTL_SEC = max(0, int(os.getenv("MEMORY_SNIPPET_CACHE_TTL_SEC", "300")))
 
         # Graph Concept Strength
         self.CONCEPT_STRENGTH_MIN = float(os.getenv("CONCEPT_STRENGTH_MIN", "0.7"))
@@ -804,6 +958,9 @@ class Settings:
         self.EXTERNAL_KB_OPENALEX_EXPLORER_ONLY = (
             os.getenv("EXTERNAL_KB_OPENALEX_EXPLORER_ONLY", "true").strip().lower() == "true"
         )
+        self.EXTERNAL_KB_BULK_UPSERT_ENABLED = (
+            os.getenv("EXTERNAL_KB_BULK_UPSERT_ENABLED", "true").strip().lower() == "true"
+        )
         self.EXTERNAL_KB_BACKFILL_BATCH_SIZE = int(os.getenv("EXTERNAL_KB_BACKFILL_BATCH_SIZE", "50"))
         if self.EXTERNAL_KB_BACKFILL_BATCH_SIZE < 1:
             self.EXTERNAL_KB_BACKFILL_BATCH_SIZE = 50
@@ -828,6 +985,31 @@ class Settings:
         self.EXTERNAL_KB_DBPEDIA_WEIGHT = float(os.getenv("EXTERNAL_KB_DBPEDIA_WEIGHT", "0.08"))
         self.EXTERNAL_KB_ORKG_WEIGHT = float(os.getenv("EXTERNAL_KB_ORKG_WEIGHT", "0.10"))
         self.EXTERNAL_KB_HTTP_MAX_RETRY = int(os.getenv("EXTERNAL_KB_HTTP_MAX_RETRY", "1"))
+        # Shared outbound HTTP client: keep-alive pools, response cache, per-host rate limits.
+        self.HTTP_CLIENT_NUM_POOLS = int(os.getenv("HTTP_CLIENT_NUM_POOLS", "32"))
+        self.HTTP_CLIENT_POOL_MAXSIZE = int(os.getenv("HTTP_CLIENT_POOL_MAXSIZE", "10"))
+        if self.HTTP_CLIENT_POOL_MAXSIZE < 1:
+            self.HTTP_CLIENT_POOL_MAXSIZE = 10
+        self.HTTP_CLIENT_CACHE_ENABLED = os.getenv("HTTP_CLIENT_CACHE_ENABLED", "true").strip().lower() == "true"
+        self.HTTP_CLIENT_CACHE_MAX_ENTRIES = int(os.getenv("HTTP_CLIENT_CACHE_MAX_ENTRIES", "2048"))
+        if self.HTTP_CLIENT_CACHE_MAX_ENTRIES < 1:
+            self.HTTP_CLIENT_CACHE_MAX_ENTRIES = 2048
+        # Comma-separated host=requests_per_second pairs.
+        self.HTTP_CLIENT_HOST_RATE_LIMITS = os.getenv("HTTP_CLIENT_HOST_RATE_LIMITS", "export.arxiv.org=1").strip()
+        self.EXTERNAL_KB_HTTP_CACHE_TTL_SEC = int(os.getenv("EXTERNAL_KB_HTTP_CACHE_TTL_SEC", "600"))
+        if self.EXTERNAL_KB_HTTP_CACHE_TTL_SEC < 0:
+            self.EXTERNAL_KB_HTTP_CACHE_TTL_SEC = 600
+        # Domain provider fan-out: one overall deadline, a per-provider budget and
+        # early return once `limit` rows at or above the score floor have arrived.
+        self.EXTERNAL_KB_DOMAIN_DEADLINE_MS = int(os.getenv("EXTERNAL_KB_DOMAIN_DEADLINE_MS", "4500"))
+        if self.EXTERNAL_KB_DOMAIN_DEADLINE_MS < 100:
+            self.EXTERNAL_KB_DOMAIN_DEADLINE_MS = 4500
+        self.EXTERNAL_KB_DOMAIN_PROVIDER_BUDGET_MS = int(os.getenv("EXTERNAL_KB_DOMAIN_PROVIDER_BUDGET_MS", "3500"))
+        if self.EXTERNAL_KB_DOMAIN_PROVIDER_BUDGET_MS < 100:
+            self.EXTERNAL_KB_DOMAIN_PROVIDER_BUDGET_MS = 3500
+        self.EXTERNAL_KB_DOMAIN_EARLY_RETURN_MIN_SCORE = float(
+            os.getenv("EXTERNAL_KB_DOMAIN_EARLY_RETURN_MIN_SCORE", "0.65")
+        )
 
         # Explorer-only Islamic providers
         self.ISLAMIC_API_ENABLED = os.getenv("ISLAMIC_API_ENABLED", "false").strip().lower() == "true"
@@ -844,6 +1026,9 @@ class Settings:
         self.ISLAMIC_API_HADITH_WEIGHT = float(os.getenv("ISLAMIC_API_HADITH_WEIGHT", "0.18"))
         self.ISLAMIC_API_HTTP_TIMEOUT_SEC = float(os.getenv("ISLAMIC_API_HTTP_TIMEOUT_SEC", "6.0"))
         self.ISLAMIC_API_HTTP_MAX_RETRY = int(os.getenv("ISLAMIC_API_HTTP_MAX_RETRY", "1"))
+        self.ISLAMIC_API_HTTP_CACHE_TTL_SEC = int(os.getenv("ISLAMIC_API_HTTP_CACHE_TTL_SEC", "600"))
+        if self.ISLAMIC_API_HTTP_CACHE_TTL_SEC < 0:
+            self.ISLAMIC_API_HTTP_CACHE_TTL_SEC = 600
         self.ISLAMIC_API_CONCURRENCY_LIMIT = int(os.getenv("ISLAMIC_API_CONCURRENCY_LIMIT", "4"))
 
         self.QURANENC_ENABLED = os.getenv("QURANENC_ENABLED", "true").strip().lower() == "true"
@@ -0,0 +1,116 @@
+"""
+Native asyncio Oracle reads for the hottest request paths.
+
+A read path is written once as a *query plan*: a generator that yields
+`Fetch` steps and is sent each step's rows (a list, or a single row / None
+for `Fetch(one=True)`). A failing step is thrown back into the generator at
+its `yield`, so best-effort sub-queries keep their ordinary try/except.
+
+- run_plan:       drives a plan on one pooled sync connection (the caller's thread)
+- run_plan_async: drives it on the asyncio pool (DB_ASYNC_ENABLED). No thread is
+                  held while Oracle works, so per-worker concurrency is bounded
+                  by DB_ASYNC_READ_POOL_MAX instead of bulkhead threads. When the
+                  async pool is off or failed to start, the plan runs through
+                  run_plan on the DB_LIGHT bulkhead exactly as before.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Generator, Tuple, TypeVar
+
+from config import settings
+from infrastructure.cursor_profiles import (
+    QUERY_CLASS_POINT_LOOKUP,
+    apply_profile,
+    get_profile,
+    record_fetch,
+)
+from infrastructure.db_manager import DatabaseManager
+from services.bulkhead_service import WORKLOAD_DB_LIGHT, run_in_bulkhead
+from services.monitoring import DB_QUERY_PLANS_TOTAL
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Fetch:
+    sql: str
+    binds: Dict[str, Any] = field(default_factory=dict)
+    query_class: str = QUERY_CLASS_POINT_LOOKUP
+    one: bool = False
+
+
+QueryPlan = Generator[Fetch, Any, T]
+
+
+def async_db_enabled() -> bool:
+    return bool(getattr(settings, "DB_ASYNC_ENABLED", False)) and DatabaseManager.async_pool_ready()
+
+
+def _advance(plan: QueryPlan[T], *, send: Any = None, error: BaseException | None = None) -> Tuple[bool, Any]:
+    """(False, next_step) while the plan has steps, (True, result) once it returns."""
+    try:
+        step = plan.throw(error) if error is not None else plan.send(send)
+    except StopIteration as done:
+        return True, done.value
+    return False, step
+
+
+def _fetched_rows(step: Fetch, result: Any) -> list:
+    if step.one:
+        return [] if result is None else [result]
+    return list(result or [])
+
+
+def run_plan(plan: QueryPlan[T]) -> T:
+    try:
+        done, value = _advance(plan)
+        if done:
+            return value
+        DB_QUERY_PLANS_TOTAL.labels(driver="sync").inc()
+        with DatabaseManager.get_read_connection() as conn:
+            with conn.cursor() as cursor:
+                while not done:
+                    step: Fetch = value
+                    try:
+                        apply_profile(cursor, get_profile(step.query_class))
+                        cursor.execute(step.sql, step.binds)
+                        result = cursor.fetchone() if step.one else cursor.fetchall()
+                    except Exception as exc:
+                        done, value = _advance(plan, error=exc)
+                        continue
+                    record_fetch(step.query_class, _fetched_rows(step, result))
+                    done, value = _advance(plan, send=result)
+        return value
+    finally:
+        plan.close()
+
+
+async def run_plan_async(plan: QueryPlan[T]) -> T:
+    if not async_db_enabled():
+        return await run_in_bulkhead(WORKLOAD_DB_LIGHT, run_plan, plan)
+    try:
+        done, value = _advance(plan)
+        if done:
+            return value
+        DB_QUERY_PLANS_TOTAL.labels(driver="async").inc()
+        async with DatabaseManager.acquire_async_read_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                while not done:
+                    step: Fetch = value
+                    try:
+                        apply_profile(cursor, get_profile(step.query_class))
+                        await cursor.execute(step.sql, step.binds)
+                        result = await (cursor.fetchone() if step.one else cursor.fetchall())
+                    except Exception as exc:
+                        done, value = _advance(plan, error=exc)
+                        continue
+                    record_fetch(step.query_class, _fetched_rows(step, result))
+                    done, value = _advance(plan, send=result)
+            finally:
+                cursor.close()
+        return value
+    finally:
+        plan.close()
@@ -0,0 +1,262 @@
+"""
+Query-class aware cursors for the Oracle pools.
+
+Every statement is tagged with one of four query classes, and each class sets
+the cursor's fetch sizing before the first execute:
+
+- point_lookup:   single-row reads; prefetch 2 so execute + fetch is one round trip
+- candidate_scan: retrieval/Flow candidate scans (100s of rows incl. CLOB text)
+- bulk_export:    full-table reads for exports/backfills; not kept in the statement cache
+- bulk_insert:    executemany batches; long-text/VECTOR binds get explicit input sizes
+
+The statement cache is per connection in python-oracledb, so its size is set on
+the pools (DB_STMT_CACHE_SIZE). A class only decides whether its statements go
+into that cache, so one-off export SQL does not push out hot search statements.
+
+Long text going into CLOB columns is bound as DB_TYPE_LONG: the value is sent
+inline with the batch, whereas DB_TYPE_CLOB would create a temporary LOB (and
+its round trips) for every row.
+
+Round trips are estimated from the rows fetched and the class's
+arraysize/prefetchrows (the thin driver does not expose a counter). Bytes are
+the sizes of the str/bytes values fetched, so CLOB-heavy scans show up.
+"""
+
+from __future__ import annotations
+
+import math
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import oracledb
+
+from config import settings
+from services.monitoring import (
+    DB_CURSOR_BYTES_FETCHED_TOTAL,
+    DB_CURSOR_ROUND_TRIPS_TOTAL,
+    DB_CURSOR_ROWS_TOTAL,
+)
+
+QUERY_CLASS_POINT_LOOKUP = "point_lookup"
+QUERY_CLASS_CANDIDATE_SCAN = "candidate_scan"
+QUERY_CLASS_BULK_EXPORT = "bulk_export"
+QUERY_CLASS_BULK_INSERT = "bulk_insert"
+
+QUERY_CLASSES = (
+    QUERY_CLASS_POINT_LOOKUP,
+    QUERY_CLASS_CANDIDATE_SCAN,
+    QUERY_CLASS_BULK_EXPORT,
+    QUERY_CLASS_BULK_INSERT,
+)
+
+_DB_TYPE_VECTOR = getattr(oracledb, "DB_TYPE_VECTOR", None)
+
+
+@dataclass(frozen=True)
+class CursorProfile:
+    arraysize: int
+    prefetchrows: int
+    cache_statement: bool = True
+
+
+def get_profile(query_class: str) -> CursorProfile:
+    profiles: Dict[str, Dict[str, Any]] = getattr(settings, "DB_CURSOR_PROFILES", {}) or {}
+    raw = profiles.get(query_class) or profiles.get(QUERY_CLASS_POINT_LOOKUP) or {}
+    return CursorProfile(
+        arraysize=max(1, int(raw.get("arraysize", 100))),
+        prefetchrows=max(0, int(raw.get("prefetchrows", 2))),
+        cache_statement=bool(raw.get("cache_statement", True)),
+    )
+
+
+def _value_bytes(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return 0
+
+
+def apply_profile(cursor: Any, profile: CursorProfile) -> None:
+    cursor.arraysize = profile.arraysize
+    cursor.prefetchrows = profile.prefetchrows
+
+
+def record_fetch(query_class: str, rows: Sequence[Any]) -> None:
+    """Export metrics for one execute + fetch made without ProfiledCursor (e.g. on an async cursor)."""
+    profile = get_profile(query_class)
+    count = len(rows)
+    trips = 1 + (math.ceil((count - profile.prefetchrows) / profile.arraysize) if count > profile.prefetchrows else 0)
+    DB_CURSOR_ROUND_TRIPS_TOTAL.labels(query_class=query_class).inc(trips)
+    if count:
+        DB_CURSOR_ROWS_TOTAL.labels(query_class=query_class).inc(count)
+        fetched = sum(
+            sum(_value_bytes(v) for v in row) if isinstance(row, (tuple, list)) else _value_bytes(row)
+            for row in rows
+        )
+        if fetched:
+            DB_CURSOR_BYTES_FETCHED_TOTAL.labels(query_class=query_class).inc(fetched)
+
+
+class ProfiledCursor:
+    """
+    Thin proxy over an oracledb cursor. execute/executemany/fetch* are
+    instrumented; everything else (var, description, rowcount, callproc, ...)
+    is delegated unchanged.
+    """
+
+    def __init__(
+        self,
+        cursor: Any,
+        query_class: str,
+        profile: CursorProfile,
+        input_sizes: Optional[Dict[str, Any]] = None,
+    ):
+        self._cursor = cursor
+        self.query_class = query_class
+        self.profile = profile
+        self._input_sizes = dict(input_sizes or {})
+        self._closed = False
+        self._buffered = 0
+        self.round_trips = 0
+        self.rows_fetched = 0
+        self.bytes_fetched = 0
+        apply_profile(cursor, profile)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    def __enter__(self) -> "ProfiledCursor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.close()
+        return False
+
+    def __iter__(self) -> Iterator[Any]:
+        for row in self._cursor:
+            self._account_rows([row])
+            yield row
+
+    # -- execution -------------------------------------------------------
+
+    def _apply_input_sizes(self, bind_names: Iterable[str]) -> None:
+        if not self._input_sizes:
+            return
+        names = {str(name) for name in bind_names}
+        sizes = {name: db_type for name, db_type in self._input_sizes.items() if name in names}
+        if sizes:
+            self._cursor.setinputsizes(**sizes)
+
+    def _prepare(self, statement: Optional[str]) -> Optional[str]:
+        if statement is None or self.profile.cache_statement:
+            return statement
+        self._cursor.prepare(statement, cache_statement=False)
+        return None
+
+    def execute(self, statement: Optional[str], parameters: Any = None, **keyword_parameters: Any) -> Any:
+        if isinstance(parameters, dict):
+            self._apply_input_sizes(parameters.keys())
+        elif keyword_parameters:
+            self._apply_input_sizes(keyword_parameters.keys())
+        statement = self._prepare(statement)
+        self.round_trips += 1
+        self._buffered = self.profile.prefetchrows
+        return self._cursor.execute(statement, parameters, **keyword_parameters)
+
+    def executemany(self, statement: Optional[str], parameters: Any, **kwargs: Any) -> Any:
+        if isinstance(parameters, list) and parameters and isinstance(parameters[0], dict):
+            self._apply_input_sizes(parameters[0].keys())
+        statement = self._prepare(statement)
+        self.round_trips += 1
+        self._buffered = 0
+        return self._cursor.executemany(statement, parameters, **kwargs)
+
+    # -- fetching --------------------------------------------------------
+
+    def _account_rows(self, rows: Sequence[Any]) -> None:
+        count = len(rows)
+        if count <= 0:
+            return
+        self.rows_fetched += count
+        for row in rows:
+            if isinstance(row, (tuple, list)):
+                self.bytes_fetched += sum(_value_bytes(v) for v in row)
+            else:
+                self.bytes_fetched += _value_bytes(row)
+        needed = count - self._buffered
+        if needed > 0:
+            trips = math.ceil(needed / self.profile.arraysize)
+            self.round_trips += trips
+            self._buffered = trips * self.profile.arraysize - needed
+        else:
+            self._buffered -= count
+
+    def fetchone(self) -> Any:
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._account_rows([row])
+        return row
+
+    def fetchmany(self, size: Optional[int] = None) -> List[Any]:
+        rows = self._cursor.fetchmany(size) if size is not None else self._cursor.fetchmany()
+        self._account_rows(rows)
+        return rows
+
+    def fetchall(self) -> List[Any]:
+        rows = self._cursor.fetchall()
+        self._account_rows(rows)
+        return rows
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self.round_trips:
+                DB_CURSOR_ROUND_TRIPS_TOTAL.labels(query_class=self.query_class).inc(self.round_trips)
+            if self.rows_fetched:
+                DB_CURSOR_ROWS_TOTAL.labels(query_class=self.query_class).inc(self.rows_fetched)
+            if self.bytes_fetched:
+                DB_CURSOR_BYTES_FETCHED_TOTAL.labels(query_class=self.query_class).inc(self.bytes_fetched)
+        finally:
+            self.round_trips = self.rows_fetched = self.bytes_fetched = 0
+            self._cursor.close()
+
+
+def _input_sizes(long_binds: Sequence[str], vector_binds: Sequence[str]) -> Dict[str, Any]:
+    sizes: Dict[str, Any] = {name: oracledb.DB_TYPE_LONG for name in long_binds}
+    if _DB_TYPE_VECTOR is not None:
+        sizes.update({name: _DB_TYPE_VECTOR for name in vector_binds})
+    return sizes
+
+
+@contextmanager
+def profiled_cursor(
+    conn: Any,
+    query_class: str,
+    *,
+    long_binds: Sequence[str] = (),
+    vector_binds: Sequence[str] = (),
+) -> Iterator[Any]:
+    """
+    `with profiled_cursor(conn, QUERY_CLASS_CANDIDATE_SCAN, vector_binds=("vec",)) as cursor:`
+
+    Drop-in replacement for `with conn.cursor() as cursor:`. With
+    DB_CURSOR_PROFILES_ENABLED=false the plain cursor is yielded.
+    """
+    if not getattr(settings, "DB_CURSOR_PROFILES_ENABLED", True):
+        with conn.cursor() as cursor:
+            yield cursor
+        return
+    cursor = ProfiledCursor(
+        conn.cursor(),
+        query_class,
+        get_profile(query_class),
+        _input_sizes(long_binds, vector_binds),
+    )
+    try:
+        yield cursor
+    finally:
+        cursor.close()
@@ -12,6 +12,12 @@ logger = logging.getLogger(__name__)
 class DatabaseManager:
     _read_pool = None
     _write_pool = None
+    _async_read_pool = None
+
+    @staticmethod
+    def _wallet_location() -> str:
+        backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return os.path.join(backend_dir, 'wallet')
 
     @classmethod
     def init_pool(cls):
@@ -26,9 +32,7 @@ class DatabaseManager:
             user = settings.DB_USER
             password = settings.DB_PASSWORD
             dsn = settings.DB_DSN
-            
-            backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            wallet_location = os.path.join(backend_dir, 'wallet')
+            wallet_location = cls._wallet_location()
 
             logger.info(f"Initializing Parallel Database Pools (Read/Write) for user: {user}")
 
@@ -43,7 +47,8 @@ class DatabaseManager:
                 config_dir=wallet_location,
                 wallet_location=wallet_location,
                 wallet_password=password,
-                getmode=oracledb.POOL_GETMODE_WAIT
+                getmode=oracledb.POOL_GETMODE_WAIT,
+                stmtcachesize=settings.DB_STMT_CACHE_SIZE,
             )
 
             # 2. WRITE POOL (Optimized for ingestion/logs)
@@ -57,13 +62,15 @@ class DatabaseManager:
                 config_dir=wallet_location,
                 wallet_location=wallet_location,
                 wallet_password=password,
-                getmode=oracledb.POOL_GETMODE_WAIT
+                getmode=oracledb.POOL_GETMODE_WAIT,
+                stmtcachesize=settings.DB_STMT_CACHE_SIZE,
             )
 
             logger.info(
                 f"✓ Database Pools initialized successfully.\n"
                 f"  Read Pool: max={settings.DB_READ_POOL_MAX}\n"
-                f"  Write Pool: max={settings.DB_WRITE_POOL_MAX}"
+                f"  Write Pool: max={settings.DB_WRITE_POOL_MAX}\n"
+                f"  Statement cache: {settings.DB_STMT_CACHE_SIZE} per connection"
             )
             
             # Pre-warm common table schema cache (Task: Performance optimization)
@@ -80,6 +87,60 @@ class DatabaseManager:
             logger.error(f"Failed to initialize Database Pools: {e}")
             raise e
 
+    @classmethod
+    def init_async_pool(cls) -> bool:
+        """
+        Creates the asyncio READ pool (python-oracledb thin mode) next to the
+        sync pools. Used by infrastructure/async_db.py for the hot read paths;
+        returns False (and the callers stay on the sync pools) if unavailable.
+        """
+        if cls._async_read_pool is not None:
+            return True
+        create_pool_async = getattr(oracledb, "create_pool_async", None)
+        if create_pool_async is None:
+            logger.warning("oracledb.create_pool_async unavailable; async DB access disabled")
+            return False
+        try:
+            wallet_location = cls._wallet_location()
+            cls._async_read_pool = create_pool_async(
+                user=settings.DB_USER,
+                password=settings.DB_PASSWORD,
+                dsn=settings.DB_DSN,
+                min=settings.DB_ASYNC_READ_POOL_MIN,
+                max=settings.DB_ASYNC_READ_POOL_MAX,
+                increment=1,
+                config_dir=wallet_location,
+                wallet_location=wallet_location,
+                wallet_password=settings.DB_PASSWORD,
+                getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+                wait_timeout=settings.DB_ASYNC_ACQUIRE_TIMEOUT_MS,
+                stmtcachesize=settings.DB_STMT_CACHE_SIZE,
+            )
+            logger.info(f"✓ Async Read Pool initialized: max={settings.DB_ASYNC_READ_POOL_MAX}")
+            return True
+        except Exception as e:
+            cls._async_read_pool = None
+            logger.error(f"Failed to initialize async Read Pool (staying on sync pools): {e}")
+            return False
+
+    @classmethod
+    def async_pool_ready(cls) -> bool:
+        return cls._async_read_pool is not None
+
+    @classmethod
+    def acquire_async_read_connection(cls):
+        """`async with DatabaseManager.acquire_async_read_connection() as conn:`"""
+        if cls._async_read_pool is None:
+            raise RuntimeError("Async Read Pool not initialized")
+        return cls._async_read_pool.acquire()
+
+    @classmethod
+    async def close_async_pool(cls):
+        pool, cls._async_read_pool = cls._async_read_pool, None
+        if pool is not None:
+            await pool.close()
+            logger.info("Async Read Pool closed.")
+
     @classmethod
     def close_pool(cls):
         """
@@ -121,6 +182,12 @@ class DatabaseManager:
             "read": {"active": 0, "opened": 0, "max": settings.DB_READ_POOL_MAX},
             "write": {"active": 0, "opened": 0, "max": settings.DB_WRITE_POOL_MAX}
         }
+        if cls._async_read_pool is not None:
+            stats["async_read"] = {
+                "active": cls._async_read_pool.busy,
+                "opened": cls._async_read_pool.opened,
+                "max": settings.DB_ASYNC_READ_POOL_MAX,
+            }
         
         if cls._read_pool:
             stats["read"]["active"] = cls._read_pool.busy
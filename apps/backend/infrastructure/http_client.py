@@ -0,0 +1,341 @@
+"""
+Shared outbound HTTP client for external integrations.
+
+One urllib3 PoolManager serves every provider: per-host keep-alive pools, so
+repeat lookups to the same API skip the TCP/TLS handshake. On top of that:
+
+- an in-process response cache keyed by (method, URL, body hash, credential
+  headers) with per-call TTLs, plus negative caching for definitive failures and
+  caller-reported outages
+- a per-host token-bucket rate limiter (HTTP_CLIENT_HOST_RATE_LIMITS)
+- request/latency metrics labelled by provider
+
+Retry policy stays with the callers; the pool never retries on its own.
+`arequest` runs the same call on a worker thread for async code.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import urllib3
+
+from config import settings
+from services.monitoring import HTTP_CLIENT_LATENCY_MS, HTTP_CLIENT_REQUESTS_TOTAL
+from utils.logger import get_logger
+
+logger = get_logger("http_client")
+
+# 4xx answers that will not change on an immediate retry. 401/403 are left out:
+# they usually mean an expired token, which the next call may already have refreshed.
+_NEGATIVE_CACHEABLE_STATUSES = frozenset({400, 404, 405, 410, 414, 422})
+# Request headers that carry credentials; responses are only shared between
+# requests sending the same values.
+_CREDENTIAL_HEADERS = frozenset({"authorization", "cookie", "proxy-authorization", "x-api-key", "api-key"})
+
+
+class HttpStatusError(Exception):
+    """Non-2xx response. `code` mirrors urllib's HTTPError for existing call sites."""
+
+    def __init__(self, code: int, url: str, body: bytes = b"", headers: Optional[Dict[str, str]] = None):
+        super().__init__(f"HTTP {code} for {url}")
+        self.code = int(code)
+        self.url = url
+        self.body = body or b""
+        self.headers = dict(headers or {})
+
+
+class HttpTransportError(Exception):
+    """Connection, TLS, timeout or local rate-limit failure (no HTTP status)."""
+
+
+@dataclass
+class HttpResponse:
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    from_cache: bool = False
+
+    @property
+    def charset(self) -> str:
+        content_type = str(self.headers.get("content-type") or "")
+        for part in content_type.split(";")[1:]:
+            key, _, value = part.strip().partition("=")
+            if key.strip().lower() == "charset" and value.strip():
+                return value.strip().strip('"')
+        return "utf-8"
+
+    def text(self) -> str:
+        try:
+            return self.body.decode(self.charset, errors="replace")
+        except LookupError:
+            return self.body.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.text())
+
+
+@dataclass
+class _CacheEntry:
+    expires_at: float
+    response: Optional[HttpResponse] = None
+    error: Optional[Exception] = field(default=None)
+
+
+class _ResponseCache:
+    """Bounded LRU with a TTL per entry."""
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[_CacheEntry]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= now:
+                self._entries.pop(key, None)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: _CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class _HostRateLimiter:
+    """Token bucket per host; hosts without a configured rate are not limited."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # host -> (tokens, last_refill)
+
+    def wait_time(self, host: str, rate_per_sec: float) -> float:
+        """Reserve one token and return how long the caller must sleep for it."""
+        burst = max(1.0, rate_per_sec)
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(host, (burst, now))
+            tokens = min(burst, tokens + (now - last) * rate_per_sec)
+            tokens -= 1.0
+            self._buckets[host] = (tokens, now)
+        return 0.0 if tokens >= 0 else (-tokens) / rate_per_sec
+
+    def refund(self, host: str) -> None:
+        with self._lock:
+            tokens, last = self._buckets.get(host, (0.0, time.monotonic()))
+            self._buckets[host] = (tokens + 1.0, last)
+
+
+_POOL: Optional[urllib3.PoolManager] = None
+_POOL_LOCK = threading.Lock()
+_CACHE: Optional[_ResponseCache] = None
+_RATE_LIMITER = _HostRateLimiter()
+_HOST_RATES: Optional[Dict[str, float]] = None
+
+
+def _pool() -> urllib3.PoolManager:
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = urllib3.PoolManager(
+                    num_pools=max(4, int(getattr(settings, "HTTP_CLIENT_NUM_POOLS", 32))),
+                    maxsize=max(1, int(getattr(settings, "HTTP_CLIENT_POOL_MAXSIZE", 10))),
+                    block=False,
+                )
+    return _POOL
+
+
+def _cache() -> _ResponseCache:
+    global _CACHE
+    if _CACHE is None:
+        with _POOL_LOCK:
+            if _CACHE is None:
+                _CACHE = _ResponseCache(int(getattr(settings, "HTTP_CLIENT_CACHE_MAX_ENTRIES", 2048)))
+    return _CACHE
+
+
+def _host_rates() -> Dict[str, float]:
+    global _HOST_RATES
+    if _HOST_RATES is None:
+        rates: Dict[str, float] = {}
+        raw = str(getattr(settings, "HTTP_CLIENT_HOST_RATE_LIMITS", "") or "")
+        for part in raw.split(","):
+            host, _, value = part.strip().partition("=")
+            try:
+                rate = float(value)
+            except ValueError:
+                continue
+            if host.strip() and rate > 0:
+                rates[host.strip().lower()] = rate
+        _HOST_RATES = rates
+    return _HOST_RATES
+
+
+def _cache_enabled() -> bool:
+    return bool(getattr(settings, "HTTP_CLIENT_CACHE_ENABLED", True))
+
+
+def _is_credential_header(name: str) -> bool:
+    lowered = name.strip().lower()
+    return lowered in _CREDENTIAL_HEADERS or "token" in lowered or "secret" in lowered
+
+
+def cache_key(
+    method: str,
+    url: str,
+    body: Optional[bytes] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> str:
+    body_hash = hashlib.sha1(body).hexdigest() if body else "-"
+    credentials = sorted(
+        (str(k).strip().lower(), str(v)) for k, v in (headers or {}).items() if _is_credential_header(str(k))
+    )
+    auth_hash = hashlib.sha1(json.dumps(credentials).encode("utf-8")).hexdigest() if credentials else "-"
+    return f"{method.upper()} {url} {body_hash} {auth_hash}"
+
+
+def remember_failure(
+    method: str,
+    url: str,
+    ttl_sec: float,
+    body: Optional[bytes] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> None:
+    """Negative-cache an outage the caller decided on (e.g. after its own retries ran out)."""
+    if not _cache_enabled() or ttl_sec <= 0:
+        return
+    _cache().put(
+        cache_key(method, url, body, headers),
+        _CacheEntry(
+            expires_at=time.monotonic() + float(ttl_sec),
+            error=HttpTransportError(f"negative-cached failure for {url}"),
+        ),
+    )
+
+
+def is_negative_cached(
+    method: str,
+    url: str,
+    body: Optional[bytes] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> bool:
+    if not _cache_enabled():
+        return False
+    entry = _cache().get(cache_key(method, url, body, headers))
+    return entry is not None and entry.error is not None
+
+
+def clear_cache() -> None:
+    if _CACHE is not None:
+        _CACHE.clear()
+
+
+def request(
+    method: str,
+    url: str,
+    *,
+    provider: str,
+    timeout_sec: float,
+    headers: Optional[Dict[str, str]] = None,
+    body: Optional[bytes] = None,
+    json_body: Any = None,
+    cache_ttl_sec: float = 0.0,
+    negative_ttl_sec: float = 0.0,
+) -> HttpResponse:
+    """
+    Send one request through the shared pool.
+
+    Returns the 2xx response or raises HttpStatusError / HttpTransportError.
+    With `cache_ttl_sec` the 2xx response is reused for identical requests; with
+    `negative_ttl_sec` definitive 4xx answers are replayed as the same error.
+    """
+    method = method.upper()
+    request_headers = {str(k): str(v) for k, v in (headers or {}).items()}
+    if json_body is not None:
+        body = json.dumps(json_body).encode("utf-8")
+        request_headers.setdefault("Content-Type", "application/json")
+
+    use_cache = _cache_enabled() and (cache_ttl_sec > 0 or negative_ttl_sec > 0)
+    key = cache_key(method, url, body, request_headers)
+    if _cache_enabled():
+        entry = _cache().get(key)
+        if entry is not None:
+            if entry.error is not None:
+                HTTP_CLIENT_REQUESTS_TOTAL.labels(provider=provider, outcome="negative_hit").inc()
+                raise entry.error
+            if entry.response is not None and cache_ttl_sec > 0:
+                HTTP_CLIENT_REQUESTS_TOTAL.labels(provider=provider, outcome="cache_hit").inc()
+                cached = entry.response
+                return HttpResponse(cached.status, cached.headers, cached.body, from_cache=True)
+
+    host = (urlsplit(url).hostname or "").lower()
+    rate = _host_rates().get(host)
+    if rate:
+        delay = _RATE_LIMITER.wait_time(host, rate)
+        if delay > timeout_sec:
+            _RATE_LIMITER.refund(host)
+            HTTP_CLIENT_REQUESTS_TOTAL.labels(provider=provider, outcome="rate_limited").inc()
+            raise HttpTransportError(f"rate limit for {host} exceeds request timeout")
+        if delay > 0:
+            time.sleep(delay)
+            timeout_sec = max(0.05, timeout_sec - delay)
+
+    started = time.perf_counter()
+    try:
+        resp = _pool().request(
+            method,
+            url,
+            body=body,
+            headers=request_headers,
+            timeout=urllib3.Timeout(total=float(timeout_sec)),
+            retries=urllib3.Retry(total=None, connect=0, read=0, status=0, other=0, redirect=5),
+            preload_content=True,
+        )
+    except urllib3.exceptions.HTTPError as exc:
+        HTTP_CLIENT_REQUESTS_TOTAL.labels(provider=provider, outcome="transport_error").inc()
+        raise HttpTransportError(str(exc)) from exc
+    finally:
+        HTTP_CLIENT_LATENCY_MS.labels(provider=provider).observe((time.perf_counter() - started) * 1000.0)
+
+    response_headers = {str(k).lower(): str(v) for k, v in resp.headers.items()}
+    status = int(resp.status or 0)
+    if status >= 400:
+        HTTP_CLIENT_REQUESTS_TOTAL.labels(provider=provider, outcome=f"http_{status // 100}xx").inc()
+        error = HttpStatusError(status, url, resp.data or b"", response_headers)
+        if use_cache and negative_ttl_sec > 0 and status in _NEGATIVE_CACHEABLE_STATUSES:
+            _cache().put(key, _CacheEntry(expires_at=time.monotonic() + float(negative_ttl_sec), error=error))
+        raise error
+
+    HTTP_CLIENT_REQUESTS_TOTAL.labels(provider=provider, outcome="ok").inc()
+    out = HttpResponse(status=status, headers=response_headers, body=resp.data or b"")
+    if use_cache and cache_ttl_sec > 0:
+        _cache().put(key, _CacheEntry(expires_at=time.monotonic() + float(cache_ttl_sec), response=out))
+    return out
+
+
+def request_json(method: str, url: str, **kwargs: Any) -> Any:
+    return request(method, url, **kwargs).json()
+
+
+async def arequest(method: str, url: str, **kwargs: Any) -> HttpResponse:
+    """Async form of `request`; the pool is shared with sync callers."""
+    return await asyncio.to_thread(request, method, url, **kwargs)
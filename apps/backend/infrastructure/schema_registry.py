@@ -0,0 +1,143 @@
+"""
+Schema capability registry.
+
+One USER_TAB_COLUMNS scan (every table and view of the schema user with its
+columns) is loaded at startup and answers the "does this table / column exist"
+questions services used to send to the data dictionary on the request path.
+
+The snapshot is refreshed on demand (POST /api/admin/schema/refresh, or after a
+service runs its own DDL) and, rate limited by SCHEMA_REGISTRY_ERROR_REFRESH_SEC,
+when a query fails with ORA-00904 / ORA-00942 because the schema moved under us.
+If the first load fails (database down), lookups report nothing as present and
+the load is retried on a later lookup.
+"""
+
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, FrozenSet, Optional
+
+from config import settings
+from infrastructure.db_manager import DatabaseManager
+from utils.logger import get_logger
+
+logger = get_logger("schema_registry")
+
+_SCHEMA_ERROR_CODES = ("ORA-00904", "ORA-00942")
+_LOAD_RETRY_SEC = 10.0
+
+
+@dataclass(frozen=True)
+class SchemaCapabilities:
+    """Typed flags derived from the snapshot for the checks services make most."""
+
+    content_v2_item_id_col: str = "BOOK_ID"
+    chat_conversation_state: bool = False
+    memory_profile_table: bool = False
+    lemma_index: bool = False
+    lemma_postings: bool = False
+    change_events: bool = False
+    library_rating: bool = False
+
+
+def is_schema_error(error: Any) -> bool:
+    text = str(error or "")
+    return any(code in text for code in _SCHEMA_ERROR_CODES)
+
+
+class SchemaRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tables: Dict[str, FrozenSet[str]] = {}
+        self._capabilities = SchemaCapabilities()
+        self._loaded_at: Optional[float] = None
+        self._last_attempt = 0.0
+        self._last_error_refresh = 0.0
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def refresh(self) -> bool:
+        """Reload the snapshot in one dictionary query. Keeps the old snapshot on failure."""
+        self._last_attempt = time.monotonic()
+        try:
+            tables: Dict[str, set] = {}
+            with DatabaseManager.get_read_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.arraysize = 5000
+                    cursor.execute("SELECT TABLE_NAME, COLUMN_NAME FROM USER_TAB_COLUMNS")
+                    for table_name, column_name in cursor.fetchall():
+                        if table_name:
+                            tables.setdefault(str(table_name).upper(), set()).add(str(column_name or "").upper())
+        except Exception as e:
+            logger.warning(f"Schema registry refresh failed: {e}")
+            return False
+
+        snapshot = {name: frozenset(cols) for name, cols in tables.items()}
+        with self._lock:
+            self._tables = snapshot
+            self._capabilities = self._derive_capabilities(snapshot)
+            self._loaded_at = time.time()
+        logger.info("Schema registry loaded", extra={"tables": len(snapshot)})
+        return True
+
+    @staticmethod
+    def _derive_capabilities(tables: Dict[str, FrozenSet[str]]) -> SchemaCapabilities:
+        content_cols = tables.get("TOMEHUB_CONTENT_V2", frozenset())
+        return SchemaCapabilities(
+            content_v2_item_id_col="ITEM_ID" if "ITEM_ID" in content_cols else "BOOK_ID",
+            chat_conversation_state="CONVERSATION_STATE_JSON" in tables.get("TOMEHUB_CHAT_SESSIONS", frozenset()),
+            memory_profile_table="TOMEHUB_USER_MEMORY_PROFILES" in tables,
+            lemma_index="TOMEHUB_LEMMA_INDEX" in tables,
+            lemma_postings="TOMEHUB_LEMMA_POSTINGS" in tables and "TOMEHUB_LEMMA_POSTINGS_STATE" in tables,
+            change_events="TOMEHUB_CHANGE_EVENTS" in tables,
+            library_rating="RATING" in tables.get("TOMEHUB_LIBRARY_ITEMS", frozenset()),
+        )
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded_at is None and time.monotonic() - self._last_attempt >= _LOAD_RETRY_SEC:
+            self.refresh()
+
+    def columns(self, table_name: str) -> FrozenSet[str]:
+        self._ensure_loaded()
+        return self._tables.get(str(table_name or "").upper(), frozenset())
+
+    def has_table(self, table_name: str) -> bool:
+        self._ensure_loaded()
+        return str(table_name or "").upper() in self._tables
+
+    def has_column(self, table_name: str, column_name: str) -> bool:
+        return str(column_name or "").upper() in self.columns(table_name)
+
+    @property
+    def capabilities(self) -> SchemaCapabilities:
+        self._ensure_loaded()
+        return self._capabilities
+
+    def note_error(self, error: Any) -> bool:
+        """
+        Report a query failure. Returns True for ORA-00904 / ORA-00942 and
+        refreshes the snapshot (at most once per SCHEMA_REGISTRY_ERROR_REFRESH_SEC).
+        """
+        if not is_schema_error(error):
+            return False
+        min_interval = float(getattr(settings, "SCHEMA_REGISTRY_ERROR_REFRESH_SEC", 30))
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_error_refresh < min_interval:
+                return True
+            self._last_error_refresh = now
+        self.refresh()
+        return True
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "loaded": self.is_loaded,
+            "loaded_at": self._loaded_at,
+            "table_count": len(self._tables),
+            "capabilities": asdict(self._capabilities),
+        }
+
+
+schema_registry = SchemaRegistry()
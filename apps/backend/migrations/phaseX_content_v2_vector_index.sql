@@ -0,0 +1,17 @@
+-- Phase X: Neighbor-partition (IVF) vector index for approximate search on TOMEHUB_CONTENT_V2.
+-- Queried via FETCH APPROX FIRST ... WITH TARGET ACCURACY (see services/vector_index_service.py).
+-- Retrain partitions after large imports: python scripts/manage_content_vector_index.py rebuild
+DECLARE
+    v_count NUMBER := 0;
+BEGIN
+    SELECT COUNT(*) INTO v_count FROM user_indexes WHERE index_name = UPPER('IDX_CNT_VEC_V2');
+    IF v_count = 0 THEN
+        EXECUTE IMMEDIATE '
+            CREATE VECTOR INDEX IDX_CNT_VEC_V2 ON TOMEHUB_CONTENT_V2 (VEC_EMBEDDING)
+            ORGANIZATION NEIGHBOR PARTITIONS
+            DISTANCE COSINE
+            WITH TARGET ACCURACY 95
+        ';
+    END IF;
+END;
+/
@@ -0,0 +1,28 @@
+-- Phase X: Per-book lemma inverted index (book, lemma) -> [chunk, count, positions]
+-- Populated from TOKEN_FREQ / lemma positions at ingest; replaced on re-ingest, deleted on purge.
+DECLARE
+    v_count NUMBER := 0;
+BEGIN
+    SELECT COUNT(*) INTO v_count FROM user_tables WHERE table_name = 'TOMEHUB_LEMMA_INDEX';
+    IF v_count = 0 THEN
+        EXECUTE IMMEDIATE '
+            CREATE TABLE TOMEHUB_LEMMA_INDEX (
+                FIREBASE_UID VARCHAR2(128) NOT NULL,
+                ITEM_ID VARCHAR2(256) NOT NULL,
+                CONTENT_ID NUMBER NOT NULL,
+                LEMMA VARCHAR2(128 CHAR) NOT NULL,
+                TERM_FREQ NUMBER(8) NOT NULL,
+                PAGE_NUMBER NUMBER,
+                CHUNK_INDEX NUMBER,
+                POSITIONS_JSON VARCHAR2(4000),
+                CONSTRAINT PK_TOMEHUB_LEMMA_INDEX PRIMARY KEY (CONTENT_ID, LEMMA)
+            )
+        ';
+    END IF;
+
+    SELECT COUNT(*) INTO v_count FROM user_indexes WHERE index_name = UPPER('IDX_LEMMA_IDX_BOOK_LEMMA');
+    IF v_count = 0 THEN
+        EXECUTE IMMEDIATE 'CREATE INDEX idx_lemma_idx_book_lemma ON TOMEHUB_LEMMA_INDEX (FIREBASE_UID, ITEM_ID, LEMMA, PAGE_NUMBER, TERM_FREQ)';
+    END IF;
+END;
+/
@@ -0,0 +1,38 @@
+-- Phase X: Search-side lemma postings (user, lemma) -> [content_id, term_freq]
+-- One row per lemma in a chunk's LEMMA_TOKENS (TERM_FREQ from TOKEN_FREQ, else 1).
+-- Written at ingest for every content row, removed with the rows on delete.
+-- Index-organized on (FIREBASE_UID, LEMMA, CONTENT_ID) so the lemma lane reads
+-- only the postings of the query lemmas. A user is served from postings once
+-- scripts/backfill_lemma_postings.py has recorded it in TOMEHUB_LEMMA_POSTINGS_STATE.
+DECLARE
+    v_count NUMBER := 0;
+BEGIN
+    SELECT COUNT(*) INTO v_count FROM user_tables WHERE table_name = 'TOMEHUB_LEMMA_POSTINGS';
+    IF v_count = 0 THEN
+        EXECUTE IMMEDIATE '
+            CREATE TABLE TOMEHUB_LEMMA_POSTINGS (
+                FIREBASE_UID VARCHAR2(128) NOT NULL,
+                LEMMA VARCHAR2(128 CHAR) NOT NULL,
+                CONTENT_ID NUMBER NOT NULL,
+                TERM_FREQ NUMBER(8) NOT NULL,
+                CONSTRAINT PK_TOMEHUB_LEMMA_POSTINGS PRIMARY KEY (FIREBASE_UID, LEMMA, CONTENT_ID)
+            ) ORGANIZATION INDEX
+        ';
+    END IF;
+
+    SELECT COUNT(*) INTO v_count FROM user_indexes WHERE index_name = UPPER('IDX_LEMMA_POSTINGS_CONTENT');
+    IF v_count = 0 THEN
+        EXECUTE IMMEDIATE 'CREATE INDEX idx_lemma_postings_content ON TOMEHUB_LEMMA_POSTINGS (CONTENT_ID)';
+    END IF;
+
+    SELECT COUNT(*) INTO v_count FROM user_tables WHERE table_name = 'TOMEHUB_LEMMA_POSTINGS_STATE';
+    IF v_count = 0 THEN
+        EXECUTE IMMEDIATE '
+            CREATE TABLE TOMEHUB_LEMMA_POSTINGS_STATE (
+                FIREBASE_UID VARCHAR2(128) PRIMARY KEY,
+                BACKFILLED_AT TIMESTAMP DEFAULT SYSTIMESTAMP NOT NULL
+            )
+        ';
+    END IF;
+END;
+/
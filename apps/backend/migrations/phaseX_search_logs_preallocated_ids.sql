@@ -0,0 +1,20 @@
+-- Let the search-log writer insert ids it pre-allocated from the identity sequence.
+-- IDs still come from the same sequence, so synchronous inserts keep working.
+
+DECLARE
+    v_type VARCHAR2(30);
+BEGIN
+    SELECT generation_type
+      INTO v_type
+      FROM user_tab_identities
+     WHERE table_name = 'TOMEHUB_SEARCH_LOGS'
+       AND column_name = 'ID';
+
+    IF v_type = 'ALWAYS' THEN
+        EXECUTE IMMEDIATE 'ALTER TABLE TOMEHUB_SEARCH_LOGS MODIFY (ID GENERATED BY DEFAULT AS IDENTITY)';
+    END IF;
+EXCEPTION
+    WHEN NO_DATA_FOUND THEN
+        NULL;
+END;
+/
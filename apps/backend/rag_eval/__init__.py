@@ -1,14 +1,20 @@
 from .dataset import load_golden_cases
 from .judge import JudgeGrade, LLMJudge
 from .models import EvalCaseResult, EvalSummary, GoldenCase
+from .replay import EvalFixture, RecordingAnswerFn, RecordingJudge, ReplayAnswerFn, ReplayJudge
 from .runner import render_markdown_report, run_eval_suite
 
 __all__ = [
     "EvalCaseResult",
+    "EvalFixture",
     "EvalSummary",
     "GoldenCase",
     "JudgeGrade",
     "LLMJudge",
+    "RecordingAnswerFn",
+    "RecordingJudge",
+    "ReplayAnswerFn",
+    "ReplayJudge",
     "load_golden_cases",
     "render_markdown_report",
     "run_eval_suite",
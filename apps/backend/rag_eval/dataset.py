@@ -37,6 +37,7 @@ def _normalize_list_item(raw: Dict[str, Any]) -> GoldenCase:
             "must_quote",
             "must_synthesize",
             "forbidden",
+            "expected_sources",
         }
     }
     return GoldenCase(
@@ -48,6 +49,7 @@ def _normalize_list_item(raw: Dict[str, Any]) -> GoldenCase:
         must_quote=_as_list(raw.get("must_quote")),
         must_synthesize=_as_list(raw.get("must_synthesize")),
         forbidden=_as_list(raw.get("forbidden")),
+        expected_sources=_as_list(raw.get("expected_sources")),
         metadata=metadata,
     )
 
@@ -14,6 +14,8 @@ class GoldenCase:
     must_quote: List[str] = field(default_factory=list)
     must_synthesize: List[str] = field(default_factory=list)
     forbidden: List[str] = field(default_factory=list)
+    # Source ids / book ids / titles retrieval should surface (optional).
+    expected_sources: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
@@ -42,6 +44,10 @@ class EvalCaseResult:
     rule_failures: List[str]
     reasoning: str
     meta: Dict[str, Any] = field(default_factory=dict)
+    case_class: str = "UNSPECIFIED"
+    # Only set for cases with expected_sources.
+    retrieval_recall: Optional[float] = None
+    retrieval_reciprocal_rank: Optional[float] = None
 
 
 @dataclass
@@ -53,3 +59,7 @@ class EvalSummary:
     average_latency_sec: float
     classifications: Dict[str, int]
     faithfulness_counts: Dict[str, int]
+    # case class (plus "ALL") -> {"count", "p50", "p95", "p99"} in seconds
+    latency_percentiles: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    # {"cases", "recall", "mrr"} over cases with expected_sources
+    retrieval: Dict[str, float] = field(default_factory=dict)
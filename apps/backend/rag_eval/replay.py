@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import json
+import threading
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from .models import GoldenCase, JudgeGrade
+
+FIXTURE_VERSION = 2
+
+SourcesTransform = Callable[[GoldenCase, List[Dict[str, Any]]], List[Dict[str, Any]]]
+
+
+def _round_trip(value: Any) -> Any:
+    # Recording returns what replay will load, so a recorded run and its replays report the same.
+    return json.loads(json.dumps(value, ensure_ascii=False, default=str))
+
+
+def _upgrade_v1_case(entry: Dict[str, Any]) -> Dict[str, Any]:
+    upgraded: Dict[str, Any] = {
+        "retrieval": {"sources": entry.get("sources") or []},
+        "generation": {key: entry[key] for key in ("answer", "meta", "grade") if key in entry},
+    }
+    if "duration_sec" in entry:
+        upgraded["duration_sec"] = entry["duration_sec"]
+    return upgraded
+
+
+class EvalFixture:
+    """
+    Per-case recording for offline replay, kept in two parts:
+
+    - `retrieval`: the sources the answer was built from, in ranked order;
+    - `generation`: answer, metadata and judge grade.
+
+    Replay recomputes retrieval metrics from the (optionally transformed)
+    sources; generation results are the recorded ones.
+    """
+
+    def __init__(self, cases: Dict[str, Dict[str, Any]] | None = None, recorded_at: str | None = None):
+        self.cases: Dict[str, Dict[str, Any]] = dict(cases or {})
+        self.recorded_at = recorded_at or datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str | Path) -> "EvalFixture":
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+        version = payload.get("version")
+        cases = payload.get("cases") or {}
+        if version == 1:
+            cases = {case_id: _upgrade_v1_case(entry) for case_id, entry in cases.items()}
+        elif version != FIXTURE_VERSION:
+            raise ValueError(f"Unsupported eval fixture version in {path}: {version}")
+        return cls(cases, recorded_at=payload.get("recorded_at"))
+
+    def save(self, path: str | Path) -> Path:
+        out = Path(path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": FIXTURE_VERSION, "recorded_at": self.recorded_at, "cases": self.cases}
+        out.write_text(json.dumps(payload, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+        return out
+
+    @property
+    def generated_at(self) -> datetime:
+        return datetime.strptime(self.recorded_at, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=UTC)
+
+    def put(self, case_id: str, section: str | None = None, **fields: Any) -> None:
+        with self._lock:
+            entry = self.cases.setdefault(case_id, {})
+            (entry.setdefault(section, {}) if section else entry).update(fields)
+
+    def get(self, case_id: str) -> Dict[str, Any]:
+        entry = self.cases.get(case_id)
+        if entry is None:
+            raise KeyError(f"Eval fixture has no recording for case '{case_id}'")
+        return entry
+
+
+class RecordingAnswerFn:
+    """Wraps an answer function and stores its output (and latency) per case."""
+
+    def __init__(
+        self,
+        fixture: EvalFixture,
+        inner: Callable[[GoldenCase, str], Tuple[str, List[Dict[str, Any]], Dict[str, Any]]] | None = None,
+    ):
+        if inner is None:
+            from .runner import _default_answer_fn as inner
+        self.inner = inner
+        self.fixture = fixture
+
+    def __call__(self, case: GoldenCase, firebase_uid: str) -> Tuple[str, List[Dict[str, Any]], Dict[str, Any]]:
+        answer, sources, meta = self.inner(case, firebase_uid)
+        answer, sources, meta = _round_trip([answer or "", sources or [], meta or {}])
+        self.fixture.put(case.case_id, "retrieval", sources=sources)
+        self.fixture.put(case.case_id, "generation", answer=answer, meta=meta)
+        return answer, sources, meta
+
+    def record_duration(self, case: GoldenCase, duration_sec: float) -> None:
+        self.fixture.put(case.case_id, duration_sec=duration_sec)
+
+
+class ReplayAnswerFn:
+    """
+    Serves recordings without network or database. `sources_transform` lets a
+    local ranking change reorder/filter the recorded retrieval; retrieval
+    metrics (expected-source recall, MRR) are recomputed on its output, while
+    the answer and grade stay the recorded ones for the original sources.
+    """
+
+    def __init__(self, fixture: EvalFixture, sources_transform: SourcesTransform | None = None):
+        self.fixture = fixture
+        self.sources_transform = sources_transform
+
+    def __call__(self, case: GoldenCase, firebase_uid: str) -> Tuple[str, List[Dict[str, Any]], Dict[str, Any]]:
+        entry = self.fixture.get(case.case_id)
+        sources = _round_trip((entry.get("retrieval") or {}).get("sources") or [])
+        if self.sources_transform is not None:
+            sources = self.sources_transform(case, sources)
+        generation = entry.get("generation") or {}
+        return generation.get("answer") or "", sources, _round_trip(generation.get("meta") or {})
+
+    def recorded_duration(self, case: GoldenCase) -> float:
+        return float(self.fixture.get(case.case_id).get("duration_sec") or 0.0)
+
+
+class RecordingJudge:
+    def __init__(self, fixture: EvalFixture, inner: Any):
+        self.inner = inner
+        self.fixture = fixture
+
+    def evaluate(self, case: GoldenCase, answer: str, sources: List[Dict[str, Any]], meta: Dict[str, Any]) -> JudgeGrade:
+        grade = self.inner.evaluate(case, answer, sources, meta)
+        self.fixture.put(case.case_id, "generation", grade=_round_trip(grade.__dict__))
+        return grade
+
+
+class ReplayJudge:
+    def __init__(self, fixture: EvalFixture):
+        self.fixture = fixture
+
+    def evaluate(self, case: GoldenCase, answer: str, sources: List[Dict[str, Any]], meta: Dict[str, Any]) -> JudgeGrade:
+        return JudgeGrade(**self.fixture.get(case.case_id)["generation"]["grade"])
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import json
+import math
 import time
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
@@ -13,6 +15,8 @@ from .models import EvalCaseResult, EvalSummary, GoldenCase, JudgeGrade
 
 AnswerFn = Callable[[GoldenCase, str], Tuple[str, List[Dict[str, Any]], Dict[str, Any]]]
 
+LATENCY_PERCENTILES = (50, 95, 99)
+
 
 def _default_answer_fn(case: GoldenCase, firebase_uid: str) -> Tuple[str, List[Dict[str, Any]], Dict[str, Any]]:
     from services.search_service import generate_answer
@@ -113,6 +117,127 @@ def classify_case_result(
     return "unknown", evidence_gaps, False
 
 
+def _source_matches(expected: str, source: Dict[str, Any]) -> bool:
+    for key in ("id", "book_id", "item_id"):
+        if source.get(key) is not None and _normalize_text(source.get(key)) == expected:
+            return True
+    return bool(expected) and expected in _normalize_text(source.get("title") or "")
+
+
+def retrieval_metrics(case: GoldenCase, sources: Sequence[Dict[str, Any]]) -> Tuple[float | None, float | None]:
+    """
+    (expected-source recall, reciprocal rank of the first expected hit) for the
+    retrieved sources, in their returned order; (None, None) without expectations.
+    An expected entry matches a source by id / book_id / item_id or inside its title.
+    """
+    expected = [_normalize_text(item) for item in case.expected_sources if _normalize_text(item)]
+    if not expected:
+        return None, None
+    found = {item for item in expected if any(_source_matches(item, source) for source in sources)}
+    first_rank = next(
+        (rank for rank, source in enumerate(sources, start=1) if any(_source_matches(item, source) for item in expected)),
+        None,
+    )
+    return len(found) / len(expected), (1.0 / first_rank) if first_rank else 0.0
+
+
+def summarize_retrieval(results: Sequence[EvalCaseResult]) -> Dict[str, float]:
+    scored = [item for item in results if item.retrieval_recall is not None]
+    if not scored:
+        return {}
+    return {
+        "cases": len(scored),
+        "recall": sum(item.retrieval_recall for item in scored) / len(scored),
+        "mrr": sum(item.retrieval_reciprocal_rank or 0.0 for item in scored) / len(scored),
+    }
+
+
+def case_class(case: GoldenCase) -> str:
+    return str(
+        case.metadata.get("case_class")
+        or case.metadata.get("category")
+        or case.expected_mode
+        or "UNSPECIFIED"
+    )
+
+
+def _percentile(values: Sequence[float], pct: float) -> float:
+    # Nearest-rank, so the reported value is always an observed latency.
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil((pct / 100.0) * len(ordered)))
+    return ordered[rank - 1]
+
+
+def latency_percentiles(results: Sequence[EvalCaseResult]) -> Dict[str, Dict[str, float]]:
+    groups: Dict[str, List[float]] = {"ALL": [item.duration_sec for item in results]}
+    for item in results:
+        groups.setdefault(item.case_class, []).append(item.duration_sec)
+    return {
+        name: {
+            "count": len(values),
+            **{f"p{pct}": _percentile(values, pct) for pct in LATENCY_PERCENTILES},
+        }
+        for name, values in sorted(groups.items())
+        if values
+    }
+
+
+def _evaluate_case(
+    case: GoldenCase,
+    firebase_uid: str,
+    judge: Any,
+    caller: AnswerFn,
+    pass_score: int,
+) -> EvalCaseResult:
+    started_at = time.perf_counter()
+    answer, sources, meta = caller(case, firebase_uid)
+    duration_sec = time.perf_counter() - started_at
+    # Record/replay answer functions (rag_eval.replay) own the latency so replays report it exactly.
+    if hasattr(caller, "recorded_duration"):
+        duration_sec = caller.recorded_duration(case)
+    elif hasattr(caller, "record_duration"):
+        caller.record_duration(case, duration_sec)
+    grade = judge.evaluate(case, answer, sources, meta)
+    rule_failures, actual_mode = evaluate_case_rules(case, answer)
+    recall, reciprocal_rank = retrieval_metrics(case, sources)
+    classification, evidence_gaps, passed = classify_case_result(
+        answer,
+        sources,
+        meta,
+        grade,
+        rule_failures,
+        pass_score=pass_score,
+    )
+    return EvalCaseResult(
+        case_id=case.case_id,
+        question=case.question,
+        answer=answer,
+        actual_mode=actual_mode,
+        source_count=len(sources),
+        source_titles=sorted(
+            {
+                str(source.get("title") or "").strip()
+                for source in sources
+                if str(source.get("title") or "").strip()
+            }
+        ),
+        duration_sec=duration_sec,
+        score=grade.score,
+        faithfulness=grade.faithfulness,
+        passed=passed,
+        classification=classification,
+        evidence_gaps=evidence_gaps,
+        rule_failures=rule_failures,
+        reasoning=grade.reasoning,
+        meta=meta,
+        case_class=case_class(case),
+        retrieval_recall=recall,
+        retrieval_reciprocal_rank=reciprocal_rank,
+    )
+
+
 def run_eval_suite(
     cases: Iterable[GoldenCase],
     firebase_uid: str,
@@ -120,49 +245,23 @@ def run_eval_suite(
     *,
     answer_fn: AnswerFn | None = None,
     pass_score: int = 4,
+    concurrency: int = 1,
 ) -> Tuple[List[EvalCaseResult], EvalSummary]:
+    """
+    Evaluate every case; with concurrency > 1 up to that many cases (answer + judge)
+    run at once. Results keep the dataset order either way.
+    """
     caller = answer_fn or _default_answer_fn
-    results: List[EvalCaseResult] = []
-
-    for case in cases:
-        started_at = time.perf_counter()
-        answer, sources, meta = caller(case, firebase_uid)
-        duration_sec = time.perf_counter() - started_at
-        grade = judge.evaluate(case, answer, sources, meta)
-        rule_failures, actual_mode = evaluate_case_rules(case, answer)
-        classification, evidence_gaps, passed = classify_case_result(
-            answer,
-            sources,
-            meta,
-            grade,
-            rule_failures,
-            pass_score=pass_score,
-        )
-        results.append(
-            EvalCaseResult(
-                case_id=case.case_id,
-                question=case.question,
-                answer=answer,
-                actual_mode=actual_mode,
-                source_count=len(sources),
-                source_titles=sorted(
-                    {
-                        str(source.get("title") or "").strip()
-                        for source in sources
-                        if str(source.get("title") or "").strip()
-                    }
-                ),
-                duration_sec=duration_sec,
-                score=grade.score,
-                faithfulness=grade.faithfulness,
-                passed=passed,
-                classification=classification,
-                evidence_gaps=evidence_gaps,
-                rule_failures=rule_failures,
-                reasoning=grade.reasoning,
-                meta=meta,
-            )
-        )
+    case_list = list(cases)
+
+    def _run(case: GoldenCase) -> EvalCaseResult:
+        return _evaluate_case(case, firebase_uid, judge, caller, pass_score)
+
+    if concurrency <= 1 or len(case_list) <= 1:
+        results = [_run(case) for case in case_list]
+    else:
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(case_list)), thread_name_prefix="rag-eval") as pool:
+            results = list(pool.map(_run, case_list))
 
     classification_counts = Counter(item.classification for item in results)
     faithfulness_counts = Counter(item.faithfulness for item in results)
@@ -182,6 +281,8 @@ def run_eval_suite(
         average_latency_sec=average_latency,
         classifications=dict(classification_counts),
         faithfulness_counts=dict(faithfulness_counts),
+        latency_percentiles=latency_percentiles(results),
+        retrieval=summarize_retrieval(results),
     )
     return results, summary
 
@@ -210,6 +311,23 @@ def render_markdown_report(
     ]
     for key, value in sorted(summary.classifications.items()):
         lines.append(f"- `{key}`: {value}")
+    if summary.retrieval:
+        lines.extend(
+            [
+                "",
+                "## Retrieval",
+                "",
+                f"- Cases with expected sources: `{int(summary.retrieval['cases'])}`",
+                f"- Expected-source recall: `{summary.retrieval['recall']:.1%}`",
+                f"- MRR: `{summary.retrieval['mrr']:.3f}`",
+            ]
+        )
+    if summary.latency_percentiles:
+        lines.extend(["", "## Latency by Case Class", "", "| Class | Cases | p50 | p95 | p99 |", "|---|---:|---:|---:|---:|"])
+        for name, stats in summary.latency_percentiles.items():
+            lines.append(
+                f"| {name} | {int(stats['count'])} | {stats['p50']:.2f}s | {stats['p95']:.2f}s | {stats['p99']:.2f}s |"
+            )
     lines.extend(["", "## Case Results", "", "| ID | Score | Faithfulness | Mode | Class | Sources | Notes |", "|---|---:|---|---|---|---:|---|"])
     for item in results:
         notes = ", ".join(item.evidence_gaps) if item.evidence_gaps else "pass"
@@ -233,14 +351,16 @@ def write_reports(
     dataset_name: str,
     results: Sequence[EvalCaseResult],
     summary: EvalSummary,
+    *,
+    generated_at: datetime | None = None,
 ) -> Tuple[Path, Path]:
     out_dir = Path(output_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
-    stamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+    stamp = (generated_at or datetime.now(UTC)).strftime("%Y%m%d_%H%M%S")
     markdown_path = out_dir / f"rag_eval_{dataset_name}_{stamp}.md"
     json_path = out_dir / f"rag_eval_{dataset_name}_{stamp}.json"
     markdown_path.write_text(
-        render_markdown_report(results, summary, dataset_name=dataset_name),
+        render_markdown_report(results, summary, dataset_name=dataset_name, generated_at=generated_at),
         encoding="utf-8",
     )
     json_path.write_text(render_json_report(results, summary), encoding="utf-8")
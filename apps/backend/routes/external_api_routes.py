@@ -1,4 +1,3 @@
-import asyncio
 from typing import Annotated
 from functools import partial
 
@@ -13,6 +12,7 @@ from middleware.external_api_auth import (
     verify_external_api_key,
 )
 from models.external_api_models import ExternalSearchRequest, ExternalSearchResponse
+from services.bulkhead_service import WORKLOAD_RETRIEVAL, run_in_bulkhead
 from services.external_retrieval_service import run_external_search
 
 
@@ -47,9 +47,8 @@ async def external_search_endpoint(
         if payload.include_private_notes:
             require_external_scope(principal, "notes:read_private")
 
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(
-            None,
+        return await run_in_bulkhead(
+            WORKLOAD_RETRIEVAL,
             partial(run_external_search, payload, principal.owner_firebase_uid),
         )
     except HTTPException:
@@ -0,0 +1,85 @@
+import io
+import os
+import sys
+from dotenv import load_dotenv
+
+if sys.platform == "win32":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(backend_dir)
+load_dotenv(os.path.join(backend_dir, ".env"))
+
+from infrastructure.db_manager import DatabaseManager, safe_read_clob
+from services.lemma_index_service import LEMMA_INDEX_TABLE, build_postings, replace_item_lemma_index
+from utils.text_utils import get_lemma_positions
+
+SOURCE_TYPES = ("PDF", "EPUB")
+
+
+def _items_missing_postings(cursor) -> list[tuple[str, str, str]]:
+    placeholders = ",".join([f":st{i}" for i in range(len(SOURCE_TYPES))])
+    params = {f"st{i}": st for i, st in enumerate(SOURCE_TYPES)}
+    cursor.execute(
+        f"""
+        SELECT DISTINCT c.firebase_uid, c.item_id, c.content_type
+        FROM TOMEHUB_CONTENT_V2 c
+        WHERE c.content_type IN ({placeholders})
+          AND c.item_id IS NOT NULL
+          AND NOT EXISTS (
+              SELECT 1 FROM {LEMMA_INDEX_TABLE} li
+              WHERE li.firebase_uid = c.firebase_uid
+                AND li.item_id = c.item_id
+          )
+        """,
+        params,
+    )
+    return [(str(r[0]), str(r[1]), str(r[2])) for r in cursor.fetchall()]
+
+
+def backfill_lemma_index():
+    DatabaseManager.init_pool()
+    try:
+        with DatabaseManager.get_write_connection() as conn:
+            with conn.cursor() as cursor:
+                items = _items_missing_postings(cursor)
+                print(f"TOTAL_ITEMS={len(items)}")
+                if not items:
+                    print("NO_ITEMS_TO_INDEX")
+                    return
+
+                for processed, (uid, item_id, content_type) in enumerate(items, start=1):
+                    cursor.execute(
+                        """
+                        SELECT chunk_index, content_chunk
+                        FROM TOMEHUB_CONTENT_V2
+                        WHERE firebase_uid = :p_uid
+                          AND item_id = :p_book
+                          AND content_type = :p_type
+                        """,
+                        {"p_uid": uid, "p_book": item_id, "p_type": content_type},
+                    )
+                    postings_by_chunk = {}
+                    for chunk_index, content_clob in cursor.fetchall():
+                        if chunk_index is None:
+                            continue
+                        content = safe_read_clob(content_clob)
+                        postings_by_chunk[int(chunk_index)] = build_postings(get_lemma_positions(content))
+
+                    written = replace_item_lemma_index(
+                        cursor,
+                        firebase_uid=uid,
+                        book_id=item_id,
+                        content_type=content_type,
+                        postings_by_chunk_index=postings_by_chunk,
+                    )
+                    conn.commit()
+                    print(f"PROCESSED={processed} ITEM={item_id} POSTINGS={written}")
+
+                print("BACKFILL_COMPLETE")
+    finally:
+        DatabaseManager.close_pool()
+
+
+if __name__ == "__main__":
+    backfill_lemma_index()
@@ -0,0 +1,98 @@
+import io
+import os
+import sys
+from dotenv import load_dotenv
+
+if sys.platform == "win32":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(backend_dir)
+load_dotenv(os.path.join(backend_dir, ".env"))
+
+from infrastructure.db_manager import DatabaseManager
+from services.lemma_postings_service import (
+    LEMMA_POSTINGS_STATE_TABLE,
+    LEMMA_POSTINGS_TABLE,
+    mark_user_backfilled,
+    write_content_postings,
+)
+
+BATCH_SIZE = 500
+
+
+def _users_to_backfill(cursor) -> list[str]:
+    cursor.execute(
+        f"""
+        SELECT DISTINCT c.firebase_uid
+        FROM TOMEHUB_CONTENT_V2 c
+        WHERE NOT EXISTS (
+            SELECT 1 FROM {LEMMA_POSTINGS_STATE_TABLE} s
+            WHERE s.FIREBASE_UID = c.firebase_uid
+        )
+        """
+    )
+    return [str(r[0]) for r in cursor.fetchall() if r[0]]
+
+
+def _rows_missing_postings(cursor, uid: str, after_id: int) -> list[tuple]:
+    cursor.execute(
+        f"""
+        SELECT c.id, c.lemma_tokens, c.token_freq
+        FROM TOMEHUB_CONTENT_V2 c
+        WHERE c.firebase_uid = :p_uid
+          AND c.id > :p_after
+          AND c.lemma_tokens IS NOT NULL
+          AND NOT EXISTS (
+              SELECT 1 FROM {LEMMA_POSTINGS_TABLE} p
+              WHERE p.FIREBASE_UID = c.firebase_uid
+                AND p.CONTENT_ID = c.id
+          )
+        ORDER BY c.id
+        FETCH FIRST :p_batch ROWS ONLY
+        """,
+        {"p_uid": uid, "p_after": after_id, "p_batch": BATCH_SIZE},
+    )
+    return cursor.fetchall()
+
+
+def backfill_lemma_postings():
+    DatabaseManager.init_pool()
+    try:
+        with DatabaseManager.get_write_connection() as conn:
+            with conn.cursor() as cursor:
+                users = _users_to_backfill(cursor)
+                print(f"TOTAL_USERS={len(users)}")
+                if not users:
+                    print("NO_USERS_TO_BACKFILL")
+                    return
+
+                for processed, uid in enumerate(users, start=1):
+                    after_id = 0
+                    written = 0
+                    while True:
+                        rows = _rows_missing_postings(cursor, uid, after_id)
+                        if not rows:
+                            break
+                        for content_id, lemmas_json, token_freq_json in rows:
+                            written += write_content_postings(
+                                cursor,
+                                firebase_uid=uid,
+                                content_id=content_id,
+                                lemmas_json=lemmas_json,
+                                token_freq_json=token_freq_json,
+                            )
+                        after_id = int(rows[-1][0])
+                        conn.commit()
+                    # Rows inserted from here on get their postings at ingest time.
+                    mark_user_backfilled(cursor, uid)
+                    conn.commit()
+                    print(f"PROCESSED={processed} USER={uid} POSTINGS={written}")
+
+                print("BACKFILL_COMPLETE")
+    finally:
+        DatabaseManager.close_pool()
+
+
+if __name__ == "__main__":
+    backfill_lemma_postings()
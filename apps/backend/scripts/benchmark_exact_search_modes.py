@@ -121,18 +121,40 @@ def benchmark(uid: str, queries: List[str], item_id: str, limit: int) -> int:
             pass
 
 
+def benchmark_local(fixture: str, uid: str, queries: List[str], item_id: str, limit: int) -> int:
+    """Same table for the offline exact lane (SQLite instr scan + boundary check); no Oracle Text column."""
+    from services.search_system.local_backend import LocalExactMatchStrategy, LocalCorpus
+
+    corpus = LocalCorpus.from_fixture(fixture)
+    strategy = LocalExactMatchStrategy(corpus)
+    try:
+        print("query | local_ms | local_hits")
+        print("-" * 48)
+        for q in queries:
+            t0 = time.perf_counter()
+            rows = strategy.search(q, uid, limit=limit, book_id=item_id or None)
+            elapsed_ms = (time.perf_counter() - t0) * 1000.0
+            print(f"{q[:28]:28} | {elapsed_ms:8.1f} | {len(rows):10d}")
+        return 0
+    finally:
+        corpus.close()
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Benchmark legacy exact search vs Oracle Text exact search")
     parser.add_argument("--uid", required=True, help="firebase_uid")
     parser.add_argument("--item-id", default="", help="optional item_id scope")
     parser.add_argument("--queries", required=True, help="comma-separated query list")
     parser.add_argument("--limit", type=int, default=40, help="max rows per query")
+    parser.add_argument("--fixture", default="", help="run offline against an export_retrieval_fixture.py JSON")
     args = parser.parse_args()
 
     queries = [q.strip() for q in args.queries.split(",") if q.strip()]
     if not queries:
         print("No queries provided.")
         return 1
+    if args.fixture:
+        return benchmark_local(args.fixture, args.uid, queries, args.item_id, args.limit)
     return benchmark(args.uid, queries, args.item_id, args.limit)
 
 
@@ -0,0 +1,153 @@
+"""
+Compare single-phase vs two-phase (late materialization) exact/lemma retrieval.
+
+Synthetic mode (default) models the candidate scan: phase one reads no LOB
+columns, and phase two reads match_text plus content/tags/summary/comment only
+for the candidates the boundary filter walks before `limit` rows are kept.
+
+    python scripts/benchmark_lexical_materialization.py --candidates 320 --limit 40
+
+Live mode runs real queries with the flag off and on and reads the
+candidate_scan bytes/round-trip counters exported by cursor_profiles:
+
+    python scripts/benchmark_lexical_materialization.py --live --uid <firebase_uid> --query vicdan
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Sequence
+
+# Add backend directory to sys.path
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+
+def _percentile(values: Sequence[float], pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    idx = min(len(ordered) - 1, max(0, int(round((pct / 100.0) * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def _synthetic_rows(n: int, rng: random.Random) -> List[Dict[str, str]]:
+    rows = []
+    for i in range(n):
+        content = "x" * rng.randint(600, 2400)
+        rows.append({
+            "id": i,
+            "match_text": content.lower(),
+            "content_chunk": content,
+            "tags": '["tag-a", "tag-b"]',
+            "summary": "s" * rng.randint(800, 3000),
+            "comment": "c" * rng.randint(0, 400),
+        })
+    return rows
+
+
+def _row_bytes(row: Dict[str, str], columns: Sequence[str]) -> int:
+    return sum(len(row[c]) for c in columns)
+
+
+def run_synthetic(candidates: int, limit: int, keep_ratio: float, repeats: int, seed: int) -> None:
+    rng = random.Random(seed)
+    match_cols = ("match_text",)
+    detail_cols = ("content_chunk", "tags", "summary", "comment")
+
+    single_bytes, late_bytes = [], []
+    single_ms, late_ms = [], []
+    for _ in range(repeats):
+        rows = _synthetic_rows(candidates, rng)
+        walked, kept = [], []
+        for r in rows:
+            if len(kept) >= limit:
+                break
+            walked.append(r)
+            if rng.random() < keep_ratio:
+                kept.append(r)
+
+        t0 = time.perf_counter()
+        single = sum(_row_bytes(r, match_cols + detail_cols) for r in rows)
+        # Decode cost of the detail CLOBs is what the single pass pays for every row.
+        _ = [r["content_chunk"].strip() + r["summary"].strip() for r in rows]
+        single_ms.append((time.perf_counter() - t0) * 1000.0)
+        single_bytes.append(single)
+
+        t0 = time.perf_counter()
+        late = sum(_row_bytes(r, match_cols + detail_cols) for r in walked)
+        _ = [r["content_chunk"].strip() + r["summary"].strip() for r in kept]
+        late_ms.append((time.perf_counter() - t0) * 1000.0)
+        late_bytes.append(late)
+
+    avg_single = sum(single_bytes) / len(single_bytes)
+    avg_late = sum(late_bytes) / len(late_bytes)
+    print(f"candidates={candidates} limit={limit} keep_ratio={keep_ratio:.2f} repeats={repeats}")
+    print(f"single-phase bytes/query: {avg_single:,.0f}  decode p50={_percentile(single_ms, 50):.3f}ms")
+    print(f"two-phase    bytes/query: {avg_late:,.0f}  decode p50={_percentile(late_ms, 50):.3f}ms")
+    if avg_single:
+        print(f"bytes saved: {100.0 * (1.0 - avg_late / avg_single):.1f}%")
+
+
+def _counter_value(counter, query_class: str) -> float:
+    return counter.labels(query_class=query_class)._value.get()
+
+
+def run_live(uid: str, queries: Sequence[str], limit: int, repeats: int) -> None:
+    from config import settings
+    from infrastructure.cursor_profiles import QUERY_CLASS_CANDIDATE_SCAN
+    from infrastructure.db_manager import DatabaseManager
+    from services.monitoring import DB_CURSOR_BYTES_FETCHED_TOTAL, DB_CURSOR_ROUND_TRIPS_TOTAL
+    from services.search_system.strategies import ExactMatchStrategy, LemmaMatchStrategy
+
+    DatabaseManager.init_pool()
+    strategies = (("exact", ExactMatchStrategy()), ("lemma", LemmaMatchStrategy()))
+    try:
+        for late in (False, True):
+            settings.SEARCH_LEXICAL_LATE_MATERIALIZATION = late
+            for name, strategy in strategies:
+                bytes_before = _counter_value(DB_CURSOR_BYTES_FETCHED_TOTAL, QUERY_CLASS_CANDIDATE_SCAN)
+                trips_before = _counter_value(DB_CURSOR_ROUND_TRIPS_TOTAL, QUERY_CLASS_CANDIDATE_SCAN)
+                latencies = []
+                for _ in range(repeats):
+                    for q in queries:
+                        t0 = time.perf_counter()
+                        strategy.search(q, uid, limit=limit)
+                        latencies.append((time.perf_counter() - t0) * 1000.0)
+                runs = max(1, repeats * len(queries))
+                fetched = _counter_value(DB_CURSOR_BYTES_FETCHED_TOTAL, QUERY_CLASS_CANDIDATE_SCAN) - bytes_before
+                trips = _counter_value(DB_CURSOR_ROUND_TRIPS_TOTAL, QUERY_CLASS_CANDIDATE_SCAN) - trips_before
+                print(
+                    f"{name:<5} late={str(late):<5} bytes/query={fetched / runs:,.0f} "
+                    f"round_trips/query={trips / runs:.1f} "
+                    f"p50={_percentile(latencies, 50):.1f}ms p95={_percentile(latencies, 95):.1f}ms"
+                )
+    finally:
+        DatabaseManager.close_pool()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--live", action="store_true", help="Run against the configured Oracle database")
+    parser.add_argument("--uid", default="", help="firebase_uid for --live")
+    parser.add_argument("--query", action="append", default=[], help="Query text for --live (repeatable)")
+    parser.add_argument("--candidates", type=int, default=320)
+    parser.add_argument("--limit", type=int, default=40)
+    parser.add_argument("--keep-ratio", type=float, default=0.35)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    if args.live:
+        if not args.uid or not args.query:
+            parser.error("--live requires --uid and at least one --query")
+        run_live(args.uid, args.query, args.limit, args.repeats)
+    else:
+        run_synthetic(args.candidates, args.limit, args.keep_ratio, args.repeats, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Offline search benchmark: SearchOrchestrator end to end on LocalRetrievalBackend.
+
+Uses the Phase-0 query set and metrics (latency p50/p95, MRR, nDCG@10) from
+scripts/phase0_benchmark.py, but calls the orchestrator in-process against a
+SQLite + NumPy corpus instead of the HTTP API, so numbers are reproducible on a
+laptop. The corpus is either an exported fixture (export_retrieval_fixture.py)
+or a seeded synthetic corpus with a deterministic hashed embedding.
+
+Run examples:
+  python scripts/benchmark_local_search.py --fixture data/fixtures/retrieval_uid.json --uid your_uid
+  python scripts/benchmark_local_search.py --synthetic 5000 --seed 7
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+# Add backend directory to sys.path
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, CURRENT_DIR)
+
+from phase0_benchmark import QueryItem, is_relevant, load_query_set, mrr, ndcg_at_k, percentile  # noqa: E402
+from services.search_system.local_backend import LocalCorpus, LocalRetrievalBackend  # noqa: E402
+from services.search_system.orchestrator import SearchOrchestrator  # noqa: E402
+from utils.text_utils import deaccent_text, get_lemmas  # noqa: E402
+
+SYNTHETIC_UID = "bench-user"
+HASH_DIM = 256
+_FILLER = (
+    "insan toplum zaman bilgi dunya hayat dusunce kitap soru cevap anlam deger "
+    "tarih kultur dil sanat bilim doga akil duygu"
+).split()
+
+
+def hashed_embedding(text: str, dim: int = HASH_DIM) -> List[float]:
+    """Deterministic bag-of-words feature hashing; stands in for the embedding API offline."""
+    vec = np.zeros(dim, dtype=np.float32)
+    for token in deaccent_text(text or "").split():
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+        vec[int.from_bytes(digest[:4], "little") % dim] += 1.0 if digest[4] & 1 else -1.0
+    return vec.tolist()
+
+
+@lru_cache(maxsize=None)
+def _word_lemmas(word: str) -> tuple:
+    return tuple(get_lemmas(word))
+
+
+def synthetic_corpus(queries: List[QueryItem], size: int, seed: int) -> LocalCorpus:
+    rng = random.Random(seed)
+    terms = sorted({t for q in queries for t in q.expected_terms}) or _FILLER
+    corpus = LocalCorpus()
+    items = [{"firebase_uid": SYNTHETIC_UID, "item_id": f"book-{i}", "item_type": "BOOK"} for i in range(max(1, size // 50))]
+    corpus.add_library_items(items)
+    chunks = []
+    for i in range(size):
+        words = rng.choices(_FILLER, k=rng.randint(20, 60))
+        for term in rng.sample(terms, k=min(len(terms), rng.randint(0, 2))):
+            words.insert(rng.randrange(len(words) + 1), term)
+        text = " ".join(words)
+        # Synthetic text reuses a small vocabulary; lemmatizing per word keeps corpus builds fast.
+        lemmas = sorted({lemma for word in words for lemma in _word_lemmas(word)})
+        chunks.append({
+            "id": i + 1,
+            "firebase_uid": SYNTHETIC_UID,
+            "item_id": items[i % len(items)]["item_id"],
+            "title": f"Kitap {i % len(items)}",
+            "content_type": rng.choice(["HIGHLIGHT", "INSIGHT", "PDF_CHUNK"]),
+            "page_number": rng.randint(1, 300),
+            "content_chunk": text,
+            "lemma_tokens": lemmas,
+            "embedding": hashed_embedding(text),
+        })
+    corpus.add_content(chunks)
+    return corpus
+
+
+def run(orchestrator: SearchOrchestrator, uid: str, queries: List[QueryItem], limit: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    mrrs: List[float] = []
+    ndcgs: List[float] = []
+    counts: List[int] = []
+    for q in queries:
+        t0 = time.perf_counter()
+        results, _meta = orchestrator.search(query=q.query, firebase_uid=uid, limit=limit, intent=q.category)
+        latencies.append((time.perf_counter() - t0) * 1000.0)
+        rels = [1 if is_relevant(f"{r.get('title', '')} {r.get('content_chunk', '')}", q.expected_terms) else 0 for r in results]
+        mrrs.append(mrr(rels))
+        ndcgs.append(ndcg_at_k(rels, 10))
+        counts.append(len(results))
+    n = max(1, len(queries))
+    return {
+        "queries": len(queries),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "mrr": round(sum(mrrs) / n, 4),
+        "ndcg_at_10": round(sum(ndcgs) / n, 4),
+        "avg_result_count": round(sum(counts) / n, 2),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the search benchmark offline on LocalRetrievalBackend.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--fixture", help="fixture JSON from export_retrieval_fixture.py")
+    source.add_argument("--synthetic", type=int, help="build a seeded synthetic corpus with this many chunks")
+    parser.add_argument("--uid", default="", help="firebase_uid inside the fixture")
+    parser.add_argument("--dataset", default=os.path.join(BACKEND_DIR, "data", "phase0_query_set.json"))
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--max-queries", type=int, default=0, help="Cap query count for quick smoke runs")
+    parser.add_argument("--db-path", default=":memory:", help="SQLite path for the loaded corpus")
+    parser.add_argument("--out", default="", help="optional JSON report path")
+    args = parser.parse_args()
+
+    queries = load_query_set(Path(args.dataset))
+    if args.max_queries > 0:
+        queries = queries[: args.max_queries]
+
+    if args.fixture:
+        if not args.uid:
+            parser.error("--uid is required with --fixture")
+        corpus = LocalCorpus.from_fixture(args.fixture, db_path=args.db_path)
+        uid = args.uid
+        embedding_fn = corpus.embedding_fn
+    else:
+        corpus = synthetic_corpus(queries, args.synthetic, args.seed)
+        uid = SYNTHETIC_UID
+        embedding_fn = hashed_embedding
+
+    orchestrator = SearchOrchestrator(embedding_fn=embedding_fn, cache=None, backend=LocalRetrievalBackend(corpus))
+    # One untimed pass so lazy model/spell-checker loads do not land in p95.
+    run(orchestrator, uid, queries[:1], args.limit)
+    report = run(orchestrator, uid, queries, args.limit)
+    report["source"] = args.fixture or f"synthetic:{args.synthetic}:seed={args.seed}"
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    corpus.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Throughput of the ingest NLP stage (chunks/sec) in-process vs the process pool.
+
+Runs services.nlp_process_pool_service.analyze_text over the same chunks with
+the in-thread baseline and with 1, 2 and 4 warm workers, checks every run
+returns the same chunks in the same order (normalized text and
+classification), and prints chunks/sec plus the number of chunks whose lemma
+set differs from the baseline. Worker start-up and analyzer loading are
+excluded (pools are warmed first).
+
+Zeyrek's parses depend on string hash order, so the script re-runs itself with
+PYTHONHASHSEED=0 (inherited by spawned workers) when it is not already set.
+Its output for unknown words also depends on what the process analyzed
+before, which is why lemma differences are reported rather than fatal.
+
+Chunks come from --text-file (split into ~--chunk-words word chunks) or are
+generated from data/dictionary.txt with a fixed seed.
+
+Run example:
+  python scripts/benchmark_nlp_process_pool.py --chunks 400 --workers 1,2,4
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+# Add backend directory to sys.path
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+from services.nlp_process_pool_service import NlpProcessPool, analyze_text  # noqa: E402
+
+
+def _chunks_from_file(path: str, chunk_words: int, limit: int) -> List[str]:
+    with open(path, encoding="utf-8") as fh:
+        words = fh.read().split()
+    chunks = [" ".join(words[i:i + chunk_words]) for i in range(0, len(words), chunk_words)]
+    return chunks[:limit] if limit else chunks
+
+
+def _synthetic_chunks(count: int, chunk_words: int, seed: int) -> List[str]:
+    vocab, weights = [], []
+    with open(os.path.join(BACKEND_DIR, "data", "dictionary.txt"), encoding="utf-8") as fh:
+        for line in fh:
+            parts = line.split()
+            if len(parts) == 2 and parts[1].isdigit():
+                vocab.append(parts[0])
+                weights.append(int(parts[1]))
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(vocab, weights=weights, k=chunk_words)) for _ in range(count)]
+
+
+def _comparable(results: List[dict]) -> List[tuple]:
+    return [(r["normalized"], json.dumps(r["classification"], sort_keys=True)) for r in results]
+
+
+def _lemma_mismatches(results: List[dict], baseline: List[dict]) -> int:
+    # get_lemmas serializes a set, so only the lemma set is comparable, not its order.
+    return sum(
+        set(json.loads(got["lemmas"])) != set(json.loads(want["lemmas"]))
+        for got, want in zip(results, baseline)
+    )
+
+
+def _run_threads(texts: List[str], threads: int) -> List[dict]:
+    # Today's path: the ingest ThreadPoolExecutor(max_workers=5) around the same work.
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(executor.map(analyze_text, texts))
+
+
+def main() -> int:
+    if os.environ.get("PYTHONHASHSEED") is None:
+        os.environ["PYTHONHASHSEED"] = "0"
+        os.execv(sys.executable, [sys.executable] + sys.argv)
+
+    parser = argparse.ArgumentParser(description="Benchmark the ingest NLP stage across process-pool sizes")
+    parser.add_argument("--text-file", default="", help="plain-text book to chunk (default: synthetic)")
+    parser.add_argument("--chunks", type=int, default=400)
+    parser.add_argument("--chunk-words", type=int, default=180)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated process counts")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--threads", type=int, default=5, help="thread count for the in-process baseline")
+    args = parser.parse_args()
+
+    if args.text_file:
+        texts = _chunks_from_file(args.text_file, args.chunk_words, args.chunks)
+    else:
+        texts = _synthetic_chunks(args.chunks, args.chunk_words, args.seed)
+    if not texts:
+        print("No chunks to analyze.")
+        return 1
+
+    analyze_text(texts[0])  # load the analyzer in this process before timing
+    t0 = time.perf_counter()
+    baseline = _run_threads(texts, args.threads)
+    base_sec = time.perf_counter() - t0
+    print(f"chunks={len(texts)} words/chunk={args.chunk_words} cpu_count={os.cpu_count()}")
+    print("mode              | seconds | chunks/sec | speedup | lemma diffs")
+    print("-" * 68)
+    print(f"{f'threads x{args.threads}':17} | {base_sec:7.2f} | {len(texts) / base_sec:10.1f} | {1.0:6.2f}x | {0:11d}")
+
+    for workers in [int(w) for w in args.workers.split(",") if w.strip()]:
+        pool = NlpProcessPool(workers=workers, batch_size=args.batch_size)
+        try:
+            pool.warm()
+            t0 = time.perf_counter()
+            results = list(pool.analyze(texts))
+            elapsed = time.perf_counter() - t0
+        finally:
+            pool.shutdown()
+        if _comparable(results) != _comparable(baseline):
+            print(f"processes x{workers}: results differ from the in-process baseline")
+            return 2
+        print(
+            f"{f'processes x{workers}':17} | {elapsed:7.2f} | {len(texts) / elapsed:10.1f} | {base_sec / elapsed:6.2f}x"
+            f" | {_lemma_mismatches(results, baseline):11d}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
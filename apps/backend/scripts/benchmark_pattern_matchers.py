@@ -0,0 +1,143 @@
+"""
+Micro-benchmark for the precompiled heuristic matchers (utils/pattern_matcher.py).
+
+Compares the per-pattern `re.search` loops the epistemic scorer and domain
+inference used to run with the compiled families, on synthetic Turkish chunks,
+and checks that both produce the same answers.
+
+Usage:
+    python scripts/benchmark_pattern_matchers.py --chunks 2000 --keywords 4
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from typing import Callable, List
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+from services import domain_policy_service as domain  # noqa: E402
+from services import epistemic_service as epi  # noqa: E402
+
+_WORDS = (
+    "vicdan ahlak adalet ozgurluk bence iki teori diger yandan onemli temel kesinlikle "
+    "insan toplum devlet tarih roman siir metafor kitap yazar eser baglam felsefe "
+    "dusunce bilgi varlik zaman mekan akil duygu irade sorumluluk"
+).split()
+
+
+def _legacy_is_definitional(text, keyword) -> bool:
+    norm_text = epi.normalize_for_matching(text)
+    norm_keyword = epi.normalize_for_matching(keyword)
+    for pattern in epi.DEFINITIONAL_PATTERNS_TR + epi.DEFINITIONAL_PATTERNS_EN:
+        if re.search(pattern.replace(r"(\w+)", re.escape(norm_keyword)), norm_text, re.IGNORECASE):
+            return True
+    keyword_pos = norm_text.find(norm_keyword)
+    if keyword_pos >= 0:
+        window = norm_text[max(0, keyword_pos - 50):keyword_pos + len(norm_keyword) + 50]
+        if any(re.search(p, window, re.IGNORECASE) for p in epi.EVALUATIVE_PATTERNS_TR):
+            return True
+    for sentence in re.split(r"[.!?]\s+", text):
+        norm_sentence = epi.normalize_for_matching(sentence.strip())
+        if norm_sentence.startswith(norm_keyword + ",") or norm_sentence.startswith(norm_keyword + " "):
+            if len(sentence) > len(keyword) + 10:
+                return True
+    return False
+
+
+def _legacy_answerability(chunk, keywords) -> List[str]:
+    full_text = f"{chunk['content_chunk']} "
+    features = []
+    if any(epi.contains_keyword(full_text, kw) for kw in keywords):
+        features.append("KEYWORD_MATCH")
+        if any(_legacy_is_definitional(full_text, kw) for kw in keywords):
+            features.append("DEFINITIONAL")
+        norm_full = epi.normalize_for_matching(full_text)
+        if any(re.search(p, norm_full, re.IGNORECASE) for p in epi.THEORY_PATTERNS_TR):
+            features.append("THEORY")
+    norm_full = epi.normalize_for_matching(full_text)
+    if any(re.search(p, norm_full, re.IGNORECASE) for p in epi.MODALITY_PATTERNS_TR):
+        features.append("MODALITY")
+    if any(re.search(p, norm_full, re.IGNORECASE) for p in epi.EVALUATIVE_PATTERNS_TR):
+        features.append("EVALUATIVE")
+    return features
+
+
+def _legacy_token_hits(text, phrases) -> int:
+    normalized = domain._normalize_ascii(text)
+    return sum(1 for p in phrases if str(p or "").strip().lower() and str(p).strip().lower() in normalized)
+
+
+def _time(label: str, fn: Callable[[], None], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    print(f"  {label:<34} {best * 1000:9.2f} ms")
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--keywords", type=int, default=4)
+    parser.add_argument("--words", type=int, default=120, help="words per synthetic chunk")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    chunks = [
+        {"content_chunk": " ".join(rng.choice(_WORDS) for _ in range(args.words)) + "."}
+        for _ in range(args.chunks)
+    ]
+    keywords = rng.sample(_WORDS, k=min(args.keywords, len(_WORDS)))
+    queries = [" ".join(rng.choice(_WORDS) for _ in range(8)) for _ in range(args.chunks)]
+
+    mismatches = 0
+    for chunk in chunks:
+        new = [f for f in epi.calculate_answerability_score(chunk, keywords)["features"] if f != "PERSONAL_COMMENT"]
+        if new != _legacy_answerability(chunk, keywords):
+            mismatches += 1
+    for query in queries:
+        if domain._ACADEMIC_PHRASES.count(domain._normalize_ascii(query)) != _legacy_token_hits(
+            query, domain._ACADEMIC_TERMS
+        ):
+            mismatches += 1
+
+    print(f"chunks={args.chunks} words/chunk={args.words} keywords={keywords}")
+    print("answerability scoring (all chunks):")
+    legacy = _time("legacy re.search loops", lambda: [_legacy_answerability(c, keywords) for c in chunks], args.repeat)
+    compiled = _time(
+        "compiled families", lambda: [epi.calculate_answerability_score(c, keywords) for c in chunks], args.repeat
+    )
+    print(f"  speedup x{legacy / compiled:.2f}")
+    print("domain term hits (all queries, 3 families):")
+    families = (domain._ACADEMIC_TERMS, domain._LITERARY_TERMS, domain._CULTURE_HISTORY_TERMS)
+    phrase_sets = (domain._ACADEMIC_PHRASES, domain._LITERARY_PHRASES, domain._CULTURE_HISTORY_PHRASES)
+    legacy = _time(
+        "legacy phrase loops",
+        lambda: [[_legacy_token_hits(q, terms) for terms in families] for q in queries],
+        args.repeat,
+    )
+
+    def _compiled_hits():
+        for q in queries:
+            normalized = domain._normalize_ascii(q)
+            for phrase_set in phrase_sets:
+                phrase_set.count(normalized)
+
+    compiled = _time("PhraseSet", _compiled_hits, args.repeat)
+    print(f"  speedup x{legacy / compiled:.2f}")
+    print(f"mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
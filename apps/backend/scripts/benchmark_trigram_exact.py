@@ -0,0 +1,117 @@
+"""
+Compare the exact lane's LIKE scan with trigram candidates + LIKE verification
+on a synthetic library, in-process (no Oracle needed).
+
+The scan models `normalized_content LIKE '%term%'` over every chunk; the
+indexed path intersects trigram postings and checks only the candidates. Both
+must return the same ids; any mismatch is reported.
+
+    python scripts/benchmark_trigram_exact.py --rows 50000 --repeats 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import List, Sequence, Tuple
+
+# Add backend directory to sys.path
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+from services.trigram_index_service import _build_index  # noqa: E402
+
+_VOCAB_SEED = [
+    "vicdan", "ahlak", "ozgurluk", "adalet", "hakikat", "bilgi", "akil", "iman", "zaman", "varlik",
+    "toplum", "devlet", "insan", "tarih", "sanat", "felsefe", "dusunce", "anlam", "deger", "erdem",
+]
+DEFAULT_TERMS = ["vicdan", "ahlak ve", "hakikat", "felsefe tarih", "erdemli", "bilgi kuram", "zq"]
+
+
+def _percentile(values: Sequence[float], pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    idx = min(len(ordered) - 1, max(0, int(round((pct / 100.0) * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def _vocabulary(rng: random.Random, size: int) -> List[str]:
+    letters = "abcdefghijklmnoprstuvyz"
+    words = list(_VOCAB_SEED)
+    while len(words) < size:
+        words.append("".join(rng.choice(letters) for _ in range(rng.randint(3, 10))))
+    return words
+
+
+def _synthetic_rows(n: int, words_per_chunk: int, vocab: List[str], rng: random.Random) -> List[Tuple[int, str, str]]:
+    rows = []
+    for row_id in range(1, n + 1):
+        # Zipf-ish: common words dominate, the long tail keeps postings selective.
+        text = " ".join(vocab[min(len(vocab) - 1, int(rng.paretovariate(1.1)) - 1)] for _ in range(words_per_chunk))
+        rows.append((row_id, f"book-{row_id // 400}", text))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--words-per-chunk", type=int, default=120)
+    parser.add_argument("--vocab", type=int, default=20000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=320, help="candidate_limit of the exact lane")
+    parser.add_argument("--term", action="append", default=[])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rows = _synthetic_rows(args.rows, args.words_per_chunk, _vocabulary(rng, args.vocab), rng)
+    texts = {row_id: text for row_id, _, text in rows}
+    ordered_desc = sorted(texts, reverse=True)
+
+    t0 = time.perf_counter()
+    index = _build_index(rows, max_id=args.rows)
+    build_s = time.perf_counter() - t0
+    print(
+        f"rows={args.rows} trigrams={len(index.postings)} build={build_s:.2f}s "
+        f"memory={index.nbytes / (1024 * 1024):.1f}MB"
+    )
+
+    mismatches = 0
+    for term in args.term or DEFAULT_TERMS:
+        scan_ms, indexed_ms = [], []
+        scan_ids: List[int] = []
+        indexed_ids: List[int] = []
+        candidates = 0
+        for _ in range(args.repeats):
+            t0 = time.perf_counter()
+            scan_ids = [i for i in ordered_desc if term in texts[i]][: args.limit]
+            scan_ms.append((time.perf_counter() - t0) * 1000.0)
+
+            t0 = time.perf_counter()
+            found = index.candidates(term)
+            if found is None:
+                indexed_ids = [i for i in ordered_desc if term in texts[i]][: args.limit]
+                candidates = len(ordered_desc)
+            else:
+                candidates = int(found.size)
+                indexed_ids = []
+                for i in found.tolist():
+                    if term in texts[i]:
+                        indexed_ids.append(i)
+                        if len(indexed_ids) >= args.limit:
+                            break
+            indexed_ms.append((time.perf_counter() - t0) * 1000.0)
+        if scan_ids != indexed_ids:
+            mismatches += 1
+        print(
+            f"{term!r:<18} matches={len(scan_ids):<4} candidates={candidates:<6} "
+            f"scan p50={_percentile(scan_ms, 50):8.2f}ms  indexed p50={_percentile(indexed_ms, 50):8.2f}ms"
+        )
+    print(f"mismatches={mismatches}")
+
+
+if __name__ == "__main__":
+    main()
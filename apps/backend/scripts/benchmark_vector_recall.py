@@ -0,0 +1,145 @@
+import argparse
+import os
+import sys
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+# Add backend directory to sys.path
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+from infrastructure.db_manager import DatabaseManager  # noqa: E402
+from services.vector_index_service import LANE_SEMANTIC, apply_vector_ranking, recall_at_k  # noqa: E402
+
+BASE_SQL = """
+    SELECT c.id, VECTOR_DISTANCE(c.vec_embedding, :p_vec, COSINE) AS dist
+    FROM TOMEHUB_CONTENT_V2 c
+    WHERE c.firebase_uid = :p_uid
+      AND c.AI_ELIGIBLE = 1
+      AND c.vec_embedding IS NOT NULL
+"""
+DISTANCE_EXPR = "VECTOR_DISTANCE(c.vec_embedding, :p_vec, COSINE)"
+
+
+def _percentile(values: Sequence[float], pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    idx = min(len(ordered) - 1, max(0, int(round((pct / 100.0) * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def _sample_query_vectors(cursor, uid: str, sample: int) -> List[Any]:
+    cursor.execute(
+        """
+        SELECT vec_embedding
+        FROM TOMEHUB_CONTENT_V2
+        WHERE firebase_uid = :p_uid
+          AND AI_ELIGIBLE = 1
+          AND vec_embedding IS NOT NULL
+        ORDER BY DBMS_RANDOM.VALUE
+        FETCH FIRST :p_n ROWS ONLY
+        """,
+        {"p_uid": uid, "p_n": sample},
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _text_query_vectors(queries: Sequence[str]) -> List[Any]:
+    from services.embedding_service import get_query_embedding
+
+    vectors = []
+    for q in queries:
+        vec = get_query_embedding(q)
+        if vec:
+            vectors.append(vec)
+    return vectors
+
+
+def _timed_ids(cursor, vec: Any, uid: str, k: int, **ranking: Any) -> Tuple[float, List[Any]]:
+    sql, params = apply_vector_ranking(
+        BASE_SQL,
+        {"p_vec": vec, "p_uid": uid, "p_limit": k},
+        lane=LANE_SEMANTIC,
+        distance_expr=DISTANCE_EXPR,
+        rank_column="dist",
+        **ranking,
+    )
+    t0 = time.perf_counter()
+    cursor.execute(sql, params)
+    ids = [row[0] for row in cursor.fetchall()]
+    return (time.perf_counter() - t0) * 1000.0, ids
+
+
+def benchmark(uid: str, k: int, sample: int, accuracies: List[int], queries: List[str]) -> int:
+    conn = None
+    cursor = None
+    try:
+        conn = DatabaseManager.get_read_connection()
+        cursor = conn.cursor()
+        vectors = _text_query_vectors(queries) if queries else _sample_query_vectors(cursor, uid, sample)
+        if not vectors:
+            print("NO_QUERY_VECTORS")
+            return 1
+
+        exact_ms: List[float] = []
+        truth: List[List[Any]] = []
+        for vec in vectors:
+            elapsed, ids = _timed_ids(cursor, vec, uid, k, exact=True)
+            exact_ms.append(elapsed)
+            truth.append(ids)
+
+        report: Dict[str, Dict[str, float]] = {
+            "exact": {"recall": 1.0, "p50": _percentile(exact_ms, 50), "p95": _percentile(exact_ms, 95)}
+        }
+        for accuracy in accuracies:
+            latencies: List[float] = []
+            recalls: List[float] = []
+            for vec, exact_ids in zip(vectors, truth):
+                elapsed, ids = _timed_ids(cursor, vec, uid, k, accuracy=accuracy)
+                latencies.append(elapsed)
+                recalls.append(recall_at_k(exact_ids, ids, k))
+            report[f"approx@{accuracy}"] = {
+                "recall": sum(recalls) / len(recalls),
+                "p50": _percentile(latencies, 50),
+                "p95": _percentile(latencies, 95),
+            }
+
+        print(f"queries={len(vectors)} k={k} uid={uid}")
+        print("mode        | recall@k | p50_ms  | p95_ms")
+        print("-" * 48)
+        for mode, row in report.items():
+            print(f"{mode:<11} | {row['recall']:.3f}    | {row['p50']:7.1f} | {row['p95']:7.1f}")
+        return 0
+    finally:
+        if cursor is not None:
+            cursor.close()
+        if conn is not None:
+            conn.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Approximate vs exact top-k recall/latency on TOMEHUB_CONTENT_V2")
+    parser.add_argument("--uid", required=True, help="firebase_uid whose chunks are searched")
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--sample", type=int, default=50, help="Stored chunk vectors sampled as queries")
+    parser.add_argument("--accuracy", type=int, action="append", default=None, help="Target accuracy (repeatable)")
+    parser.add_argument("--query", action="append", default=None, help="Text query to embed instead of sampling")
+    args = parser.parse_args()
+
+    DatabaseManager.init_pool()
+    try:
+        return benchmark(
+            uid=args.uid,
+            k=max(1, args.k),
+            sample=max(1, args.sample),
+            accuracies=args.accuracy or [70, 80, 90, 95],
+            queries=args.query or [],
+        )
+    finally:
+        DatabaseManager.close_pool()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,6 +2,7 @@
 import argparse
 import os
 import sys
+import time
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -13,7 +14,16 @@ if str(backend_dir) not in sys.path:
 
 load_dotenv(dotenv_path=backend_dir / ".env")
 
-from rag_eval import LLMJudge, load_golden_cases, run_eval_suite
+from rag_eval import (
+    EvalFixture,
+    LLMJudge,
+    RecordingAnswerFn,
+    RecordingJudge,
+    ReplayAnswerFn,
+    ReplayJudge,
+    load_golden_cases,
+    run_eval_suite,
+)
 from rag_eval.runner import write_reports
 
 
@@ -45,6 +55,23 @@ def parse_args() -> argparse.Namespace:
         default=4,
         help="Minimum judge score required for a case to pass.",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Cases evaluated at once (answer + judge). Report order is unchanged.",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--record",
+        default="",
+        help="Write retrieved sources, answers, metadata, latencies and judge grades to this fixture file.",
+    )
+    mode.add_argument(
+        "--replay",
+        default="",
+        help="Evaluate offline from a fixture written by --record (no network, deterministic report).",
+    )
     parser.add_argument(
         "--fail-under-pass-rate",
         type=float,
@@ -73,20 +100,49 @@ def main() -> int:
     print(f"Dataset: {args.dataset}")
     print(f"UID: {args.uid}")
 
+    fixture = None
+    generated_at = None
+    if args.replay:
+        fixture = EvalFixture.load(args.replay)
+        answer_fn, judge = ReplayAnswerFn(fixture), ReplayJudge(fixture)
+        generated_at = fixture.generated_at
+        print(f"Replaying: {args.replay}")
+    elif args.record:
+        fixture = EvalFixture()
+        answer_fn, judge = RecordingAnswerFn(fixture), RecordingJudge(fixture, LLMJudge())
+    else:
+        answer_fn, judge = None, LLMJudge()
+
+    started_at = time.perf_counter()
     results, summary = run_eval_suite(
         cases,
         args.uid,
-        LLMJudge(),
+        judge,
+        answer_fn=answer_fn,
         pass_score=args.pass_score,
+        concurrency=args.concurrency,
     )
+    wall_clock_sec = time.perf_counter() - started_at
+    if args.record:
+        print(f"Fixture: {fixture.save(args.record)}")
     dataset_name = Path(args.dataset).stem
-    markdown_path, json_path = write_reports(args.output_dir, dataset_name, results, summary)
+    markdown_path, json_path = write_reports(
+        args.output_dir, dataset_name, results, summary, generated_at=generated_at
+    )
 
     print("")
     print(f"Pass rate: {summary.pass_rate:.1%}")
     print(f"Average score: {summary.average_score:.2f}/5")
     print(f"Average latency: {summary.average_latency_sec:.2f}s")
+    for name, stats in summary.latency_percentiles.items():
+        print(f"Latency {name}: p50={stats['p50']:.2f}s p95={stats['p95']:.2f}s p99={stats['p99']:.2f}s")
+    print(f"Wall clock: {wall_clock_sec:.2f}s (concurrency={args.concurrency})")
     print(f"Classifications: {summary.classifications}")
+    if summary.retrieval:
+        print(
+            f"Retrieval ({int(summary.retrieval['cases'])} cases): "
+            f"recall={summary.retrieval['recall']:.1%} mrr={summary.retrieval['mrr']:.3f}"
+        )
     print(f"Markdown report: {markdown_path}")
     print(f"JSON report: {json_path}")
 
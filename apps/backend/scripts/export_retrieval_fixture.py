@@ -0,0 +1,145 @@
+"""
+Export one user's searchable corpus to a JSON fixture for LocalRetrievalBackend.
+
+The fixture holds TOMEHUB_CONTENT_V2 rows (with their embeddings) and the
+matching TOMEHUB_LIBRARY_ITEMS rows. Pass --dataset to also embed the benchmark
+queries once, so later runs need neither Oracle nor the embedding API.
+
+Run example:
+  python scripts/export_retrieval_fixture.py --uid your_uid --out data/fixtures/retrieval_uid.json \
+      --dataset data/phase0_query_set.json
+"""
+
+import argparse
+import array
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add backend directory to sys.path
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(CURRENT_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+from infrastructure.db_manager import DatabaseManager, safe_read_clob  # noqa: E402
+from services.search_system.local_backend import FIXTURE_VERSION  # noqa: E402
+
+_CONTENT_SQL = """
+    SELECT c.id, c.item_id, c.title, c.content_type, c.page_number, c.chunk_index,
+           c.content_chunk, c.normalized_content, c.lemma_tokens, c.tags_json, c.comment_text,
+           c.ingestion_type, c.AI_ELIGIBLE, c.rag_weight, c.vec_embedding
+    FROM TOMEHUB_CONTENT_V2 c
+    WHERE c.firebase_uid = :p_uid
+      AND c.id > :p_after
+    ORDER BY c.id
+    FETCH FIRST :p_batch ROWS ONLY
+"""
+
+_ITEMS_SQL = """
+    SELECT ITEM_ID, ITEM_TYPE, TITLE, SUMMARY_TEXT, SEARCH_VISIBILITY, PERSONAL_NOTE_CATEGORY, IS_DELETED
+    FROM TOMEHUB_LIBRARY_ITEMS
+    WHERE FIREBASE_UID = :p_uid
+"""
+
+
+def _vector(value: Any) -> List[float] | None:
+    if value is None:
+        return None
+    if isinstance(value, array.array):
+        return [float(x) for x in value]
+    return [float(x) for x in list(value)]
+
+
+def _text(value: Any) -> str | None:
+    return None if value is None else safe_read_clob(value)
+
+
+def export(uid: str, limit: int, batch_size: int) -> Dict[str, Any]:
+    content: List[Dict[str, Any]] = []
+    items: List[Dict[str, Any]] = []
+    with DatabaseManager.get_read_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(_ITEMS_SQL, {"p_uid": uid})
+            for r in cursor.fetchall():
+                items.append({
+                    "firebase_uid": uid,
+                    "item_id": r[0],
+                    "item_type": r[1],
+                    "title": r[2],
+                    "summary_text": _text(r[3]),
+                    "search_visibility": r[4],
+                    "personal_note_category": r[5],
+                    "is_deleted": int(r[6] or 0),
+                })
+
+            after_id = 0
+            while not limit or len(content) < limit:
+                cursor.execute(_CONTENT_SQL, {"p_uid": uid, "p_after": after_id, "p_batch": batch_size})
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                for r in rows:
+                    content.append({
+                        "id": int(r[0]),
+                        "firebase_uid": uid,
+                        "item_id": r[1],
+                        "title": r[2],
+                        "content_type": r[3],
+                        "page_number": r[4],
+                        "chunk_index": r[5],
+                        "content_chunk": _text(r[6]),
+                        "normalized_content": _text(r[7]),
+                        "lemma_tokens": _text(r[8]),
+                        "tags_json": _text(r[9]),
+                        "comment_text": _text(r[10]),
+                        "ingestion_type": r[11],
+                        "ai_eligible": r[12],
+                        "rag_weight": r[13],
+                        "embedding": _vector(r[14]),
+                    })
+                after_id = int(rows[-1][0])
+                print(f"  exported {len(content)} chunks (last id {after_id})")
+    if limit:
+        content = content[:limit]
+    return {"version": FIXTURE_VERSION, "library_items": items, "content": content, "query_embeddings": {}}
+
+
+def _embed_queries(dataset: Path) -> Dict[str, List[float]]:
+    from services.embedding_service import get_query_embedding
+
+    out: Dict[str, List[float]] = {}
+    for entry in json.loads(dataset.read_text(encoding="utf-8")):
+        query = str(entry.get("query") or "").strip()
+        if query and query not in out:
+            vec = get_query_embedding(query)
+            if vec:
+                out[query] = _vector(vec)
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Export a user's corpus to a LocalRetrievalBackend fixture")
+    parser.add_argument("--uid", required=True, help="firebase_uid")
+    parser.add_argument("--out", required=True, help="output JSON path")
+    parser.add_argument("--dataset", default="", help="query set whose queries are embedded into the fixture")
+    parser.add_argument("--limit", type=int, default=0, help="max chunks to export (0 = all)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    payload = export(args.uid, args.limit, args.batch_size)
+    if args.dataset:
+        payload["query_embeddings"] = _embed_queries(Path(args.dataset))
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    print(
+        f"Wrote {out}: {len(payload['content'])} chunks, {len(payload['library_items'])} items, "
+        f"{len(payload['query_embeddings'])} query embeddings"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
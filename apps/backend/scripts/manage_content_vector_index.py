@@ -0,0 +1,62 @@
+import argparse
+import io
+import os
+import sys
+from dotenv import load_dotenv
+
+if sys.platform == "win32":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(backend_dir)
+load_dotenv(os.path.join(backend_dir, ".env"))
+
+from infrastructure.db_manager import DatabaseManager
+from services.vector_index_service import (
+    CONTENT_VECTOR_INDEX,
+    create_content_vector_index,
+    get_content_index_status,
+    rebuild_content_vector_index,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=f"Manage {CONTENT_VECTOR_INDEX} on TOMEHUB_CONTENT_V2")
+    parser.add_argument("action", choices=("status", "create", "rebuild"))
+    parser.add_argument("--accuracy", type=int, default=95, help="Index default target accuracy")
+    parser.add_argument("--partitions", type=int, default=None, help="IVF neighbor partitions (default: Oracle chooses)")
+    parser.add_argument("--parallel", type=int, default=None, help="Parallel degree for the build")
+    args = parser.parse_args()
+
+    DatabaseManager.init_pool()
+    try:
+        with DatabaseManager.get_write_connection() as conn:
+            with conn.cursor() as cursor:
+                status = get_content_index_status(cursor)
+                if args.action == "create":
+                    if status:
+                        print(f"INDEX_EXISTS={status}")
+                    else:
+                        create_content_vector_index(
+                            cursor,
+                            accuracy=args.accuracy,
+                            neighbor_partitions=args.partitions,
+                            parallel=args.parallel,
+                        )
+                        print("INDEX_CREATED")
+                elif args.action == "rebuild":
+                    rebuild_content_vector_index(
+                        cursor,
+                        accuracy=args.accuracy,
+                        neighbor_partitions=args.partitions,
+                        parallel=args.parallel,
+                    )
+                    print("INDEX_REBUILT")
+                print(f"STATUS={get_content_index_status(cursor)}")
+    finally:
+        DatabaseManager.close_pool()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
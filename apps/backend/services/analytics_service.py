@@ -12,7 +12,13 @@ from typing import Optional, Tuple, List
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from infrastructure.db_manager import DatabaseManager
+from infrastructure.schema_registry import schema_registry
 from services.cache_service import get_cache, generate_cache_key
+from services.lemma_index_service import (
+    get_indexed_context_chunks,
+    get_indexed_counts,
+    get_indexed_page_distribution,
+)
 from utils.text_utils import (
     calculate_fuzzy_score,
     get_lemmas,
@@ -21,7 +27,6 @@ from utils.text_utils import (
 )
 
 logger = logging.getLogger(__name__)
-_CONTENT_V2_ITEM_ID_COL: Optional[str] = None
 
 ANALYTIC_PATTERNS = [
     r"\bkaç\s+(defa|kez|kere)\s+geç",  # "kaç kez geçiyor"
@@ -78,37 +83,12 @@ BOOK_STOP_WORDS = [
 ]
 
 
-def _get_content_v2_item_id_col(cursor=None) -> str:
+def _get_content_v2_item_id_col() -> str:
     """
     Oracle migration compatibility: TOMEHUB_CONTENT_V2 may use ITEM_ID (new) or BOOK_ID (legacy).
     Returns a safe column name for filtering/selecting item ids.
     """
-    global _CONTENT_V2_ITEM_ID_COL
-    if _CONTENT_V2_ITEM_ID_COL:
-        return _CONTENT_V2_ITEM_ID_COL
-
-    try:
-        if cursor is not None:
-            cursor.execute(
-                """
-                SELECT column_name
-                FROM user_tab_columns
-                WHERE table_name = 'TOMEHUB_CONTENT_V2'
-                """
-            )
-            cols = {str(r[0]).upper() for r in (cursor.fetchall() or []) if r and r[0]}
-            if "ITEM_ID" in cols:
-                _CONTENT_V2_ITEM_ID_COL = "ITEM_ID"
-                return _CONTENT_V2_ITEM_ID_COL
-            if "BOOK_ID" in cols:
-                _CONTENT_V2_ITEM_ID_COL = "BOOK_ID"
-                return _CONTENT_V2_ITEM_ID_COL
-    except Exception:
-        # Fall through to conservative default for older schemas.
-        pass
-
-    _CONTENT_V2_ITEM_ID_COL = "BOOK_ID"
-    return _CONTENT_V2_ITEM_ID_COL
+    return schema_registry.capabilities.content_v2_item_id_col
 
 def _book_title_variants(title: str) -> List[str]:
     raw = str(title or "").strip()
@@ -387,7 +367,7 @@ def resolve_all_book_ids(
     try:
         with DatabaseManager.get_read_connection() as conn:
             with conn.cursor() as cursor:
-                item_id_col = _get_content_v2_item_id_col(cursor)
+                item_id_col = _get_content_v2_item_id_col()
                 bind_names = [f":st{i}" for i in range(len(source_types))]
                 bind_clause = ",".join(bind_names)
                 params = {f"st{i}": st for i, st in enumerate(source_types)}
@@ -518,6 +498,21 @@ def _normalize_to_lemma(term: str) -> str:
     return normalize_canonical(term)
 
 
+def _term_candidates(term: str) -> List[str]:
+    """Lemma, canonical and ASCII forms of a term (shared by count/distribution/KWIC)."""
+    candidates: List[str] = []
+    for cand in (_normalize_to_lemma(term), normalize_canonical(term), normalize_text(term)):
+        if cand and cand not in candidates:
+            candidates.append(cand)
+    return candidates
+
+
+def _lemma_index_applies(source_types: Tuple[str, ...]) -> bool:
+    # Postings are written for PDF/EPUB book ingests only.
+    requested = {str(st or "").upper() for st in (source_types or ())}
+    return {"PDF", "EPUB"}.issubset(requested)
+
+
 def count_lemma_occurrences(
     firebase_uid: str,
     book_id: str,
@@ -527,16 +522,7 @@ def count_lemma_occurrences(
     if not firebase_uid or not book_id or not term:
         return 0
 
-    candidates = []
-    lemma = _normalize_to_lemma(term)
-    if lemma:
-        candidates.append(lemma)
-    canonical = normalize_canonical(term)
-    if canonical and canonical not in candidates:
-        candidates.append(canonical)
-    ascii_term = normalize_text(term)
-    if ascii_term and ascii_term not in candidates:
-        candidates.append(ascii_term)
+    candidates = _term_candidates(term)
     if not candidates:
         return 0
 
@@ -558,16 +544,25 @@ def count_lemma_occurrences(
             return int(cached_val)
 
     try:
-        # Use existing distribution logic for accuracy (scan-based)
-        # This ensures we count inflections correctly even if index is stale
-        dist = get_keyword_distribution(firebase_uid, book_id, term, source_types)
-        count = sum(d['count'] for d in dist)
-        
+        indexed_counts = (
+            get_indexed_counts(firebase_uid, [book_id], candidates)
+            if _lemma_index_applies(source_types)
+            else {}
+        )
+        if book_id in indexed_counts:
+            # Lemma index is authoritative for books ingested with postings.
+            count = indexed_counts[book_id]
+        else:
+            # Use existing distribution logic for accuracy (scan-based)
+            # This ensures we count inflections correctly even if index is stale
+            dist = get_keyword_distribution(firebase_uid, book_id, term, source_types)
+            count = sum(d['count'] for d in dist)
+
         # If count is still 0, try a quick raw count in original content just in case
-        if count == 0:
+        if count == 0 and book_id not in indexed_counts:
             with DatabaseManager.get_read_connection() as conn:
                 with conn.cursor() as cursor:
-                    item_id_col = _get_content_v2_item_id_col(cursor)
+                    item_id_col = _get_content_v2_item_id_col()
                     bind_names = [f":st{i}" for i in range(len(source_types))]
                     bind_clause = ",".join(bind_names)
                     params = {f"st{i}": st for i, st in enumerate(source_types)}
@@ -598,6 +593,72 @@ def count_lemma_occurrences(
     return count
 
 
+def _snippet_around(content: str, idx: int, length: int) -> str:
+    start = max(0, idx - 150)
+    end = min(len(content), idx + length + 150)
+    snippet = content[start:end]
+    if start > 0:
+        snippet = "..." + snippet
+    if end < len(content):
+        snippet = snippet + "..."
+    return snippet
+
+
+def _contexts_from_indexed_chunks(indexed_chunks: List[dict], candidates: List[str]) -> list[dict]:
+    """Hydrate KWIC snippets for lemma-index hits with a single IN-list fetch."""
+    if not indexed_chunks:
+        return []
+    ids = [c["content_id"] for c in indexed_chunks]
+    binds = {f"p_id{i}": cid for i, cid in enumerate(ids)}
+    content_by_id: dict[int, str] = {}
+    try:
+        with DatabaseManager.get_read_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    SELECT id, content_chunk
+                    FROM TOMEHUB_CONTENT_V2
+                    WHERE id IN ({", ".join(f":{k}" for k in binds)})
+                    """,
+                    binds,
+                )
+                for r_id, raw_content in cursor.fetchall() or []:
+                    content_by_id[int(r_id)] = str(raw_content or "")
+    except Exception as e:
+        logger.error("Concordance hydration failed: %s", e)
+        return []
+
+    results = []
+    for hit in indexed_chunks:
+        content = content_by_id.get(hit["content_id"])
+        if not content:
+            continue
+        lowered = content.lower()
+        found = None
+        for cand in candidates:
+            idx = lowered.find(cand.lower())
+            if idx != -1:
+                found = (idx, len(cand), cand)
+                break
+        if found is None and hit.get("positions"):
+            # Inflected surface form: align on the recorded token position instead.
+            spans = [m.span() for m in re.finditer(r"\S+", content)]
+            pos = int(hit["positions"][0])
+            if 0 <= pos < len(spans):
+                start, end = spans[pos]
+                found = (start, end - start, candidates[0])
+        if found is None:
+            continue
+        idx, length, cand = found
+        results.append({
+            "chunk_id": hit["content_id"],
+            "page_number": hit.get("page_number"),
+            "snippet": _snippet_around(content, idx, length),
+            "keyword_found": cand,
+        })
+    return results
+
+
 def get_keyword_contexts(
     firebase_uid: str,
     book_id: str,
@@ -619,22 +680,22 @@ def get_keyword_contexts(
         return []
 
     # 1. Generate Candidates (Consistency with count)
-    candidates = []
-    lemma = _normalize_to_lemma(term)
-    if lemma: candidates.append(lemma)
-    canonical = normalize_canonical(term)
-    if canonical and canonical not in candidates: candidates.append(canonical)
-    ascii_term = normalize_text(term)
-    if ascii_term and ascii_term not in candidates: candidates.append(ascii_term)
-    
+    candidates = _term_candidates(term)
     if not candidates:
         return []
 
+    if _lemma_index_applies(source_types):
+        indexed_chunks = get_indexed_context_chunks(
+            firebase_uid, book_id, candidates, limit=limit, offset=offset
+        )
+        if indexed_chunks is not None:
+            return _contexts_from_indexed_chunks(indexed_chunks, candidates)
+
     results = []
     try:
         with DatabaseManager.get_read_connection() as conn:
             with conn.cursor() as cursor:
-                item_id_col = _get_content_v2_item_id_col(cursor)
+                item_id_col = _get_content_v2_item_id_col()
                 # Build SQL for finding chunks
                 # We use INSTR on normalized_content for reliable matching
                 bind_names = [f":st{i}" for i in range(len(source_types))]
@@ -730,14 +791,7 @@ def get_keyword_distribution(
         return []
 
     # 1. Generate Candidates (Consistency)
-    candidates = []
-    lemma = _normalize_to_lemma(term)
-    if lemma: candidates.append(lemma)
-    canonical = normalize_canonical(term)
-    if canonical and canonical not in candidates: candidates.append(canonical)
-    ascii_term = normalize_text(term)
-    if ascii_term and ascii_term not in candidates: candidates.append(ascii_term)
-    
+    candidates = _term_candidates(term)
     if not candidates:
         return []
 
@@ -756,12 +810,20 @@ def get_keyword_distribution(
         if cached_val is not None:
              return cached_val
 
+    if _lemma_index_applies(source_types):
+        indexed = get_indexed_page_distribution(firebase_uid, book_id, candidates)
+        if indexed is not None:
+            if cache and cache_key:
+                ttl = 86400 if book_id and len(book_id) > 10 else 3600
+                cache.set(cache_key, indexed, ttl=ttl)
+            return indexed
+
     distribution = {}
 
     try:
         with DatabaseManager.get_read_connection() as conn:
             with conn.cursor() as cursor:
-                item_id_col = _get_content_v2_item_id_col(cursor)
+                item_id_col = _get_content_v2_item_id_col()
                 bind_names = [f":st{i}" for i in range(len(source_types))]
                 bind_clause = ",".join(bind_names)
                 
@@ -873,11 +935,37 @@ def get_comparative_stats(
     """
     Parallel fetch of lemma counts for multiple books.
     Returns: [{ "book_id": "...", "title": "...", "count": 120 }, ...]
+
+    Books with lemma-index postings are answered by one grouped lookup;
+    only the remaining books fall back to per-book scans.
     """
     if not target_book_ids:
         return []
     results = []
-    
+
+    book_ids = [b for b in target_book_ids if b and b != "ALL_NOTES"]
+    candidates = _term_candidates(term)
+    indexed_counts = get_indexed_counts(firebase_uid, book_ids, candidates) if candidates else {}
+
+    titles: dict[str, str] = {}
+    if book_ids:
+        try:
+            binds = {f"p_b{i}": bid for i, bid in enumerate(book_ids)}
+            with DatabaseManager.get_read_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        f"""
+                        SELECT ITEM_ID, title FROM TOMEHUB_LIBRARY_ITEMS
+                        WHERE firebase_uid = :uid AND ITEM_ID IN ({", ".join(f":{k}" for k in binds)})
+                        """,
+                        {"uid": firebase_uid, **binds},
+                    )
+                    for bid, title in cursor.fetchall() or []:
+                        if bid and title:
+                            titles[str(bid)] = title
+        except Exception as e:
+            logger.error("Comparative title fetch failed: %s", e)
+
     # Helper to fetch count + title for one book
     def fetch_one(b_id):
         try:
@@ -888,33 +976,28 @@ def get_comparative_stats(
 
             # Regular Book
             count = count_lemma_occurrences(firebase_uid, b_id, term)
-            
-            # Get title (simple query)
-            title = "Unknown Book"
-            with DatabaseManager.get_read_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute(
-                        "SELECT title FROM TOMEHUB_LIBRARY_ITEMS WHERE firebase_uid = :uid AND ITEM_ID = :bid",
-                        {"uid": firebase_uid, "bid": b_id}
-                    )
-                    row = cursor.fetchone()
-                    if row:
-                        title = row[0]
-            
-            return {"book_id": b_id, "title": title, "count": count}
+            return {"book_id": b_id, "title": titles.get(b_id, "Unknown Book"), "count": count}
         except Exception as e:
             logger.error("Comparative fetch failed for %s: %s", b_id, e)
             return None
 
+    pending = []
+    for b_id in target_book_ids:
+        if b_id in indexed_counts:
+            results.append({"book_id": b_id, "title": titles.get(b_id, "Unknown Book"), "count": indexed_counts[b_id]})
+        else:
+            pending.append(b_id)
+
     # Parallel execution
-    with ThreadPoolExecutor(max_workers=min(10, len(target_book_ids))) as executor:
-        futures = [executor.submit(fetch_one, bid) for bid in target_book_ids]
-        
-        for future in as_completed(futures):
-            res = future.result()
-            if res:
-                results.append(res)
-    
+    if pending:
+        with ThreadPoolExecutor(max_workers=min(10, len(pending))) as executor:
+            futures = [executor.submit(fetch_one, bid) for bid in pending]
+
+            for future in as_completed(futures):
+                res = future.result()
+                if res:
+                    results.append(res)
+
     # Sort by count descending
     results.sort(key=lambda x: x["count"], reverse=True)
     return results
@@ -0,0 +1,256 @@
+"""
+In-process cache of generated RAG answers.
+
+`search_service.generate_answer` still runs retrieval on every call; when the
+retrieved context is the same as last time it skips context building, the graph
+bridge and the LLM call and returns the stored answer, sources and generation
+metadata. Entries are keyed by:
+
+- user, normalized question, answer mode and every scope/filter argument,
+- a fingerprint of the retrieved context ids, in order,
+- a hash of the chat history tail and session summary that go into the prompt,
+- the generation settings (model route, output budget),
+
+and are only served while the user's corpus version is unchanged:
+
+- ingestion/purge call `notify_content_changed` (via _invalidate_search_cache),
+  which drops the user's entries in this worker,
+- the corpus version is the newest TOMEHUB_CHANGE_EVENTS id for the user,
+  re-read every ANSWER_CACHE_EVENT_POLL_SEC, so changes made through other
+  workers invalidate entries here too.
+
+Memory is bounded by ANSWER_CACHE_MAX_ENTRIES (LRU) and ANSWER_CACHE_TTL_SEC.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from config import settings
+from services.cache_service import normalize_query
+from services.change_event_service import fetch_change_events_since
+from services.monitoring import ANSWER_CACHE_REQUESTS_TOTAL, ANSWER_CACHE_SAVED_TOKENS_TOTAL
+from utils.logger import get_logger
+
+logger = get_logger("answer_cache_service")
+
+
+@dataclass
+class CachedAnswer:
+    answer: str
+    sources: list
+    generation_meta: Dict[str, Any]
+    corpus_version: int
+    tokens: int
+    created_at: float
+
+
+@dataclass
+class _CorpusState:
+    version: int = 0
+    checked_at: float = 0.0
+    stale: bool = True
+
+
+def _enabled() -> bool:
+    return bool(getattr(settings, "ANSWER_CACHE_ENABLED", False))
+
+
+def _ttl_sec() -> float:
+    return float(getattr(settings, "ANSWER_CACHE_TTL_SEC", 3600))
+
+
+def _max_entries() -> int:
+    return int(getattr(settings, "ANSWER_CACHE_MAX_ENTRIES", 2000))
+
+
+def _poll_sec() -> float:
+    return float(getattr(settings, "ANSWER_CACHE_EVENT_POLL_SEC", 30))
+
+
+def _digest(value: Any) -> str:
+    raw = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:24]
+
+
+def context_fingerprint(chunks: Iterable[Dict[str, Any]]) -> str:
+    """Order-sensitive fingerprint of retrieved chunk ids (title + content prefix when a chunk has no id)."""
+    ids = []
+    for chunk in chunks or []:
+        chunk_id = chunk.get("id")
+        if chunk_id is None:
+            chunk_id = f"{chunk.get('title', '')}_{str(chunk.get('content_chunk', '') or '')[:64]}"
+        ids.append(str(chunk_id))
+    return _digest(ids)
+
+
+def usage_tokens(*results: Any) -> int:
+    """Total tokens reported by GenerateResult.usage_metadata across the given results."""
+    total = 0
+    for result in results:
+        usage = getattr(result, "usage_metadata", None) or {}
+        if not isinstance(usage, dict):
+            continue
+        tokens = usage.get("total_token_count") or usage.get("total_tokens")
+        if not tokens:
+            tokens = (
+                (usage.get("prompt_token_count") or usage.get("prompt_tokens") or 0)
+                + (
+                    usage.get("candidates_token_count")
+                    or usage.get("completion_token_count")
+                    or usage.get("completion_tokens")
+                    or 0
+                )
+            )
+        try:
+            total += int(tokens or 0)
+        except (TypeError, ValueError):
+            continue
+    return total
+
+
+class AnswerCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], CachedAnswer]" = OrderedDict()
+        self._corpus: Dict[str, _CorpusState] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return _enabled() and _max_entries() > 0
+
+    def build_key(
+        self,
+        *,
+        question: str,
+        answer_mode: str,
+        scope: Dict[str, Any],
+        chunks: Iterable[Dict[str, Any]],
+        conversation: Any = None,
+        generation: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        return _digest(
+            {
+                "q": normalize_query(question or ""),
+                "mode": answer_mode,
+                "scope": scope,
+                "ctx": context_fingerprint(chunks),
+                "conv": _digest(conversation) if conversation else "",
+                "gen": generation or {},
+            }
+        )
+
+    # -- corpus version ----------------------------------------------------
+
+    def corpus_version(self, firebase_uid: str) -> int:
+        """Newest change event id for the user, re-read at most every ANSWER_CACHE_EVENT_POLL_SEC."""
+        now = time.monotonic()
+        with self._lock:
+            state = self._corpus.setdefault(firebase_uid, _CorpusState())
+            if not state.stale and now - state.checked_at < _poll_sec():
+                return state.version
+
+        _changes, last_event_id = fetch_change_events_since(firebase_uid=firebase_uid, since_ms=0, limit=1)
+        version = int(last_event_id or 0)
+        with self._lock:
+            state = self._corpus.setdefault(firebase_uid, _CorpusState())
+            if version != state.version:
+                self._drop_user_locked(firebase_uid)
+            state.version = version
+            state.checked_at = now
+            state.stale = False
+        return version
+
+    def notify_content_changed(self, firebase_uid: str, item_id: Optional[str] = None) -> None:
+        # Any change can move retrieval results for any question, so drop the whole user.
+        with self._lock:
+            self._drop_user_locked(firebase_uid)
+            self._corpus.setdefault(firebase_uid, _CorpusState()).stale = True
+
+    def _drop_user_locked(self, firebase_uid: str) -> None:
+        for entry_key in [k for k in self._entries if k[0] == firebase_uid]:
+            del self._entries[entry_key]
+
+    # -- lookups -----------------------------------------------------------
+
+    def get(self, firebase_uid: str, key: str, corpus_version: int) -> Optional[CachedAnswer]:
+        """Entry for `key` if it was stored under `corpus_version` (read before retrieval) and is fresh."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get((firebase_uid, key))
+            if entry is not None and (
+                entry.corpus_version != corpus_version or time.monotonic() - entry.created_at > _ttl_sec()
+            ):
+                del self._entries[(firebase_uid, key)]
+                entry = None
+            if entry is None:
+                ANSWER_CACHE_REQUESTS_TOTAL.labels(outcome="miss").inc()
+                return None
+            self._entries.move_to_end((firebase_uid, key))
+        ANSWER_CACHE_REQUESTS_TOTAL.labels(outcome="hit").inc()
+        if entry.tokens:
+            ANSWER_CACHE_SAVED_TOKENS_TOTAL.inc(entry.tokens)
+        return CachedAnswer(
+            answer=entry.answer,
+            sources=copy.deepcopy(entry.sources),
+            generation_meta=dict(entry.generation_meta),
+            corpus_version=entry.corpus_version,
+            tokens=entry.tokens,
+            created_at=entry.created_at,
+        )
+
+    def put(
+        self,
+        firebase_uid: str,
+        key: str,
+        *,
+        corpus_version: int,
+        answer: str,
+        sources: list,
+        generation_meta: Dict[str, Any],
+        tokens: int = 0,
+    ) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            state = self._corpus.get(firebase_uid)
+            if state is None or state.stale or state.version != corpus_version:
+                # The library changed while this answer was generated.
+                return
+        entry = CachedAnswer(
+            answer=answer,
+            sources=copy.deepcopy(sources),
+            generation_meta=dict(generation_meta),
+            corpus_version=corpus_version,
+            tokens=max(0, int(tokens or 0)),
+            created_at=time.monotonic(),
+        )
+        max_entries = _max_entries()
+        with self._lock:
+            self._entries[(firebase_uid, key)] = entry
+            self._entries.move_to_end((firebase_uid, key))
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._corpus.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+answer_cache = AnswerCache()
+
+
+def notify_content_changed(firebase_uid: str, item_id: Optional[str] = None) -> None:
+    answer_cache.notify_content_changed(firebase_uid, item_id)
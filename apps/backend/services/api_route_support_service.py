@@ -1,4 +1,3 @@
-import asyncio
 import inspect
 import json
 from datetime import datetime
@@ -8,7 +7,8 @@ from typing import Any, Callable, Dict, List, Optional
 from fastapi import BackgroundTasks, HTTPException
 
 from config import settings
-from infrastructure.db_manager import DatabaseManager
+from infrastructure.async_db import Fetch, QueryPlan, async_db_enabled, run_plan, run_plan_async
+from infrastructure.cursor_profiles import QUERY_CLASS_CANDIDATE_SCAN
 from services.analytics_service import (
     count_lemma_occurrences,
     extract_target_term,
@@ -16,6 +16,12 @@ from services.analytics_service import (
     is_analytic_word_count,
     resolve_book_id_from_question,
 )
+from services.bulkhead_service import (
+    WORKLOAD_DB_LIGHT,
+    WORKLOAD_LLM,
+    WORKLOAD_RETRIEVAL,
+    run_in_bulkhead,
+)
 from services.search_diagnostics_service import enrich_search_metadata
 from services.query_plan_service import looks_explicit_compare_query
 from utils.logger import get_logger
@@ -169,6 +175,97 @@ def resolve_chat_scope_policy(
     }
 
 
+def _outbox_poll_payload(changes: List[Dict[str, Any]], last_event_id: Optional[int]) -> Dict[str, Any]:
+    server_time_ms = int(datetime.now().timestamp() * 1000)
+    return {
+        "success": True,
+        "server_time_ms": server_time_ms,
+        "server_time": datetime.now().isoformat(),
+        "last_event_id": last_event_id,
+        "changes": changes,
+        "events": changes,
+        "count": len(changes),
+        "source": "outbox",
+    }
+
+
+def _legacy_poll_plan(firebase_uid: str, cutoff_ms: int, safe_limit: int) -> QueryPlan[List[Dict[str, Any]]]:
+    events: list[dict[str, Any]] = []
+    rows = yield Fetch(
+        """
+        SELECT ITEM_ID, TITLE, COALESCE(UPDATED_AT, CREATED_AT)
+        FROM TOMEHUB_LIBRARY_ITEMS
+        WHERE FIREBASE_UID = :p_uid
+        ORDER BY COALESCE(UPDATED_AT, CREATED_AT) DESC
+        FETCH FIRST :p_limit ROWS ONLY
+        """,
+        {"p_uid": firebase_uid, "p_limit": safe_limit},
+        query_class=QUERY_CLASS_CANDIDATE_SCAN,
+    )
+    for row in rows:
+        ts = row[2]
+        ts_ms = int(ts.timestamp() * 1000) if ts else int(datetime.now().timestamp() * 1000)
+        if ts_ms <= cutoff_ms:
+            continue
+        events.append(
+            {
+                "event_type": "book.updated",
+                "book_id": str(row[0]),
+                "title": str(row[1] or ""),
+                "updated_at_ms": ts_ms,
+            }
+        )
+
+    rows = yield Fetch(
+        """
+        SELECT ITEM_ID, CONTENT_TYPE, MAX(CREATED_AT)
+        FROM TOMEHUB_CONTENT_V2
+        WHERE FIREBASE_UID = :p_uid
+          AND CONTENT_TYPE IN ('HIGHLIGHT', 'INSIGHT', 'PERSONAL_NOTE')
+        GROUP BY ITEM_ID, CONTENT_TYPE
+        FETCH FIRST :p_limit ROWS ONLY
+        """,
+        {"p_uid": firebase_uid, "p_limit": safe_limit},
+        query_class=QUERY_CLASS_CANDIDATE_SCAN,
+    )
+    for row in rows:
+        source_type = str(row[1] or "").upper()
+        ts = row[2]
+        if not ts:
+            continue
+        ts_ms = int(ts.timestamp() * 1000)
+        if ts_ms <= cutoff_ms:
+            continue
+        event_type = "highlight.synced" if source_type in {"HIGHLIGHT", "INSIGHT"} else "note.synced"
+        events.append(
+            {
+                "event_type": event_type,
+                "book_id": str(row[0] or ""),
+                "source_type": source_type,
+                "updated_at_ms": ts_ms,
+            }
+        )
+    return events
+
+
+def _legacy_poll_payload(events: List[Dict[str, Any]], safe_limit: int) -> Dict[str, Any]:
+    events.sort(key=lambda item: int(item.get("updated_at_ms") or 0), reverse=True)
+    if len(events) > safe_limit:
+        events = events[:safe_limit]
+
+    server_time_ms = int(datetime.now().timestamp() * 1000)
+    return {
+        "success": True,
+        "server_time_ms": server_time_ms,
+        "server_time": datetime.now().isoformat(),
+        "last_event_id": None,
+        "changes": events,
+        "events": events,
+        "count": len(events),
+        "source": "legacy_aggregate",
+    }
+
+
 def fetch_realtime_poll_payload(
     *,
     firebase_uid: str,
@@ -177,7 +274,6 @@ def fetch_realtime_poll_payload(
 ) -> Dict[str, Any]:
     safe_limit = max(1, min(int(limit), 300))
     cutoff_ms = max(int(since_ms or 0), 0)
-    events: list[dict[str, Any]] = []
 
     try:
         from services.change_event_service import fetch_change_events_since
@@ -188,94 +284,55 @@ def fetch_realtime_poll_payload(
             limit=safe_limit,
         )
         if changes:
-            server_time_ms = int(datetime.now().timestamp() * 1000)
-            return {
-                "success": True,
-                "server_time_ms": server_time_ms,
-                "server_time": datetime.now().isoformat(),
-                "last_event_id": last_event_id,
-                "changes": changes,
-                "events": changes,
-                "count": len(changes),
-                "source": "outbox",
-            }
+            return _outbox_poll_payload(changes, last_event_id)
     except Exception as exc:
         logger.warning("Realtime polling outbox read failed (fallback to legacy query): %s", exc)
 
     try:
-        with DatabaseManager.get_read_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(
-                    """
-                    SELECT ITEM_ID, TITLE, COALESCE(UPDATED_AT, CREATED_AT)
-                    FROM TOMEHUB_LIBRARY_ITEMS
-                    WHERE FIREBASE_UID = :p_uid
-                    ORDER BY COALESCE(UPDATED_AT, CREATED_AT) DESC
-                    FETCH FIRST :p_limit ROWS ONLY
-                    """,
-                    {"p_uid": firebase_uid, "p_limit": safe_limit},
-                )
-                for row in cursor.fetchall():
-                    ts = row[2]
-                    ts_ms = int(ts.timestamp() * 1000) if ts else int(datetime.now().timestamp() * 1000)
-                    if ts_ms <= cutoff_ms:
-                        continue
-                    events.append(
-                        {
-                            "event_type": "book.updated",
-                            "book_id": str(row[0]),
-                            "title": str(row[1] or ""),
-                            "updated_at_ms": ts_ms,
-                        }
-                    )
-
-                cursor.execute(
-                    """
-                    SELECT ITEM_ID, CONTENT_TYPE, MAX(CREATED_AT)
-                    FROM TOMEHUB_CONTENT_V2
-                    WHERE FIREBASE_UID = :p_uid
-                      AND CONTENT_TYPE IN ('HIGHLIGHT', 'INSIGHT', 'PERSONAL_NOTE')
-                    GROUP BY ITEM_ID, CONTENT_TYPE
-                    FETCH FIRST :p_limit ROWS ONLY
-                    """,
-                    {"p_uid": firebase_uid, "p_limit": safe_limit},
-                )
-                for row in cursor.fetchall():
-                    source_type = str(row[1] or "").upper()
-                    ts = row[2]
-                    if not ts:
-                        continue
-                    ts_ms = int(ts.timestamp() * 1000)
-                    if ts_ms <= cutoff_ms:
-                        continue
-                    event_type = "highlight.synced" if source_type in {"HIGHLIGHT", "INSIGHT"} else "note.synced"
-                    events.append(
-                        {
-                            "event_type": event_type,
-                            "book_id": str(row[0] or ""),
-                            "source_type": source_type,
-                            "updated_at_ms": ts_ms,
-                        }
-                    )
+        events = run_plan(_legacy_poll_plan(firebase_uid, cutoff_ms, safe_limit))
     except Exception as exc:
         logger.error("Realtime polling query failed: %s", exc)
         raise HTTPException(status_code=500, detail="Realtime polling failed")
+    return _legacy_poll_payload(events, safe_limit)
 
-    events.sort(key=lambda item: int(item.get("updated_at_ms") or 0), reverse=True)
-    if len(events) > safe_limit:
-        events = events[:safe_limit]
 
-    server_time_ms = int(datetime.now().timestamp() * 1000)
-    return {
-        "success": True,
-        "server_time_ms": server_time_ms,
-        "server_time": datetime.now().isoformat(),
-        "last_event_id": None,
-        "changes": events,
-        "events": events,
-        "count": len(events),
-        "source": "legacy_aggregate",
-    }
+async def fetch_realtime_poll_payload_async(
+    *,
+    firebase_uid: str,
+    since_ms: int,
+    limit: int,
+) -> Dict[str, Any]:
+    """fetch_realtime_poll_payload as coroutines on the asyncio pool; thread offload when it is off."""
+    if not async_db_enabled():
+        return await run_in_bulkhead(
+            WORKLOAD_DB_LIGHT,
+            fetch_realtime_poll_payload,
+            firebase_uid=firebase_uid,
+            since_ms=since_ms,
+            limit=limit,
+        )
+    safe_limit = max(1, min(int(limit), 300))
+    cutoff_ms = max(int(since_ms or 0), 0)
+
+    try:
+        from services.change_event_service import fetch_change_events_since_async
+
+        changes, last_event_id = await fetch_change_events_since_async(
+            firebase_uid=firebase_uid,
+            since_ms=cutoff_ms,
+            limit=safe_limit,
+        )
+        if changes:
+            return _outbox_poll_payload(changes, last_event_id)
+    except Exception as exc:
+        logger.warning("Realtime polling outbox read failed (fallback to legacy query): %s", exc)
+
+    try:
+        events = await run_plan_async(_legacy_poll_plan(firebase_uid, cutoff_ms, safe_limit))
+    except Exception as exc:
+        logger.error("Realtime polling query failed: %s", exc)
+        raise HTTPException(status_code=500, detail="Realtime polling failed")
+    return _legacy_poll_payload(events, safe_limit)
 
 
 def build_search_analytic_response(
@@ -431,9 +488,8 @@ async def execute_search_request(
         target_book_ids=search_request.target_book_ids,
     )
 
-    loop = asyncio.get_running_loop()
-    answer, sources, metadata = await loop.run_in_executor(
-        None,
+    answer, sources, metadata = await run_in_bulkhead(
+        WORKLOAD_LLM,
         partial(
             _call_with_supported_kwargs,
             generate_answer_fn,
@@ -499,7 +555,6 @@ async def execute_search_request(
 
 async def _prepare_chat_session_context(
     *,
-    loop: asyncio.AbstractEventLoop,
     firebase_uid: str,
     session_id: Optional[int],
     message: str,
@@ -510,18 +565,20 @@ async def _prepare_chat_session_context(
     effective_session_id = session_id
     if not effective_session_id:
         new_title = f"Chat: {message[:40]}..."
-        effective_session_id = await loop.run_in_executor(None, create_session_fn, firebase_uid, new_title)
+        effective_session_id = await run_in_bulkhead(WORKLOAD_DB_LIGHT, create_session_fn, firebase_uid, new_title)
         if not effective_session_id:
             raise HTTPException(status_code=500, detail="Failed to create session")
 
-    ctx_data = await loop.run_in_executor(None, get_session_context_fn, effective_session_id)
-    memory_context_snippet = await loop.run_in_executor(None, get_memory_context_snippet_fn, firebase_uid)
+    if inspect.iscoroutinefunction(get_session_context_fn):
+        ctx_data = await get_session_context_fn(effective_session_id)
+    else:
+        ctx_data = await run_in_bulkhead(WORKLOAD_DB_LIGHT, get_session_context_fn, effective_session_id)
+    memory_context_snippet = await run_in_bulkhead(WORKLOAD_DB_LIGHT, get_memory_context_snippet_fn, firebase_uid)
     return effective_session_id, ctx_data, memory_context_snippet
 
 
 async def maybe_execute_chat_analytic_response(
     *,
-    loop: asyncio.AbstractEventLoop,
     firebase_uid: str,
     session_id: int,
     message: str,
@@ -540,7 +597,7 @@ async def maybe_execute_chat_analytic_response(
 
     if not resolved_book_id and not term:
         answer = "Analitik sayÄ±m iÃ§in kitap ve kelime gerekli. Ã–rn: \"Mahur Beste kitabÄ±nda zaman kelimesi kaÃ§ defa geÃ§iyor?\""
-        await loop.run_in_executor(None, add_message_fn, session_id, "assistant", answer, [])
+        await run_in_bulkhead(WORKLOAD_DB_LIGHT, add_message_fn, session_id, "assistant", answer, [])
         background_tasks.add_task(summarize_session_history_fn, session_id)
         return {
             "answer": answer,
@@ -556,7 +613,7 @@ async def maybe_execute_chat_analytic_response(
         }
     if not resolved_book_id:
         answer = "Analitik sayÄ±m iÃ§in hangi kitabÄ± soruyorsun? Ã–rn: \"Mahur Beste kitabÄ±nda zaman kelimesi kaÃ§ defa geÃ§iyor?\""
-        await loop.run_in_executor(None, add_message_fn, session_id, "assistant", answer, [])
+        await run_in_bulkhead(WORKLOAD_DB_LIGHT, add_message_fn, session_id, "assistant", answer, [])
         background_tasks.add_task(summarize_session_history_fn, session_id)
         return {
             "answer": answer,
@@ -572,7 +629,7 @@ async def maybe_execute_chat_analytic_response(
         }
     if not term:
         answer = "SayÄ±lacak kelimeyi belirtir misin?"
-        await loop.run_in_executor(None, add_message_fn, session_id, "assistant", answer, [])
+        await run_in_bulkhead(WORKLOAD_DB_LIGHT, add_message_fn, session_id, "assistant", answer, [])
         background_tasks.add_task(summarize_session_history_fn, session_id)
         return {
             "answer": answer,
@@ -597,7 +654,7 @@ async def maybe_execute_chat_analytic_response(
     logger.info("Final Narrative Answer: %s", answer)
     contexts = get_keyword_contexts(firebase_uid, resolved_book_id, term, limit=10)
 
-    await loop.run_in_executor(None, add_message_fn, session_id, "assistant", answer, [])
+    await run_in_bulkhead(WORKLOAD_DB_LIGHT, add_message_fn, session_id, "assistant", answer, [])
     background_tasks.add_task(summarize_session_history_fn, session_id)
     return {
         "answer": answer,
@@ -636,10 +693,8 @@ async def execute_chat_request(
     get_memory_context_snippet_fn: Callable[..., Any],
     refresh_memory_profile_fn: Callable[..., Any],
 ) -> Dict[str, Any]:
-    loop = asyncio.get_running_loop()
     requested_domain_mode = _resolve_requested_domain_mode(chat_request)
     session_id, ctx_data, memory_context_snippet = await _prepare_chat_session_context(
-        loop=loop,
         firebase_uid=firebase_uid,
         session_id=chat_request.session_id,
         message=chat_request.message,
@@ -648,10 +703,9 @@ async def execute_chat_request(
         get_memory_context_snippet_fn=get_memory_context_snippet_fn,
     )
 
-    await loop.run_in_executor(None, add_message_fn, session_id, "user", chat_request.message)
+    await run_in_bulkhead(WORKLOAD_DB_LIGHT, add_message_fn, session_id, "user", chat_request.message)
 
     analytic_payload = await maybe_execute_chat_analytic_response(
-        loop=loop,
         firebase_uid=firebase_uid,
         session_id=session_id,
         message=chat_request.message,
@@ -712,8 +766,8 @@ async def execute_chat_request(
         if memory_context_snippet:
             conversation_state["memory_profile"] = memory_context_snippet[:1000]
 
-        rag_ctx = await loop.run_in_executor(
-            None,
+        rag_ctx = await run_in_bulkhead(
+            WORKLOAD_RETRIEVAL,
             partial(
                 _call_with_supported_kwargs,
                 get_rag_context_fn,
@@ -811,8 +865,8 @@ async def execute_chat_request(
                     }
                 )
     else:
-        answer_result, sources_result, meta_result = await loop.run_in_executor(
-            None,
+        answer_result, sources_result, meta_result = await run_in_bulkhead(
+            WORKLOAD_LLM,
             partial(
                 _call_with_supported_kwargs,
                 generate_answer_fn,
@@ -851,7 +905,7 @@ async def execute_chat_request(
         final_metadata.setdefault("memory_profile_loaded", bool(memory_context_snippet))
         final_metadata.setdefault("requested_domain_mode", requested_domain_mode)
 
-    await loop.run_in_executor(None, add_message_fn, session_id, "assistant", answer, sources)
+    await run_in_bulkhead(WORKLOAD_DB_LIGHT, add_message_fn, session_id, "assistant", answer, sources)
     background_tasks.add_task(summarize_session_history_fn, session_id)
     background_tasks.add_task(refresh_memory_profile_fn, firebase_uid)
 
@@ -1,19 +1,16 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import random
 import re
-import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
 from difflib import SequenceMatcher
 from typing import Any, Dict, List, Optional, Set, Tuple
 from urllib import parse as urllib_parse
-from urllib import request as urllib_request
-from urllib.error import HTTPError, URLError
 
 from config import settings
+from infrastructure import http_client
 from utils.isbn_utils import equivalent_isbn_set, normalize_valid_isbn
 from utils.logger import get_logger
 
@@ -22,12 +19,8 @@ logger = get_logger("book_metadata_resolver")
 GOOGLE_MAX_RESULTS = 12
 OPENLIB_MAX_RESULTS = 12
 NEGATIVE_CACHE_TTL_SEC = 180.0
+RESPONSE_CACHE_TTL_SEC = 900.0
 COVER_CHECK_TTL_SEC = 900.0
-
-_NEGATIVE_CACHE_LOCK = threading.Lock()
-_NEGATIVE_CACHE: Dict[str, float] = {}
-_COVER_CHECK_CACHE_LOCK = threading.Lock()
-_COVER_CHECK_CACHE: Dict[str, Tuple[float, bool]] = {}
 _RESOLVER_EXECUTOR = ThreadPoolExecutor(max_workers=6, thread_name_prefix="book-resolver-main")
 _PROVIDER_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="book-resolver-provider")
 _CYRILLIC_RE = re.compile(r"[\u0400-\u04FF]")
@@ -216,58 +209,45 @@ def _normalize_author_script(
     return latinized or raw_author
 
 
-def _is_negative_cached(cache_key: str) -> bool:
-    now = time.time()
-    with _NEGATIVE_CACHE_LOCK:
-        exp = _NEGATIVE_CACHE.get(cache_key)
-        if exp is None:
-            return False
-        if exp < now:
-            _NEGATIVE_CACHE.pop(cache_key, None)
-            return False
-        return True
-
-
-def _mark_negative_cache(cache_key: str, ttl_sec: float = NEGATIVE_CACHE_TTL_SEC) -> None:
-    with _NEGATIVE_CACHE_LOCK:
-        _NEGATIVE_CACHE[cache_key] = time.time() + max(1.0, float(ttl_sec))
-
-
 def _fetch_json_with_retry_with_status(
     url: str,
     *,
     provider: str,
-    cache_key: str,
     timeout_sec: float,
     max_attempts: int = 3,
     headers: Optional[Dict[str, str]] = None,
 ) -> Tuple[Optional[Dict[str, Any]], Optional[int]]:
-    if _is_negative_cached(cache_key):
+    if http_client.is_negative_cached("GET", url):
         return None, None
 
     user_agent = "TomeHub-BookResolver/1.0"
     if provider == "open-library":
         user_agent = "TomeHub-BookResolver/1.0 (+https://tomehub.local)"
 
+    request_headers = {"User-Agent": user_agent}
+    if headers:
+        request_headers.update({str(k): str(v) for k, v in headers.items()})
     for attempt in range(max_attempts):
-        request_headers = {"User-Agent": user_agent}
-        if headers:
-            request_headers.update({str(k): str(v) for k, v in headers.items()})
-        req = urllib_request.Request(url=url, headers=request_headers, method="GET")
         try:
-            with urllib_request.urlopen(req, timeout=timeout_sec) as resp:
-                charset = resp.headers.get_content_charset() or "utf-8"
-                raw = resp.read().decode(charset, errors="replace")
-                return json.loads(raw), int(getattr(resp, "status", 200) or 200)
-        except HTTPError as exc:
-            code = int(getattr(exc, "code", 0) or 0)
+            resp = http_client.request(
+                "GET",
+                url,
+                provider=provider,
+                timeout_sec=timeout_sec,
+                headers=request_headers,
+                cache_ttl_sec=RESPONSE_CACHE_TTL_SEC,
+                negative_ttl_sec=NEGATIVE_CACHE_TTL_SEC,
+            )
+            return resp.json(), resp.status
+        except http_client.HttpStatusError as exc:
+            code = exc.code
             retryable = code in {429, 500, 502, 503, 504}
             if retryable and attempt + 1 < max_attempts:
                 wait_s = (0.35 * (2 ** attempt)) + random.uniform(0.05, 0.20)
                 time.sleep(wait_s)
                 continue
             if retryable:
-                _mark_negative_cache(cache_key, ttl_sec=120.0 if code == 429 else 90.0)
+                http_client.remember_failure("GET", url, ttl_sec=120.0 if code == 429 else 90.0)
             logger.warning(
                 "Book metadata provider HTTP failure: provider=%s status=%s url=%s",
                 provider,
@@ -275,12 +255,12 @@ def _fetch_json_with_retry_with_status(
                 url,
             )
             return None, code
-        except (URLError, TimeoutError) as exc:
+        except http_client.HttpTransportError as exc:
             if attempt + 1 < max_attempts:
                 wait_s = (0.30 * (2 ** attempt)) + random.uniform(0.05, 0.15)
                 time.sleep(wait_s)
                 continue
-            _mark_negative_cache(cache_key, ttl_sec=60.0)
+            http_client.remember_failure("GET", url, ttl_sec=60.0)
             logger.warning(
                 "Book metadata provider network failure: provider=%s url=%s error=%s",
                 provider,
@@ -303,7 +283,6 @@ def _fetch_json_with_retry(
     url: str,
     *,
     provider: str,
-    cache_key: str,
     timeout_sec: float,
     max_attempts: int = 3,
     headers: Optional[Dict[str, str]] = None,
@@ -311,7 +290,6 @@ def _fetch_json_with_retry(
     data, _status = _fetch_json_with_retry_with_status(
         url,
         provider=provider,
-        cache_key=cache_key,
         timeout_sec=timeout_sec,
         max_attempts=max_attempts,
         headers=headers,
@@ -358,24 +336,6 @@ def _sanitize_cover_url(url: Optional[str]) -> Optional[str]:
     return raw
 
 
-def _cover_cache_get(url: str) -> Optional[bool]:
-    now = time.time()
-    with _COVER_CHECK_CACHE_LOCK:
-        hit = _COVER_CHECK_CACHE.get(url)
-        if not hit:
-            return None
-        exp, value = hit
-        if exp < now:
-            _COVER_CHECK_CACHE.pop(url, None)
-            return None
-        return value
-
-
-def _cover_cache_set(url: str, value: bool, ttl: float = COVER_CHECK_TTL_SEC) -> None:
-    with _COVER_CHECK_CACHE_LOCK:
-        _COVER_CHECK_CACHE[url] = (time.time() + ttl, value)
-
-
 def _is_viable_cover_url(url: Optional[str]) -> bool:
     raw = _sanitize_cover_url(url)
     if not raw:
@@ -384,22 +344,22 @@ def _is_viable_cover_url(url: Optional[str]) -> bool:
     if any(x in lowered for x in ("placeholder", "default.jpg", "no-cover")):
         return False
 
-    cached = _cover_cache_get(raw)
-    if cached is not None:
-        return cached
-
-    req = urllib_request.Request(raw, headers={"User-Agent": "TomeHub-BookResolver/1.0"}, method="HEAD")
     try:
-        with urllib_request.urlopen(req, timeout=3.0) as resp:
-            status_ok = int(getattr(resp, "status", 200) or 200) < 400
-            content_type = str(resp.headers.get("Content-Type") or "").lower()
-            ok = status_ok and ("image" in content_type or "octet-stream" in content_type)
-            _cover_cache_set(raw, ok)
-            return ok
+        resp = http_client.request(
+            "HEAD",
+            raw,
+            provider="cover-check",
+            timeout_sec=3.0,
+            headers={"User-Agent": "TomeHub-BookResolver/1.0"},
+            cache_ttl_sec=COVER_CHECK_TTL_SEC,
+            negative_ttl_sec=COVER_CHECK_TTL_SEC,
+        )
     except Exception as exc:
         logger.warning("Cover viability check failed for %s: %s", raw, exc)
-        _cover_cache_set(raw, False, ttl=180.0)
+        http_client.remember_failure("HEAD", raw, ttl_sec=180.0)
         return False
+    content_type = str(resp.headers.get("content-type") or "").lower()
+    return "image" in content_type or "octet-stream" in content_type
 
 
 def _map_openlibrary_bib_entry(entry: Dict[str, Any], query_isbns: Set[str]) -> Optional[Dict[str, Any]]:
@@ -592,7 +552,6 @@ def _fetch_openlibrary_by_bib(isbn_set: Set[str]) -> List[Dict[str, Any]]:
         data = _fetch_json_with_retry(
             api_url,
             provider="open-library",
-            cache_key=f"ol-bib:{isbn}",
             timeout_sec=4.0,
             max_attempts=2,
         )
@@ -621,7 +580,6 @@ def _fetch_openlibrary_search(query: str, *, isbn_mode: bool, isbn_set: Set[str]
         data = _fetch_json_with_retry(
             api_url,
             provider="open-library",
-            cache_key=f"ol-search:{variant}",
             timeout_sec=4.0,
             max_attempts=2,
         )
@@ -676,7 +634,6 @@ def _fetch_google_books(query: str, isbn_set: Set[str]) -> List[Dict[str, Any]]:
         data, status_code = _fetch_json_with_retry_with_status(
             api_url,
             provider="google-books",
-            cache_key=f"gbooks:{variant}",
             timeout_sec=4.5,
             max_attempts=3,
         )
@@ -689,7 +646,6 @@ def _fetch_google_books(query: str, isbn_set: Set[str]) -> List[Dict[str, Any]]:
             data = _fetch_json_with_retry(
                 fallback_url,
                 provider="google-books",
-                cache_key=f"gbooks-nokey:{variant}",
                 timeout_sec=4.5,
                 max_attempts=2,
             )
@@ -765,7 +721,6 @@ def _fetch_big_book(query: str, isbn_set: Set[str]) -> List[Dict[str, Any]]:
     data = _fetch_json_with_retry(
         url,
         provider="big-book-api",
-        cache_key=f"big-book:{search_query}",
         timeout_sec=4.0,
         max_attempts=2,
         headers={"x-api-key": api_key},
@@ -0,0 +1,138 @@
+"""
+Per-workload executor bulkheads for blocking work behind async routes.
+
+Each workload class gets its own bounded thread pool and admission limit
+(running + queued). When a class is full, route calls fail fast with a 503 and
+Retry-After instead of queueing behind unrelated work, so a burst of PDF parses
+or slow LLM calls cannot starve cheap chat-history reads.
+
+Workload classes:
+- db_light:  short Oracle reads/writes (sessions, messages, feedback, profiles)
+- retrieval: search / RAG context assembly
+- llm:       answer generation and other model calls
+- parsing:   PDF download, classification, parsing, OCR and finalisation
+
+Background workers pass `shed=False`: they still run on the class pool but wait
+for a thread instead of being rejected.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, TypeVar
+
+from fastapi import HTTPException
+
+from config import settings
+from services.monitoring import (
+    BULKHEAD_INFLIGHT,
+    BULKHEAD_QUEUE_WAIT_MS,
+    BULKHEAD_REJECTED_TOTAL,
+)
+from services.sampling_profiler_service import sampling_profiler
+from utils.logger import get_logger
+
+logger = get_logger("bulkhead_service")
+
+T = TypeVar("T")
+
+WORKLOAD_DB_LIGHT = "db_light"
+WORKLOAD_RETRIEVAL = "retrieval"
+WORKLOAD_LLM = "llm"
+WORKLOAD_PARSING = "parsing"
+
+# (workers, queue) defaults; overridable via BULKHEAD_<CLASS>_WORKERS / _QUEUE.
+_DEFAULT_LIMITS: Dict[str, tuple[int, int]] = {
+    WORKLOAD_DB_LIGHT: (8, 64),
+    WORKLOAD_RETRIEVAL: (8, 32),
+    WORKLOAD_LLM: (16, 32),
+    WORKLOAD_PARSING: (2, 8),
+}
+
+
+class BulkheadFullError(HTTPException):
+    """503 raised when a workload class has no free worker or queue slot."""
+
+    def __init__(self, workload: str, retry_after_sec: int):
+        super().__init__(
+            status_code=503,
+            detail=f"Server busy ({workload}); retry shortly",
+            headers={"Retry-After": str(max(1, int(retry_after_sec)))},
+        )
+        self.workload = workload
+
+
+class Bulkhead:
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(0, int(max_queue))
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"bulkhead-{name}")
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+
+    def _run(self, fn: Callable[[], T], enqueued_at: float, route: str | None = None) -> T:
+        BULKHEAD_QUEUE_WAIT_MS.labels(workload=self.name).observe((time.perf_counter() - enqueued_at) * 1000.0)
+        if route is None:
+            return fn()
+        with sampling_profiler.attribute_thread(route):
+            return fn()
+
+    async def run(self, fn: Callable[[], T], *, shed: bool = True) -> T:
+        admitted = self._slots.acquire(blocking=False)
+        if not admitted and shed:
+            BULKHEAD_REJECTED_TOTAL.labels(workload=self.name).inc()
+            logger.warning("Bulkhead full; shedding request", extra={"workload": self.name})
+            raise BulkheadFullError(self.name, int(getattr(settings, "BULKHEAD_RETRY_AFTER_SEC", 2)))
+
+        BULKHEAD_INFLIGHT.labels(workload=self.name).inc()
+        # Carry contextvars across like asyncio.to_thread does.
+        context = contextvars.copy_context()
+        # Non-None only while an admin profiling session runs.
+        route = sampling_profiler.current_route()
+        future = self.executor.submit(context.run, self._run, fn, time.perf_counter(), route)
+
+        def _release(_future: Any) -> None:
+            # Runs on completion or cancellation, so a client disconnect
+            # never leaks a slot while the thread is still busy.
+            BULKHEAD_INFLIGHT.labels(workload=self.name).dec()
+            if admitted:
+                self._slots.release()
+
+        future.add_done_callback(_release)
+        return await asyncio.wrap_future(future)
+
+
+_BULKHEADS: Dict[str, Bulkhead] = {}
+_BULKHEADS_LOCK = threading.Lock()
+
+
+def get_bulkhead(workload: str) -> Bulkhead:
+    bulkhead = _BULKHEADS.get(workload)
+    if bulkhead is not None:
+        return bulkhead
+    if workload not in _DEFAULT_LIMITS:
+        raise ValueError(f"Unknown bulkhead workload: {workload}")
+    with _BULKHEADS_LOCK:
+        bulkhead = _BULKHEADS.get(workload)
+        if bulkhead is None:
+            default_workers, default_queue = _DEFAULT_LIMITS[workload]
+            prefix = f"BULKHEAD_{workload.upper()}"
+            bulkhead = Bulkhead(
+                workload,
+                max_workers=int(getattr(settings, f"{prefix}_WORKERS", default_workers)),
+                max_queue=int(getattr(settings, f"{prefix}_QUEUE", default_queue)),
+            )
+            _BULKHEADS[workload] = bulkhead
+    return bulkhead
+
+
+async def run_in_bulkhead(workload: str, fn: Callable[..., T], *args: Any, shed: bool = True, **kwargs: Any) -> T:
+    """Run a blocking call on its workload pool; falls back to the default executor when disabled."""
+    call = partial(fn, *args, **kwargs) if (args or kwargs) else fn
+    if not bool(getattr(settings, "BULKHEAD_ENABLED", True)):
+        return await asyncio.get_running_loop().run_in_executor(None, call)
+    return await get_bulkhead(workload).run(call, shed=shed)
+
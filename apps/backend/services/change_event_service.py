@@ -5,6 +5,8 @@ import logging
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
+from infrastructure.async_db import Fetch, QueryPlan, run_plan, run_plan_async
+from infrastructure.cursor_profiles import QUERY_CLASS_CANDIDATE_SCAN
 from infrastructure.db_manager import DatabaseManager, safe_read_clob
 
 logger = logging.getLogger("change_event_service")
@@ -71,6 +73,27 @@ def emit_change_event(
         return None
 
 
+def _change_events_plan(firebase_uid: str, since_ms: int, limit: int) -> QueryPlan[List[Any]]:
+    safe_limit = max(1, min(int(limit or 100), 300))
+    rows = yield Fetch(
+        """
+        SELECT EVENT_ID, ITEM_ID, ENTITY_TYPE, EVENT_TYPE, PAYLOAD_JSON, CREATED_AT
+        FROM TOMEHUB_CHANGE_EVENTS
+        WHERE FIREBASE_UID = :p_uid
+          AND CREATED_AT > :p_cutoff
+        ORDER BY EVENT_ID DESC
+        FETCH FIRST :p_limit ROWS ONLY
+        """,
+        {
+            "p_uid": str(firebase_uid).strip(),
+            "p_cutoff": _to_utc_dt_from_ms(since_ms),
+            "p_limit": safe_limit,
+        },
+        query_class=QUERY_CLASS_CANDIDATE_SCAN,
+    )
+    return list(rows or [])
+
+
 def fetch_change_events_since(
     *,
     firebase_uid: str,
@@ -83,34 +106,32 @@ def fetch_change_events_since(
     """
     if not firebase_uid:
         return ([], None)
+    try:
+        rows = run_plan(_change_events_plan(firebase_uid, since_ms, limit))
+    except Exception as e:
+        logger.warning("fetch_change_events_since failed (non-critical): %s", e)
+        return ([], None)
+    return _changes_from_rows(rows)
 
-    safe_limit = max(1, min(int(limit or 100), 300))
-    cutoff_dt = _to_utc_dt_from_ms(since_ms)
-    rows: List[Any] = []
 
+async def fetch_change_events_since_async(
+    *,
+    firebase_uid: str,
+    since_ms: int = 0,
+    limit: int = 100,
+) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """fetch_change_events_since on the asyncio pool (see infrastructure/async_db.py)."""
+    if not firebase_uid:
+        return ([], None)
     try:
-        with DatabaseManager.get_read_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(
-                    """
-                    SELECT EVENT_ID, ITEM_ID, ENTITY_TYPE, EVENT_TYPE, PAYLOAD_JSON, CREATED_AT
-                    FROM TOMEHUB_CHANGE_EVENTS
-                    WHERE FIREBASE_UID = :p_uid
-                      AND CREATED_AT > :p_cutoff
-                    ORDER BY EVENT_ID DESC
-                    FETCH FIRST :p_limit ROWS ONLY
-                    """,
-                    {
-                        "p_uid": str(firebase_uid).strip(),
-                        "p_cutoff": cutoff_dt,
-                        "p_limit": safe_limit,
-                    },
-                )
-                rows = cursor.fetchall() or []
+        rows = await run_plan_async(_change_events_plan(firebase_uid, since_ms, limit))
     except Exception as e:
         logger.warning("fetch_change_events_since failed (non-critical): %s", e)
         return ([], None)
+    return _changes_from_rows(rows)
+
 
+def _changes_from_rows(rows: List[Any]) -> Tuple[List[Dict[str, Any]], Optional[int]]:
     changes: List[Dict[str, Any]] = []
     last_event_id: Optional[int] = None
     for row in rows:
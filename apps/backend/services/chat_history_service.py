@@ -5,12 +5,29 @@ TomeHub Chat History Service
 Manages persistent chat sessions and message history.
 """
 
+import asyncio
 import json
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional
+from infrastructure.async_db import Fetch, QueryPlan, async_db_enabled, run_plan, run_plan_async
+from infrastructure.cursor_profiles import QUERY_CLASS_CANDIDATE_SCAN
 from infrastructure.db_manager import DatabaseManager, safe_read_clob
+from infrastructure.schema_registry import schema_registry
 from config import settings
+from services.bulkhead_service import WORKLOAD_DB_LIGHT, run_in_bulkhead
+from services.chat_session_cache_service import (
+    chat_write_behind,
+    empty_context,
+    get_hot_context,
+    hot_message_window,
+    put_hot_context,
+    update_hot_context,
+    write_behind_enabled,
+)
 from services.llm_client import (
     MODEL_TIER_FLASH,
     MODEL_TIER_LITE,
@@ -19,29 +36,10 @@ from services.llm_client import (
 )
 
 logger = logging.getLogger("chat_history_service")
-_CONV_STATE_COLUMN_AVAILABLE: Optional[bool] = None
 
 
 def _conversation_state_column_available() -> bool:
-    global _CONV_STATE_COLUMN_AVAILABLE
-    if _CONV_STATE_COLUMN_AVAILABLE is not None:
-        return bool(_CONV_STATE_COLUMN_AVAILABLE)
-    try:
-        with DatabaseManager.get_read_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(
-                    """
-                    SELECT COUNT(*)
-                    FROM user_tab_columns
-                    WHERE table_name = 'TOMEHUB_CHAT_SESSIONS'
-                      AND column_name = 'CONVERSATION_STATE_JSON'
-                    """
-                )
-                row = cursor.fetchone()
-                _CONV_STATE_COLUMN_AVAILABLE = bool(row and int(row[0] or 0) > 0)
-    except Exception:
-        _CONV_STATE_COLUMN_AVAILABLE = False
-    return bool(_CONV_STATE_COLUMN_AVAILABLE)
+    return schema_registry.capabilities.chat_conversation_state
 
 
 def _update_conversation_state_column(session_id: int, state_json: str) -> bool:
@@ -59,11 +57,10 @@ def _update_conversation_state_column(session_id: int, state_json: str) -> bool:
                     {"p_state": state_json, "p_sid": session_id},
                 )
                 conn.commit()
+        update_hot_context(session_id, conversation_state_json=state_json)
         return True
     except Exception as e:
-        if "ORA-00904" in str(e):
-            global _CONV_STATE_COLUMN_AVAILABLE
-            _CONV_STATE_COLUMN_AVAILABLE = False
+        if schema_registry.note_error(e):
             return False
         logger.error(f"Failed to update conversation_state_json {session_id}: {e}")
         return False
@@ -81,15 +78,21 @@ def create_session(firebase_uid: str, title: str = "New Chat") -> int:
                 """, {"p_uid": firebase_uid, "title": title, "id_col": id_var})
                 session_id = id_var.getvalue()[0]
                 conn.commit()
-                return int(session_id)
+        put_hot_context(int(session_id), empty_context())
+        return int(session_id)
     except Exception as e:
         logger.error(f"Failed to create chat session: {e}")
         return None
 
 def add_message(session_id: int, role: str, content: str, citations: Optional[List[Dict]] = None):
-    """Save a message to the history."""
+    """Save a message to the history (queued for the write-behind batcher when enabled)."""
     try:
         citations_json = json.dumps(citations or [], ensure_ascii=False)
+        message = {"role": role, "content": content, "citations": citations or []}
+        if write_behind_enabled():
+            update_hot_context(session_id, message=message)
+            chat_write_behind.enqueue(session_id, role, content, citations_json)
+            return
         with DatabaseManager.get_write_connection() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("""
@@ -105,78 +108,138 @@ def add_message(session_id: int, role: str, content: str, citations: Optional[Li
                 # Also update session's UPDATED_AT
                 cursor.execute("UPDATE TOMEHUB_CHAT_SESSIONS SET UPDATED_AT = CURRENT_TIMESTAMP WHERE ID = :p_sid", {"p_sid": session_id})
                 conn.commit()
+        update_hot_context(session_id, message=message)
     except Exception as e:
         logger.error(f"Failed to add message to session {session_id}: {e}")
 
+def _history_plan(session_id: int, limit: int) -> QueryPlan[List[Dict]]:
+    rows = yield Fetch("""
+        SELECT ROLE, CONTENT, CITATIONS
+        FROM (
+            SELECT ROLE, CONTENT, CITATIONS, CREATED_AT
+            FROM TOMEHUB_CHAT_MESSAGES
+            WHERE SESSION_ID = :p_sid
+            ORDER BY CREATED_AT DESC
+        )
+        WHERE ROWNUM <= :p_limit
+        ORDER BY CREATED_AT ASC
+    """, {"p_sid": session_id, "p_limit": limit}, query_class=QUERY_CLASS_CANDIDATE_SCAN)
+    messages = []
+    for role, content_lob, citations_json in rows:
+        messages.append({
+            "role": role,
+            "content": safe_read_clob(content_lob),
+            "citations": json.loads(safe_read_clob(citations_json) or "[]")
+        })
+    return messages
+
+def _fetch_history(session_id: int, limit: int) -> List[Dict]:
+    return run_plan(_history_plan(session_id, limit))
+
 def get_session_history(session_id: int, limit: Optional[int] = None) -> List[Dict]:
     """Retrieve last N messages for context."""
-    messages = []
     if limit is None:
         limit = settings.CHAT_CONTEXT_LIMIT
+    if limit <= 0:
+        return []
+    hot = get_hot_context(session_id)
+    if hot is not None:
+        cached = hot.get("messages") or []
+        if len(cached) >= limit or hot.get("complete"):
+            return cached[-limit:]
     try:
-        with DatabaseManager.get_read_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT ROLE, CONTENT, CITATIONS
-                    FROM (
-                        SELECT ROLE, CONTENT, CITATIONS, CREATED_AT
-                        FROM TOMEHUB_CHAT_MESSAGES
-                        WHERE SESSION_ID = :p_sid
-                        ORDER BY CREATED_AT DESC
-                    )
-                    WHERE ROWNUM <= :p_limit
-                    ORDER BY CREATED_AT ASC
-                """, {"p_sid": session_id, "p_limit": limit})
-                
-                rows = cursor.fetchall()
-                for role, content_lob, citations_json in rows:
-                    messages.append({
-                        "role": role,
-                        "content": safe_read_clob(content_lob),
-                        "citations": json.loads(safe_read_clob(citations_json) or "[]")
-                    })
+        if write_behind_enabled():
+            chat_write_behind.flush()
+        return _fetch_history(session_id, limit)
     except Exception as e:
         logger.error(f"Failed to get history for session {session_id}: {e}")
-        
-    return messages
+        return []
 
-def get_session_context(session_id: int) -> Dict:
-    """Return both running summary and recent messages."""
-    result = {
+def _empty_session_context() -> Dict:
+    return {
         "summary": "",
         "conversation_state_json": "",
         "recent_messages": []
     }
+
+def _hot_session_context(session_id: int) -> Optional[Dict]:
+    hot = get_hot_context(session_id)
+    if hot is None:
+        return None
+    return {
+        "summary": hot.get("summary") or "",
+        "conversation_state_json": hot.get("conversation_state_json") or "",
+        "recent_messages": (hot.get("messages") or [])[-settings.CHAT_CONTEXT_LIMIT:],
+    }
+
+def _session_context_plan(session_id: int) -> QueryPlan[Dict]:
+    """Summary/state row plus the hot-context message window, as one read plan."""
+    result = _empty_session_context()
+    if _conversation_state_column_available():
+        try:
+            row = yield Fetch(
+                "SELECT RUNNING_SUMMARY, CONVERSATION_STATE_JSON FROM TOMEHUB_CHAT_SESSIONS WHERE ID = :p_sid",
+                {"p_sid": session_id},
+                one=True,
+            )
+            if row:
+                result["summary"] = safe_read_clob(row[0]) or ""
+                result["conversation_state_json"] = safe_read_clob(row[1]) or ""
+        except Exception as e:
+            if not schema_registry.note_error(e):
+                raise
+    if not result["summary"]:
+        row = yield Fetch(
+            "SELECT RUNNING_SUMMARY FROM TOMEHUB_CHAT_SESSIONS WHERE ID = :p_sid",
+            {"p_sid": session_id},
+            one=True,
+        )
+        if row:
+            result["summary"] = safe_read_clob(row[0]) or ""
+    result["recent_messages"] = yield from _history_plan(session_id, hot_message_window())
+    return result
+
+def _remember_session_context(session_id: int, fetched: Dict) -> Dict:
+    messages = fetched["recent_messages"]
+    put_hot_context(session_id, {
+        "summary": fetched["summary"],
+        "conversation_state_json": fetched["conversation_state_json"],
+        "messages": messages,
+        "complete": len(messages) < hot_message_window(),
+    })
+    return {**fetched, "recent_messages": messages[-settings.CHAT_CONTEXT_LIMIT:]}
+
+def get_session_context(session_id: int) -> Dict:
+    """Return both running summary and recent messages (hot context first, Oracle on a miss)."""
+    hot = _hot_session_context(session_id)
+    if hot is not None:
+        return hot
     try:
-        with DatabaseManager.get_read_connection() as conn:
-            with conn.cursor() as cursor:
-                if _conversation_state_column_available():
-                    try:
-                        cursor.execute(
-                            "SELECT RUNNING_SUMMARY, CONVERSATION_STATE_JSON FROM TOMEHUB_CHAT_SESSIONS WHERE ID = :p_sid",
-                            {"p_sid": session_id},
-                        )
-                        row = cursor.fetchone()
-                        if row:
-                            result["summary"] = safe_read_clob(row[0]) or ""
-                            result["conversation_state_json"] = safe_read_clob(row[1]) or ""
-                    except Exception as e:
-                        if "ORA-00904" in str(e):
-                            global _CONV_STATE_COLUMN_AVAILABLE
-                            _CONV_STATE_COLUMN_AVAILABLE = False
-                        else:
-                            raise
-                if not result["summary"]:
-                    cursor.execute("SELECT RUNNING_SUMMARY FROM TOMEHUB_CHAT_SESSIONS WHERE ID = :p_sid", {"p_sid": session_id})
-                    row = cursor.fetchone()
-                    if row:
-                        result["summary"] = safe_read_clob(row[0]) or ""
-                    
-        result["recent_messages"] = get_session_history(session_id, limit=settings.CHAT_CONTEXT_LIMIT)
+        if write_behind_enabled():
+            chat_write_behind.flush()
+        return _remember_session_context(session_id, run_plan(_session_context_plan(session_id)))
     except Exception as e:
         logger.error(f"Failed to get context for session {session_id}: {e}")
-        
-    return result
+    return _empty_session_context()
+
+async def get_session_context_async(session_id: int) -> Dict:
+    """
+    get_session_context with the Oracle reads on the asyncio pool. The hot-store
+    lookup and write-behind flush stay on a thread; they are short and sync-only.
+    """
+    if not async_db_enabled():
+        return await run_in_bulkhead(WORKLOAD_DB_LIGHT, get_session_context, session_id)
+    hot = await asyncio.to_thread(_hot_session_context, session_id)
+    if hot is not None:
+        return hot
+    try:
+        if write_behind_enabled() and chat_write_behind.pending_count():
+            await asyncio.to_thread(chat_write_behind.flush)
+        fetched = await run_plan_async(_session_context_plan(session_id))
+        return await asyncio.to_thread(_remember_session_context, session_id, fetched)
+    except Exception as e:
+        logger.error(f"Failed to get context for session {session_id}: {e}")
+    return _empty_session_context()
 
 def update_session_summary(session_id: int, summary: str):
     """Update the running summary of the session (legacy, still supports text)."""
@@ -189,6 +252,7 @@ def update_session_summary(session_id: int, summary: str):
                     WHERE ID = :p_sid
                 """, {"p_summary": summary, "p_sid": session_id})
                 conn.commit()
+        update_hot_context(session_id, summary=summary)
     except Exception as e:
         logger.error(f"Failed to update session summary {session_id}: {e}")
 
@@ -207,6 +271,27 @@ def update_session_tags(session_id: int, tags: List[str]):
     except Exception as e:
         logger.error(f"Failed to update session tags {session_id}: {e}")
 
+def _strip_code_fence(text: str) -> str:
+    text = (text or "").strip()
+    if text.startswith('```'):
+        text = text.split('```')[1]
+        if text.startswith('json'):
+            text = text[4:]
+        text = text.strip()
+    return text
+
+def _normalize_tags(tags) -> List[str]:
+    if not isinstance(tags, list):
+        return []
+    cleaned = []
+    for t in tags:
+        if not isinstance(t, str):
+            continue
+        t = t.strip().lstrip('#')
+        if t:
+            cleaned.append(t[:40])
+    return cleaned[:5]
+
 def generate_and_update_session_tags(session_id: int):
     """
     Generate topic tags from recent messages and update TAGS JSON.
@@ -251,24 +336,7 @@ KONUŞMA:
 
         # Parse JSON array
         try:
-            if tags_text.startswith('```'):
-                tags_text = tags_text.split('```')[1]
-                if tags_text.startswith('json'):
-                    tags_text = tags_text[4:]
-                tags_text = tags_text.strip()
-            tags = json.loads(tags_text)
-            if isinstance(tags, list):
-                # Normalize and limit
-                cleaned = []
-                for t in tags:
-                    if not isinstance(t, str):
-                        continue
-                    t = t.strip().lstrip('#')
-                    if t:
-                        cleaned.append(t[:40])
-                tags = cleaned[:5]
-            else:
-                tags = []
+            tags = _normalize_tags(json.loads(_strip_code_fence(tags_text)))
         except Exception:
             tags = []
 
@@ -432,43 +500,48 @@ def get_conversation_state(session_id: int) -> Dict:
     Retrieve the structured conversation state.
     Returns default empty state if none exists or parsing fails.
     """
-    default_state = {
+    try:
+        return _conversation_state_from(get_session_context(session_id))
+    except Exception as e:
+        logger.error(f"Failed to get conversation state {session_id}: {e}")
+        return _default_conversation_state()
+
+def _default_conversation_state() -> Dict:
+    return {
         "active_topic": "",
         "assumptions": [],
         "open_questions": [],
         "established_facts": [],
         "turn_count": 0
     }
-    
-    try:
-        ctx = get_session_context(session_id)
-        state_json = str(ctx.get("conversation_state_json") or "").strip()
-        if state_json.startswith("{"):
-            try:
-                parsed = json.loads(state_json)
-                if isinstance(parsed, dict):
-                    return parsed
-            except Exception:
-                pass
-        summary = ctx.get('summary', '')
-        
-        if not summary:
-            return default_state
-            
-        # Try to parse as JSON (new structured format)
-        if summary.strip().startswith('{'):
-            return json.loads(summary)
-        else:
-            # Legacy: plain text summary - migrate to structured format
-            return {
-                **default_state,
-                "legacy_summary": summary,
-                "active_topic": summary[:100] if summary else ""
-            }
-    except Exception as e:
-        logger.error(f"Failed to get conversation state {session_id}: {e}")
+
+def _conversation_state_from(ctx: Dict) -> Dict:
+    """Structured state from a session row's conversation_state_json / summary."""
+    default_state = _default_conversation_state()
+    state_json = str(ctx.get("conversation_state_json") or "").strip()
+    if state_json.startswith("{"):
+        try:
+            parsed = json.loads(state_json)
+            if isinstance(parsed, dict):
+                return parsed
+        except Exception:
+            pass
+    summary = ctx.get('summary', '')
+
+    if not summary:
         return default_state
 
+    # Try to parse as JSON (new structured format)
+    if summary.strip().startswith('{'):
+        return json.loads(summary)
+    else:
+        # Legacy: plain text summary - migrate to structured format
+        return {
+            **default_state,
+            "legacy_summary": summary,
+            "active_topic": summary[:100] if summary else ""
+        }
+
 def extract_structured_state(session_id: int):
     """
     Extracts structured conversation state from chat history using LLM.
@@ -565,13 +638,331 @@ JSON ÇIKTISI:"""
     except Exception as e:
         logger.error(f"Failed to extract structured state for session {session_id}: {e}")
 
+def _maintenance_plan(session_id: int, limit: int) -> QueryPlan[Dict]:
+    """Session row (summary, state, title, lock) plus the last `limit` messages, as one read plan."""
+    result = {**_empty_session_context(), "title": "", "title_locked": False, "messages": []}
+    row = None
+    if _conversation_state_column_available():
+        try:
+            row = yield Fetch(
+                "SELECT RUNNING_SUMMARY, TITLE, TITLE_LOCKED, CONVERSATION_STATE_JSON "
+                "FROM TOMEHUB_CHAT_SESSIONS WHERE ID = :p_sid",
+                {"p_sid": session_id},
+                one=True,
+            )
+        except Exception as e:
+            if not schema_registry.note_error(e):
+                raise
+    if row is None:
+        row = yield Fetch(
+            "SELECT RUNNING_SUMMARY, TITLE, TITLE_LOCKED FROM TOMEHUB_CHAT_SESSIONS WHERE ID = :p_sid",
+            {"p_sid": session_id},
+            one=True,
+        )
+    if row:
+        result["summary"] = safe_read_clob(row[0]) or ""
+        result["title"] = (row[1] or "").strip()
+        result["title_locked"] = bool(row[2])
+        if len(row) > 3:
+            result["conversation_state_json"] = safe_read_clob(row[3]) or ""
+    result["messages"] = yield from _history_plan(session_id, limit)
+    return result
+
+def _build_maintenance_prompt(current_state: Dict, history_str: str, turn_count: int, want_title: bool) -> str:
+    prev_state_str = json.dumps(current_state, ensure_ascii=False, indent=2) if current_state.get('active_topic') else "İlk durum (henüz analiz yapılmadı)"
+    title_rule = (
+        f'"title": 3-6 kelimelik, en fazla {settings.CHAT_TITLE_MAX_LENGTH} karakterlik kısa başlık (tırnak/nokta yok)'
+        if want_title
+        else '"title": null'
+    )
+    return f"""
+Aşağıdaki konuşma geçmişini analiz et ve TEK bir JSON nesnesi döndür.
+SADECE JSON formatında yanıt ver, başka hiçbir şey yazma.
+
+ÖNCEKİ DURUM:
+{prev_state_str}
+
+YENİ MESAJLAR:
+{history_str}
+
+JSON FORMATI (Türkçe içerik):
+{{
+    "state": {{
+        "active_topic": "Şu an tartışılan ana konu (tek cümle)",
+        "assumptions": [
+            {{"id": 1, "text": "Varsayım metni", "confidence": "HIGH/MEDIUM/LOW", "introduced_at_turn": 1}}
+        ],
+        "open_questions": ["Henüz cevaplanmamış soru"],
+        "established_facts": [
+            {{"text": "Notlardan doğrulanmış bilgi", "source": "Kaynak adı veya ID"}}
+        ],
+        "turn_count": {turn_count}
+    }},
+    "title": "...",
+    "tags": ["Etiket1", "Etiket2"]
+}}
+
+KURALLAR:
+1. state.assumptions: Kullanıcının veya sistemin yaptığı yorumlar/çıkarımlar. Bunlar GERÇEK DEĞİL.
+2. state.established_facts: SADECE notlardan/kaynaklardan doğrulanmış bilgiler.
+3. state.open_questions: Hala cevapsız kalan veya belirsiz konular.
+4. Önceki durumu GÜNCELLE, silme. Geçerliliğini yitiren varsayımları kaldırabilirsin.
+5. {title_rule}
+6. "tags": 3-5 kısa Türkçe etiket; kişisel veri veya özel isim kullanma.
+
+JSON ÇIKTISI:"""
+
+def _write_session_maintenance(
+    session_id: int,
+    *,
+    state_json: Optional[str],
+    title: Optional[str],
+    lock_title: bool,
+    tags: List[str],
+    raw_summary: Optional[str] = None,
+) -> None:
+    """
+    Persist state, title and tags with one UPDATE. `raw_summary` (an unparseable
+    model response) is kept as the legacy text summary when there is no state.
+    """
+    sets = ["UPDATED_AT = CURRENT_TIMESTAMP"]
+    params: Dict = {"p_sid": session_id}
+    write_state_column = bool(state_json) and _conversation_state_column_available()
+    summary = state_json or raw_summary
+    if summary:
+        sets.append("RUNNING_SUMMARY = :p_summary")
+        params["p_summary"] = summary
+    if write_state_column:
+        sets.append("CONVERSATION_STATE_JSON = :p_state")
+        params["p_state"] = state_json
+    if title:
+        sets.append("TITLE = :p_title")
+        params["p_title"] = title
+    if title or lock_title:
+        sets.append("TITLE_LOCKED = 1")
+    if tags:
+        sets.append("TAGS = :p_tags")
+        params["p_tags"] = json.dumps(tags, ensure_ascii=False)
+    if len(sets) == 1:
+        return
+    try:
+        with DatabaseManager.get_write_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"UPDATE TOMEHUB_CHAT_SESSIONS SET {', '.join(sets)} WHERE ID = :p_sid",
+                    params,
+                )
+                conn.commit()
+    except Exception as e:
+        schema_registry.note_error(e)
+        raise
+    if summary:
+        update_hot_context(
+            session_id,
+            summary=summary,
+            conversation_state_json=state_json if write_state_column else None,
+        )
+
+def run_session_maintenance(session_id: int):
+    """
+    Post-turn bookkeeping in one pass: read the session row and history with one
+    query plan, ask the model for conversation state, title and tags in a single
+    JSON response, and write all three with one UPDATE.
+    """
+    try:
+        if write_behind_enabled():
+            chat_write_behind.flush()
+        session = run_plan(_maintenance_plan(session_id, settings.CHAT_SUMMARY_LIMIT))
+        messages = session["messages"]
+        if len(messages) < 2:  # Too few to analyze
+            return
+
+        current_title, title_locked = session["title"], session["title_locked"]
+        lock_title = False
+        want_title = False
+        if not title_locked:
+            if current_title and current_title.lower() != "new chat":
+                lock_title = True
+            elif len(messages) >= settings.CHAT_TITLE_MIN_MESSAGES:
+                want_title = True
+
+        try:
+            current_state = _conversation_state_from(session)
+        except Exception:
+            current_state = _default_conversation_state()
+        turn_count = current_state.get('turn_count', 0) + len(messages) // 2
+        history_str = ""
+        for msg in messages:
+            content = msg['content'][:300] if len(msg['content']) > 300 else msg['content']
+            history_str += f"{msg['role'].upper()}: {content}\n---\n"
+
+        payload: Dict = {}
+        raw_summary = None
+        try:
+            model = get_model_for_tier(MODEL_TIER_FLASH)
+            result = generate_text(
+                model=model,
+                prompt=_build_maintenance_prompt(current_state, history_str, turn_count, want_title),
+                task="chat_session_maintenance",
+                model_tier=MODEL_TIER_FLASH,
+                timeout_s=30.0,
+                response_mime_type="application/json",
+            )
+            response_text = _strip_code_fence(result.text if result else "")
+            try:
+                parsed = json.loads(response_text)
+            except json.JSONDecodeError as je:
+                logger.warning(f"Failed to parse maintenance JSON: {je}. Raw: {response_text[:200]}")
+                # Fallback: store raw response as legacy summary
+                raw_summary = response_text or None
+                parsed = None
+            if isinstance(parsed, dict):
+                payload = parsed
+        except Exception as e:
+            logger.warning(f"Session maintenance LLM call failed for {session_id}: {e}")
+
+        state = payload.get("state")
+        if isinstance(state, dict) and state:
+            state.setdefault("turn_count", turn_count)
+            state_json = json.dumps(state, ensure_ascii=False)
+        else:
+            state = {}
+            state_json = None
+
+        title = None
+        if want_title:
+            title = str(payload.get("title") or "").strip().strip('"').strip()
+            if not title:
+                title = _fallback_title_from_history(messages) or f"Chat {datetime.utcnow().strftime('%Y-%m-%d')}"
+            title = title[:settings.CHAT_TITLE_MAX_LENGTH].strip()
+
+        _write_session_maintenance(
+            session_id,
+            state_json=state_json,
+            title=title,
+            lock_title=lock_title,
+            tags=_normalize_tags(payload.get("tags")),
+            raw_summary=raw_summary,
+        )
+        logger.info(f"Session {session_id} maintenance done: {state.get('active_topic', 'N/A')}")
+    except Exception as e:
+        logger.error(f"Session maintenance failed for {session_id}: {e}")
+
+
+class _SessionMaintenanceDebouncer:
+    """
+    Coalesces maintenance requests per session: the first request schedules a run
+    CHAT_MAINTENANCE_DEBOUNCE_SEC later and requests arriving before it starts
+    are absorbed; a request made while the run is in flight queues one more run.
+    """
+
+    def __init__(self, job):
+        self._job = job
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._due: Dict[int, float] = {}
+        self._running: set = set()
+        self._rerun: set = set()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stopping = False
+
+    def schedule(self, session_id: int) -> None:
+        delay = float(getattr(settings, "CHAT_MAINTENANCE_DEBOUNCE_SEC", 0) or 0)
+        if delay <= 0 or self._stopping:
+            self._job(session_id)
+            return
+        with self._lock:
+            if session_id in self._running:
+                self._rerun.add(session_id)
+                return
+            self._due.setdefault(session_id, time.monotonic() + delay)
+            if self._thread is None or not self._thread.is_alive():
+                self._executor = self._executor or ThreadPoolExecutor(
+                    max_workers=int(getattr(settings, "CHAT_MAINTENANCE_WORKERS", 2)),
+                    thread_name_prefix="chat-maintenance",
+                )
+                self._thread = threading.Thread(target=self._loop, name="chat-maintenance-debounce", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def pending(self) -> Dict[int, float]:
+        with self._lock:
+            return dict(self._due)
+
+    def drain(self, timeout: float = 60.0) -> int:
+        """
+        Run every pending session now instead of after its window (app shutdown).
+        In-flight runs finish first; later schedule() calls run inline. Returns
+        the number of runs started here.
+        """
+        with self._lock:
+            self._stopping = True
+            executor, self._executor = self._executor, None
+        self._wake.set()
+        if executor is not None:
+            executor.shutdown(wait=True)
+        deadline = time.monotonic() + timeout
+        ran = 0
+        while time.monotonic() < deadline:
+            with self._lock:
+                if not self._due:
+                    break
+                session_id = min(self._due, key=self._due.get)
+                del self._due[session_id]
+            self._job(session_id)
+            ran += 1
+        remaining = self.pending()
+        if remaining:
+            logger.error(f"Session maintenance drain stopped with {len(remaining)} pending session(s)")
+        return ran
+
+    def _loop(self) -> None:
+        while True:
+            now = time.monotonic()
+            with self._lock:
+                if self._stopping:
+                    return
+                ready = [sid for sid, due in self._due.items() if due <= now]
+                for sid in ready:
+                    del self._due[sid]
+                    self._running.add(sid)
+                next_due = min(self._due.values(), default=now + 60.0)
+                executor = self._executor
+            for sid in ready:
+                try:
+                    executor.submit(self._execute, sid)
+                except RuntimeError:
+                    # Executor shut down by drain(); hand the session back to it.
+                    with self._lock:
+                        self._running.discard(sid)
+                        self._due[sid] = now
+            self._wake.wait(timeout=max(0.05, next_due - now))
+            self._wake.clear()
+
+    def _execute(self, session_id: int) -> None:
+        try:
+            self._job(session_id)
+        finally:
+            delay = float(getattr(settings, "CHAT_MAINTENANCE_DEBOUNCE_SEC", 0) or 0)
+            with self._lock:
+                self._running.discard(session_id)
+                if session_id in self._rerun:
+                    self._rerun.discard(session_id)
+                    self._due[session_id] = time.monotonic() + delay
+            self._wake.set()
+
+
+_maintenance_debouncer = _SessionMaintenanceDebouncer(lambda session_id: run_session_maintenance(session_id))
+
+def drain_session_maintenance(timeout: float = 60.0) -> int:
+    """Run debounced maintenance still waiting out its window; called on app shutdown."""
+    return _maintenance_debouncer.drain(timeout=timeout)
+
 # Keep old function for backward compatibility
 def summarize_session_history(session_id: int):
     """
-    Legacy function - now delegates to structured state extraction.
-    Kept for backward compatibility with existing callers.
+    Post-turn hook used by the chat routes. Schedules the debounced single-call
+    maintenance job (state + title + tags) for the session.
     """
-    extract_structured_state(session_id)
-    generate_and_update_session_title(session_id)
-    generate_and_update_session_tags(session_id)
-
+    _maintenance_debouncer.schedule(session_id)
@@ -0,0 +1,419 @@
+"""
+Hot chat-session context and write-behind message persistence.
+
+A chat turn used to read TOMEHUB_CHAT_SESSIONS twice plus a sorted CLOB history
+query, then INSERT + UPDATE + commit once for the user message and again for
+the answer. Here the per-session context (running summary, conversation state,
+last messages) lives in Redis - or, with CHAT_HOT_CONTEXT_LOCAL_FALLBACK, in
+this process - and is updated in place on every turn:
+
+- `get_hot_context` / `put_hot_context` / `update_hot_context` hold the context
+  under `chat_ctx:{session_id}` for CHAT_HOT_CONTEXT_TTL_SEC (refreshed on write).
+  `update_hot_context` is an atomic read-modify-write (WATCH/MULTI in Redis, the
+  store lock in-process), so a message appended by the request path and a
+  summary written by the maintenance job never overwrite each other.
+- `chat_write_behind` queues message rows and flushes them with one executemany
+  INSERT plus one UPDATED_AT touch per session, every CHAT_WRITE_BEHIND_FLUSH_MS
+  or once CHAT_WRITE_BEHIND_BATCH_SIZE rows are waiting. A failed batch is
+  retried row by row; rows that keep failing go back to the head of the queue
+  with backoff until CHAT_WRITE_BEHIND_MAX_ATTEMPTS, then are dropped and logged.
+  The app lifespan calls `stop()` so the queue is drained before the pool closes.
+
+The in-process fallback is only coherent with a single worker process; with
+several workers leave it off and run Redis.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+from cachetools import TTLCache
+
+from config import settings
+from infrastructure.cursor_profiles import QUERY_CLASS_BULK_INSERT, profiled_cursor
+from infrastructure.db_manager import DatabaseManager
+from services.cache_service import get_cache
+from services.monitoring import (
+    CHAT_HOT_CONTEXT_REQUESTS_TOTAL,
+    CHAT_WRITE_BEHIND_QUEUE_DEPTH,
+    CHAT_WRITE_BEHIND_ROWS_TOTAL,
+)
+from utils.logger import get_logger
+
+try:
+    from redis.exceptions import WatchError
+except ImportError:  # redis is optional; without it there is no Redis client to raise this
+    class WatchError(Exception):
+        pass
+
+logger = get_logger("chat_session_cache_service")
+
+_KEY_PREFIX = "chat_ctx:"
+_LOCAL_MAX_SESSIONS = 5000
+_RETRY_BASE_SEC = 1.0
+_RETRY_MAX_SEC = 30.0
+_UPDATE_MAX_ATTEMPTS = 5
+
+_INSERT_SQL = """
+    INSERT INTO TOMEHUB_CHAT_MESSAGES (SESSION_ID, ROLE, CONTENT, CITATIONS, CREATED_AT)
+    VALUES (:p_sid, :p_role, :p_content, :p_citations,
+            CURRENT_TIMESTAMP + NUMTODSINTERVAL(:p_seq / 1000000, 'SECOND'))
+"""
+_TOUCH_SQL = "UPDATE TOMEHUB_CHAT_SESSIONS SET UPDATED_AT = CURRENT_TIMESTAMP WHERE ID = :p_sid"
+
+
+def hot_context_enabled() -> bool:
+    return bool(getattr(settings, "CHAT_HOT_CONTEXT_ENABLED", True))
+
+
+def write_behind_enabled() -> bool:
+    return bool(getattr(settings, "CHAT_WRITE_BEHIND_ENABLED", False))
+
+
+def hot_message_window() -> int:
+    """Messages kept per session: enough for both the prompt and summary extraction."""
+    return max(int(settings.CHAT_CONTEXT_LIMIT), int(settings.CHAT_SUMMARY_LIMIT))
+
+
+def _ttl_sec() -> int:
+    return int(getattr(settings, "CHAT_HOT_CONTEXT_TTL_SEC", 1800))
+
+
+def empty_context() -> Dict[str, Any]:
+    return {"summary": "", "conversation_state_json": "", "messages": [], "complete": True}
+
+
+# ---------------------------------------------------------------------------
+# Hot context store
+# ---------------------------------------------------------------------------
+
+_local_lock = threading.Lock()
+_local_store: TTLCache = TTLCache(
+    maxsize=_LOCAL_MAX_SESSIONS, ttl=int(getattr(settings, "CHAT_HOT_CONTEXT_TTL_SEC", 1800))
+)
+
+
+def _redis():
+    cache = get_cache()
+    l2 = getattr(cache, "l2", None) if cache is not None else None
+    if l2 is not None and l2.is_available():
+        return l2.redis
+    return None
+
+
+def _local_fallback() -> bool:
+    return bool(getattr(settings, "CHAT_HOT_CONTEXT_LOCAL_FALLBACK", False))
+
+
+def _key(session_id: int) -> str:
+    return f"{_KEY_PREFIX}{int(session_id)}"
+
+
+def get_hot_context(session_id: int) -> Optional[Dict[str, Any]]:
+    if not hot_context_enabled() or not session_id:
+        return None
+    ctx = None
+    client = _redis()
+    if client is not None:
+        try:
+            raw = client.get(_key(session_id))
+            ctx = json.loads(raw) if raw else None
+        except Exception as e:
+            logger.warning(f"Hot chat context read failed for session {session_id}: {e}")
+    elif _local_fallback():
+        with _local_lock:
+            ctx = _local_store.get(_key(session_id))
+            ctx = json.loads(ctx) if ctx else None
+    CHAT_HOT_CONTEXT_REQUESTS_TOTAL.labels(outcome="hit" if ctx else "miss").inc()
+    return ctx
+
+
+def _serialize_context(ctx: Dict[str, Any]) -> str:
+    window = hot_message_window()
+    messages = list(ctx.get("messages") or [])
+    return json.dumps(
+        {
+            "summary": ctx.get("summary") or "",
+            "conversation_state_json": ctx.get("conversation_state_json") or "",
+            "messages": messages[-window:],
+            "complete": bool(ctx.get("complete")) and len(messages) <= window,
+        },
+        ensure_ascii=False,
+    )
+
+
+def put_hot_context(session_id: int, ctx: Dict[str, Any]) -> None:
+    if not hot_context_enabled() or not session_id:
+        return
+    payload = _serialize_context(ctx)
+    client = _redis()
+    if client is not None:
+        try:
+            client.setex(_key(session_id), _ttl_sec(), payload)
+        except Exception as e:
+            logger.warning(f"Hot chat context write failed for session {session_id}: {e}")
+            drop_hot_context(session_id)
+    elif _local_fallback():
+        with _local_lock:
+            _local_store[_key(session_id)] = payload
+
+
+def _apply_patch(
+    ctx: Dict[str, Any],
+    summary: Optional[str],
+    conversation_state_json: Optional[str],
+    message: Optional[Dict[str, Any]],
+) -> None:
+    if summary is not None:
+        ctx["summary"] = summary
+    if conversation_state_json is not None:
+        ctx["conversation_state_json"] = conversation_state_json
+    if message is not None:
+        ctx.setdefault("messages", []).append(message)
+
+
+def _update_redis(client, session_id: int, patch_args: tuple) -> bool:
+    key = _key(session_id)
+    for _ in range(_UPDATE_MAX_ATTEMPTS):
+        try:
+            with client.pipeline() as pipe:
+                pipe.watch(key)
+                raw = pipe.get(key)
+                if not raw:
+                    pipe.unwatch()
+                    CHAT_HOT_CONTEXT_REQUESTS_TOTAL.labels(outcome="miss").inc()
+                    return False
+                ctx = json.loads(raw)
+                _apply_patch(ctx, *patch_args)
+                pipe.multi()
+                pipe.setex(key, _ttl_sec(), _serialize_context(ctx))
+                pipe.execute()
+                CHAT_HOT_CONTEXT_REQUESTS_TOTAL.labels(outcome="hit").inc()
+                return True
+        except WatchError:
+            continue
+        except Exception as e:
+            logger.warning(f"Hot chat context update failed for session {session_id}: {e}")
+            break
+    # Contended or failed: drop the entry so the next read rebuilds it from Oracle.
+    drop_hot_context(session_id)
+    return False
+
+
+def update_hot_context(
+    session_id: int,
+    *,
+    summary: Optional[str] = None,
+    conversation_state_json: Optional[str] = None,
+    message: Optional[Dict[str, Any]] = None,
+) -> bool:
+    """Patch a cached context atomically. Returns False (and changes nothing) when none is cached."""
+    if not hot_context_enabled() or not session_id:
+        return False
+    patch_args = (summary, conversation_state_json, message)
+    client = _redis()
+    if client is not None:
+        return _update_redis(client, session_id, patch_args)
+    if not _local_fallback():
+        return False
+    with _local_lock:
+        raw = _local_store.get(_key(session_id))
+        if not raw:
+            CHAT_HOT_CONTEXT_REQUESTS_TOTAL.labels(outcome="miss").inc()
+            return False
+        ctx = json.loads(raw)
+        _apply_patch(ctx, *patch_args)
+        _local_store[_key(session_id)] = _serialize_context(ctx)
+    CHAT_HOT_CONTEXT_REQUESTS_TOTAL.labels(outcome="hit").inc()
+    return True
+
+
+def drop_hot_context(session_id: int) -> None:
+    client = _redis()
+    if client is not None:
+        try:
+            client.delete(_key(session_id))
+        except Exception as e:
+            logger.warning(f"Hot chat context delete failed for session {session_id}: {e}")
+    with _local_lock:
+        _local_store.pop(_key(session_id), None)
+
+
+# ---------------------------------------------------------------------------
+# Write-behind message batcher
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _PendingRow:
+    session_id: int
+    role: str
+    content: str
+    citations_json: str
+    attempts: int = 0
+    not_before: float = 0.0
+
+
+class ChatWriteBehind:
+    def __init__(self):
+        self._queue: Deque[_PendingRow] = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def enqueue(self, session_id: int, role: str, content: str, citations_json: str) -> None:
+        with self._cond:
+            self._queue.append(_PendingRow(int(session_id), role, content, citations_json))
+            CHAT_WRITE_BEHIND_QUEUE_DEPTH.set(len(self._queue))
+            if len(self._queue) >= self._batch_size():
+                self._cond.notify()
+        self._ensure_worker()
+
+    def flush(self, *, ignore_backoff: bool = True) -> int:
+        """Write everything queued now. Returns the number of rows persisted."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._take_batch(ignore_backoff=ignore_backoff)
+                if not batch:
+                    break
+                ok = self._write(batch)
+                written += ok
+                if ok < len(batch):
+                    # Failed rows were re-queued with backoff; don't spin on them here.
+                    break
+        return written
+
+    def stop(self, timeout: float = 10.0) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=timeout)
+        # Final drain on the caller's thread, retrying until rows succeed or exhaust their attempts.
+        deadline = time.monotonic() + timeout
+        while self.pending_count() and time.monotonic() < deadline:
+            self.flush()
+        remaining = self.pending_count()
+        if remaining:
+            logger.error(f"Chat write-behind stopped with {remaining} unsaved message(s)")
+        self._thread = None
+        self._stopping = False
+
+    # -- internals ---------------------------------------------------------
+
+    @staticmethod
+    def _batch_size() -> int:
+        return int(getattr(settings, "CHAT_WRITE_BEHIND_BATCH_SIZE", 50))
+
+    @staticmethod
+    def _flush_interval_sec() -> float:
+        return int(getattr(settings, "CHAT_WRITE_BEHIND_FLUSH_MS", 250)) / 1000.0
+
+    @staticmethod
+    def _max_attempts() -> int:
+        return int(getattr(settings, "CHAT_WRITE_BEHIND_MAX_ATTEMPTS", 5))
+
+    def _ensure_worker(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._cond:
+            if self._stopping or (self._thread is not None and self._thread.is_alive()):
+                return
+            self._thread = threading.Thread(target=self._run, name="chat-write-behind", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._stopping and len(self._queue) < self._batch_size():
+                    self._cond.wait(timeout=self._flush_interval_sec())
+                if self._stopping:
+                    return
+            try:
+                self.flush(ignore_backoff=False)
+            except Exception as e:
+                logger.error(f"Chat write-behind flush failed: {e}")
+
+    def _take_batch(self, *, ignore_backoff: bool) -> List[_PendingRow]:
+        now = time.monotonic()
+        batch: List[_PendingRow] = []
+        with self._cond:
+            # FIFO: a row waiting on backoff holds back the rows behind it so order is kept.
+            while self._queue and len(batch) < self._batch_size():
+                if not ignore_backoff and self._queue[0].not_before > now:
+                    break
+                batch.append(self._queue.popleft())
+            CHAT_WRITE_BEHIND_QUEUE_DEPTH.set(len(self._queue))
+        return batch
+
+    def _write(self, batch: List[_PendingRow]) -> int:
+        try:
+            _write_rows(batch)
+            CHAT_WRITE_BEHIND_ROWS_TOTAL.labels(outcome="written").inc(len(batch))
+            return len(batch)
+        except Exception as e:
+            logger.warning(f"Chat write-behind batch of {len(batch)} failed, retrying row by row: {e}")
+
+        written = 0
+        requeue: List[_PendingRow] = []
+        for pos, row in enumerate(batch):
+            try:
+                _write_rows([row])
+                written += 1
+            except Exception as e:
+                row.attempts += 1
+                if row.attempts >= self._max_attempts():
+                    CHAT_WRITE_BEHIND_ROWS_TOTAL.labels(outcome="dropped").inc()
+                    logger.error(
+                        f"Dropping chat message for session {row.session_id} after {row.attempts} attempts: {e}"
+                    )
+                    continue
+                row.not_before = time.monotonic() + min(_RETRY_MAX_SEC, _RETRY_BASE_SEC * (2 ** (row.attempts - 1)))
+                # Stop here: rows behind a failed one wait with it, so a later turn
+                # is never committed before an earlier one.
+                requeue = batch[pos:]
+                break
+        if written:
+            CHAT_WRITE_BEHIND_ROWS_TOTAL.labels(outcome="written").inc(written)
+        if requeue:
+            CHAT_WRITE_BEHIND_ROWS_TOTAL.labels(outcome="retried").inc()
+            with self._cond:
+                self._queue.extendleft(reversed(requeue))
+                CHAT_WRITE_BEHIND_QUEUE_DEPTH.set(len(self._queue))
+        return written
+
+
+def _write_rows(rows: List[_PendingRow]) -> None:
+    # p_seq spaces rows of one batch a microsecond apart so history keeps turn order.
+    params = [
+        {
+            "p_sid": row.session_id,
+            "p_role": row.role,
+            "p_content": row.content,
+            "p_citations": row.citations_json,
+            "p_seq": seq,
+        }
+        for seq, row in enumerate(rows)
+    ]
+    session_ids = sorted({row.session_id for row in rows})
+    with DatabaseManager.get_write_connection() as conn:
+        with profiled_cursor(conn, QUERY_CLASS_BULK_INSERT, long_binds=("p_content",)) as cursor:
+            try:
+                cursor.executemany(_INSERT_SQL, params)
+                cursor.executemany(_TOUCH_SQL, [{"p_sid": sid} for sid in session_ids])
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+
+chat_write_behind = ChatWriteBehind()
@@ -1,13 +1,43 @@
 from __future__ import annotations
 
-from difflib import SequenceMatcher
 import ftfy
 import logging
-from rapidfuzz import fuzz, process
 import re
+from typing import Optional, Tuple
+
+from rapidfuzz.distance import Indel
+
+from utils.symspell_index import SymSpellIndex
 
 logger = logging.getLogger(__name__)
 
+WORD_RE = re.compile(r"[0-9A-Za-z\u00c7\u011e\u0130\u00d6\u015e\u00dc\u00e7\u011f\u0131\u00f6\u015f\u00fc\u00e2\u00ee\u00fb]+")
+
+
+def turkish_lower(text: str) -> str:
+    return str(text or "").replace("\u0130", "i").replace("I", "\u0131").lower()
+
+
+def _match_case(source: str, target: str) -> str:
+    if len(source) > 1 and source.isupper():
+        return target.replace("i", "\u0130").replace("\u0131", "I").upper()
+    if source[:1].isupper():
+        head = target[:1].replace("i", "\u0130").replace("\u0131", "I").upper()
+        return head + target[1:]
+    return target
+
+
+def delta_ratio(original: str, candidate: str, score_cutoff: Optional[float] = None) -> float:
+    """
+    1 - similarity, where similarity = 2 * LCS / total chars (the form of
+    SequenceMatcher.ratio()).
+
+    Uses rapidfuzz's bit-parallel Indel distance, so long pages stay cheap
+    while reordered or rewritten text still scores as a large change. Above
+    `score_cutoff` the result is reported as 1.0.
+    """
+    return Indel.normalized_distance(str(original or ""), str(candidate or ""), score_cutoff=score_cutoff)
+
 
 class LinguisticCorrectionService:
     RULE_VERSION = "tr_ocr_v2_safe"
@@ -29,8 +59,14 @@ class LinguisticCorrectionService:
         (r"([a-z])1\b", "\\1\u0131"),
     ]
 
-    def __init__(self):
+    # Word-level repair only touches tokens this long; short words are too
+    # ambiguous at edit distance 1.
+    MIN_REPAIR_WORD_LEN = 4
+
+    def __init__(self, dictionary: Optional[SymSpellIndex] = None):
+        """`dictionary` enables word-level repair against a corpus dictionary (see ocr_dictionary_service)."""
         self.valid_words = set()
+        self.dictionary = dictionary
         self._load_bootstrap_dictionary()
 
     def _load_bootstrap_dictionary(self) -> None:
@@ -54,6 +90,9 @@ class LinguisticCorrectionService:
         için
         """
         self.valid_words = {w.strip() for w in bootstrap_words.strip().split() if w.strip()}
+        self._bootstrap_index = SymSpellIndex(max_edit_distance=2)
+        for word in self.valid_words:
+            self._bootstrap_index.add(word)
 
     def fix_text(self, text: str) -> str:
         if not text:
@@ -66,18 +105,37 @@ class LinguisticCorrectionService:
         for pattern, replacement in self.REGEX_RULES:
             candidate = re.sub(pattern, replacement, candidate, flags=re.IGNORECASE)
 
-        if self._delta_ratio(original, candidate) > self.MAX_DELTA_RATIO:
+        if self.dictionary is not None and len(self.dictionary):
+            candidate = WORD_RE.sub(self._repair_word, candidate)
+
+        if self._delta_ratio(original, candidate, self.MAX_DELTA_RATIO) > self.MAX_DELTA_RATIO:
             logger.debug("Linguistic correction skipped due to high delta ratio")
             return ftfy.fix_text(original)
 
         return candidate
 
-    def verify_word(self, word: str):
-        return process.extractOne(word, self.valid_words, scorer=fuzz.ratio)
+    def _repair_word(self, match: "re.Match[str]") -> str:
+        token = match.group(0)
+        if len(token) < self.MIN_REPAIR_WORD_LEN or token.isdigit():
+            return token
+        lowered = turkish_lower(token)
+        if lowered in self.dictionary:
+            return token
+        # Allow the full edit budget only on longer words.
+        max_distance = 1 if len(lowered) <= 5 else None
+        suggestion = self.dictionary.lookup(lowered, max_distance=max_distance)
+        if suggestion is None:
+            return token
+        return _match_case(token, suggestion.term)
+
+    def verify_word(self, word: str) -> Optional[Tuple[str, int, int]]:
+        """Closest known word as (word, count, edit distance), or None if nothing is within range."""
+        index = self.dictionary if self.dictionary is not None and len(self.dictionary) else self._bootstrap_index
+        suggestion = index.lookup(turkish_lower(word))
+        if suggestion is None:
+            return None
+        return suggestion.term, suggestion.count, suggestion.distance
 
     @staticmethod
-    def _delta_ratio(original: str, candidate: str) -> float:
-        if original == candidate:
-            return 0.0
-        similarity = SequenceMatcher(None, str(original or ""), str(candidate or "")).ratio()
-        return max(0.0, 1.0 - similarity)
+    def _delta_ratio(original: str, candidate: str, score_cutoff: Optional[float] = None) -> float:
+        return delta_ratio(original, candidate, score_cutoff)
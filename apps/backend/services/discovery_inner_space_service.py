@@ -7,6 +7,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
 from infrastructure.db_manager import DatabaseManager, safe_read_clob
+from infrastructure.schema_registry import schema_registry
 from models.discovery_models import (
     DiscoveryInnerSpaceCard,
     DiscoveryInnerSpaceMetadata,
@@ -439,21 +440,8 @@ def _build_theme_pulse_card(
     )
 
 
-def _table_columns(table_name: str) -> set[str]:
-    try:
-        with DatabaseManager.get_read_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    SELECT COLUMN_NAME
-                    FROM USER_TAB_COLUMNS
-                    WHERE TABLE_NAME = :p_table
-                    """,
-                    {"p_table": table_name.upper()},
-                )
-                return {str(row[0] or "").upper() for row in cur.fetchall() or []}
-    except Exception:
-        return set()
+def _table_columns(table_name: str) -> frozenset[str]:
+    return schema_registry.columns(table_name)
 
 
 def _parse_tags(value: Any) -> List[str]:
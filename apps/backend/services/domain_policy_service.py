@@ -4,6 +4,7 @@ import re
 from typing import Any, Dict, Iterable, List, Optional
 
 from services.islamic_api_service import is_religious_query
+from utils.pattern_matcher import PhraseSet
 
 DOMAIN_MODE_AUTO = "AUTO"
 DOMAIN_MODE_ACADEMIC = "ACADEMIC"
@@ -139,6 +140,17 @@ _LITERARY_WORK_CONTEXT_TERMS = {
     "hamlet",
 }
 
+# Term families compiled once (see utils.pattern_matcher).
+_ACADEMIC_PHRASES = PhraseSet(_ACADEMIC_TERMS)
+_LITERARY_PHRASES = PhraseSet(_LITERARY_TERMS)
+_CULTURE_HISTORY_PHRASES = PhraseSet(_CULTURE_HISTORY_TERMS)
+_LITERARY_CLOSE_READING_PHRASES = PhraseSet(_LITERARY_CLOSE_READING_TERMS)
+_LITERARY_AUTHOR_CONTEXT_PHRASES = PhraseSet(_LITERARY_AUTHOR_CONTEXT_TERMS)
+_LITERARY_WORK_CONTEXT_PHRASES = PhraseSet(_LITERARY_WORK_CONTEXT_TERMS)
+_ACADEMIC_MARKER_RE = re.compile(r"\b(doi|isbn|abstract|paper|journal)\b")
+_LITERARY_MARKER_RE = re.compile(r"\b(siir|poem|stanza|narrator|metaphor|metafor)\b")
+_CULTURE_HISTORY_MARKER_RE = re.compile(r"\b(history|historical|archive|museum|empire|medeniyet|tarih)\b")
+
 _INTERNAL_SOURCE_TYPES = {
     "HIGHLIGHT",
     "PERSONAL_NOTE",
@@ -373,9 +385,9 @@ def infer_literary_query_type(question: str) -> str:
     normalized = _normalize_ascii(query)
     if not query:
         return "GENERAL_LITERARY"
-    close_hits = _token_hits(normalized, _LITERARY_CLOSE_READING_TERMS)
-    author_hits = _token_hits(normalized, _LITERARY_AUTHOR_CONTEXT_TERMS)
-    work_hits = _token_hits(normalized, _LITERARY_WORK_CONTEXT_TERMS)
+    close_hits = _LITERARY_CLOSE_READING_PHRASES.count(normalized)
+    author_hits = _LITERARY_AUTHOR_CONTEXT_PHRASES.count(normalized)
+    work_hits = _LITERARY_WORK_CONTEXT_PHRASES.count(normalized)
 
     if close_hits >= max(author_hits, work_hits, 1):
         return "CLOSE_READING"
@@ -712,16 +724,9 @@ def _normalize_ascii(text: str) -> str:
     )
 
 
-def _token_hits(text: str, phrases: Iterable[str]) -> int:
-    normalized = _normalize_ascii(text)
-    hits = 0
-    for phrase in phrases:
-        pattern = str(phrase or "").strip().lower()
-        if not pattern:
-            continue
-        if pattern in normalized:
-            hits += 1
-    return hits
+def _token_hits(text: str, phrases: Iterable[str] | PhraseSet) -> int:
+    matcher = phrases if isinstance(phrases, PhraseSet) else PhraseSet(phrases)
+    return matcher.count(_normalize_ascii(text))
 
 
 def _infer_domain(question: str) -> Dict[str, Any]:
@@ -738,17 +743,18 @@ def _infer_domain(question: str) -> Dict[str, Any]:
             "secondary_confidence": 0.0,
         }
 
+    normalized = _normalize_ascii(text)
     scores = {
-        DOMAIN_MODE_ACADEMIC: _token_hits(text, _ACADEMIC_TERMS),
-        DOMAIN_MODE_LITERARY: _token_hits(text, _LITERARY_TERMS),
-        DOMAIN_MODE_CULTURE_HISTORY: _token_hits(text, _CULTURE_HISTORY_TERMS),
+        DOMAIN_MODE_ACADEMIC: _ACADEMIC_PHRASES.count(normalized),
+        DOMAIN_MODE_LITERARY: _LITERARY_PHRASES.count(normalized),
+        DOMAIN_MODE_CULTURE_HISTORY: _CULTURE_HISTORY_PHRASES.count(normalized),
     }
 
-    if re.search(r"\b(doi|isbn|abstract|paper|journal)\b", _normalize_ascii(text)):
+    if _ACADEMIC_MARKER_RE.search(normalized):
         scores[DOMAIN_MODE_ACADEMIC] += 2
-    if re.search(r"\b(siir|poem|stanza|narrator|metaphor|metafor)\b", _normalize_ascii(text)):
+    if _LITERARY_MARKER_RE.search(normalized):
         scores[DOMAIN_MODE_LITERARY] += 2
-    if re.search(r"\b(history|historical|archive|museum|empire|medeniyet|tarih)\b", _normalize_ascii(text)):
+    if _CULTURE_HISTORY_MARKER_RE.search(normalized):
         scores[DOMAIN_MODE_CULTURE_HISTORY] += 2
 
     ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
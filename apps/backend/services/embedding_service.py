@@ -8,8 +8,11 @@ Generates 768-dimensional vectors compatible with Oracle VECTOR(768, FLOAT32).
 """
 
 import array
+import hashlib
 import logging
-from typing import List, Optional
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
 
 from config import settings
 from services.circuit_breaker_service import (
@@ -35,6 +38,39 @@ RETRY_CONFIG = RetryConfig(
 )
 
 
+# Process-local memo of recent vectors keyed by (task_type, text hash), so a question
+# embedded during retrieval is not embedded again by the judge, and re-evaluated
+# answers are not re-embedded.
+_memo_lock = threading.Lock()
+_memo: "OrderedDict[Tuple[str, str], array.array]" = OrderedDict()
+
+
+def _memo_key(text: str, task_type: str) -> Tuple[str, str]:
+    return task_type, hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _memo_get(text: str, task_type: str) -> Optional[array.array]:
+    key = _memo_key(text, task_type)
+    with _memo_lock:
+        vector = _memo.get(key)
+        if vector is None:
+            return None
+        _memo.move_to_end(key)
+    return array.array("f", vector)
+
+
+def _memo_put(text: str, task_type: str, vector: Optional[array.array]) -> None:
+    max_entries = int(getattr(settings, "EMBEDDING_MEMO_SIZE", 2048) or 0)
+    if vector is None or max_entries <= 0:
+        return
+    key = _memo_key(text, task_type)
+    with _memo_lock:
+        _memo[key] = array.array("f", vector)
+        _memo.move_to_end(key)
+        while len(_memo) > max_entries:
+            _memo.popitem(last=False)
+
+
 def _call_embedding_api(text_or_list: str | List[str], task_type: str = "retrieval_document"):
     if not text_or_list:
         raise ValueError("Input must be a non-empty string or list")
@@ -63,6 +99,9 @@ def get_embedding(text: str) -> Optional[array.array]:
         logger.error("Invalid input: text must be a non-empty string")
         return None
 
+    cached = _memo_get(text, "retrieval_document")
+    if cached is not None:
+        return cached
     try:
         vector = CIRCUIT_BREAKER.call(
             retry_with_backoff,
@@ -72,7 +111,9 @@ def get_embedding(text: str) -> Optional[array.array]:
             task_type="retrieval_document",
         )
         if vector:
-            return array.array("f", vector)
+            result = array.array("f", vector)
+            _memo_put(text, "retrieval_document", result)
+            return result
         return None
     except CircuitBreakerOpenException as exc:
         logger.error("Embedding API circuit breaker OPEN: %s", exc)
@@ -90,6 +131,9 @@ def get_query_embedding(text: str) -> Optional[array.array]:
         logger.error("Invalid input: text must be a non-empty string")
         return None
 
+    cached = _memo_get(text, "retrieval_query")
+    if cached is not None:
+        return cached
     try:
         vector = CIRCUIT_BREAKER.call(
             retry_with_backoff,
@@ -99,7 +143,9 @@ def get_query_embedding(text: str) -> Optional[array.array]:
             task_type="retrieval_query",
         )
         if vector:
-            return array.array("f", vector)
+            result = array.array("f", vector)
+            _memo_put(text, "retrieval_query", result)
+            return result
         return None
     except CircuitBreakerOpenException as exc:
         logger.error("Query embedding circuit breaker OPEN: %s", exc)
@@ -150,6 +196,27 @@ def batch_get_embeddings(texts: List[str], task_type: str = "retrieval_document"
     return all_embeddings
 
 
+def get_embeddings_memoized(texts: List[str], task_type: str = "retrieval_document") -> List[Optional[array.array]]:
+    """
+    Embeddings for a few texts, answered from the memo where possible; all
+    misses go out in one batched request. Order follows `texts`.
+    """
+    results: List[Optional[array.array]] = []
+    misses: List[str] = []
+    for text in texts:
+        vector = _memo_get(text, task_type) if text and isinstance(text, str) else None
+        results.append(vector)
+        if vector is None and text and isinstance(text, str) and text not in misses:
+            misses.append(text)
+    if not misses:
+        return results
+
+    fetched = dict(zip(misses, batch_get_embeddings(misses, task_type=task_type)))
+    for text, vector in fetched.items():
+        _memo_put(text, task_type, vector)
+    return [vector if vector is not None else fetched.get(text) for text, vector in zip(texts, results)]
+
+
 def get_circuit_breaker_status() -> dict:
     """Get current circuit breaker status for monitoring."""
     return CIRCUIT_BREAKER.get_status()
@@ -12,10 +12,12 @@ fails to recognize that retrieved information constitutes a direct answer.
 """
 
 import re
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional
 from config import settings
 from services.domain_policy_service import DOMAIN_MODE_AUTO, DOMAIN_MODE_RELIGIOUS, domain_prompt_instructions, normalize_domain_mode
 from services.monitoring import L3_PERF_GUARD_APPLIED_TOTAL
+from utils.pattern_matcher import FeatureMatcher, PatternFamily
 
 # Import semantic classifier (use fast version by default for performance)
 try:
@@ -132,6 +134,27 @@ MODALITY_PATTERNS_TR = [
     r'(?:^|\s)(?:benim|ben)\s+', # direct self-reference
 ]
 
+# Compiled once; calculate_answerability_score runs for every candidate chunk.
+_EVALUATIVE_FAMILY = PatternFamily("EVALUATIVE", EVALUATIVE_PATTERNS_TR, re.IGNORECASE)
+_CHUNK_FEATURES = FeatureMatcher([
+    PatternFamily("THEORY", THEORY_PATTERNS_TR, re.IGNORECASE),
+    PatternFamily("MODALITY", MODALITY_PATTERNS_TR, re.IGNORECASE),
+    _EVALUATIVE_FAMILY,
+])
+_SENTENCE_SPLIT = re.compile(r'[.!?]\s+')
+
+
+@lru_cache(maxsize=1024)
+def _definitional_family(norm_keyword: str) -> PatternFamily:
+    """TR + EN definitional patterns specialised for one keyword, as one alternation."""
+    escaped = re.escape(norm_keyword)
+    return PatternFamily(
+        "DEFINITIONAL",
+        [p.replace(r'(\w+)', escaped) for p in DEFINITIONAL_PATTERNS_TR + DEFINITIONAL_PATTERNS_EN],
+        re.IGNORECASE,
+    )
+
+
 def extract_core_concepts(question: str) -> List[str]:
     """
     Extract the core concept(s) from a user question.
@@ -242,13 +265,13 @@ def calculate_answerability_score(chunk: Dict, keywords: List[str]) -> Dict:
     
     personal_comment = chunk.get('personal_comment', '') or ''
     full_text = f"{text} {personal_comment}"
+    # Normalise once; every feature below matches against the same text.
+    norm_full = normalize_for_matching(full_text)
+    norm_keywords = [normalize_for_matching(kw) for kw in keywords]
+    feature_hits = _CHUNK_FEATURES.hits(norm_full)
     
     # Feature 1: Exact/Morphological Keyword Match (+1)
-    has_keyword = False
-    for kw in keywords:
-        if contains_keyword(full_text, kw):
-            has_keyword = True
-            break
+    has_keyword = any(norm_kw in norm_full for norm_kw in norm_keywords)
             
     if has_keyword:
         score += 1
@@ -256,11 +279,10 @@ def calculate_answerability_score(chunk: Dict, keywords: List[str]) -> Dict:
         
         # Feature 2: Definitional Pattern (+3, increased from +2)
         # Only check definition IF keyword is present
-        is_def = False
-        for kw in keywords:
-            if is_definitional(full_text, kw):
-                is_def = True
-                break
+        is_def = any(
+            _is_definitional_normalized(full_text, norm_full, kw, norm_kw)
+            for kw, norm_kw in zip(keywords, norm_keywords)
+        )
         
         if is_def:
             score += 3  # Increased weight for definitional
@@ -268,22 +290,13 @@ def calculate_answerability_score(chunk: Dict, keywords: List[str]) -> Dict:
         
         # Feature 2b: Theory Pattern (+1) - new
         # Detects philosophical/theoretical structures
-        norm_full = normalize_for_matching(full_text)
-        has_theory = any(re.search(p, norm_full, re.IGNORECASE) for p in THEORY_PATTERNS_TR)
-        if has_theory:
+        if 'THEORY' in feature_hits:
             score += 1
             features.append('THEORY')
             
     # Feature 3: Modality / First-Person Voice (+1)
     # Check both text and personal comment
-    has_modality = False
-    norm_full = normalize_for_matching(full_text) if 'norm_full' not in dir() else norm_full
-    for pattern in MODALITY_PATTERNS_TR:
-        if re.search(pattern, norm_full, re.IGNORECASE):
-            has_modality = True
-            break
-            
-    if has_modality:
+    if 'MODALITY' in feature_hits:
         score += 1
         features.append('MODALITY')
         
@@ -294,8 +307,7 @@ def calculate_answerability_score(chunk: Dict, keywords: List[str]) -> Dict:
         features.append('PERSONAL_COMMENT')
     
     # Feature 5: Evaluative Phrases (+1) - new
-    has_evaluative = any(re.search(p, norm_full, re.IGNORECASE) for p in EVALUATIVE_PATTERNS_TR)
-    if has_evaluative:
+    if 'EVALUATIVE' in feature_hits:
         score += 1
         features.append('EVALUATIVE')
         
@@ -343,33 +355,28 @@ def is_definitional(text: str, keyword: str) -> bool:
     
     This indicates Level A - the highest epistemic priority.
     """
-    norm_text = normalize_for_matching(text)
-    norm_keyword = normalize_for_matching(keyword)
-    
-    # Check Turkish definitional patterns
-    for pattern in DEFINITIONAL_PATTERNS_TR:
-        # Replace placeholder with actual keyword
-        specific_pattern = pattern.replace(r'(\w+)', re.escape(norm_keyword))
-        if re.search(specific_pattern, norm_text, re.IGNORECASE):
-            return True
-    
-    # Check English definitional patterns
-    for pattern in DEFINITIONAL_PATTERNS_EN:
-        specific_pattern = pattern.replace(r'(\w+)', re.escape(norm_keyword))
-        if re.search(specific_pattern, norm_text, re.IGNORECASE):
-            return True
+    return _is_definitional_normalized(
+        text, normalize_for_matching(text), keyword, normalize_for_matching(keyword)
+    )
+
+
+def _is_definitional_normalized(text: str, norm_text: str, keyword: str, norm_keyword: str) -> bool:
+    # Turkish + English definitional patterns, specialised for the keyword
+    if _definitional_family(norm_keyword).search(norm_text):
+        return True
     
     # Check if keyword appears near evaluative words (within 50 chars)
     keyword_pos = norm_text.find(norm_keyword)
     if keyword_pos >= 0:
         context_window = norm_text[max(0, keyword_pos-50):keyword_pos+len(norm_keyword)+50]
-        for pattern in EVALUATIVE_PATTERNS_TR:
-            if re.search(pattern, context_window, re.IGNORECASE):
-                return True
+        if _EVALUATIVE_FAMILY.search(context_window):
+            return True
+    else:
+        # A sentence cannot start with a keyword the text does not contain.
+        return False
     
     # Check sentence structure: "Keyword, ..." at start of sentence
-    sentences = re.split(r'[.!?]\s+', text)
-    for sentence in sentences:
+    for sentence in _SENTENCE_SPLIT.split(text):
         norm_sentence = normalize_for_matching(sentence.strip())
         if norm_sentence.startswith(norm_keyword + ',') or norm_sentence.startswith(norm_keyword + ' '):
             # Sentence starts with keyword - likely definitional
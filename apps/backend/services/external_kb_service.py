@@ -3,17 +3,18 @@ import re
 import threading
 import time
 import xml.etree.ElementTree as ET
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from urllib import parse as urllib_parse
-from urllib import request as urllib_request
-from urllib.error import HTTPError
 
 import oracledb
 
 from config import settings
+from infrastructure import http_client
 from infrastructure.db_manager import DatabaseManager, safe_read_clob
 from services.book_metadata_resolver_service import resolve_book_metadata
+from services.monitoring import EXTERNAL_KB_PROVIDER_LATENCY_MS, EXTERNAL_KB_PROVIDER_SKIPS_TOTAL
 from utils.logger import get_logger
 
 logger = get_logger("external_kb_service")
@@ -23,6 +24,11 @@ _ACTIVE_KEYS: set[Tuple[str, str, str]] = set()
 _DOI_RE = re.compile(r"\b(10\.\d{4,}(?:\.\d+)*\/(?:(?![\"&'<>])\S)+)\b", re.IGNORECASE)
 
 _BACKFILL_LOCK = threading.Lock()
+
+# Domain provider fan-out. Abandoned calls keep their worker until their own
+# (budget-capped) HTTP timeout fires, so the pool is sized above one domain's fan-out.
+_DOMAIN_PROVIDER_EXECUTOR = ThreadPoolExecutor(max_workers=12, thread_name_prefix="external-kb-domain")
+_PROVIDER_DEADLINE = threading.local()
 _BACKFILL_STATUS: Dict[str, Any] = {
     "running": False,
     "started_at": None,
@@ -169,6 +175,17 @@ def _commons_file_url(filename: str) -> Optional[str]:
     return f"https://commons.wikimedia.org/wiki/Special:FilePath/{encoded}"
 
 
+def _bounded_timeout(timeout_sec: float) -> Optional[float]:
+    """Cap an HTTP timeout by the calling provider's remaining budget; None once it is spent."""
+    deadline = getattr(_PROVIDER_DEADLINE, "value", None)
+    if deadline is None:
+        return timeout_sec
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        return None
+    return min(float(timeout_sec), remaining)
+
+
 def _http_get_json(
     url: str,
     timeout_sec: float,
@@ -178,14 +195,23 @@ def _http_get_json(
     request_headers = {"User-Agent": "TomeHub-ExternalKB/1.0"}
     if headers:
         request_headers.update({str(k): str(v) for k, v in headers.items()})
-    req = urllib_request.Request(url=url, headers=request_headers, method="GET")
+    cache_ttl = float(getattr(settings, "EXTERNAL_KB_HTTP_CACHE_TTL_SEC", 600))
     for idx in range(retries + 1):
+        effective_timeout = _bounded_timeout(timeout_sec)
+        if effective_timeout is None:
+            return None
         try:
-            with urllib_request.urlopen(req, timeout=timeout_sec) as resp:
-                charset = resp.headers.get_content_charset() or "utf-8"
-                return json.loads(resp.read().decode(charset, errors="replace"))
-        except HTTPError as e:
-            code = int(getattr(e, "code", 0) or 0)
+            return http_client.request_json(
+                "GET",
+                url,
+                provider="external_kb",
+                timeout_sec=effective_timeout,
+                headers=request_headers,
+                cache_ttl_sec=cache_ttl,
+                negative_ttl_sec=cache_ttl,
+            )
+        except http_client.HttpStatusError as e:
+            code = e.code
             if idx < retries and (code == 429 or code >= 500):
                 time.sleep(0.2 * (idx + 1))
                 continue
@@ -600,21 +626,26 @@ def _http_post_json(
     headers: Optional[Dict[str, str]] = None,
 ) -> Optional[Dict[str, Any]]:
     retries = max(0, int(getattr(settings, "EXTERNAL_KB_HTTP_MAX_RETRY", 1)))
-    request_headers = {
-        "User-Agent": "TomeHub-ExternalKB/1.0",
-        "Content-Type": "application/json",
-    }
+    request_headers = {"User-Agent": "TomeHub-ExternalKB/1.0"}
     if headers:
         request_headers.update({str(k): str(v) for k, v in headers.items()})
-    body = json.dumps(payload).encode("utf-8")
-    req = urllib_request.Request(url=url, data=body, headers=request_headers, method="POST")
+    cache_ttl = float(getattr(settings, "EXTERNAL_KB_HTTP_CACHE_TTL_SEC", 600))
     for idx in range(retries + 1):
+        effective_timeout = _bounded_timeout(timeout_sec)
+        if effective_timeout is None:
+            return None
         try:
-            with urllib_request.urlopen(req, timeout=timeout_sec) as resp:
-                charset = resp.headers.get_content_charset() or "utf-8"
-                return json.loads(resp.read().decode(charset, errors="replace"))
-        except HTTPError as e:
-            code = int(getattr(e, "code", 0) or 0)
+            return http_client.request_json(
+                "POST",
+                url,
+                provider="external_kb",
+                timeout_sec=effective_timeout,
+                headers=request_headers,
+                json_body=payload,
+                cache_ttl_sec=cache_ttl,
+            )
+        except http_client.HttpStatusError as e:
+            code = e.code
             if idx < retries and (code == 429 or code >= 500):
                 time.sleep(0.2 * (idx + 1))
                 continue
@@ -710,20 +741,23 @@ def _search_arxiv_direct(query: str, limit: int = 3) -> List[Dict[str, Any]]:
     }
     url = f"http://export.arxiv.org/api/query?{urllib_parse.urlencode(params)}"
     retries = max(0, int(getattr(settings, "EXTERNAL_KB_HTTP_MAX_RETRY", 1)))
-    req = urllib_request.Request(
-        url=url,
-        headers={"User-Agent": "TomeHub-ExternalKB/1.0 (+https://tomehub.nl)"},
-        method="GET",
-    )
     raw = None
     for idx in range(retries + 1):
+        effective_timeout = _bounded_timeout(4.0)
+        if effective_timeout is None:
+            return []
         try:
-            with urllib_request.urlopen(req, timeout=4.0) as resp:
-                charset = resp.headers.get_content_charset() or "utf-8"
-                raw = resp.read().decode(charset, errors="replace")
-                break
-        except HTTPError as e:
-            code = int(getattr(e, "code", 0) or 0)
+            raw = http_client.request(
+                "GET",
+                url,
+                provider="external_kb",
+                timeout_sec=effective_timeout,
+                headers={"User-Agent": "TomeHub-ExternalKB/1.0 (+https://tomehub.nl)"},
+                cache_ttl_sec=float(getattr(settings, "EXTERNAL_KB_HTTP_CACHE_TTL_SEC", 600)),
+            ).text()
+            break
+        except http_client.HttpStatusError as e:
+            code = e.code
             if idx < retries and (code == 429 or code >= 500):
                 time.sleep(0.2 * (idx + 1))
                 continue
@@ -1490,6 +1524,98 @@ def _search_literary_book_metadata_direct(
     return out
 
 
+def _run_domain_provider(
+    provider_name: str,
+    fn: Callable[[], List[Dict[str, Any]]],
+    domain: str,
+    overall_deadline: float,
+) -> List[Dict[str, Any]]:
+    budget_sec = max(0.1, int(getattr(settings, "EXTERNAL_KB_DOMAIN_PROVIDER_BUDGET_MS", 3500)) / 1000.0)
+    _PROVIDER_DEADLINE.value = min(overall_deadline, time.monotonic() + budget_sec)
+    started = time.perf_counter()
+    try:
+        return fn() or []
+    finally:
+        _PROVIDER_DEADLINE.value = None
+        EXTERNAL_KB_PROVIDER_LATENCY_MS.labels(provider=provider_name, domain=domain).observe(
+            (time.perf_counter() - started) * 1000.0
+        )
+
+
+def _fan_out_domain_providers(
+    tasks: List[Tuple[str, Callable[[], List[Dict[str, Any]]]]],
+    domain: str,
+    hard_limit: int,
+) -> List[Dict[str, Any]]:
+    """
+    Run domain providers concurrently under one overall deadline.
+
+    Each provider's HTTP calls are capped by its own budget. Collection stops at the
+    deadline, or early once `hard_limit` rows at or above the early-return score have
+    arrived. Providers still running are abandoned and counted by skip reason. Rows
+    are returned in plan order so ties sort the same way as the sequential path did.
+    """
+    if not tasks:
+        return []
+
+    deadline_sec = max(0.1, int(getattr(settings, "EXTERNAL_KB_DOMAIN_DEADLINE_MS", 4500)) / 1000.0)
+    min_score = float(getattr(settings, "EXTERNAL_KB_DOMAIN_EARLY_RETURN_MIN_SCORE", 0.65))
+    overall_deadline = time.monotonic() + deadline_sec
+
+    futures = {
+        _DOMAIN_PROVIDER_EXECUTOR.submit(_run_domain_provider, name, fn, domain, overall_deadline): (idx, name)
+        for idx, (name, fn) in enumerate(tasks)
+    }
+    rows_by_index: Dict[int, List[Dict[str, Any]]] = {}
+    strong_rows = 0
+    early_return = False
+    pending = set(futures.keys())
+    while pending:
+        remaining = overall_deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            idx, name = futures[future]
+            try:
+                rows = [row for row in (future.result() or []) if isinstance(row, dict)]
+            except Exception as exc:
+                EXTERNAL_KB_PROVIDER_SKIPS_TOTAL.labels(provider=name, reason="error").inc()
+                logger.warning(
+                    "Domain external provider failed",
+                    extra={"provider": name, "domain": domain, "error": str(exc)},
+                )
+                continue
+            rows_by_index[idx] = rows
+            strong_rows += sum(1 for row in rows if float(row.get("score") or 0.0) >= min_score)
+        if pending and strong_rows >= hard_limit:
+            early_return = True
+            break
+
+    for future in pending:
+        name = futures[future][1]
+        cancelled = future.cancel()
+        if early_return:
+            reason = "early_return"
+        else:
+            reason = "cancelled" if cancelled else "timeout"
+        EXTERNAL_KB_PROVIDER_SKIPS_TOTAL.labels(provider=name, reason=reason).inc()
+    if pending:
+        logger.info(
+            "Domain external fan-out returned before all providers finished",
+            extra={
+                "domain": domain,
+                "early_return": early_return,
+                "skipped_providers": sorted(futures[f][1] for f in pending),
+            },
+        )
+
+    provider_rows: List[Dict[str, Any]] = []
+    for idx in sorted(rows_by_index):
+        provider_rows.extend(rows_by_index[idx])
+    return provider_rows
+
+
 def get_domain_external_candidates(question: str, domain_mode: str, limit: int = 5, active_providers: Optional[List[str]] = None) -> List[Dict[str, Any]]:
     normalized_domain = str(domain_mode or "").strip().upper()
     hard_limit = max(1, min(int(limit or 5), 8))
@@ -1503,29 +1629,47 @@ def get_domain_external_candidates(question: str, domain_mode: str, limit: int =
             return True
         return provider_name.upper() in active_providers
 
-    provider_rows: List[Dict[str, Any]] = []
+    small = min(3, hard_limit)
     if normalized_domain == "ACADEMIC":
-        if _is_provider_active("OPENALEX"): provider_rows.extend(_search_openalex_direct(query, limit=min(3, hard_limit)))
-        if _is_provider_active("CROSSREF"): provider_rows.extend(_search_crossref_direct(query, limit=min(3, hard_limit)))
-        if _is_provider_active("SEMANTIC_SCHOLAR"): provider_rows.extend(_search_semantic_scholar_direct(query, limit=min(3, hard_limit)))
-        if _is_provider_active("SHARE"): provider_rows.extend(_search_share_direct(query, limit=min(3, hard_limit)))
-        if _is_provider_active("ARXIV"): provider_rows.extend(_search_arxiv_direct(query, limit=min(3, hard_limit)))
+        plan: List[Tuple[str, Callable[[], List[Dict[str, Any]]]]] = [
+            ("OPENALEX", lambda: _search_openalex_direct(query, limit=small)),
+            ("CROSSREF", lambda: _search_crossref_direct(query, limit=small)),
+            ("SEMANTIC_SCHOLAR", lambda: _search_semantic_scholar_direct(query, limit=small)),
+            ("SHARE", lambda: _search_share_direct(query, limit=small)),
+            ("ARXIV", lambda: _search_arxiv_direct(query, limit=small)),
+        ]
     elif normalized_domain == "CULTURE_HISTORY":
-        if _is_provider_active("EUROPEANA"): provider_rows.extend(_search_europeana_direct(query, limit=min(3, hard_limit)))
-        if _is_provider_active("INTERNET_ARCHIVE"): provider_rows.extend(_search_internet_archive_direct(query, limit=min(3, hard_limit)))
-        if _is_provider_active("ART_SEARCH_API"): provider_rows.extend(_search_artic_direct(query, limit=min(2, hard_limit)))
-        if _is_provider_active("POETRYDB"): provider_rows.extend(_search_poetrydb_direct(query, limit=min(2, hard_limit)))
+        plan = [
+            ("EUROPEANA", lambda: _search_europeana_direct(query, limit=small)),
+            ("INTERNET_ARCHIVE", lambda: _search_internet_archive_direct(query, limit=small)),
+            ("ART_SEARCH_API", lambda: _search_artic_direct(query, limit=min(2, hard_limit))),
+            ("POETRYDB", lambda: _search_poetrydb_direct(query, limit=min(2, hard_limit))),
+        ]
     elif normalized_domain == "LITERARY":
-        if _is_provider_active("GUTENDEX"): provider_rows.extend(_search_gutendex_direct(query, limit=min(3, hard_limit)))
-        if _is_provider_active("POETRYDB"): provider_rows.extend(_search_poetrydb_direct(query, limit=min(3, hard_limit)))
-        if _is_provider_active("ART_SEARCH_API"): provider_rows.extend(_search_artic_direct(query, limit=min(2, hard_limit)))
-        provider_rows.extend(
-            _search_literary_book_metadata_direct(
-                query,
-                limit=min(3, hard_limit),
-                active_providers=active_providers,
-            )
-        )
+        plan = [
+            ("GUTENDEX", lambda: _search_gutendex_direct(query, limit=small)),
+            ("POETRYDB", lambda: _search_poetrydb_direct(query, limit=small)),
+            ("ART_SEARCH_API", lambda: _search_artic_direct(query, limit=min(2, hard_limit))),
+            # Filters GOOGLE_BOOKS / OPEN_LIBRARY / BIG_BOOK_API against active_providers itself.
+            (
+                "BOOK_METADATA",
+                lambda: _search_literary_book_metadata_direct(
+                    query,
+                    limit=small,
+                    active_providers=active_providers,
+                ),
+            ),
+        ]
+    else:
+        plan = []
+
+    tasks: List[Tuple[str, Callable[[], List[Dict[str, Any]]]]] = []
+    for provider_name, fn in plan:
+        if provider_name != "BOOK_METADATA" and not _is_provider_active(provider_name):
+            EXTERNAL_KB_PROVIDER_SKIPS_TOTAL.labels(provider=provider_name, reason="inactive").inc()
+            continue
+        tasks.append((provider_name, fn))
+    provider_rows = _fan_out_domain_providers(tasks, normalized_domain, hard_limit)
 
     deduped: List[Dict[str, Any]] = []
     seen = set()
@@ -2063,6 +2207,174 @@ def _upsert_edge(cursor: Any, edge: Dict[str, Any], entity_map: Dict[Tuple[str,
     return True
 
 
+_BULK_ID_LOOKUP_CHUNK = 400
+
+
+def _entity_key(provider: Any, external_id: Any) -> Tuple[str, str]:
+    return str(provider or "").strip().upper(), str(external_id or "").strip()
+
+
+def _bulk_upsert_entities(cursor: Any, entities: List[Dict[str, Any]]) -> Dict[Tuple[str, str], int]:
+    """
+    Upsert all entities with one array-bound MERGE, then resolve their ids with
+    chunked (PROVIDER, EXTERNAL_ID) IN-list SELECTs. Unique-key collisions from a
+    concurrent writer land in batch errors; the SELECT still finds their ids.
+    """
+    rows: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for ent in entities:
+        key = _entity_key(ent.get("provider"), ent.get("external_id"))
+        if not key[0] or not key[1]:
+            continue
+        rows[key] = {
+            "p_provider": key[0],
+            "p_ext": key[1],
+            "p_type": str(ent.get("entity_type") or "UNKNOWN").strip().upper(),
+            "p_label": str(ent.get("label") or "")[:512],
+            "p_payload": _as_json(ent.get("payload")),
+        }
+    if not rows:
+        return {}
+
+    cursor.setinputsizes(p_payload=oracledb.DB_TYPE_CLOB)
+    cursor.executemany(
+        """
+        MERGE INTO TOMEHUB_EXTERNAL_ENTITIES t
+        USING (
+            SELECT :p_provider AS PROVIDER, :p_ext AS EXTERNAL_ID, :p_type AS ENTITY_TYPE,
+                   :p_label AS LABEL, :p_payload AS PAYLOAD_JSON
+            FROM DUAL
+        ) s
+        ON (t.PROVIDER = s.PROVIDER AND t.EXTERNAL_ID = s.EXTERNAL_ID)
+        WHEN MATCHED THEN UPDATE SET
+            t.ENTITY_TYPE = s.ENTITY_TYPE,
+            t.LABEL = s.LABEL,
+            t.PAYLOAD_JSON = s.PAYLOAD_JSON,
+            t.UPDATED_AT = CURRENT_TIMESTAMP
+        WHEN NOT MATCHED THEN INSERT (PROVIDER, EXTERNAL_ID, ENTITY_TYPE, LABEL, PAYLOAD_JSON, UPDATED_AT)
+        VALUES (s.PROVIDER, s.EXTERNAL_ID, s.ENTITY_TYPE, s.LABEL, s.PAYLOAD_JSON, CURRENT_TIMESTAMP)
+        """,
+        list(rows.values()),
+        batcherrors=True,
+    )
+    batch_errors = list(cursor.getbatcherrors() or [])
+    if batch_errors:
+        logger.warning(
+            "external_kb entity merge reported batch errors",
+            extra={"errors": len(batch_errors), "first_error": str(batch_errors[0].message)},
+        )
+
+    entity_map: Dict[Tuple[str, str], int] = {}
+    keys = list(rows.keys())
+    for start in range(0, len(keys), _BULK_ID_LOOKUP_CHUNK):
+        chunk = keys[start:start + _BULK_ID_LOOKUP_CHUNK]
+        binds: Dict[str, Any] = {}
+        pairs = []
+        for i, (provider, ext_id) in enumerate(chunk):
+            binds[f"p_p{i}"] = provider
+            binds[f"p_e{i}"] = ext_id
+            pairs.append(f"(:p_p{i}, :p_e{i})")
+        cursor.execute(
+            f"SELECT PROVIDER, EXTERNAL_ID, ID FROM TOMEHUB_EXTERNAL_ENTITIES WHERE (PROVIDER, EXTERNAL_ID) IN ({', '.join(pairs)})",
+            binds,
+        )
+        for provider, ext_id, eid in cursor.fetchall() or []:
+            if eid is not None:
+                entity_map[_entity_key(provider, ext_id)] = int(eid)
+    return entity_map
+
+
+def _bulk_upsert_edges(cursor: Any, edge_rows: List[Dict[str, Any]]) -> int:
+    if not edge_rows:
+        return 0
+    cursor.executemany(
+        """
+        MERGE INTO TOMEHUB_EXTERNAL_EDGES t
+        USING (
+            SELECT :p_src AS SRC_ENTITY_ID, :p_dst AS DST_ENTITY_ID, :p_rel AS REL_TYPE, :p_weight AS WEIGHT,
+                   :p_provider AS PROVIDER, :p_book AS BOOK_ID, :p_uid AS FIREBASE_UID
+            FROM DUAL
+        ) s
+        ON (
+            t.SRC_ENTITY_ID = s.SRC_ENTITY_ID AND t.DST_ENTITY_ID = s.DST_ENTITY_ID AND t.REL_TYPE = s.REL_TYPE
+            AND t.PROVIDER = s.PROVIDER AND t.BOOK_ID = s.BOOK_ID AND t.FIREBASE_UID = s.FIREBASE_UID
+        )
+        WHEN MATCHED THEN UPDATE SET t.WEIGHT = s.WEIGHT, t.UPDATED_AT = CURRENT_TIMESTAMP
+        WHEN NOT MATCHED THEN INSERT
+            (SRC_ENTITY_ID, DST_ENTITY_ID, REL_TYPE, WEIGHT, PROVIDER, BOOK_ID, FIREBASE_UID, UPDATED_AT)
+        VALUES
+            (s.SRC_ENTITY_ID, s.DST_ENTITY_ID, s.REL_TYPE, s.WEIGHT, s.PROVIDER, s.BOOK_ID, s.FIREBASE_UID, CURRENT_TIMESTAMP)
+        """,
+        edge_rows,
+        batcherrors=True,
+    )
+    failed = len(list(cursor.getbatcherrors() or []))
+    if failed:
+        logger.warning("external_kb edge merge reported batch errors", extra={"errors": failed})
+    return len(edge_rows) - failed
+
+
+def _upsert_graph_bulk(
+    cursor: Any,
+    norms: List[Dict[str, Any]],
+    book_id: str,
+    firebase_uid: str,
+) -> Tuple[int, int]:
+    """Entities of every provider in one MERGE, their edges in a second one."""
+    all_entities = [ent for norm in norms for ent in norm.get("entities", [])]
+    entity_map = _bulk_upsert_entities(cursor, all_entities)
+
+    edge_rows: Dict[Tuple[int, int, str, str], Dict[str, Any]] = {}
+    for norm in norms:
+        # Edges only resolve against entities normalized from the same payload.
+        local_keys = {_entity_key(ent.get("provider"), ent.get("external_id")) for ent in norm.get("entities", [])}
+        for edge in norm.get("edges", []):
+            src_key = _entity_key(edge.get("sp"), edge.get("sid"))
+            dst_key = _entity_key(edge.get("dp"), edge.get("did"))
+            if src_key not in local_keys or dst_key not in local_keys:
+                continue
+            src_id = entity_map.get(src_key)
+            dst_id = entity_map.get(dst_key)
+            if not src_id or not dst_id or src_id == dst_id:
+                continue
+            rel = str(edge.get("rel") or "RELATED_TO").strip().upper()
+            provider = str(edge.get("provider") or "").strip().upper()
+            edge_rows[(src_id, dst_id, rel, provider)] = {
+                "p_src": src_id,
+                "p_dst": dst_id,
+                "p_rel": rel,
+                "p_weight": float(edge.get("weight") or 0.5),
+                "p_provider": provider,
+                "p_book": book_id,
+                "p_uid": firebase_uid,
+            }
+    entity_upserts = sum(
+        1 for ent in all_entities if _entity_key(ent.get("provider"), ent.get("external_id")) in entity_map
+    )
+    return entity_upserts, _bulk_upsert_edges(cursor, list(edge_rows.values()))
+
+
+def _upsert_graph_row_by_row(
+    cursor: Any,
+    norms: List[Dict[str, Any]],
+    book_id: str,
+    firebase_uid: str,
+) -> Tuple[int, int]:
+    entity_upserts = 0
+    edge_upserts = 0
+    for norm in norms:
+        entity_map: Dict[Tuple[str, str], int] = {}
+        for ent in norm.get("entities", []):
+            eid = _ensure_entity(cursor, ent)
+            if not eid:
+                continue
+            entity_map[_entity_key(ent.get("provider"), ent.get("external_id"))] = eid
+            entity_upserts += 1
+        for edge in norm.get("edges", []):
+            if _upsert_edge(cursor, edge, entity_map, book_id, firebase_uid):
+                edge_upserts += 1
+    return entity_upserts, edge_upserts
+
+
 def upsert_external_graph(
     book_id: str,
     firebase_uid: str,
@@ -2154,19 +2466,19 @@ def upsert_external_graph(
     try:
         with DatabaseManager.get_write_connection() as conn:
             with conn.cursor() as cursor:
-                for norm in [wikidata_meta, openalex_meta, dbpedia_meta, orkg_meta]:
-                    if not norm:
-                        continue
-                    entity_map: Dict[Tuple[str, str], int] = {}
-                    for ent in norm.get("entities", []):
-                        eid = _ensure_entity(cursor, ent)
-                        if not eid:
-                            continue
-                        entity_map[(str(ent.get("provider") or "").strip().upper(), str(ent.get("external_id") or "").strip())] = eid
-                        entity_upserts += 1
-                    for edge in norm.get("edges", []):
-                        if _upsert_edge(cursor, edge, entity_map, book_id, firebase_uid):
-                            edge_upserts += 1
+                norms = [norm for norm in (wikidata_meta, openalex_meta, dbpedia_meta, orkg_meta) if norm]
+                if norms and bool(getattr(settings, "EXTERNAL_KB_BULK_UPSERT_ENABLED", True)):
+                    try:
+                        entity_upserts, edge_upserts = _upsert_graph_bulk(cursor, norms, book_id, firebase_uid)
+                    except Exception as exc:
+                        logger.warning(
+                            "external_kb bulk graph upsert failed; falling back to row-by-row upserts",
+                            extra={"book_id": book_id, "uid": firebase_uid, "error": str(exc)},
+                        )
+                        conn.rollback()
+                        entity_upserts, edge_upserts = _upsert_graph_row_by_row(cursor, norms, book_id, firebase_uid)
+                elif norms:
+                    entity_upserts, edge_upserts = _upsert_graph_row_by_row(cursor, norms, book_id, firebase_uid)
 
                 cursor.execute(
                     """
@@ -2532,20 +2844,40 @@ def _backfill_worker(scope_uid: Optional[str]) -> None:
         with _BACKFILL_LOCK:
             _BACKFILL_STATUS["total"] = _count_books(scope_uid)
         batch = max(1, int(getattr(settings, "EXTERNAL_KB_BACKFILL_BATCH_SIZE", 50)))
-        with DatabaseManager.get_read_connection() as conn:
-            with conn.cursor() as cursor:
-                if scope_uid:
-                    cursor.execute("SELECT ITEM_ID, FIREBASE_UID, TITLE, AUTHOR FROM TOMEHUB_LIBRARY_ITEMS WHERE FIREBASE_UID=:p_uid ORDER BY ITEM_ID", {"p_uid": scope_uid})
-                else:
-                    cursor.execute("SELECT ITEM_ID, FIREBASE_UID, TITLE, AUTHOR FROM TOMEHUB_LIBRARY_ITEMS ORDER BY FIREBASE_UID, ITEM_ID")
-                while True:
-                    rows = cursor.fetchmany(batch)
-                    if not rows:
-                        break
-                    for row in rows:
-                        _run_external_enrichment(str(row[0] or ""), str(row[1] or ""), str(row[2] or ""), str(row[3] or ""), None, "BACKFILL", False)
-                        with _BACKFILL_LOCK:
-                            _BACKFILL_STATUS["processed"] = int(_BACKFILL_STATUS.get("processed", 0)) + 1
+        # Keyset pages: the read connection goes back to the pool before the
+        # (slow, network-bound) enrichment of each page starts.
+        last_key: Optional[Tuple[str, str]] = None
+        while True:
+            conditions = []
+            params: Dict[str, Any] = {"p_batch": batch}
+            if scope_uid:
+                conditions.append("FIREBASE_UID = :p_uid")
+                params["p_uid"] = scope_uid
+            if last_key is not None:
+                conditions.append("(FIREBASE_UID > :p_last_uid OR (FIREBASE_UID = :p_last_uid AND ITEM_ID > :p_last_item))")
+                params["p_last_uid"], params["p_last_item"] = last_key
+            where_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            with DatabaseManager.get_read_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        f"""
+                        SELECT ITEM_ID, FIREBASE_UID, TITLE, AUTHOR FROM TOMEHUB_LIBRARY_ITEMS
+                        {where_sql}
+                        ORDER BY FIREBASE_UID, ITEM_ID
+                        FETCH FIRST :p_batch ROWS ONLY
+                        """,
+                        params,
+                    )
+                    rows = cursor.fetchall()
+            if not rows:
+                break
+            for row in rows:
+                _run_external_enrichment(str(row[0] or ""), str(row[1] or ""), str(row[2] or ""), str(row[3] or ""), None, "BACKFILL", False)
+                with _BACKFILL_LOCK:
+                    _BACKFILL_STATUS["processed"] = int(_BACKFILL_STATUS.get("processed", 0)) + 1
+            last_key = (str(rows[-1][1] or ""), str(rows[-1][0] or ""))
+            if len(rows) < batch:
+                break
     except Exception as e:
         with _BACKFILL_LOCK:
             _BACKFILL_STATUS["last_error"] = str(e)
@@ -25,6 +25,8 @@ from services.flow_session_service import (
 from services.embedding_service import get_embedding, get_query_embedding
 from services.chunk_quality_audit_service import should_skip_for_flow
 from services.flow_text_repair_service import repair_for_flow_card
+from services.vector_index_service import LANE_FLOW, fetch_vector_ranked
+from infrastructure.cursor_profiles import QUERY_CLASS_CANDIDATE_SCAN, profiled_cursor
 from infrastructure.db_manager import DatabaseManager, safe_read_clob
 import oracledb  # For DatabaseError exception handling
 from config import settings
@@ -966,13 +968,18 @@ class FlowService:
         sql, params = self._apply_personal_note_visibility_guard(sql, params, r_type)
         sql, params = self._apply_category_filter(sql, params, category)
              
-        sql += " ORDER BY distance ASC FETCH FIRST :p_limit ROWS ONLY "
-        
         cards = []
         with DatabaseManager.get_read_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(sql, params)
-                for row in cursor.fetchall():
+            with profiled_cursor(conn, QUERY_CLASS_CANDIDATE_SCAN) as cursor:
+                rows = fetch_vector_ranked(
+                    cursor,
+                    sql,
+                    params,
+                    lane=LANE_FLOW,
+                    distance_expr="VECTOR_DISTANCE(VEC_EMBEDDING, :p_vec, COSINE)",
+                    rank_column="distance",
+                )
+                for row in rows:
                     raw_content = safe_read_clob(row[1])
                     content = extract_note_content(raw_content)
                     content = _prepare_flow_card_content(content, row[3])
@@ -1086,7 +1093,7 @@ class FlowService:
     def _execute_simple_fetch(self, sql: str, params: dict, reason_prefix: str, zone: int) -> List[FlowCard]:
          cards = []
          with DatabaseManager.get_read_connection() as conn:
-            with conn.cursor() as cursor:
+            with profiled_cursor(conn, QUERY_CLASS_CANDIDATE_SCAN) as cursor:
                 cursor.execute(sql, params)
                 for row in cursor.fetchall():
                     raw_content = safe_read_clob(row[1])
@@ -1263,7 +1270,7 @@ class FlowService:
         candidates = []
         try:
             with DatabaseManager.get_read_connection() as conn:
-                with conn.cursor() as cursor:
+                with profiled_cursor(conn, QUERY_CLASS_CANDIDATE_SCAN) as cursor:
                     if zone == 1:
                         # ZONE 1: Tight Context (Same book, nearby pages)
                         candidates = self._fetch_zone1_tight_context(
@@ -1311,7 +1318,7 @@ class FlowService:
         cards = []
         try:
             with DatabaseManager.get_read_connection() as conn:
-                with conn.cursor() as cursor:
+                with profiled_cursor(conn, QUERY_CLASS_CANDIDATE_SCAN) as cursor:
                     sql = """
                         SELECT id, content_chunk, title, page_number, content_type AS source_type
                         FROM TOMEHUB_CONTENT_V2
@@ -1425,10 +1432,16 @@ class FlowService:
                 sql, params = self._apply_personal_note_visibility_guard(sql, params, resource_type)
                 sql, params = self._apply_category_filter(sql, params, category)
                 
-                sql += " ORDER BY distance FETCH FIRST :p_limit ROWS ONLY "
-                cursor.execute(sql, params)
+                rows = fetch_vector_ranked(
+                    cursor,
+                    sql,
+                    params,
+                    lane=LANE_FLOW,
+                    distance_expr="VECTOR_DISTANCE(VEC_EMBEDDING, :p_vec, COSINE)",
+                    rank_column="distance",
+                )
                 cards = []
-                for row in cursor.fetchall():
+                for row in rows:
                     distance = row[5]
                     similarity = 1 - distance if distance else 0
                     if similarity >= 0.35:
@@ -1605,10 +1618,17 @@ class FlowService:
             sql, params = self._apply_personal_note_visibility_guard(sql, params, resource_type)
             sql, params = self._apply_category_filter(sql, params, category)
                 
-            sql += " ORDER BY distance OFFSET :p_offset ROWS FETCH NEXT :p_limit ROWS ONLY "
-            cursor.execute(sql, params)
+            rows = fetch_vector_ranked(
+                cursor,
+                sql,
+                params,
+                lane=LANE_FLOW,
+                distance_expr="VECTOR_DISTANCE(VEC_EMBEDDING, :p_vec, COSINE)",
+                rank_column="distance",
+                offset_bind="p_offset",
+            )
             
-            for row in cursor.fetchall():
+            for row in rows:
                 distance = row[5]
                 similarity = 1 - distance if distance else 0
                 if similarity >= 0.40:
@@ -1661,11 +1681,17 @@ class FlowService:
         sql, params = self._apply_personal_note_visibility_guard(sql, params, resource_type)
         sql, params = self._apply_category_filter(sql, params, category)
             
-        sql += " ORDER BY distance FETCH FIRST :p_limit ROWS ONLY "
-        cursor.execute(sql, params)
+        rows = fetch_vector_ranked(
+            cursor,
+            sql,
+            params,
+            lane=LANE_FLOW,
+            distance_expr="VECTOR_DISTANCE(VEC_EMBEDDING, :p_vec, COSINE)",
+            rank_column="distance",
+        )
         
         cards = []
-        for row in cursor.fetchall():
+        for row in rows:
             distance = row[5]
             similarity = 1 - distance if distance else 0
             
@@ -1781,10 +1807,17 @@ class FlowService:
             sql, params = self._apply_personal_note_visibility_guard(sql, params, resource_type)
             sql, params = self._apply_category_filter(sql, params, category)
                 
-            sql += " ORDER BY distance OFFSET :p_offset ROWS FETCH NEXT :p_limit ROWS ONLY "
-            cursor.execute(sql, params)
+            rows = fetch_vector_ranked(
+                cursor,
+                sql,
+                params,
+                lane=LANE_FLOW,
+                distance_expr="VECTOR_DISTANCE(VEC_EMBEDDING, :p_vec, COSINE)",
+                rank_column="distance",
+                offset_bind="p_offset",
+            )
             
-            for row in cursor.fetchall():
+            for row in rows:
                 distance = row[5]
                 similarity = 1 - distance if distance else 0
                 
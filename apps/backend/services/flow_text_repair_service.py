@@ -13,13 +13,12 @@ import re
 import threading
 import time
 from collections import OrderedDict
-from difflib import SequenceMatcher
 from typing import Optional, Set
 
 import ftfy
 
 from config import settings
-from services.correction_service import LinguisticCorrectionService
+from services.correction_service import LinguisticCorrectionService, delta_ratio
 from services.monitoring import (
     FLOW_TEXT_REPAIR_APPLIED_TOTAL,
     FLOW_TEXT_REPAIR_HIGH_DELTA_REJECT_TOTAL,
@@ -142,7 +141,7 @@ class FlowTextRepairService:
                 self._cache.set(cache_key, original)
                 return original
 
-            delta_ratio = self._delta_ratio(original, repaired)
+            delta_ratio = self._delta_ratio(original, repaired, self.max_delta_ratio)
             if delta_ratio > self.max_delta_ratio:
                 FLOW_TEXT_REPAIR_HIGH_DELTA_REJECT_TOTAL.labels(source_type=source).inc()
                 self._cache.set(cache_key, original)
@@ -235,11 +234,8 @@ class FlowTextRepairService:
         return text.strip()
 
     @staticmethod
-    def _delta_ratio(original: str, candidate: str) -> float:
-        if original == candidate:
-            return 0.0
-        similarity = SequenceMatcher(None, original, candidate).ratio()
-        return max(0.0, 1.0 - similarity)
+    def _delta_ratio(original: str, candidate: str, score_cutoff: Optional[float] = None) -> float:
+        return delta_ratio(original, candidate, score_cutoff)
 
     def _apply_pipeline(self, text: str) -> str:
         candidate = ftfy.fix_text(text)
@@ -40,6 +40,16 @@ from services.ingestion_status_service import (
     set_storage_delete_pending,
 )
 from services.object_storage_service import cleanup_pdf_artifacts
+from services.lemma_index_service import (
+    LEMMA_INDEX_TABLE,
+    content_rows_by_chunk_index,
+    replace_item_lemma_index,
+)
+from services.lemma_postings_service import (
+    LEMMA_POSTINGS_TABLE,
+    write_content_postings as write_lemma_postings,
+    write_item_postings as write_item_lemma_postings,
+)
 from utils.text_utils import normalize_text, get_lemmas, get_lemma_frequencies
 from utils.tag_utils import prepare_labels
 import json
@@ -52,6 +62,8 @@ from utils.logger import get_logger
 from config import settings
 
 logger = get_logger("ingestion_service")
+from services.nlp_process_pool_service import analyze_text, nlp_process_pool
+from services.ocr_dictionary_service import get_user_ocr_dictionary
 from services.monitoring import (
     INGESTION_LATENCY,
     DATA_CLEANER_AI_APPLIED_TOTAL,
@@ -78,6 +90,7 @@ load_dotenv(dotenv_path=env_path)
 
 
 from infrastructure.db_manager import DatabaseManager, acquire_lock
+from infrastructure.schema_registry import schema_registry
 
 # Removed local get_database_connection
 
@@ -301,6 +314,34 @@ def _invalidate_search_cache(firebase_uid: str, book_id: Optional[str] = None) -
     if not firebase_uid:
         return
 
+    try:
+        from services.vector_cache_service import notify_content_changed
+
+        notify_content_changed(firebase_uid, book_id)
+    except Exception as e:
+        logger.warning(f"Vector cache invalidation failed (non-critical): {e}")
+
+    try:
+        from services.trigram_index_service import notify_content_changed as notify_trigram_index
+
+        notify_trigram_index(firebase_uid, book_id)
+    except Exception as e:
+        logger.warning(f"Trigram index invalidation failed (non-critical): {e}")
+
+    try:
+        from services.search_system.neighbor_cache import neighbor_cache
+
+        neighbor_cache.invalidate(firebase_uid, book_id)
+    except Exception as e:
+        logger.warning(f"Parent-context cache invalidation failed (non-critical): {e}")
+
+    try:
+        from services.answer_cache_service import notify_content_changed as notify_answer_cache
+
+        notify_answer_cache(firebase_uid, book_id)
+    except Exception as e:
+        logger.warning(f"Answer cache invalidation failed (non-critical): {e}")
+
     try:
         from services.cache_service import get_cache
 
@@ -316,6 +357,8 @@ def _invalidate_search_cache(firebase_uid: str, book_id: Optional[str] = None) -
             book_pattern = f"search:*:*:{book_id}:*"
             cache.delete_pattern(book_pattern)
             logger.info(f"Cache invalidated for book {book_id} (pattern: {book_pattern})")
+            # Layer-3 counts/distributions are cached per book for up to 24h.
+            cache.delete_pattern(f"analytics_*:*:{firebase_uid}:{book_id}:*")
     except Exception as e:
         logger.warning(f"Cache invalidation failed (non-critical): {e}")
 
@@ -398,7 +441,24 @@ def delete_book_content(title: str, author: str, firebase_uid: str, conn=None) -
             
         with conn.cursor() as cursor:
             db_title = f"{title} - {author}"
-            
+
+            # Postings are keyed by content id; drop them with the rows they point to.
+            for postings_table in (LEMMA_INDEX_TABLE, LEMMA_POSTINGS_TABLE):
+                try:
+                    cursor.execute(
+                        f"""
+                        DELETE FROM {postings_table}
+                        WHERE CONTENT_ID IN (
+                            SELECT ID FROM TOMEHUB_CONTENT_V2
+                            WHERE firebase_uid = :p_uid AND title = :p_title
+                        )
+                        """,
+                        {"p_uid": firebase_uid, "p_title": db_title},
+                    )
+                except Exception as idx_err:
+                    if not (_is_missing_table_error(idx_err) or _is_invalid_identifier_error(idx_err)):
+                        raise
+
             query = """
             DELETE FROM TOMEHUB_CONTENT_V2 
             WHERE firebase_uid = :p_uid 
@@ -445,16 +505,8 @@ def _is_invalid_identifier_error(error: Exception) -> bool:
         return False
 
 
-def _table_columns(cursor, table_name: str) -> set[str]:
-    cursor.execute(
-        """
-        SELECT COLUMN_NAME
-        FROM USER_TAB_COLUMNS
-        WHERE TABLE_NAME = :p_table
-        """,
-        {"p_table": str(table_name or "").upper()},
-    )
-    return {str(r[0]).upper() for r in cursor.fetchall()}
+def _table_columns(table_name: str) -> set[str]:
+    return set(schema_registry.columns(table_name))
 
 
 def _chunked(seq, size: int):
@@ -475,10 +527,12 @@ def _delete_content_children_by_ids(cursor, content_ids: list[int]) -> None:
         ("TOMEHUB_CONTENT_TAGS", ("CONTENT_ID", "CHUNK_ID")),
         ("TOMEHUB_FLOW_SEEN", ("CHUNK_ID", "CONTENT_ID")),
         ("TOMEHUB_CONCEPT_CHUNKS", ("CONTENT_ID", "CHUNK_ID")),
+        (LEMMA_INDEX_TABLE, ("CONTENT_ID",)),
+        (LEMMA_POSTINGS_TABLE, ("CONTENT_ID",)),
     ]
     for child_table, col_candidates in child_specs:
         try:
-            child_cols = _table_columns(cursor, child_table)
+            child_cols = _table_columns(child_table)
             if not child_cols:
                 continue
             child_col = next((c for c in col_candidates if c in child_cols), None)
@@ -621,7 +675,7 @@ def purge_item_content(
                 content_table = None
                 content_cols = set()
                 for candidate in ("TOMEHUB_CONTENT_V2", "TOMEHUB_CONTENT"):
-                    cols = _table_columns(cursor, candidate)
+                    cols = _table_columns(candidate)
                     if cols:
                         content_table = candidate
                         content_cols = cols
@@ -682,7 +736,7 @@ def purge_item_content(
                 )
                 for key, table_name, id_col_candidates in aux_specs:
                     try:
-                        aux_cols = _table_columns(cursor, table_name)
+                        aux_cols = _table_columns(table_name)
                         if not aux_cols:
                             continue
                         id_col = next((c for c in id_col_candidates if c in aux_cols), None)
@@ -706,7 +760,7 @@ def purge_item_content(
 
                 if not retain_pdf_row:
                     try:
-                        ingested_cols = _table_columns(cursor, "TOMEHUB_INGESTED_FILES")
+                        ingested_cols = _table_columns("TOMEHUB_INGESTED_FILES")
                         if ingested_cols:
                             ingested_id_col = "BOOK_ID" if "BOOK_ID" in ingested_cols else ("ITEM_ID" if "ITEM_ID" in ingested_cols else None)
                             if ingested_id_col:
@@ -826,6 +880,9 @@ def ingest_book(file_path: str, title: str, author: str, firebase_uid: str, book
     _runtime_log("Step 2 & 3: Atomic Database Transaction (Locking -> Processing -> Ingestion)")
     _runtime_log(f"{'='*70}")
     
+    successful_inserts = 0
+    valid_chunks = []
+    committed = False
     try:
         with DatabaseManager.get_write_connection() as connection:
             with connection.cursor() as cursor:
@@ -1101,6 +1158,55 @@ def ingest_book(file_path: str, title: str, author: str, firebase_uid: str, book
                         
                     # 2. Batch Embedding generation (Using stored/cleaned text)
                     batch_texts = [r['text_used'] for r in valid_nlp_results]
+                    embeddings = batch_get_embeddings(batch_texts)
+
+                    # 3. Insert rows; lemma postings go in the same transaction.
+                    for idx, res in enumerate(valid_nlp_results):
+                        chunk = res['chunk']
+                        embedding = embeddings[idx] if idx < len(embeddings) else None
+                        if embedding is None:
+                            failed_embeddings += 1
+                            continue
+                        out_id = cursor.var(oracledb.NUMBER)
+                        cursor.execute(insert_sql, {
+                            "p_uid": firebase_uid,
+                            "p_type": source_type,
+                            "p_title": f"{title} - {author}",
+                            "p_content": res['decluttered_text'],
+                            "p_page": chunk.get('page_num', 0),
+                            "p_chunk_idx": res['index'],
+                            "p_vec": embedding,
+                            "p_book_id": book_id,
+                            "p_norm_content": res['normalized'],
+                            "p_lemmas": res['lemmas'],
+                            "p_token_freq": res['lemma_freqs'],
+                            "p_out_id": out_id,
+                        })
+                        new_id = out_id.getvalue()
+                        if isinstance(new_id, list):
+                            new_id = new_id[0] if new_id else None
+                        if new_id is not None:
+                            write_lemma_postings(
+                                cursor,
+                                firebase_uid=firebase_uid,
+                                content_id=new_id,
+                                lemmas_json=res['lemmas'],
+                                token_freq_json=res['lemma_freqs'],
+                            )
+                        successful_inserts += 1
+
+                total_processed = successful_inserts + failed_embeddings
+                if total_processed > 0:
+                    failure_rate = failed_embeddings / total_processed
+                    if failure_rate > 0.10:
+                        error_msg = f"Ingestion Aborted: High embedding failure rate ({failure_rate:.1%}). threshold=10%"
+                        logger.error(error_msg, extra={"failed": failed_embeddings, "total": total_processed})
+                        connection.rollback()
+                        raise Exception(error_msg)
+
+                connection.commit()
+                committed = True
+
         if successful_inserts > 0:
             if os.path.exists(file_path):
                 os.remove(file_path)
@@ -1112,7 +1218,12 @@ def ingest_book(file_path: str, title: str, author: str, firebase_uid: str, book
              _runtime_log(f"[WARNING] File preserved: {file_path}")
              
     except Exception as e:
-        _runtime_log(f"[ERROR] Failed to delete file: {e}")
+        if not committed:
+            # Nothing was persisted; the transaction (rows and postings) is rolled back.
+            successful_inserts = 0
+            logger.error("Book ingestion transaction failed", extra={"error": str(e), "book_id": book_id})
+        else:
+            _runtime_log(f"[ERROR] Failed to delete file: {e}")
     
     if successful_inserts == 0:
         INGESTION_LATENCY.labels(status="fail", source_type=source_type).observe(time.time() - start_time)
@@ -1209,6 +1320,9 @@ def ingest_text_item(
                         new_id = new_id[0] if new_id else None
                     if new_id is not None:
                         _insert_content_tags(cursor, int(new_id), prepared_tags)
+                        write_lemma_postings(
+                            cursor, firebase_uid=firebase_uid, content_id=new_id, lemmas_json=lemmas_json
+                        )
                     connection.commit()
                     _invalidate_search_cache(firebase_uid=firebase_uid, book_id=book_id)
                     maybe_trigger_epistemic_distribution_refresh_async(book_id=book_id, firebase_uid=firebase_uid, reason="ingest_text_item")
@@ -1240,6 +1354,7 @@ def ingest_pre_extracted_chunks(
     categories: Optional[str] = None,
     file_path: Optional[str] = None,
     cleanup_file: bool = False,
+    ocr_repair: bool = False,
 ) -> bool:
     if categories:
         categories = ",".join([c.strip() for c in categories.replace("\n", ",").split(",") if c.strip()])
@@ -1251,6 +1366,13 @@ def ingest_pre_extracted_chunks(
         logger.error("Failed to persist pre-extracted chunks: chunk list is empty")
         return False
 
+    # OCR'd books also get word-level repair against the user's own clean vocabulary.
+    chunk_corrector = corrector_service
+    if ocr_repair:
+        ocr_dictionary = get_user_ocr_dictionary(firebase_uid)
+        if ocr_dictionary is not None:
+            chunk_corrector = LinguisticCorrectionService(dictionary=ocr_dictionary)
+
     successful_inserts = 0
     failed_embeddings = 0
     valid_chunks = []
@@ -1286,6 +1408,7 @@ def ingest_pre_extracted_chunks(
                 """
 
                 BATCH_SIZE = 50
+                use_nlp_process_pool = nlp_process_pool.enabled
                 data_cleaner_lock = threading.Lock()
                 data_cleaner_cache: dict[str, str] = {}
                 data_cleaner_budget = {
@@ -1317,7 +1440,7 @@ def ingest_pre_extracted_chunks(
                     if sis and sis.get("decision") == "QUARANTINE":
                         skip_chunk = True
 
-                    repaired_text = corrector_service.fix_text(chunk_text)
+                    repaired_text = chunk_corrector.fix_text(chunk_text)
                     repaired = False
                     if repaired_text != chunk_text:
                         chunk_text = repaired_text
@@ -1411,15 +1534,13 @@ def ingest_pre_extracted_chunks(
                         skip_chunk = True
 
                     text_for_index = storage_text or str(chunk_text or "").strip()
+                    nlp_fields = {} if use_nlp_process_pool else analyze_text(text_for_index)
                     return {
                         "index": idx,
                         "chunk": chunk,
                         "text_used": text_for_index,
                         "repaired": repaired,
-                        "normalized": normalize_text(text_for_index),
-                        "lemmas": json.dumps(get_lemmas(text_for_index), ensure_ascii=False),
-                        "lemma_freqs": json.dumps(get_lemma_frequencies(text_for_index), ensure_ascii=False),
-                        "classification": classify_passage_fast(text_for_index),
+                        **nlp_fields,
                         "decluttered_text": text_for_index,
                         "skip": skip_chunk,
                         "data_cleaner_ai_used": use_ai_cleaner,
@@ -1475,6 +1596,10 @@ def ingest_pre_extracted_chunks(
                     logger.warning("No valid chunks found after pre-extracted validation.")
                     return False
 
+                content_type = "PDF" if file_ext == ".pdf" else "EPUB"
+                lemma_postings_by_chunk: dict[int, list] = {}
+                lemma_tokens_by_chunk: dict[int, tuple] = {}
+
                 for i in range(0, len(valid_chunks), BATCH_SIZE):
                     batch = valid_chunks[i:i + BATCH_SIZE]
                     with ThreadPoolExecutor(max_workers=5) as executor:
@@ -1485,6 +1610,10 @@ def ingest_pre_extracted_chunks(
                         continue
 
                     batch_texts = [r["text_used"] for r in valid_nlp_results]
+                    if use_nlp_process_pool:
+                        # Cleaning (incl. AI calls) stayed on threads; the CPU-bound NLP runs on worker processes.
+                        for res, fields in zip(valid_nlp_results, nlp_process_pool.analyze(batch_texts)):
+                            res.update(fields)
                     embeddings = batch_get_embeddings(batch_texts)
                     insert_rows = []
                     insert_chunk_indexes = []
@@ -1496,7 +1625,7 @@ def ingest_pre_extracted_chunks(
                             continue
                         insert_rows.append({
                             "p_uid": firebase_uid,
-                            "p_type": "PDF" if file_ext == ".pdf" else "EPUB",
+                            "p_type": content_type,
                             "p_title": f"{title} - {author}",
                             "p_content": res["decluttered_text"],
                             "p_page": chunk.get("page_num", 0),
@@ -1508,6 +1637,8 @@ def ingest_pre_extracted_chunks(
                             "p_token_freq": res["lemma_freqs"],
                         })
                         insert_chunk_indexes.append(int(res["index"]))
+                        lemma_postings_by_chunk[int(res["index"])] = res.get("lemma_postings") or []
+                        lemma_tokens_by_chunk[int(res["index"])] = (res["lemmas"], res["lemma_freqs"])
 
                     successful_inserts += _insert_chunk_batch(insert_rows, insert_chunk_indexes)
 
@@ -1520,6 +1651,26 @@ def ingest_pre_extracted_chunks(
                         connection.rollback()
                         raise Exception(error_msg)
 
+                if successful_inserts > 0:
+                    replace_item_lemma_index(
+                        cursor,
+                        firebase_uid=firebase_uid,
+                        book_id=book_id,
+                        content_type=content_type,
+                        postings_by_chunk_index=lemma_postings_by_chunk,
+                    )
+                    write_item_lemma_postings(
+                        cursor,
+                        firebase_uid=firebase_uid,
+                        content_ids_by_chunk_index={
+                            chunk_index: content_id
+                            for chunk_index, (content_id, _) in content_rows_by_chunk_index(
+                                cursor, firebase_uid=firebase_uid, book_id=book_id, content_type=content_type
+                            ).items()
+                        },
+                        tokens_by_chunk_index=lemma_tokens_by_chunk,
+                    )
+
                 connection.commit()
     except Exception as exc:
         logger.error("Pre-extracted chunk ingestion failed", extra={"error": str(exc), "book_id": book_id})
@@ -1638,7 +1789,8 @@ def sync_highlights_for_item(
                     prepared_tags = prepare_labels(tags_json) if tags_json else []
 
                     embedding = embeddings[idx] if idx < len(embeddings) else None
-                    
+                    lemmas_json = json.dumps(get_lemmas(text), ensure_ascii=False)
+
                     created_at_ms = h.get("createdAt")
                     created_at_dt = datetime.fromtimestamp(created_at_ms / 1000.0) if created_at_ms else None
 
@@ -1656,7 +1808,7 @@ def sync_highlights_for_item(
                             "p_vec": embedding,
                             "p_book_id": book_id,
                             "p_norm": normalize_text(text),
-                            "p_lemmas": json.dumps(get_lemmas(text), ensure_ascii=False),
+                            "p_lemmas": lemmas_json,
                             "p_comment": comment,
                             "p_tags": tags_json,
                             "p_created_at": created_at_dt,
@@ -1668,6 +1820,9 @@ def sync_highlights_for_item(
                         new_id = new_id[0] if new_id else None
                     if new_id is not None:
                         _insert_content_tags(cursor, int(new_id), prepared_tags)
+                        write_lemma_postings(
+                            cursor, firebase_uid=firebase_uid, content_id=new_id, lemmas_json=lemmas_json
+                        )
                     inserted += 1
 
                 connection.commit()
@@ -1796,6 +1951,7 @@ def sync_personal_note_for_item(
                     return {"success": True, "deleted": deleted, "inserted": 0}
 
                 embedding = get_embedding(semantic_text)
+                lemmas_json = json.dumps(get_lemmas(semantic_text), ensure_ascii=False)
 
                 tags_json = json.dumps(tags, ensure_ascii=False) if tags else None
                 prepared_tags = prepare_labels(tags_json) if tags_json else []
@@ -1822,7 +1978,7 @@ def sync_personal_note_for_item(
                         "p_vec": embedding,
                         "p_book_id": book_id,
                         "p_norm": normalize_text(semantic_text),
-                        "p_lemmas": json.dumps(get_lemmas(semantic_text), ensure_ascii=False),
+                        "p_lemmas": lemmas_json,
                         "p_comment": None,
                         "p_tags": tags_json,
                         "p_out_id": out_id,
@@ -1833,6 +1989,9 @@ def sync_personal_note_for_item(
                     new_id = new_id[0] if new_id else None
                 if new_id is not None:
                     _insert_content_tags(cursor, int(new_id), prepared_tags)
+                    write_lemma_postings(
+                        cursor, firebase_uid=firebase_uid, content_id=new_id, lemmas_json=lemmas_json
+                    )
                 inserted = 1
                 connection.commit()
                 _invalidate_search_cache(firebase_uid=firebase_uid, book_id=book_id)
@@ -1922,6 +2081,9 @@ def process_bulk_items_logic(items: list, firebase_uid: str) -> dict:
                             new_id = new_id[0] if new_id else None
                         if new_id is not None:
                             _insert_content_tags(cursor, int(new_id), prepared_tags)
+                            write_lemma_postings(
+                                cursor, firebase_uid=firebase_uid, content_id=new_id, lemmas_json=lemmas_json
+                            )
                         success += 1
                         time.sleep(0.2) # Rate limit
                     except Exception as e:
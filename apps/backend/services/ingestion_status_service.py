@@ -6,10 +6,10 @@ import logging
 from typing import Any, Dict, Iterable, Optional
 
 from infrastructure.db_manager import DatabaseManager
+from infrastructure.schema_registry import schema_registry
 
 logger = logging.getLogger(__name__)
 
-_COLUMN_CACHE: Optional[set[str]] = None
 _TERMINAL_PARSE_STATUSES = {"COMPLETED", "FAILED"}
 
 _FIELD_TO_COLUMN = {
@@ -49,27 +49,15 @@ _FIELD_TO_COLUMN = {
 
 
 def invalidate_ingestion_status_column_cache() -> None:
-    global _COLUMN_CACHE
-    _COLUMN_CACHE = None
-
-
-def _get_columns(cursor) -> set[str]:
-    global _COLUMN_CACHE
-    if _COLUMN_CACHE is not None:
-        return _COLUMN_CACHE
-    cursor.execute(
-        """
-        SELECT COLUMN_NAME
-        FROM USER_TAB_COLUMNS
-        WHERE TABLE_NAME = 'TOMEHUB_INGESTED_FILES'
-        """
-    )
-    _COLUMN_CACHE = {str(row[0]).upper() for row in cursor.fetchall()}
-    return _COLUMN_CACHE
+    schema_registry.refresh()
+
+
+def _get_columns() -> frozenset[str]:
+    return schema_registry.columns("TOMEHUB_INGESTED_FILES")
 
 
-def _supported_fields(cursor, payload: Dict[str, Any]) -> Dict[str, Any]:
-    columns = _get_columns(cursor)
+def _supported_fields(payload: Dict[str, Any]) -> Dict[str, Any]:
+    columns = _get_columns()
     supported: Dict[str, Any] = {}
     for field_name, value in payload.items():
         column_name = _FIELD_TO_COLUMN.get(field_name)
@@ -108,7 +96,7 @@ def upsert_ingestion_status(
     try:
         with DatabaseManager.get_write_connection() as conn:
             with conn.cursor() as cursor:
-                supported = _supported_fields(cursor, payload)
+                supported = _supported_fields(payload)
 
                 update_assignments = ["UPDATED_AT = CURRENT_TIMESTAMP"]
                 insert_columns = ["BOOK_ID", "FIREBASE_UID"]
@@ -148,7 +136,7 @@ def fetch_ingestion_status(book_id: str, firebase_uid: str) -> Optional[Dict[str
     try:
         with DatabaseManager.get_read_connection() as conn:
             with conn.cursor() as cursor:
-                columns = _get_columns(cursor)
+                columns = _get_columns()
                 select_parts = [
                     "STATUS",
                     "SOURCE_FILE_NAME",
@@ -228,7 +216,7 @@ def get_user_storage_bytes(firebase_uid: str, exclude_book_id: Optional[str] = N
     try:
         with DatabaseManager.get_read_connection() as conn:
             with conn.cursor() as cursor:
-                columns = _get_columns(cursor)
+                columns = _get_columns()
                 if "SIZE_BYTES" not in columns:
                     return 0
 
@@ -269,7 +257,7 @@ def list_pending_parse_jobs(limit: int = 100) -> list[Dict[str, Any]]:
     try:
         with DatabaseManager.get_read_connection() as conn:
             with conn.cursor() as cursor:
-                columns = _get_columns(cursor)
+                columns = _get_columns()
                 required = {"PARSE_STATUS", "OBJECT_KEY", "BUCKET_NAME", "STATUS"}
                 if not required.issubset(columns):
                     return rows
@@ -325,7 +313,7 @@ def list_stale_parse_jobs(stale_after_sec: int, limit: int = 100) -> list[Dict[s
     try:
         with DatabaseManager.get_read_connection() as conn:
             with conn.cursor() as cursor:
-                columns = _get_columns(cursor)
+                columns = _get_columns()
                 required = {"PARSE_STATUS", "OBJECT_KEY", "BUCKET_NAME", "STATUS", "UPDATED_AT"}
                 if not required.issubset(columns):
                     return rows
@@ -407,7 +395,7 @@ def list_pending_storage_deletes(limit: int = 100) -> list[Dict[str, Any]]:
     try:
         with DatabaseManager.get_read_connection() as conn:
             with conn.cursor() as cursor:
-                columns = _get_columns(cursor)
+                columns = _get_columns()
                 if "STORAGE_STATUS" not in columns or "OBJECT_KEY" not in columns:
                     return rows
                 cursor.execute(
@@ -1,16 +1,14 @@
 import base64
 import html
-import json
 import re
 import threading
 import time
 from typing import Any, Dict, List, Optional, Tuple
 from urllib import parse as urllib_parse
-from urllib import request as urllib_request
-from urllib.error import HTTPError
 import concurrent.futures
 
 from config import settings
+from infrastructure import http_client
 from services.religious_dataset_search_service import get_religious_dataset_candidates
 from utils.logger import get_logger
 
@@ -34,12 +32,6 @@ _HADITH_NUMBER_RE = re.compile(r"\b(?:hadis|hadith)\s*(?:no|numara|number)?\s*[:
 
 _QURAN_TOKEN_CACHE: Dict[str, Any] = {"token": None, "expires_at": 0.0}
 _QURAN_TOKEN_LOCK = threading.Lock()
-_CATEGORY_CACHE: Dict[str, Dict[str, Any]] = {}
-_CATEGORY_CACHE_LOCK = threading.Lock()
-_QURANENC_TRANSLATION_CACHE: Dict[str, Dict[str, Any]] = {}
-_QURANENC_TRANSLATION_CACHE_LOCK = threading.Lock()
-_ISLAMHOUSE_CATEGORY_TREE_CACHE: Dict[str, Dict[str, Any]] = {}
-_ISLAMHOUSE_CATEGORY_TREE_CACHE_LOCK = threading.Lock()
 
 
 def _normalize_ascii(text: str) -> str:
@@ -127,22 +119,31 @@ def _http_json(
     headers: Optional[Dict[str, str]] = None,
     data: Optional[bytes] = None,
     method: str = "GET",
+    cache_ttl_sec: Optional[float] = None,
 ) -> Optional[Any]:
     retries = max(0, int(getattr(settings, "ISLAMIC_API_HTTP_MAX_RETRY", 1)))
     req_headers = {"User-Agent": "TomeHub-IslamicExplorer/1.0"}
     if headers:
         req_headers.update({str(k): str(v) for k, v in headers.items()})
-    req = urllib_request.Request(url=url, data=data, headers=req_headers, method=method)
     # Optimized timeout: 3 seconds
     effective_timeout = float(timeout_sec or getattr(settings, "ISLAMIC_API_HTTP_TIMEOUT_SEC", 3.0))
+    # Only idempotent reads are cached; token exchanges go out every time.
+    if cache_ttl_sec is None:
+        cache_ttl_sec = float(getattr(settings, "ISLAMIC_API_HTTP_CACHE_TTL_SEC", 600)) if method.upper() == "GET" else 0.0
     for idx in range(retries + 1):
         try:
-            with urllib_request.urlopen(req, timeout=effective_timeout) as resp:
-                charset = resp.headers.get_content_charset() or "utf-8"
-                payload = resp.read().decode(charset, errors="replace")
-                return json.loads(payload)
-        except HTTPError as exc:
-            code = int(getattr(exc, "code", 0) or 0)
+            return http_client.request_json(
+                method,
+                url,
+                provider="islamic_api",
+                timeout_sec=effective_timeout,
+                headers=req_headers,
+                body=data,
+                cache_ttl_sec=cache_ttl_sec,
+                negative_ttl_sec=cache_ttl_sec,
+            )
+        except http_client.HttpStatusError as exc:
+            code = exc.code
             if idx < retries and (code == 429 or code >= 500):
                 time.sleep(0.2 * (idx + 1))
                 continue
@@ -207,12 +208,7 @@ def _quranenc_list_translations(language: str) -> List[Dict[str, Any]]:
     if not bool(getattr(settings, "QURANENC_ENABLED", True)):
         return []
     lang = str(language or getattr(settings, "QURANENC_DEFAULT_LANGUAGE", "tr") or "tr").strip().lower() or "tr"
-    now = time.time()
     ttl = max(300, int(getattr(settings, "QURANENC_TRANSLATION_CACHE_TTL_SEC", 21600) or 21600))
-    with _QURANENC_TRANSLATION_CACHE_LOCK:
-        cached = _QURANENC_TRANSLATION_CACHE.get(lang)
-        if cached and float(cached.get("expires_at") or 0.0) > now:
-            return list(cached.get("data") or [])
     base_url = str(getattr(settings, "QURANENC_API_BASE_URL", "") or "").strip().rstrip("/")
     if not base_url:
         return []
@@ -220,12 +216,9 @@ def _quranenc_list_translations(language: str) -> List[Dict[str, Any]]:
         f"{base_url}/translations/list/{urllib_parse.quote(lang)}"
         f"?localization={urllib_parse.quote(lang)}"
     )
-    response = _http_json(url)
+    response = _http_json(url, cache_ttl_sec=ttl)
     rows = (response or {}).get("translations") if isinstance(response, dict) else None
-    translations = rows if isinstance(rows, list) else []
-    with _QURANENC_TRANSLATION_CACHE_LOCK:
-        _QURANENC_TRANSLATION_CACHE[lang] = {"expires_at": now + ttl, "data": translations}
-    return translations
+    return list(rows) if isinstance(rows, list) else []
 
 
 def _quranenc_translation_key(language: Optional[str] = None) -> Optional[str]:
@@ -317,23 +310,15 @@ def _islamhouse_category_tree(language: str) -> List[Dict[str, Any]]:
     if not bool(getattr(settings, "ISLAMHOUSE_ENABLED", True)):
         return []
     lang = str(language or getattr(settings, "ISLAMHOUSE_DEFAULT_LANGUAGE", "tr") or "tr").strip().lower() or "tr"
-    now = time.time()
     ttl = max(300, int(getattr(settings, "ISLAMHOUSE_CATEGORY_CACHE_TTL_SEC", 21600) or 21600))
-    with _ISLAMHOUSE_CATEGORY_TREE_CACHE_LOCK:
-        cached = _ISLAMHOUSE_CATEGORY_TREE_CACHE.get(lang)
-        if cached and float(cached.get("expires_at") or 0.0) > now:
-            return list(cached.get("data") or [])
     base_url = str(getattr(settings, "ISLAMHOUSE_API_BASE_URL", "") or "").strip().rstrip("/")
     api_key = str(getattr(settings, "ISLAMHOUSE_API_KEY", "") or "").strip()
     if not base_url or not api_key:
         return []
     url = f"{base_url}/{urllib_parse.quote(api_key)}/main/get-object-category-tree/{urllib_parse.quote(lang)}/json"
-    response = _http_json(url)
+    response = _http_json(url, cache_ttl_sec=ttl)
     rows = (response or {}).get("sub_categories") if isinstance(response, dict) else None
-    categories = rows if isinstance(rows, list) else []
-    with _ISLAMHOUSE_CATEGORY_TREE_CACHE_LOCK:
-        _ISLAMHOUSE_CATEGORY_TREE_CACHE[lang] = {"expires_at": now + ttl, "data": categories}
-    return categories
+    return list(rows) if isinstance(rows, list) else []
 
 
 def _flatten_islamhouse_categories(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -814,18 +799,10 @@ def _normalize_quran_foundation_exact(verse: Dict[str, Any]) -> Optional[Dict[st
 
 def _get_hadeethenc_categories(language: str) -> List[Dict[str, Any]]:
     lang = str(language or "tr").strip().lower() or "tr"
-    now = time.time()
     ttl = max(300, int(getattr(settings, "HADEETHENC_CATEGORY_CACHE_TTL_SEC", 21600) or 21600))
-    with _CATEGORY_CACHE_LOCK:
-        cached = _CATEGORY_CACHE.get(lang)
-        if cached and float(cached.get("expires_at") or 0.0) > now:
-            return list(cached.get("data") or [])
     url = f"{str(getattr(settings, 'HADEETHENC_API_BASE_URL', '')).rstrip('/')}/categories/list/?language={urllib_parse.quote(lang)}"
-    response = _http_json(url)
-    rows = response if isinstance(response, list) else []
-    with _CATEGORY_CACHE_LOCK:
-        _CATEGORY_CACHE[lang] = {"expires_at": now + ttl, "data": rows}
-    return rows
+    response = _http_json(url, cache_ttl_sec=ttl)
+    return list(response) if isinstance(response, list) else []
 
 
 def _pick_hadeethenc_category_ids(question: str, limit: int) -> List[str]:
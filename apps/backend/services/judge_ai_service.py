@@ -16,7 +16,7 @@ from services.rubric import (
     get_verdict,
     generate_hints_from_failures
 )
-from services.embedding_service import get_embedding
+from services.embedding_service import get_embedding, get_embeddings_memoized
 from utils.spell_checker import get_spell_checker
 import numpy as np
 
@@ -240,8 +240,8 @@ def verify_relevance(question: str, answer: str, intent: str) -> Tuple[float, Li
     violations = []
     
     # Step 1: Semantic Similarity
-    q_emb = get_embedding(question)
-    a_emb = get_embedding(answer)
+    # One batched request at most: the question is usually memoized from retrieval.
+    q_emb, a_emb = get_embeddings_memoized([question, answer])
     similarity = cosine_similarity(q_emb, a_emb)
     
     # NOTE: Don't inflate the score - use raw similarity with realistic ceiling
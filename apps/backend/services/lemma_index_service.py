@@ -0,0 +1,314 @@
+"""
+Per-book lemma inverted index.
+
+TOMEHUB_LEMMA_INDEX holds one posting per (chunk, lemma): term frequency, page,
+chunk index and the token positions of the lemma inside the chunk. It is written
+in the ingestion transaction from the same lemma analysis that fills TOKEN_FREQ,
+replaced on re-ingest and removed with the content rows on purge.
+
+Analytics (counts, page distribution, concordance, comparative stats) read it as
+indexed lookups and fall back to CLOB scans for books ingested before it existed.
+"""
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config import settings
+from infrastructure.db_manager import DatabaseManager
+from utils.logger import get_logger
+
+logger = get_logger("lemma_index_service")
+
+LEMMA_INDEX_TABLE = "TOMEHUB_LEMMA_INDEX"
+_MAX_LEMMA_BYTES = 128
+_MAX_POSITIONS_PER_POSTING = 64
+_INSERT_BATCH_SIZE = 1000
+
+
+def _is_missing_table_or_column(error: Exception) -> bool:
+    text = str(error or "")
+    return "ORA-00942" in text or "ORA-00904" in text
+
+
+def is_enabled() -> bool:
+    return bool(getattr(settings, "ANALYTICS_LEMMA_INDEX_ENABLED", True))
+
+
+def build_postings(lemma_positions: Dict[str, List[int]]) -> List[Tuple[str, int, str]]:
+    """Turn a {lemma: [positions]} map into (lemma, term_freq, positions_json) rows."""
+    postings: List[Tuple[str, int, str]] = []
+    for lemma, positions in (lemma_positions or {}).items():
+        key = str(lemma or "").strip().lower()
+        if not key or len(key.encode("utf-8")) > _MAX_LEMMA_BYTES:
+            continue
+        hits = [int(p) for p in (positions or [])]
+        if not hits:
+            continue
+        postings.append((key, len(hits), json.dumps(hits[:_MAX_POSITIONS_PER_POSTING])))
+    return postings
+
+
+def _bind_list(prefix: str, values: Sequence[Any]) -> Tuple[str, Dict[str, Any]]:
+    binds = {f"{prefix}{i}": value for i, value in enumerate(values)}
+    return ", ".join(f":{key}" for key in binds), binds
+
+
+def delete_item_lemma_index(cursor, *, firebase_uid: str, book_id: str) -> int:
+    """Remove all postings of one item. Runs on the caller's transaction."""
+    if not firebase_uid or not book_id:
+        return 0
+    try:
+        cursor.execute(
+            f"DELETE FROM {LEMMA_INDEX_TABLE} WHERE FIREBASE_UID = :p_uid AND ITEM_ID = :p_book",
+            {"p_uid": firebase_uid, "p_book": book_id},
+        )
+        return int(cursor.rowcount or 0)
+    except Exception as e:
+        if _is_missing_table_or_column(e):
+            return 0
+        raise
+
+
+def content_rows_by_chunk_index(
+    cursor,
+    *,
+    firebase_uid: str,
+    book_id: str,
+    content_type: str,
+) -> Dict[int, Tuple[int, Any]]:
+    """{chunk_index: (content_id, page_number)} for one item's rows of a content type."""
+    cursor.execute(
+        """
+        SELECT ID, CHUNK_INDEX, PAGE_NUMBER
+        FROM TOMEHUB_CONTENT_V2
+        WHERE FIREBASE_UID = :p_uid
+          AND ITEM_ID = :p_book
+          AND CONTENT_TYPE = :p_type
+        """,
+        {"p_uid": firebase_uid, "p_book": book_id, "p_type": str(content_type or "").upper()},
+    )
+    resolved: Dict[int, Tuple[int, Any]] = {}
+    for content_id, chunk_index, page_number in cursor.fetchall() or []:
+        if content_id is None or chunk_index is None:
+            continue
+        resolved[int(chunk_index)] = (int(content_id), page_number)
+    return resolved
+
+
+def replace_item_lemma_index(
+    cursor,
+    *,
+    firebase_uid: str,
+    book_id: str,
+    content_type: str,
+    postings_by_chunk_index: Dict[int, List[Tuple[str, int, str]]],
+) -> int:
+    """
+    Rebuild the postings of one item inside the ingestion transaction.
+
+    Content ids are resolved with one SELECT on (uid, item, content_type) so the
+    bulk content insert does not need RETURNING variables. The old postings are
+    deleted first; if writing the new ones fails, the writes are rolled back to
+    a savepoint so the item is left with no postings and analytics fall back to
+    the CLOB scan instead of reading a partial index. A failing delete is raised,
+    since stale postings would be served as authoritative.
+    """
+    if not is_enabled() or not firebase_uid or not book_id:
+        return 0
+    delete_item_lemma_index(cursor, firebase_uid=firebase_uid, book_id=book_id)
+    if not postings_by_chunk_index:
+        return 0
+
+    cursor.execute("SAVEPOINT lemma_index_write")
+    try:
+        rows: List[Dict[str, Any]] = []
+        resolved = content_rows_by_chunk_index(
+            cursor, firebase_uid=firebase_uid, book_id=book_id, content_type=content_type
+        )
+        for chunk_index, (content_id, page_number) in resolved.items():
+            for lemma, term_freq, positions_json in postings_by_chunk_index.get(int(chunk_index), []):
+                rows.append(
+                    {
+                        "p_uid": firebase_uid,
+                        "p_book": book_id,
+                        "p_cid": content_id,
+                        "p_lemma": lemma,
+                        "p_tf": int(term_freq),
+                        "p_page": page_number,
+                        "p_chunk_idx": chunk_index,
+                        "p_pos": positions_json,
+                    }
+                )
+
+        for start in range(0, len(rows), _INSERT_BATCH_SIZE):
+            cursor.executemany(
+                f"""
+                INSERT INTO {LEMMA_INDEX_TABLE}
+                (FIREBASE_UID, ITEM_ID, CONTENT_ID, LEMMA, TERM_FREQ, PAGE_NUMBER, CHUNK_INDEX, POSITIONS_JSON)
+                VALUES (:p_uid, :p_book, :p_cid, :p_lemma, :p_tf, :p_page, :p_chunk_idx, :p_pos)
+                """,
+                rows[start:start + _INSERT_BATCH_SIZE],
+            )
+        return len(rows)
+    except Exception as e:
+        cursor.execute("ROLLBACK TO SAVEPOINT lemma_index_write")
+        if not _is_missing_table_or_column(e):
+            logger.warning(
+                "lemma index write failed; item left unindexed",
+                extra={"book_id": book_id, "uid": firebase_uid, "error": str(e)},
+            )
+        return 0
+
+
+def _indexed_book_ids(cursor, firebase_uid: str, book_ids: Sequence[str]) -> set[str]:
+    # One EXISTS probe per book keeps this on the (uid, item) index prefix
+    # instead of walking every posting of large books.
+    probes = []
+    binds: Dict[str, Any] = {"p_uid": firebase_uid}
+    for i, bid in enumerate(book_ids):
+        binds[f"p_b{i}"] = bid
+        probes.append(
+            f"SELECT :p_b{i} FROM DUAL WHERE EXISTS ("
+            f"SELECT 1 FROM {LEMMA_INDEX_TABLE} WHERE FIREBASE_UID = :p_uid AND ITEM_ID = :p_b{i})"
+        )
+    cursor.execute(" UNION ALL ".join(probes), binds)
+    return {str(row[0]) for row in cursor.fetchall() or [] if row and row[0]}
+
+
+def get_indexed_counts(firebase_uid: str, book_ids: Iterable[str], lemmas: Sequence[str]) -> Dict[str, int]:
+    """
+    Total occurrences of `lemmas` per book, for books that have postings.
+    Books missing from the result are not indexed and need the scan fallback.
+    """
+    ids = [str(b) for b in dict.fromkeys(book_ids or []) if b]
+    lemma_keys = [str(l).strip().lower() for l in dict.fromkeys(lemmas or []) if l]
+    if not is_enabled() or not firebase_uid or not ids or not lemma_keys:
+        return {}
+    try:
+        with DatabaseManager.get_read_connection() as conn:
+            with conn.cursor() as cursor:
+                indexed = _indexed_book_ids(cursor, firebase_uid, ids)
+                if not indexed:
+                    return {}
+                book_clause, book_binds = _bind_list("p_b", sorted(indexed))
+                lemma_clause, lemma_binds = _bind_list("p_l", lemma_keys)
+                cursor.execute(
+                    f"""
+                    SELECT ITEM_ID, SUM(TERM_FREQ)
+                    FROM {LEMMA_INDEX_TABLE}
+                    WHERE FIREBASE_UID = :p_uid
+                      AND ITEM_ID IN ({book_clause})
+                      AND LEMMA IN ({lemma_clause})
+                    GROUP BY ITEM_ID
+                    """,
+                    {"p_uid": firebase_uid, **book_binds, **lemma_binds},
+                )
+                counts = {bid: 0 for bid in indexed}
+                for item_id, total in cursor.fetchall() or []:
+                    counts[str(item_id)] = int(total or 0)
+                return counts
+    except Exception as e:
+        if not _is_missing_table_or_column(e):
+            logger.warning("lemma index count lookup failed", extra={"uid": firebase_uid, "error": str(e)})
+        return {}
+
+
+def get_indexed_page_distribution(
+    firebase_uid: str,
+    book_id: str,
+    lemmas: Sequence[str],
+) -> Optional[List[Dict[str, int]]]:
+    """Per-page occurrence counts, or None when the book has no postings."""
+    lemma_keys = [str(l).strip().lower() for l in dict.fromkeys(lemmas or []) if l]
+    if not is_enabled() or not firebase_uid or not book_id or not lemma_keys:
+        return None
+    try:
+        with DatabaseManager.get_read_connection() as conn:
+            with conn.cursor() as cursor:
+                if not _indexed_book_ids(cursor, firebase_uid, [book_id]):
+                    return None
+                lemma_clause, lemma_binds = _bind_list("p_l", lemma_keys)
+                cursor.execute(
+                    f"""
+                    SELECT PAGE_NUMBER, SUM(TERM_FREQ)
+                    FROM {LEMMA_INDEX_TABLE}
+                    WHERE FIREBASE_UID = :p_uid
+                      AND ITEM_ID = :p_book
+                      AND LEMMA IN ({lemma_clause})
+                      AND PAGE_NUMBER IS NOT NULL
+                    GROUP BY PAGE_NUMBER
+                    ORDER BY PAGE_NUMBER
+                    """,
+                    {"p_uid": firebase_uid, "p_book": book_id, **lemma_binds},
+                )
+                return [
+                    {"page_number": int(page), "count": int(total or 0)}
+                    for page, total in cursor.fetchall() or []
+                    if page and total
+                ]
+    except Exception as e:
+        if not _is_missing_table_or_column(e):
+            logger.warning("lemma index distribution lookup failed", extra={"uid": firebase_uid, "book_id": book_id, "error": str(e)})
+        return None
+
+
+def get_indexed_context_chunks(
+    firebase_uid: str,
+    book_id: str,
+    lemmas: Sequence[str],
+    *,
+    limit: int = 50,
+    offset: int = 0,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Matching chunks in reading order for concordance, or None when not indexed.
+    Each row carries the first recorded token positions for snippet alignment.
+    """
+    lemma_keys = [str(l).strip().lower() for l in dict.fromkeys(lemmas or []) if l]
+    if not is_enabled() or not firebase_uid or not book_id or not lemma_keys:
+        return None
+    try:
+        with DatabaseManager.get_read_connection() as conn:
+            with conn.cursor() as cursor:
+                if not _indexed_book_ids(cursor, firebase_uid, [book_id]):
+                    return None
+                lemma_clause, lemma_binds = _bind_list("p_l", lemma_keys)
+                cursor.execute(
+                    f"""
+                    SELECT CONTENT_ID, PAGE_NUMBER, MIN(CHUNK_INDEX), SUM(TERM_FREQ), MIN(POSITIONS_JSON)
+                    FROM {LEMMA_INDEX_TABLE}
+                    WHERE FIREBASE_UID = :p_uid
+                      AND ITEM_ID = :p_book
+                      AND LEMMA IN ({lemma_clause})
+                    GROUP BY CONTENT_ID, PAGE_NUMBER
+                    ORDER BY PAGE_NUMBER, MIN(CHUNK_INDEX), CONTENT_ID
+                    OFFSET :p_offset ROWS FETCH NEXT :p_limit ROWS ONLY
+                    """,
+                    {
+                        "p_uid": firebase_uid,
+                        "p_book": book_id,
+                        "p_offset": max(0, int(offset or 0)),
+                        "p_limit": max(1, int(limit or 50)),
+                        **lemma_binds,
+                    },
+                )
+                chunks: List[Dict[str, Any]] = []
+                for content_id, page_number, chunk_index, term_freq, positions_json in cursor.fetchall() or []:
+                    try:
+                        positions = json.loads(positions_json) if positions_json else []
+                    except (TypeError, ValueError):
+                        positions = []
+                    chunks.append(
+                        {
+                            "content_id": int(content_id),
+                            "page_number": page_number,
+                            "chunk_index": chunk_index,
+                            "count": int(term_freq or 0),
+                            "positions": positions,
+                        }
+                    )
+                return chunks
+    except Exception as e:
+        if not _is_missing_table_or_column(e):
+            logger.warning("lemma index context lookup failed", extra={"uid": firebase_uid, "book_id": book_id, "error": str(e)})
+        return None
@@ -0,0 +1,248 @@
+"""
+Search-side lemma postings for the lemma lane.
+
+TOMEHUB_LEMMA_POSTINGS holds one (user, lemma, content_id, term_freq) row per
+lemma in a chunk's LEMMA_TOKENS, the same set `lemma_tokens LIKE '%"lemma"%'`
+matches. TERM_FREQ comes from TOKEN_FREQ when the row has it (book chunks) and
+is 1 otherwise. Postings are written in the insert transaction of every content
+path and deleted with the content rows. A failed postings write fails the
+content insert: a backfilled user is served from postings only, so a chunk
+without them would be invisible to the lane.
+
+Unlike TOMEHUB_LEMMA_INDEX (per-book analytics, book chunks only, with
+positions), this table covers every content type and is keyed for
+"postings of these lemmas for this user", so the lane can rank the top-k chunks
+in SQL. A user is served from it only after
+scripts/backfill_lemma_postings.py has indexed their older rows and recorded
+them in TOMEHUB_LEMMA_POSTINGS_STATE. Until then the lane keeps the LIKE scan.
+"""
+
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from config import settings
+from infrastructure.db_manager import safe_read_clob
+from infrastructure.schema_registry import schema_registry
+from utils.logger import get_logger
+
+logger = get_logger("lemma_postings_service")
+
+LEMMA_POSTINGS_TABLE = "TOMEHUB_LEMMA_POSTINGS"
+LEMMA_POSTINGS_STATE_TABLE = "TOMEHUB_LEMMA_POSTINGS_STATE"
+_MAX_LEMMA_BYTES = 128
+_INSERT_BATCH_SIZE = 1000
+_READY_TTL_SEC = 300.0
+_DOC_COUNT_TTL_SEC = 600.0
+
+_cache_lock = threading.Lock()
+_ready_cache: Dict[str, Tuple[float, bool]] = {}
+_doc_count_cache: Dict[str, Tuple[float, int]] = {}
+
+
+def _is_missing_table_or_column(error: Exception) -> bool:
+    text = str(error or "")
+    return "ORA-00942" in text or "ORA-00904" in text
+
+
+def is_enabled() -> bool:
+    return bool(getattr(settings, "SEARCH_LEMMA_POSTINGS_ENABLED", True)) and schema_registry.capabilities.lemma_postings
+
+
+def _load_json(raw: Any, default: Any) -> Any:
+    if raw is None:
+        return default
+    if not isinstance(raw, str):
+        raw = safe_read_clob(raw)
+    try:
+        return json.loads(raw) if raw else default
+    except (TypeError, ValueError):
+        return default
+
+
+def postings_from_tokens(lemmas_json: Any, token_freq_json: Any = None) -> List[Tuple[str, int]]:
+    """(lemma, term_freq) pairs for one content row from its LEMMA_TOKENS / TOKEN_FREQ values."""
+    lemmas = _load_json(lemmas_json, [])
+    freqs = _load_json(token_freq_json, {})
+    if not isinstance(lemmas, list):
+        return []
+    if not isinstance(freqs, dict):
+        freqs = {}
+    postings: Dict[str, int] = {}
+    for lemma in lemmas:
+        key = str(lemma or "")
+        if not key.strip() or len(key.encode("utf-8")) > _MAX_LEMMA_BYTES:
+            continue
+        try:
+            term_freq = max(1, int(freqs.get(key) or 1))
+        except (TypeError, ValueError):
+            term_freq = 1
+        postings[key] = term_freq
+    return list(postings.items())
+
+
+def _insert_rows(cursor, rows: List[Dict[str, Any]]) -> int:
+    """
+    Insert postings under a savepoint. A missing table (schema not migrated yet)
+    writes nothing; any other failure rolls the postings back and is raised so
+    the caller's content insert fails with it.
+    """
+    if not rows:
+        return 0
+    cursor.execute("SAVEPOINT lemma_postings_write")
+    try:
+        for start in range(0, len(rows), _INSERT_BATCH_SIZE):
+            cursor.executemany(
+                f"""
+                INSERT INTO {LEMMA_POSTINGS_TABLE} (FIREBASE_UID, LEMMA, CONTENT_ID, TERM_FREQ)
+                VALUES (:p_uid, :p_lemma, :p_cid, :p_tf)
+                """,
+                rows[start:start + _INSERT_BATCH_SIZE],
+            )
+    except Exception as e:
+        cursor.execute("ROLLBACK TO SAVEPOINT lemma_postings_write")
+        if _is_missing_table_or_column(e):
+            return 0
+        logger.warning("lemma postings write failed", extra={"uid": rows[0]["p_uid"], "error": str(e)})
+        raise
+    return len(rows)
+
+
+def write_content_postings(
+    cursor,
+    *,
+    firebase_uid: str,
+    content_id: Any,
+    lemmas_json: Any,
+    token_freq_json: Any = None,
+) -> int:
+    """
+    Add the postings of one freshly inserted content row, on the caller's
+    transaction. Raises on write failure (see _insert_rows).
+    """
+    if not firebase_uid or content_id is None:
+        return 0
+    rows = [
+        {"p_uid": firebase_uid, "p_lemma": lemma, "p_cid": int(content_id), "p_tf": term_freq}
+        for lemma, term_freq in postings_from_tokens(lemmas_json, token_freq_json)
+    ]
+    return _insert_rows(cursor, rows)
+
+
+def write_item_postings(
+    cursor,
+    *,
+    firebase_uid: str,
+    content_ids_by_chunk_index: Dict[int, Any],
+    tokens_by_chunk_index: Dict[int, Tuple[Any, Any]],
+) -> int:
+    """Postings for a bulk chunk insert whose ids were resolved by chunk index."""
+    if not firebase_uid or not tokens_by_chunk_index:
+        return 0
+    rows: List[Dict[str, Any]] = []
+    for chunk_index, (lemmas_json, token_freq_json) in tokens_by_chunk_index.items():
+        content_id = content_ids_by_chunk_index.get(int(chunk_index))
+        if content_id is None:
+            continue
+        for lemma, term_freq in postings_from_tokens(lemmas_json, token_freq_json):
+            rows.append({"p_uid": firebase_uid, "p_lemma": lemma, "p_cid": int(content_id), "p_tf": term_freq})
+    return _insert_rows(cursor, rows)
+
+
+def mark_user_backfilled(cursor, firebase_uid: str) -> None:
+    cursor.execute(
+        f"""
+        MERGE INTO {LEMMA_POSTINGS_STATE_TABLE} s
+        USING (SELECT :p_uid AS FIREBASE_UID FROM DUAL) src
+        ON (s.FIREBASE_UID = src.FIREBASE_UID)
+        WHEN MATCHED THEN UPDATE SET s.BACKFILLED_AT = SYSTIMESTAMP
+        WHEN NOT MATCHED THEN INSERT (FIREBASE_UID) VALUES (src.FIREBASE_UID)
+        """,
+        {"p_uid": firebase_uid},
+    )
+    with _cache_lock:
+        _ready_cache.pop(firebase_uid, None)
+
+
+def postings_ready(cursor, firebase_uid: str) -> bool:
+    """True once the user's pre-existing rows have been backfilled (cached per worker)."""
+    if not firebase_uid or not is_enabled():
+        return False
+    now = time.monotonic()
+    with _cache_lock:
+        cached = _ready_cache.get(firebase_uid)
+    if cached is not None and now - cached[0] < _READY_TTL_SEC:
+        return cached[1]
+    try:
+        cursor.execute(
+            f"SELECT 1 FROM {LEMMA_POSTINGS_STATE_TABLE} WHERE FIREBASE_UID = :p_uid",
+            {"p_uid": firebase_uid},
+        )
+        ready = cursor.fetchone() is not None
+    except Exception as e:
+        if not _is_missing_table_or_column(e):
+            logger.warning("lemma postings state lookup failed", extra={"uid": firebase_uid, "error": str(e)})
+        ready = False
+    with _cache_lock:
+        _ready_cache[firebase_uid] = (now, ready)
+    return ready
+
+
+def user_document_count(cursor, firebase_uid: str) -> int:
+    """N for the idf term. Cached per worker; it only shifts lemma weights, not membership."""
+    now = time.monotonic()
+    with _cache_lock:
+        cached = _doc_count_cache.get(firebase_uid)
+    if cached is not None and now - cached[0] < _DOC_COUNT_TTL_SEC:
+        return cached[1]
+    cursor.execute("SELECT COUNT(*) FROM TOMEHUB_CONTENT_V2 WHERE firebase_uid = :p_uid", {"p_uid": firebase_uid})
+    row = cursor.fetchone()
+    count = max(1, int(row[0] or 0)) if row else 1
+    with _cache_lock:
+        _doc_count_cache[firebase_uid] = (now, count)
+    return count
+
+
+def topk_cte(lemmas: Sequence[str], document_count: int) -> Tuple[str, Dict[str, Any]]:
+    """
+    WITH clause exposing `lemma_scores(CONTENT_ID, LEMMA_SCORE, LEMMA_HITS)` for
+    the query lemmas: sum over matched lemmas of (1 + ln tf) * ln(1 + N / df).
+    Only postings of those lemmas are read; the caller joins the content rows,
+    applies its filters and orders by LEMMA_SCORE.
+    """
+    binds: Dict[str, Any] = {"p_docs": float(max(1, int(document_count)))}
+    lemma_binds = []
+    for i, lemma in enumerate(lemmas):
+        binds[f"p_pl{i}"] = lemma
+        lemma_binds.append(f":p_pl{i}")
+    sql = f"""
+        WITH lemma_hits AS (
+            SELECT p.CONTENT_ID, p.LEMMA, p.TERM_FREQ
+            FROM {LEMMA_POSTINGS_TABLE} p
+            WHERE p.FIREBASE_UID = :p_uid
+              AND p.LEMMA IN ({', '.join(lemma_binds)})
+        ),
+        lemma_df AS (
+            SELECT LEMMA, COUNT(*) AS DF FROM lemma_hits GROUP BY LEMMA
+        ),
+        lemma_scores AS (
+            SELECT h.CONTENT_ID,
+                   SUM((1 + LN(h.TERM_FREQ)) * LN(1 + :p_docs / d.DF)) AS LEMMA_SCORE,
+                   COUNT(*) AS LEMMA_HITS
+            FROM lemma_hits h
+            JOIN lemma_df d ON d.LEMMA = h.LEMMA
+            GROUP BY h.CONTENT_ID
+        )
+    """
+    return sql, binds
+
+
+def clear_caches(firebase_uid: Optional[str] = None) -> None:
+    with _cache_lock:
+        if firebase_uid:
+            _ready_cache.pop(firebase_uid, None)
+            _doc_count_cache.pop(firebase_uid, None)
+        else:
+            _ready_cache.clear()
+            _doc_count_cache.clear()
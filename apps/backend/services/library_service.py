@@ -7,7 +7,10 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import oracledb
 
+from infrastructure.async_db import Fetch, QueryPlan, run_plan, run_plan_async
+from infrastructure.cursor_profiles import QUERY_CLASS_CANDIDATE_SCAN
 from infrastructure.db_manager import DatabaseManager, safe_read_clob
+from infrastructure.schema_registry import schema_registry
 from services.ingestion_service import purge_item_content
 from services.category_taxonomy_service import (
     extract_book_categories_from_tags,
@@ -17,31 +20,16 @@ from utils.logger import get_logger
 
 logger = get_logger("library_service")
 
-_TABLE_COLUMNS_CACHE: dict[str, set[str]] = {}
-
 _ITEM_TYPES = {"BOOK", "ARTICLE", "PERSONAL_NOTE", "MOVIE", "SERIES"}
 _CONTENT_TYPE_CANDIDATES = ("CONTENT_TYPE", "SOURCE_TYPE")
 _ITEM_ID_CANDIDATES = ("ITEM_ID", "BOOK_ID")
 _LIBRARY_TABLE = "TOMEHUB_LIBRARY_ITEMS"
 
 
-def _columns_for(table_name: str, *, force_refresh: bool = False) -> set[str]:
-    key = table_name.upper()
-    if key in _TABLE_COLUMNS_CACHE and not force_refresh:
-        return _TABLE_COLUMNS_CACHE[key]
-    with DatabaseManager.get_read_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT COLUMN_NAME
-                FROM USER_TAB_COLUMNS
-                WHERE TABLE_NAME = :p_table
-                """,
-                {"p_table": key},
-            )
-            cols = {str(r[0]).upper() for r in cur.fetchall()}
-    _TABLE_COLUMNS_CACHE[key] = cols
-    return cols
+def _columns_for(table_name: str, *, force_refresh: bool = False) -> frozenset[str]:
+    if force_refresh:
+        schema_registry.refresh()
+    return schema_registry.columns(table_name)
 
 
 def _table_exists(table_name: str) -> bool:
@@ -229,6 +217,8 @@ def _encode_cursor(updated_at_ms: int, item_id: str) -> str:
 def ensure_library_rating_column() -> None:
     """Add/migrate RATING column in library table for half-star support (idempotent)."""
     cols = _library_cols()
+    if not schema_registry.is_loaded:
+        return
     if "RATING" in cols:
         # Column already exists — try to widen to NUMBER(3,1) for half-stars (no-op if already correct).
         try:
@@ -238,7 +228,7 @@ def ensure_library_rating_column() -> None:
                         f"ALTER TABLE {_LIBRARY_TABLE} MODIFY (RATING NUMBER(3,1))"
                     )
                 conn.commit()
-            _TABLE_COLUMNS_CACHE.pop(_LIBRARY_TABLE, None)
+            schema_registry.refresh()
         except Exception:
             pass  # Already correct type or unsupported; non-fatal.
         return
@@ -249,12 +239,12 @@ def ensure_library_rating_column() -> None:
                     f"ALTER TABLE {_LIBRARY_TABLE} ADD (RATING NUMBER(3,1) CHECK (RATING BETWEEN 0.5 AND 5))"
                 )
             conn.commit()
-        _TABLE_COLUMNS_CACHE.pop(_LIBRARY_TABLE, None)
+        schema_registry.refresh()
         logger.info("Added RATING column to %s", _LIBRARY_TABLE)
     except Exception as e:
         msg = str(e).lower()
         if "already" in msg or "ora-01430" in msg or "ora-00955" in msg:
-            _TABLE_COLUMNS_CACHE.pop(_LIBRARY_TABLE, None)
+            schema_registry.refresh()
             return
         logger.warning("Could not add RATING column: %s", e)
 
@@ -339,7 +329,7 @@ def ensure_personal_note_folders_table() -> None:
                         continue
                     raise
         conn.commit()
-    _TABLE_COLUMNS_CACHE.pop("TOMEHUB_PERSONAL_NOTE_FOLDERS", None)
+    schema_registry.refresh()
 
 
 def _canonical_item_type(value: Optional[str]) -> str:
@@ -351,14 +341,14 @@ def _canonical_item_type(value: Optional[str]) -> str:
     return "BOOK"
 
 
-def list_library_items(
+def _library_items_plan(
     firebase_uid: str,
     *,
-    limit: int = 1000,
-    cursor: Optional[str] = None,
-    types: Optional[list[str]] = None,
-    include_media: bool = True,
-) -> dict:
+    limit: int,
+    cursor: Optional[str],
+    types: Optional[list[str]],
+    include_media: bool,
+) -> QueryPlan[dict]:
     limit = max(1, min(int(limit or 1000), 2000))
     decoded_cursor = _decode_cursor(cursor)
     requested_types = [_canonical_item_type(t) for t in (types or []) if str(t or "").strip()]
@@ -431,176 +421,201 @@ def list_library_items(
         FETCH FIRST :p_limit ROWS ONLY
     """
 
-    with DatabaseManager.get_read_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute(sql, binds)
-            fetched = cur.fetchall()
-
-            has_more = len(fetched) > limit
-            visible = fetched[:limit]
-
-            item_ids: list[str] = []
-            for r in visible:
-                item_id = str(r[0])
-                updated_ms = _ts_to_ms(r[26] or r[23])
-                item = {
-                    "id": item_id,
-                    "type": _canonical_item_type(r[1]),
-                    "title": str(r[2] or "").strip() or "Untitled",
-                    "author": str(r[3] or "").strip() or "Unknown Author",
-                    "translator": str(r[4] or "").strip() or None,
-                    "publisher": str(r[5] or "").strip() or None,
-                    "publicationYear": str(r[6]) if r[6] is not None else None,
-                    "isbn": str(r[7] or "").strip() or None,
-                    "url": str(r[8] or "").strip() or None,
-                    "status": str(r[9] or "On Shelf"),
-                    "readingStatus": str(r[10] or "To Read"),
-                    "tags": _safe_json_list(r[11], field_name="item_tags"),
-                    # Personal note body primarily comes from content table. For local-only
-                    # categories we fall back to the library summary metadata.
-                    "generalNotes": safe_read_clob(r[12]) if (str(r[1] or "").strip().upper() == "PERSONAL_NOTE" and r[12] is not None) else "",
-                    "summaryText": safe_read_clob(r[12]) if r[12] is not None else "",
-                    "contentLanguageMode": str(r[13] or "AUTO"),
-                    "contentLanguageResolved": str(r[14]).lower() if r[14] else None,
-                    "sourceLanguageHint": str(r[15]).lower() if r[15] else None,
-                    "languageDecisionReason": str(r[16] or "").strip() or None,
-                    "languageDecisionConfidence": float(r[17]) if r[17] is not None else None,
-                    "personalNoteCategory": str(r[18] or "").strip() or None,
-                    "personalFolderId": str(r[19] or "").strip() or None,
-                    "folderPath": safe_read_clob(r[20]) if r[20] is not None else None,
-                    "coverUrl": str(r[21] or "").strip() or None,
-                    "castTop": _safe_json_list(r[22], field_name="cast_top"),
-                    "addedAt": _ts_to_ms(r[23]),
-                    "isFavorite": bool(int(r[24])) if r[24] is not None else False,
-                    "pageCount": int(r[25]) if r[25] is not None else None,
-                    "rating": float(r[27]) if r[27] is not None else None,
-                    "originalTitle": str(r[28] or "").strip() or None,
-                    "highlights": [],
-                    "isIngested": False,
-                    "_updatedAtMs": updated_ms,
+    fetched = yield Fetch(sql, binds, query_class=QUERY_CLASS_CANDIDATE_SCAN)
+
+    has_more = len(fetched) > limit
+    visible = fetched[:limit]
+
+    item_ids: list[str] = []
+    for r in visible:
+        item_id = str(r[0])
+        updated_ms = _ts_to_ms(r[26] or r[23])
+        item = {
+            "id": item_id,
+            "type": _canonical_item_type(r[1]),
+            "title": str(r[2] or "").strip() or "Untitled",
+            "author": str(r[3] or "").strip() or "Unknown Author",
+            "translator": str(r[4] or "").strip() or None,
+            "publisher": str(r[5] or "").strip() or None,
+            "publicationYear": str(r[6]) if r[6] is not None else None,
+            "isbn": str(r[7] or "").strip() or None,
+            "url": str(r[8] or "").strip() or None,
+            "status": str(r[9] or "On Shelf"),
+            "readingStatus": str(r[10] or "To Read"),
+            "tags": _safe_json_list(r[11], field_name="item_tags"),
+            # Personal note body primarily comes from content table. For local-only
+            # categories we fall back to the library summary metadata.
+            "generalNotes": safe_read_clob(r[12]) if (str(r[1] or "").strip().upper() == "PERSONAL_NOTE" and r[12] is not None) else "",
+            "summaryText": safe_read_clob(r[12]) if r[12] is not None else "",
+            "contentLanguageMode": str(r[13] or "AUTO"),
+            "contentLanguageResolved": str(r[14]).lower() if r[14] else None,
+            "sourceLanguageHint": str(r[15]).lower() if r[15] else None,
+            "languageDecisionReason": str(r[16] or "").strip() or None,
+            "languageDecisionConfidence": float(r[17]) if r[17] is not None else None,
+            "personalNoteCategory": str(r[18] or "").strip() or None,
+            "personalFolderId": str(r[19] or "").strip() or None,
+            "folderPath": safe_read_clob(r[20]) if r[20] is not None else None,
+            "coverUrl": str(r[21] or "").strip() or None,
+            "castTop": _safe_json_list(r[22], field_name="cast_top"),
+            "addedAt": _ts_to_ms(r[23]),
+            "isFavorite": bool(int(r[24])) if r[24] is not None else False,
+            "pageCount": int(r[25]) if r[25] is not None else None,
+            "rating": float(r[27]) if r[27] is not None else None,
+            "originalTitle": str(r[28] or "").strip() or None,
+            "highlights": [],
+            "isIngested": False,
+            "_updatedAtMs": updated_ms,
+        }
+        rows.append(item)
+        item_ids.append(item_id)
+
+    # Ingestion status (best-effort)
+    if item_ids and _table_exists("TOMEHUB_INGESTED_FILES"):
+        phs = []
+        b2 = {"p_uid": firebase_uid}
+        for i, iid in enumerate(item_ids):
+            k = f"p_i_{i}"
+            phs.append(f":{k}")
+            b2[k] = iid
+        try:
+            ing_rows = yield Fetch(
+                f"""
+                SELECT BOOK_ID, STATUS
+                FROM TOMEHUB_INGESTED_FILES
+                WHERE FIREBASE_UID = :p_uid
+                  AND BOOK_ID IN ({', '.join(phs)})
+                """,
+                b2,
+                query_class=QUERY_CLASS_CANDIDATE_SCAN,
+            )
+            ing_map = {str(r[0]): str(r[1] or "").upper() for r in ing_rows}
+            for item in rows:
+                item["isIngested"] = ing_map.get(item["id"]) == "COMPLETED"
+        except Exception as e:
+            logger.warning(f"list_library_items ingestion-status join failed: {e}")
+
+    # Highlights / insights from active content table (best-effort)
+    content_table = resolve_active_content_table()
+    if item_ids and content_table:
+        shape = _content_table_shape(content_table)
+        item_col = shape["item_col"]
+        type_col = shape["type_col"]
+        if item_col and type_col and shape["content_col"]:
+            phs = []
+            b3 = {"p_uid": firebase_uid}
+            for i, iid in enumerate(item_ids):
+                k = f"p_h_{i}"
+                phs.append(f":{k}")
+                b3[k] = iid
+
+            # Build expressions safely
+            comment_expr = f'"{shape["comment_col"]}"' if shape["comment_col"] == "COMMENT" else (shape["comment_col"] or "NULL")
+            page_expr = shape["page_col"] or "NULL"
+            idx_expr = shape["chunk_idx_col"] or "NULL"
+            id_expr = shape["id_col"] or "NULL"
+            tags_expr = shape["tags_col"] or "NULL"
+            created_at_expr = shape["created_at_col"] or "NULL"
+            sql_h = f"""
+                SELECT
+                    {item_col} AS item_id,
+                    {id_expr} AS row_id,
+                    {type_col} AS src_type,
+                    {shape['content_col']} AS content_chunk,
+                    {page_expr} AS page_number,
+                    {idx_expr} AS chunk_index,
+                    {comment_expr} AS comment_text,
+                    {tags_expr} AS tags_json,
+                    {created_at_expr} AS created_at
+                FROM {content_table}
+                WHERE FIREBASE_UID = :p_uid
+                  AND {item_col} IN ({', '.join(phs)})
+                  AND UPPER({type_col}) IN ('HIGHLIGHT','INSIGHT','PERSONAL_NOTE')
+                ORDER BY {item_col}, {page_expr if shape['page_col'] else '1'}, {idx_expr if shape['chunk_idx_col'] else '1'}
+            """
+            try:
+                highlight_rows = yield Fetch(sql_h, b3, query_class=QUERY_CLASS_CANDIDATE_SCAN)
+                agg: dict[str, list[dict[str, Any]]] = {}
+                personal_note_body: dict[str, str] = {}
+                item_meta = {
+                    str(item.get("id") or ""): {
+                        "type": str(item.get("type") or "").upper(),
+                        "category": str(item.get("personalNoteCategory") or "").upper(),
+                    }
+                    for item in rows
                 }
-                rows.append(item)
-                item_ids.append(item_id)
-
-            # Ingestion status (best-effort)
-            if item_ids and _table_exists("TOMEHUB_INGESTED_FILES"):
-                phs = []
-                b2 = {"p_uid": firebase_uid}
-                for i, iid in enumerate(item_ids):
-                    k = f"p_i_{i}"
-                    phs.append(f":{k}")
-                    b2[k] = iid
-                try:
-                    cur.execute(
-                        f"""
-                        SELECT BOOK_ID, STATUS
-                        FROM TOMEHUB_INGESTED_FILES
-                        WHERE FIREBASE_UID = :p_uid
-                          AND BOOK_ID IN ({', '.join(phs)})
-                        """,
-                        b2,
+                for hr in highlight_rows:
+                    iid = str(hr[0] or "").strip()
+                    if not iid:
+                        continue
+                    src_type = str(hr[2] or "").upper()
+                    text = safe_read_clob(hr[3]) if hr[3] is not None else ""
+                    if not text:
+                        continue
+                    meta = item_meta.get(iid) or {}
+                    is_ideas_note_body = (
+                        meta.get("type") == "PERSONAL_NOTE"
+                        and meta.get("category") == "IDEAS"
+                        and src_type == "INSIGHT"
                     )
-                    ing_map = {str(r[0]): str(r[1] or "").upper() for r in cur.fetchall()}
-                    for item in rows:
-                        item["isIngested"] = ing_map.get(item["id"]) == "COMPLETED"
-                except Exception as e:
-                    logger.warning(f"list_library_items ingestion-status join failed: {e}")
-
-            # Highlights / insights from active content table (best-effort)
-            content_table = resolve_active_content_table()
-            if item_ids and content_table:
-                shape = _content_table_shape(content_table)
-                item_col = shape["item_col"]
-                type_col = shape["type_col"]
-                if item_col and type_col and shape["content_col"]:
-                    phs = []
-                    b3 = {"p_uid": firebase_uid}
-                    for i, iid in enumerate(item_ids):
-                        k = f"p_h_{i}"
-                        phs.append(f":{k}")
-                        b3[k] = iid
-
-                    # Build expressions safely
-                    comment_expr = f'"{shape["comment_col"]}"' if shape["comment_col"] == "COMMENT" else (shape["comment_col"] or "NULL")
-                    page_expr = shape["page_col"] or "NULL"
-                    idx_expr = shape["chunk_idx_col"] or "NULL"
-                    id_expr = shape["id_col"] or "NULL"
-                    tags_expr = shape["tags_col"] or "NULL"
-                    created_at_expr = shape["created_at_col"] or "NULL"
-                    sql_h = f"""
-                        SELECT
-                            {item_col} AS item_id,
-                            {id_expr} AS row_id,
-                            {type_col} AS src_type,
-                            {shape['content_col']} AS content_chunk,
-                            {page_expr} AS page_number,
-                            {idx_expr} AS chunk_index,
-                            {comment_expr} AS comment_text,
-                            {tags_expr} AS tags_json,
-                            {created_at_expr} AS created_at
-                        FROM {content_table}
-                        WHERE FIREBASE_UID = :p_uid
-                          AND {item_col} IN ({', '.join(phs)})
-                          AND UPPER({type_col}) IN ('HIGHLIGHT','INSIGHT','PERSONAL_NOTE')
-                        ORDER BY {item_col}, {page_expr if shape['page_col'] else '1'}, {idx_expr if shape['chunk_idx_col'] else '1'}
-                    """
-                    try:
-                        cur.execute(sql_h, b3)
-                        agg: dict[str, list[dict[str, Any]]] = {}
-                        personal_note_body: dict[str, str] = {}
-                        item_meta = {
-                            str(item.get("id") or ""): {
-                                "type": str(item.get("type") or "").upper(),
-                                "category": str(item.get("personalNoteCategory") or "").upper(),
-                            }
-                            for item in rows
+                    if src_type == "PERSONAL_NOTE" or is_ideas_note_body:
+                        personal_note_body[iid] = text
+                        continue
+                    h_type = "insight" if src_type == "INSIGHT" else "highlight"
+                    agg.setdefault(iid, []).append(
+                        {
+                            "id": str(hr[1]) if hr[1] is not None else f"{iid}-{len(agg.get(iid, []))}",
+                            "text": text,
+                            "type": h_type,
+                            "pageNumber": int(hr[4]) if hr[4] is not None else None,
+                            "comment": safe_read_clob(hr[6]) if hr[6] is not None else None,
+                            "createdAt": _ts_to_ms(hr[8]),
+                            "tags": _safe_json_list(hr[7], field_name="highlight_tags"),
+                            "isFavorite": False,
                         }
-                        for hr in cur.fetchall():
-                            iid = str(hr[0] or "").strip()
-                            if not iid:
-                                continue
-                            src_type = str(hr[2] or "").upper()
-                            text = safe_read_clob(hr[3]) if hr[3] is not None else ""
-                            if not text:
-                                continue
-                            meta = item_meta.get(iid) or {}
-                            is_ideas_note_body = (
-                                meta.get("type") == "PERSONAL_NOTE"
-                                and meta.get("category") == "IDEAS"
-                                and src_type == "INSIGHT"
-                            )
-                            if src_type == "PERSONAL_NOTE" or is_ideas_note_body:
-                                personal_note_body[iid] = text
-                                continue
-                            h_type = "insight" if src_type == "INSIGHT" else "highlight"
-                            agg.setdefault(iid, []).append(
-                                {
-                                    "id": str(hr[1]) if hr[1] is not None else f"{iid}-{len(agg.get(iid, []))}",
-                                    "text": text,
-                                    "type": h_type,
-                                    "pageNumber": int(hr[4]) if hr[4] is not None else None,
-                                    "comment": safe_read_clob(hr[6]) if hr[6] is not None else None,
-                                    "createdAt": _ts_to_ms(hr[8]),
-                                    "tags": _safe_json_list(hr[7], field_name="highlight_tags"),
-                                    "isFavorite": False,
-                                }
-                            )
-                        for item in rows:
-                            item["highlights"] = agg.get(item["id"], [])
-                            if item.get("type") == "PERSONAL_NOTE":
-                                item["generalNotes"] = personal_note_body.get(item["id"], item.get("generalNotes", ""))
-                    except Exception as e:
-                        logger.warning(f"list_library_items highlight query failed: {e}")
+                    )
+                for item in rows:
+                    item["highlights"] = agg.get(item["id"], [])
+                    if item.get("type") == "PERSONAL_NOTE":
+                        item["generalNotes"] = personal_note_body.get(item["id"], item.get("generalNotes", ""))
+            except Exception as e:
+                logger.warning(f"list_library_items highlight query failed: {e}")
 
-            if has_more and visible:
-                last = rows[-1]
-                next_cursor = _encode_cursor(int(last["_updatedAtMs"]), str(last["id"]))
+    if has_more and visible:
+        last = rows[-1]
+        next_cursor = _encode_cursor(int(last["_updatedAtMs"]), str(last["id"]))
 
     for item in rows:
         item.pop("_updatedAtMs", None)
     return {"items": rows, "next_cursor": next_cursor, "count": len(rows)}
 
 
+def list_library_items(
+    firebase_uid: str,
+    *,
+    limit: int = 1000,
+    cursor: Optional[str] = None,
+    types: Optional[list[str]] = None,
+    include_media: bool = True,
+) -> dict:
+    return run_plan(
+        _library_items_plan(firebase_uid, limit=limit, cursor=cursor, types=types, include_media=include_media)
+    )
+
+
+async def list_library_items_async(
+    firebase_uid: str,
+    *,
+    limit: int = 1000,
+    cursor: Optional[str] = None,
+    types: Optional[list[str]] = None,
+    include_media: bool = True,
+) -> dict:
+    """list_library_items on the asyncio pool (see infrastructure/async_db.py)."""
+    return await run_plan_async(
+        _library_items_plan(firebase_uid, limit=limit, cursor=cursor, types=types, include_media=include_media)
+    )
+
+
 def _clean_folder_payload(payload: dict[str, Any]) -> dict[str, Any]:
     category = str(payload.get("category") or "PRIVATE").strip().upper()
     if category not in {"PRIVATE", "DAILY", "IDEAS", "BOOKMARK"}:
@@ -7,6 +7,8 @@ from typing import Any, Dict, List, Optional
 
 from config import settings
 from infrastructure.db_manager import DatabaseManager, safe_read_clob
+from infrastructure.schema_registry import schema_registry
+from services.cache_service import get_cache
 from services.chat_history_service import get_session_history
 from services.library_service import _content_table_shape, resolve_active_content_table  # pragmatic reuse
 from services.llm_client import MODEL_TIER_LITE, generate_text, get_model_for_tier
@@ -17,21 +19,7 @@ _PROFILE_TABLE = "TOMEHUB_USER_MEMORY_PROFILES"
 
 
 def _table_exists(table_name: str) -> bool:
-    try:
-        with DatabaseManager.get_read_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(
-                    """
-                    SELECT COUNT(*)
-                    FROM USER_TABLES
-                    WHERE TABLE_NAME = :p_table
-                    """,
-                    {"p_table": table_name.upper()},
-                )
-                row = cursor.fetchone()
-                return bool(row and int(row[0] or 0) > 0)
-    except Exception:
-        return False
+    return schema_registry.has_table(table_name)
 
 
 def ensure_memory_profile_table() -> None:
@@ -67,6 +55,7 @@ def ensure_memory_profile_table() -> None:
                             continue
                         raise
                 conn.commit()
+        schema_registry.refresh()
     except Exception as exc:
         logger.warning("Could not ensure memory profile table: %s", exc)
 
@@ -399,6 +388,7 @@ def _store_memory_profile(firebase_uid: str, payload: Dict[str, Any]) -> Dict[st
                 },
             )
             conn.commit()
+    _invalidate_memory_snippet(firebase_uid)
     profile = get_memory_profile(firebase_uid) or {}
     profile["status"] = "ready"
     return profile
@@ -509,5 +499,28 @@ def build_memory_context_snippet(profile: Optional[Dict[str, Any]], *, max_chars
     return snippet[:max_chars].strip()
 
 
+def _memory_snippet_key(firebase_uid: str, max_chars: int) -> str:
+    return f"memory_snippet:{firebase_uid}:{max_chars}"
+
+
+def _invalidate_memory_snippet(firebase_uid: str) -> None:
+    cache = get_cache()
+    if cache is None:
+        return
+    cache.delete(_memory_snippet_key(firebase_uid, 1200))
+    cache.delete_pattern(f"memory_snippet:{firebase_uid}:*")
+
+
 def get_memory_context_snippet(firebase_uid: str, *, max_chars: int = 1200) -> str:
-    return build_memory_context_snippet(get_memory_profile(firebase_uid), max_chars=max_chars)
+    # Read on every chat turn; cached until the profile is stored again or the TTL lapses.
+    cache = get_cache()
+    ttl = int(getattr(settings, "MEMORY_SNIPPET_CACHE_TTL_SEC", 300) or 0)
+    key = _memory_snippet_key(firebase_uid, max_chars)
+    if cache is not None and ttl > 0:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    snippet = build_memory_context_snippet(get_memory_profile(firebase_uid), max_chars=max_chars)
+    if cache is not None and ttl > 0:
+        cache.set(key, snippet, ttl)
+    return snippet
@@ -515,3 +515,192 @@ EMBEDDING_BACKFILL_COST_ESTIMATE = Gauge(
     'tomehub_embedding_backfill_cost_estimate_usd',
     'Estimated embedding backfill cost in USD'
 )
+
+# Domain external provider fan-out (ACADEMIC / CULTURE_HISTORY / LITERARY)
+EXTERNAL_KB_PROVIDER_LATENCY_MS = Histogram(
+    'tomehub_external_kb_provider_latency_ms',
+    'Domain external provider call latency in milliseconds',
+    labelnames=['provider', 'domain'],
+    buckets=(25, 50, 100, 200, 350, 500, 800, 1200, 2000, 3000, 5000)
+)
+
+EXTERNAL_KB_PROVIDER_SKIPS_TOTAL = Counter(
+    'tomehub_external_kb_provider_skips_total',
+    'Domain external providers whose rows were not used, by reason',
+    labelnames=['provider', 'reason']
+)
+
+# Shared outbound HTTP client (infrastructure/http_client.py)
+HTTP_CLIENT_REQUESTS_TOTAL = Counter(
+    'tomehub_http_client_requests_total',
+    'Outbound HTTP requests through the shared client by provider and outcome',
+    labelnames=['provider', 'outcome']
+)
+
+HTTP_CLIENT_LATENCY_MS = Histogram(
+    'tomehub_http_client_latency_ms',
+    'Outbound HTTP request latency in milliseconds (network calls only, cache hits excluded)',
+    labelnames=['provider'],
+    buckets=(10, 25, 50, 100, 200, 350, 500, 800, 1200, 2000, 3000, 5000, 8000)
+)
+
+# Executor bulkheads (services/bulkhead_service.py)
+BULKHEAD_INFLIGHT = Gauge(
+    'tomehub_bulkhead_inflight',
+    'Blocking calls running or queued per workload bulkhead',
+    labelnames=['workload']
+)
+
+BULKHEAD_REJECTED_TOTAL = Counter(
+    'tomehub_bulkhead_rejected_total',
+    'Calls shed with 503 because the workload bulkhead was full',
+    labelnames=['workload']
+)
+
+BULKHEAD_QUEUE_WAIT_MS = Histogram(
+    'tomehub_bulkhead_queue_wait_ms',
+    'Time a blocking call waited for a bulkhead worker in milliseconds',
+    labelnames=['workload'],
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+)
+
+# In-process per-user vector cache (services/vector_cache_service.py)
+VECTOR_CACHE_REQUESTS_TOTAL = Counter(
+    'tomehub_vector_cache_requests_total',
+    'Semantic candidate lookups against the in-process vector cache',
+    labelnames=['outcome']
+)
+
+VECTOR_CACHE_BYTES = Gauge(
+    'tomehub_vector_cache_bytes',
+    'Memory held by cached per-user vector matrices'
+)
+
+VECTOR_CACHE_USERS = Gauge(
+    'tomehub_vector_cache_users',
+    'Users with a loaded in-process vector index'
+)
+
+# Approximate vector search (services/vector_index_service.py)
+VECTOR_APPROX_FALLBACK_TOTAL = Counter(
+    'tomehub_vector_approx_fallback_total',
+    'Approximate vector queries re-run exactly because they returned fewer rows than requested',
+    labelnames=['lane']
+)
+
+# In-process per-user trigram index for exact search (services/trigram_index_service.py)
+TRIGRAM_INDEX_REQUESTS_TOTAL = Counter(
+    'tomehub_trigram_index_requests_total',
+    'Exact-search LIKE candidate lookups against the in-process trigram index',
+    labelnames=['outcome']
+)
+
+TRIGRAM_INDEX_BYTES = Gauge(
+    'tomehub_trigram_index_bytes',
+    'Memory held by cached per-user trigram posting lists'
+)
+
+TRIGRAM_INDEX_USERS = Gauge(
+    'tomehub_trigram_index_users',
+    'Users with a loaded in-process trigram index'
+)
+
+# Hot chat-session context and write-behind messages (services/chat_session_cache_service.py)
+CHAT_HOT_CONTEXT_REQUESTS_TOTAL = Counter(
+    'tomehub_chat_hot_context_requests_total',
+    'Chat session context lookups against the hot context store',
+    labelnames=['outcome']
+)
+
+CHAT_WRITE_BEHIND_QUEUE_DEPTH = Gauge(
+    'tomehub_chat_write_behind_queue_depth',
+    'Chat message rows waiting to be flushed to Oracle'
+)
+
+CHAT_WRITE_BEHIND_ROWS_TOTAL = Counter(
+    'tomehub_chat_write_behind_rows_total',
+    'Chat message rows handled by the write-behind batcher',
+    labelnames=['outcome']
+)
+
+# Query-class aware Oracle cursors (infrastructure/cursor_profiles.py)
+DB_CURSOR_ROUND_TRIPS_TOTAL = Counter(
+    'tomehub_db_cursor_round_trips_total',
+    'Estimated Oracle round trips (executes + fetches) per query class',
+    labelnames=['query_class']
+)
+
+DB_CURSOR_ROWS_TOTAL = Counter(
+    'tomehub_db_cursor_rows_total',
+    'Rows fetched through profiled cursors per query class',
+    labelnames=['query_class']
+)
+
+DB_CURSOR_BYTES_FETCHED_TOTAL = Counter(
+    'tomehub_db_cursor_bytes_fetched_total',
+    'Size of text/binary column values fetched per query class',
+    labelnames=['query_class']
+)
+
+DB_QUERY_PLANS_TOTAL = Counter(
+    'tomehub_db_query_plans_total',
+    'Hot-path read plans executed, by driver (sync pool thread vs asyncio pool)',
+    labelnames=['driver']
+)
+
+# Lemma lane retrieval path (services/lemma_postings_service.py)
+SEARCH_LEMMA_LANE_TOTAL = Counter(
+    'tomehub_search_lemma_lane_total',
+    'Lemma lane searches by retrieval path (postings top-k vs LIKE scan)',
+    labelnames=['path']
+)
+
+# Search analytics log writer (services/search_log_writer_service.py)
+SEARCH_LOG_WRITE_BEHIND_QUEUE_DEPTH = Gauge(
+    'tomehub_search_log_write_behind_queue_depth',
+    'Search log rows waiting to be flushed to Oracle'
+)
+
+SEARCH_LOG_WRITE_BEHIND_ROWS_TOTAL = Counter(
+    'tomehub_search_log_write_behind_rows_total',
+    'Search log rows handled by the background writer (written, dropped_overflow, failed)',
+    labelnames=['outcome']
+)
+
+# On-demand sampling profiler (services/sampling_profiler_service.py)
+PROFILER_SESSIONS_TOTAL = Counter(
+    'tomehub_profiler_sessions_total',
+    'Admin profiling sessions by outcome (completed, busy, failed)',
+    labelnames=['outcome']
+)
+
+PROFILER_SAMPLES_TOTAL = Counter(
+    'tomehub_profiler_samples_total',
+    'Non-idle thread stacks captured by profiling sessions'
+)
+
+# Ingest NLP stage (services/nlp_process_pool_service.py)
+INGESTION_NLP_CHUNKS_TOTAL = Counter(
+    'tomehub_ingestion_nlp_chunks_total',
+    'Chunks analyzed by the ingest NLP stage, by path (process_pool, in_process)',
+    labelnames=['path']
+)
+
+# Generated RAG answer cache (services/answer_cache_service.py)
+ANSWER_CACHE_REQUESTS_TOTAL = Counter(
+    'tomehub_answer_cache_requests_total',
+    'Answer cache lookups after retrieval (hit, miss)',
+    labelnames=['outcome']
+)
+
+ANSWER_CACHE_SAVED_TOKENS_TOTAL = Counter(
+    'tomehub_answer_cache_saved_tokens_total',
+    'LLM tokens the cached answers originally cost, counted on every hit'
+)
+
+# Corpus-derived OCR correction dictionary (services/ocr_dictionary_service.py)
+OCR_DICTIONARY_REQUESTS_TOTAL = Counter(
+    'tomehub_ocr_dictionary_requests_total',
+    'OCR dictionary lookups at ingest (hit, built, too_small, error)',
+    labelnames=['outcome']
+)
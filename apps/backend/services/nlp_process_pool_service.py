@@ -0,0 +1,161 @@
+"""
+Process-pool stage for per-chunk Turkish NLP at ingest.
+
+Zeyrek lemmatization, normalization and passage classification are pure
+Python and CPU-bound; on the ingest thread pool they share one GIL. With
+INGESTION_NLP_PROCESS_WORKERS > 0, `ingest_pre_extracted_chunks` hands the
+cleaned chunk texts to this pool instead:
+
+- workers are started once per API process and kept warm; the initializer
+  imports utils.text_utils (which builds the Zeyrek analyzer) and runs one
+  analysis so the first real batch does not pay for it,
+- texts travel in batches (INGESTION_NLP_PROCESS_BATCH_SIZE) to amortize
+  pickling, and results stream back in input order,
+- a broken pool (worker killed, OOM) is dropped and the call falls back to
+  in-process analysis, so ingest never fails because of this stage.
+
+`analyze_text` produces the per-chunk NLP fields (normalized, lemmas,
+lemma_freqs, lemma_postings, classification); ingest_pre_extracted_chunks
+calls it directly when the pool is disabled.
+"""
+
+import json
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from config import settings
+from services.monitoring import INGESTION_NLP_CHUNKS_TOTAL
+from utils.logger import get_logger
+
+logger = get_logger("nlp_process_pool_service")
+
+_WARMUP_TEXT = "Kitapların sayfalarında okunan düşünceler"
+
+
+def analyze_text(text: str) -> Dict[str, Any]:
+    """normalized / lemmas / lemma_freqs / lemma_postings / classification for one chunk text."""
+    from services.lemma_index_service import build_postings
+    from utils.text_utils import get_lemma_positions, get_lemmas, normalize_text
+
+    try:
+        from services.semantic_classifier import classify_passage_fast
+    except ImportError:
+        def classify_passage_fast(_text):
+            return {'type': 'SITUATIONAL', 'quotability': 'MEDIUM', 'confidence': 0.5}
+
+    lemma_positions = get_lemma_positions(text)
+    return {
+        "normalized": normalize_text(text),
+        "lemmas": json.dumps(get_lemmas(text), ensure_ascii=False),
+        "lemma_freqs": json.dumps(
+            {lemma: len(hits) for lemma, hits in lemma_positions.items()},
+            ensure_ascii=False,
+        ),
+        "lemma_postings": build_postings(lemma_positions),
+        "classification": classify_passage_fast(text),
+    }
+
+
+def _warm_worker() -> None:
+    # Runs once per worker process: loads the analyzer and touches every code path.
+    analyze_text(_WARMUP_TEXT)
+
+
+def _analyze_batch(texts: Sequence[str]) -> List[Dict[str, Any]]:
+    return [analyze_text(text) for text in texts]
+
+
+def _batches(texts: Sequence[str], batch_size: int) -> Iterator[Sequence[str]]:
+    for start in range(0, len(texts), batch_size):
+        yield texts[start:start + batch_size]
+
+
+class NlpProcessPool:
+    def __init__(self, workers: Optional[int] = None, batch_size: Optional[int] = None):
+        self._workers = workers
+        self._batch_size = batch_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def workers(self) -> int:
+        if self._workers is not None:
+            return max(0, int(self._workers))
+        return max(0, int(getattr(settings, "INGESTION_NLP_PROCESS_WORKERS", 0)))
+
+    @property
+    def batch_size(self) -> int:
+        if self._batch_size is not None:
+            return max(1, int(self._batch_size))
+        return max(1, int(getattr(settings, "INGESTION_NLP_PROCESS_BATCH_SIZE", 8)))
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: the API process is multi-threaded, fork would copy held locks.
+                start_method = str(getattr(settings, "INGESTION_NLP_PROCESS_START_METHOD", "spawn") or "spawn")
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(start_method),
+                    initializer=_warm_worker,
+                )
+                logger.info("NLP process pool started", extra={"workers": self.workers, "start_method": start_method})
+            return self._executor
+
+    def warm(self) -> None:
+        """Start every worker now (each runs its initializer) instead of on the first ingest."""
+        if not self.enabled:
+            return
+        executor = self._get_executor()
+        list(executor.map(_analyze_batch, [[_WARMUP_TEXT]] * self.workers))
+
+    def analyze(self, texts: Sequence[str]) -> Iterator[Dict[str, Any]]:
+        """Yield analyze_text(t) for each text, in order; batches run concurrently across workers."""
+        texts = list(texts)
+        if not texts:
+            return
+        if not self.enabled:
+            INGESTION_NLP_CHUNKS_TOTAL.labels(path="in_process").inc(len(texts))
+            for text in texts:
+                yield analyze_text(text)
+            return
+
+        done = 0
+        try:
+            for batch_result in self._get_executor().map(_analyze_batch, _batches(texts, self.batch_size)):
+                for fields in batch_result:
+                    done += 1
+                    yield fields
+            INGESTION_NLP_CHUNKS_TOTAL.labels(path="process_pool").inc(len(texts))
+        except BrokenProcessPool as exc:
+            logger.warning(
+                "NLP process pool broke; finishing batch in-process",
+                extra={"error": str(exc), "remaining": len(texts) - done},
+            )
+            self._discard_executor()
+            INGESTION_NLP_CHUNKS_TOTAL.labels(path="process_pool").inc(done)
+            INGESTION_NLP_CHUNKS_TOTAL.labels(path="in_process").inc(len(texts) - done)
+            for text in texts[done:]:
+                yield analyze_text(text)
+
+    def _discard_executor(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+nlp_process_pool = NlpProcessPool()
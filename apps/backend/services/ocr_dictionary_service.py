@@ -0,0 +1,168 @@
+"""
+Per-user OCR correction dictionary built from the user's own clean text.
+
+OCR'd PDFs (classification route IMAGE_SCAN) are repaired word by word at
+ingest against the vocabulary of the user's other books instead of the small
+bootstrap list in LinguisticCorrectionService:
+
+- counts come from surface tokens of TOMEHUB_CONTENT_V2.content_chunk plus the
+  lemma frequencies stored in token_freq, for chunks whose book was not itself
+  ingested through the IMAGE_SCAN route,
+- words seen fewer than OCR_DICTIONARY_MIN_COUNT times are dropped, and a user
+  with fewer than OCR_DICTIONARY_MIN_WORDS words gets no dictionary (regex
+  rules only), so rare OCR garbage never becomes a correction target,
+- the words go into a SymSpellIndex, so each lookup costs the same whatever
+  the vocabulary size.
+
+Dictionaries are cached per user (OCR_DICTIONARY_TTL_SEC, LRU over
+OCR_DICTIONARY_MAX_USERS); a slightly stale vocabulary is harmless here.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from config import settings
+from infrastructure.cursor_profiles import QUERY_CLASS_BULK_EXPORT, profiled_cursor
+from infrastructure.db_manager import DatabaseManager, safe_read_clob
+from infrastructure.schema_registry import schema_registry
+from services.correction_service import WORD_RE, turkish_lower
+from services.monitoring import OCR_DICTIONARY_REQUESTS_TOTAL
+from utils.logger import get_logger
+from utils.symspell_index import SymSpellIndex
+
+logger = get_logger("ocr_dictionary_service")
+
+_MIN_WORD_LEN = 2
+
+
+def count_words(rows: Iterable[Tuple[str, Any]]) -> Counter:
+    """Word counts from (content_chunk, token_freq JSON) rows."""
+    counts: Counter = Counter()
+    for text, token_freq in rows:
+        for token in WORD_RE.findall(text or ""):
+            if len(token) >= _MIN_WORD_LEN and not any(ch.isdigit() for ch in token):
+                counts[turkish_lower(token)] += 1
+        if not token_freq:
+            continue
+        try:
+            lemma_freqs = json.loads(token_freq) if isinstance(token_freq, str) else token_freq
+        except (TypeError, ValueError):
+            continue
+        if not isinstance(lemma_freqs, dict):
+            continue
+        for lemma, freq in lemma_freqs.items():
+            lemma = turkish_lower(lemma)
+            if len(lemma) >= _MIN_WORD_LEN and lemma.isalpha():
+                try:
+                    counts[lemma] += int(freq)
+                except (TypeError, ValueError):
+                    continue
+    return counts
+
+
+def build_index(counts: Dict[str, int], *, min_count: int, max_edit_distance: int) -> SymSpellIndex:
+    index = SymSpellIndex(max_edit_distance=max_edit_distance)
+    index.update((word, count) for word, count in counts.items() if count >= min_count)
+    return index
+
+
+def _fetch_clean_rows(firebase_uid: str, max_chunks: int) -> list:
+    sql = """
+        SELECT c.content_chunk, c.token_freq
+        FROM TOMEHUB_CONTENT_V2 c
+        WHERE c.firebase_uid = :p_uid
+          AND c.content_chunk IS NOT NULL
+    """
+    if "CLASSIFICATION_ROUTE" in schema_registry.columns("TOMEHUB_INGESTED_FILES"):
+        sql += """
+          AND NOT EXISTS (
+              SELECT 1 FROM TOMEHUB_INGESTED_FILES f
+              WHERE f.BOOK_ID = c.item_id
+                AND f.FIREBASE_UID = c.firebase_uid
+                AND f.CLASSIFICATION_ROUTE = 'IMAGE_SCAN'
+          )
+        """
+    sql += " ORDER BY c.id DESC FETCH FIRST :p_max ROWS ONLY "
+    with DatabaseManager.get_read_connection() as conn:
+        with profiled_cursor(conn, QUERY_CLASS_BULK_EXPORT) as cursor:
+            cursor.execute(sql, {"p_uid": firebase_uid, "p_max": int(max_chunks)})
+            return [(safe_read_clob(text), safe_read_clob(freq)) for text, freq in cursor.fetchall()]
+
+
+class OcrDictionaryCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Optional[SymSpellIndex], float]]" = OrderedDict()
+
+    def get(self, firebase_uid: str) -> Optional[SymSpellIndex]:
+        """The user's dictionary, or None when disabled, too small or unavailable."""
+        if not getattr(settings, "OCR_DICTIONARY_ENABLED", False) or not firebase_uid:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(firebase_uid)
+            if entry is not None and now - entry[1] < settings.OCR_DICTIONARY_TTL_SEC:
+                self._entries.move_to_end(firebase_uid)
+                OCR_DICTIONARY_REQUESTS_TOTAL.labels(outcome="hit").inc()
+                return entry[0]
+
+        try:
+            index = self._build(firebase_uid)
+        except Exception as e:
+            OCR_DICTIONARY_REQUESTS_TOTAL.labels(outcome="error").inc()
+            logger.warning(f"OCR dictionary build failed for {firebase_uid}: {e}")
+            return None
+
+        with self._lock:
+            self._entries[firebase_uid] = (index, now)
+            self._entries.move_to_end(firebase_uid)
+            while len(self._entries) > settings.OCR_DICTIONARY_MAX_USERS:
+                self._entries.popitem(last=False)
+        return index
+
+    def _build(self, firebase_uid: str) -> Optional[SymSpellIndex]:
+        started = time.perf_counter()
+        rows = _fetch_clean_rows(firebase_uid, settings.OCR_DICTIONARY_MAX_CHUNKS)
+        index = build_index(
+            count_words(rows),
+            min_count=settings.OCR_DICTIONARY_MIN_COUNT,
+            max_edit_distance=settings.OCR_DICTIONARY_MAX_EDIT_DISTANCE,
+        )
+        if len(index) < settings.OCR_DICTIONARY_MIN_WORDS:
+            OCR_DICTIONARY_REQUESTS_TOTAL.labels(outcome="too_small").inc()
+            logger.info(
+                "OCR dictionary too small; using regex repairs only",
+                extra={"uid": firebase_uid, "words": len(index), "chunks": len(rows)},
+            )
+            return None
+        OCR_DICTIONARY_REQUESTS_TOTAL.labels(outcome="built").inc()
+        logger.info(
+            "OCR dictionary built",
+            extra={
+                "uid": firebase_uid,
+                "words": len(index),
+                "chunks": len(rows),
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+            },
+        )
+        return index
+
+    def drop(self, firebase_uid: str) -> None:
+        with self._lock:
+            self._entries.pop(firebase_uid, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+ocr_dictionary_cache = OcrDictionaryCache()
+
+
+def get_user_ocr_dictionary(firebase_uid: str) -> Optional[SymSpellIndex]:
+    return ocr_dictionary_cache.get(firebase_uid)
@@ -14,6 +14,7 @@ from services.canonical_document_service import CanonicalDocument, merge_documen
 from services.chunk_render_service import render_document_chunks, summarize_chunk_metrics
 from services.external_kb_service import maybe_trigger_external_enrichment_async
 from services.index_freshness_service import maybe_trigger_graph_enrichment_async
+from services.bulkhead_service import WORKLOAD_DB_LIGHT, WORKLOAD_PARSING, run_in_bulkhead
 from services.ingestion_service import ingest_pre_extracted_chunks
 from services.ingestion_status_service import (
     delete_ingested_file_row,
@@ -57,6 +58,15 @@ from services.report_service import generate_file_report
 logger = logging.getLogger(__name__)
 
 
+async def _run_parsing(fn, *args, **kwargs):
+    # Background parse work waits for a parsing slot rather than being shed.
+    return await run_in_bulkhead(WORKLOAD_PARSING, fn, *args, shed=False, **kwargs)
+
+
+async def _run_housekeeping(fn, *args, **kwargs):
+    return await run_in_bulkhead(WORKLOAD_DB_LIGHT, fn, *args, shed=False, **kwargs)
+
+
 def _status_json(value: Dict[str, object]) -> str:
     return json.dumps(value, ensure_ascii=False)
 
@@ -507,8 +517,8 @@ class AsyncPdfIngestionManager:
                 parse_path="PDF_V2",
                 parse_status="CLASSIFYING",
             )
-            temp_path = await asyncio.to_thread(download_object_to_tempfile, bucket_name, object_key, ".pdf")
-            classifier_result = await asyncio.to_thread(classify_pdf, temp_path)
+            temp_path = await _run_parsing(download_object_to_tempfile, bucket_name, object_key, ".pdf")
+            classifier_result = await _run_parsing(classify_pdf, temp_path)
             route = _resolve_processing_route(classifier_result)
             PDF_CLASSIFIER_ROUTE_TOTAL.labels(route=route).inc()
 
@@ -526,18 +536,18 @@ class AsyncPdfIngestionManager:
 
             if route == "TEXT_NATIVE":
                 parser_engine = "PYMUPDF"
-                document = await asyncio.to_thread(
+                document = await _run_parsing(
                     _run_text_native_parse,
                     pdf_path=temp_path,
                     document_id=book_id,
                     classifier_result=classifier_result,
                 )
-                document, chunks, quality_metrics = await asyncio.to_thread(_finalize_document, document)
+                document, chunks, quality_metrics = await _run_parsing(_finalize_document, document)
                 retry_as_ocr, retry_reason = _should_retry_as_ocr(classifier_result, quality_metrics)
                 if retry_as_ocr:
                     PDF_RETRY_AS_OCR_TOTAL.labels(reason=retry_reason).inc()
                     route = "IMAGE_SCAN"
-                    document, fallback_engine, fallback_triggered, shard_count, shard_failed_count = await asyncio.to_thread(
+                    document, fallback_engine, fallback_triggered, shard_count, shard_failed_count = await _run_parsing(
                         _run_ocr_parse,
                         pdf_path=temp_path,
                         document_id=book_id,
@@ -549,21 +559,21 @@ class AsyncPdfIngestionManager:
                         "retry_as_ocr": True,
                         "retry_reason": retry_reason,
                     }
-                    document, chunks, quality_metrics = await asyncio.to_thread(_finalize_document, document)
+                    document, chunks, quality_metrics = await _run_parsing(_finalize_document, document)
                 else:
                     document.routing_metrics = {
                         **dict(document.routing_metrics or {}),
                         "retry_as_ocr": False,
                     }
             else:
-                document, fallback_engine, fallback_triggered, shard_count, shard_failed_count = await asyncio.to_thread(
+                document, fallback_engine, fallback_triggered, shard_count, shard_failed_count = await _run_parsing(
                     _run_ocr_parse,
                     pdf_path=temp_path,
                     document_id=book_id,
                     classifier_result=classifier_result,
                 )
                 parser_engine = str(document.parser_engine or "LLAMAPARSE")
-                document, chunks, quality_metrics = await asyncio.to_thread(_finalize_document, document)
+                document, chunks, quality_metrics = await _run_parsing(_finalize_document, document)
 
             upsert_ingestion_status(
                 book_id,
@@ -583,14 +593,14 @@ class AsyncPdfIngestionManager:
                 avg_chunk_tokens=float(quality_metrics.get("avg_chunk_tokens", 0.0) or 0.0),
             )
 
-            await asyncio.to_thread(
+            await _run_parsing(
                 put_json_object,
                 bucket_name,
                 build_canonical_object_key(firebase_uid, book_id),
                 document.to_dict(),
             )
 
-            success = await asyncio.to_thread(
+            success = await _run_parsing(
                 ingest_pre_extracted_chunks,
                 chunks=chunks,
                 title=title,
@@ -601,6 +611,7 @@ class AsyncPdfIngestionManager:
                 categories=categories,
                 file_path=None,
                 cleanup_file=False,
+                ocr_repair=route == "IMAGE_SCAN",
             )
             if not success:
                 raise RuntimeError("Failed to persist PDF Ingestion V2 chunks")
@@ -669,7 +680,7 @@ class AsyncPdfIngestionManager:
                     pass
 
     async def resume_pending_jobs(self) -> None:
-        pending_rows = await asyncio.to_thread(list_pending_parse_jobs)
+        pending_rows = await _run_housekeeping(list_pending_parse_jobs)
         for row in pending_rows:
             book_id = str(row.get("book_id") or "")
             firebase_uid = str(row.get("firebase_uid") or "")
@@ -692,7 +703,7 @@ class AsyncPdfIngestionManager:
             )
 
     async def retry_pending_storage_deletes_once(self) -> None:
-        rows = await asyncio.to_thread(list_pending_storage_deletes)
+        rows = await _run_housekeeping(list_pending_storage_deletes)
         for row in rows:
             book_id = str(row.get("book_id") or "")
             firebase_uid = str(row.get("firebase_uid") or "")
@@ -700,15 +711,15 @@ class AsyncPdfIngestionManager:
             object_key = str(row.get("object_key") or "")
             output_prefix = str(row.get("oci_output_prefix") or "")
             try:
-                await asyncio.to_thread(cleanup_pdf_artifacts, bucket_name, object_key, output_prefix)
-                await asyncio.to_thread(delete_ingested_file_row, book_id, firebase_uid)
+                await _run_housekeeping(cleanup_pdf_artifacts, bucket_name, object_key, output_prefix)
+                await _run_housekeeping(delete_ingested_file_row, book_id, firebase_uid)
             except Exception as exc:
                 mark_storage_delete_failed(book_id, firebase_uid, str(exc))
 
     async def recover_stale_parse_jobs_once(self) -> None:
         stale_after_sec = int(getattr(settings, "PDF_PROCESSING_STALE_SEC", 1800) or 1800)
         recovery_limit = int(getattr(settings, "PDF_PROCESSING_RECOVERY_LIMIT", 50) or 50)
-        rows = await asyncio.to_thread(list_stale_parse_jobs, stale_after_sec, recovery_limit)
+        rows = await _run_housekeeping(list_stale_parse_jobs, stale_after_sec, recovery_limit)
         for row in rows:
             book_id = str(row.get("book_id") or "")
             firebase_uid = str(row.get("firebase_uid") or "")
@@ -726,7 +737,7 @@ class AsyncPdfIngestionManager:
             title = str(metadata.get("title") or row.get("file_name") or book_id)
             author = str(metadata.get("author") or "")
             if not bucket_name or not object_key:
-                await asyncio.to_thread(
+                await _run_housekeeping(
                     upsert_ingestion_status,
                     book_id,
                     firebase_uid,
@@ -738,7 +749,7 @@ class AsyncPdfIngestionManager:
                 logger.warning("Marked stale PDF ingestion job as failed due to missing storage reference: %s/%s", firebase_uid, book_id)
                 continue
 
-            await asyncio.to_thread(
+            await _run_housekeeping(
                 upsert_ingestion_status,
                 book_id,
                 firebase_uid,
@@ -768,7 +779,7 @@ class AsyncPdfIngestionManager:
         if cleanup_interval_sec > 0 and (now - self._last_canonical_cleanup_ts) < cleanup_interval_sec:
             return
 
-        deleted_count = await asyncio.to_thread(
+        deleted_count = await _run_housekeeping(
             delete_expired_canonical_objects,
             None,
             retention_days=retention_days,
@@ -1,11 +1,9 @@
-import json
 import re
 import time
 from typing import Any, Dict, List, Optional, Sequence, Tuple
-from urllib import error as urllib_error
-from urllib import request as urllib_request
 
 from config import settings
+from infrastructure import http_client
 from services.circuit_breaker_service import CircuitBreaker, CircuitBreakerConfig, CircuitBreakerOpenException
 from services.monitoring import (
     CIRCUIT_BREAKER_STATE,
@@ -232,17 +230,15 @@ def _typesense_request_json(method: str, path: str, payload: Optional[Dict[str,
     base_url = str(getattr(settings, "RELIGIOUS_DATASET_TYPESENSE_URL", "") or "").strip().rstrip("/")
     if not base_url:
         raise RuntimeError("RELIGIOUS_DATASET_TYPESENSE_URL missing")
-    data = json.dumps(payload).encode("utf-8") if payload is not None else None
-    req = urllib_request.Request(
-        url=f"{base_url}{path}",
-        method=method.upper(),
-        data=data,
+    timeout_sec = float(getattr(settings, "RELIGIOUS_DATASET_TIMEOUT_SEC", 0.45) or 0.45)
+    return http_client.request_json(
+        method,
+        f"{base_url}{path}",
+        provider="typesense",
+        timeout_sec=timeout_sec,
         headers=_typesense_headers(),
+        json_body=payload,
     )
-    timeout_sec = float(getattr(settings, "RELIGIOUS_DATASET_TIMEOUT_SEC", 0.45) or 0.45)
-    with urllib_request.urlopen(req, timeout=timeout_sec) as resp:
-        charset = resp.headers.get_content_charset() or "utf-8"
-        return json.loads(resp.read().decode(charset, errors="replace"))
 
 
 def _checked_typesense_request(method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Any:
@@ -254,7 +250,7 @@ def _checked_typesense_request(method: str, path: str, payload: Optional[Dict[st
     except CircuitBreakerOpenException:
         RELIGIOUS_DATASET_SEARCH_TOTAL.labels(status="circuit_open", lane="typesense").inc()
         raise
-    except urllib_error.HTTPError as exc:
+    except http_client.HttpStatusError as exc:
         RELIGIOUS_DATASET_SEARCH_TOTAL.labels(status=f"http_{int(getattr(exc, 'code', 0) or 0)}", lane="typesense").inc()
         raise
     except Exception:
@@ -505,7 +501,7 @@ def get_religious_dataset_candidates(
     except CircuitBreakerOpenException:
         logger.warning("Religious dataset lane skipped because circuit breaker is open")
         return [], {"used": False, "providers": {}, "reason": "circuit_open"}
-    except urllib_error.HTTPError as exc:
+    except http_client.HttpStatusError as exc:
         logger.warning("Religious dataset lane HTTP error status=%s", getattr(exc, "code", None))
         return [], {"used": False, "providers": {}, "reason": f"http_{getattr(exc, 'code', 'error')}"}
     except Exception as exc:
@@ -0,0 +1,285 @@
+"""
+On-demand sampling stack profiler for the live API process.
+
+An admin request (`POST /api/admin/profile`) starts one bounded session: a
+worker thread reads `sys._current_frames()` every interval and counts Python
+stacks until the window closes. Nothing is installed between sessions (no
+sys.setprofile / settrace hooks), so the process pays nothing while idle, and
+a session costs one stack walk per thread per tick regardless of request load.
+
+Samples are attributed to a route:
+- the thread's stack contains a FastAPI endpoint function (async endpoints on
+  the event loop, sync endpoints on the anyio pool), or
+- the thread is a bulkhead worker running a call submitted from a route
+  (services/bulkhead_service.py tags the call while a session is active),
+- otherwise `[thread:<name>]` with pool indices stripped.
+
+Idle threads (parked on a lock, queue or selector) are skipped unless asked for.
+Output is collapsed stacks (flamegraph.pl / speedscope import) or a speedscope
+JSON document with one sampled profile per route.
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from config import settings
+from services.monitoring import PROFILER_SAMPLES_TOTAL, PROFILER_SESSIONS_TOTAL
+from utils.logger import get_logger
+
+logger = get_logger("sampling_profiler_service")
+
+FORMAT_COLLAPSED = "collapsed"
+FORMAT_SPEEDSCOPE = "speedscope"
+FORMATS = (FORMAT_COLLAPSED, FORMAT_SPEEDSCOPE)
+
+_MAX_STACK_DEPTH = 128
+_UNATTRIBUTED_THREAD_RE = re.compile(r"[_-]?\d+(_\d+)?$")
+# Leaf frames of threads that are waiting rather than working.
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+Frame = Tuple[str, str, int]
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profiling session is already running in this process."""
+
+
+class ProfileResult:
+    def __init__(
+        self,
+        stacks: Dict[Tuple[str, Tuple[Frame, ...]], int],
+        *,
+        interval_ms: float,
+        duration_sec: float,
+        ticks: int,
+    ):
+        self.stacks = stacks
+        self.interval_ms = interval_ms
+        self.duration_sec = duration_sec
+        self.ticks = ticks
+
+    @property
+    def sample_count(self) -> int:
+        return sum(self.stacks.values())
+
+    def route_totals(self) -> Dict[str, int]:
+        totals: Counter = Counter()
+        for (route, _stack), count in self.stacks.items():
+            totals[route] += count
+        return dict(totals.most_common())
+
+    def to_collapsed(self) -> str:
+        lines = []
+        for (route, stack), count in sorted(self.stacks.items(), key=lambda kv: -kv[1]):
+            names = [_sanitize(route)] + [_sanitize(_frame_name(f)) for f in stack]
+            lines.append(f"{';'.join(names)} {count}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def to_speedscope(self, name: str = "tomehub") -> Dict[str, Any]:
+        frame_index: Dict[Frame, int] = {}
+        frames: List[Dict[str, Any]] = []
+        profiles: Dict[str, Dict[str, Any]] = {}
+        for (route, stack), count in sorted(self.stacks.items(), key=lambda kv: (kv[0][0], -kv[1])):
+            indices = []
+            for frame in stack:
+                idx = frame_index.get(frame)
+                if idx is None:
+                    idx = frame_index[frame] = len(frames)
+                    frames.append({"name": frame[1], "file": frame[0], "line": frame[2]})
+                indices.append(idx)
+            profile = profiles.setdefault(route, {
+                "type": "sampled",
+                "name": route,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": 0,
+                "samples": [],
+                "weights": [],
+            })
+            weight = round(count * self.interval_ms, 3)
+            profile["samples"].append(indices)
+            profile["weights"].append(weight)
+            profile["endValue"] = round(profile["endValue"] + weight, 3)
+        ordered = sorted(profiles.values(), key=lambda p: -p["endValue"])
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "tomehub-sampling-profiler",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": ordered,
+        }
+
+
+def _frame_name(frame: Frame) -> str:
+    return f"{frame[1]} ({os.path.basename(frame[0])}:{frame[2]})"
+
+
+def _sanitize(name: str) -> str:
+    # Collapsed format separates frames with ';' and the count with the last space.
+    return name.replace(";", ",").replace("\n", " ")
+
+
+def _thread_label(thread: Optional[threading.Thread]) -> str:
+    name = thread.name if thread is not None else "unknown"
+    return f"[thread:{_UNATTRIBUTED_THREAD_RE.sub('', name) or name}]"
+
+
+def build_route_index(app: Any) -> Dict[Any, str]:
+    """Endpoint code object -> "METHOD /path" for every route registered on the app."""
+    index: Dict[Any, str] = {}
+    for route in getattr(app, "routes", []):
+        endpoint = getattr(route, "endpoint", None)
+        path = getattr(route, "path", None)
+        if endpoint is None or not path:
+            continue
+        while hasattr(endpoint, "__wrapped__"):
+            endpoint = endpoint.__wrapped__
+        code = getattr(endpoint, "__code__", None)
+        if code is None:
+            continue
+        methods = sorted(getattr(route, "methods", None) or [])
+        index.setdefault(code, f"{','.join(methods) or 'WS'} {path}".strip())
+    return index
+
+
+class SamplingProfiler:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._route_index: Dict[Any, str] = {}
+        self._thread_routes: Dict[int, str] = {}
+        # Read without the lock by bulkhead workers; only ever flipped inside profile().
+        self.active = False
+
+    def current_route(self) -> Optional[str]:
+        """Route of the calling frame's endpoint while a session runs; None (and no stack walk) otherwise."""
+        if not self.active:
+            return None
+        frame = sys._getframe(1)
+        index = self._route_index
+        while frame is not None:
+            route = index.get(frame.f_code)
+            if route is not None:
+                return route
+            frame = frame.f_back
+        return None
+
+    @contextmanager
+    def attribute_thread(self, route: Optional[str]) -> Iterator[None]:
+        if not route:
+            yield
+            return
+        ident = threading.get_ident()
+        self._thread_routes[ident] = route
+        try:
+            yield
+        finally:
+            self._thread_routes.pop(ident, None)
+
+    def profile(
+        self,
+        duration_sec: float,
+        *,
+        interval_ms: float = 10.0,
+        route_index: Optional[Dict[Any, str]] = None,
+        include_idle: bool = False,
+    ) -> ProfileResult:
+        """Blocking: samples for `duration_sec` and returns the aggregated stacks."""
+        max_duration = float(getattr(settings, "PROFILER_MAX_DURATION_SEC", 60))
+        duration_sec = min(max(0.1, float(duration_sec)), max_duration)
+        interval_ms = min(max(float(getattr(settings, "PROFILER_MIN_INTERVAL_MS", 1)), float(interval_ms)), 1000.0)
+        if not self._lock.acquire(blocking=False):
+            PROFILER_SESSIONS_TOTAL.labels(outcome="busy").inc()
+            raise ProfilerBusyError("A profiling session is already running")
+        try:
+            self._route_index = route_index or {}
+            self.active = True
+            result = self._sample_loop(duration_sec, interval_ms / 1000.0, include_idle)
+            PROFILER_SESSIONS_TOTAL.labels(outcome="completed").inc()
+            PROFILER_SAMPLES_TOTAL.inc(result.sample_count)
+            logger.info(
+                "Profiling session finished",
+                extra={
+                    "duration_sec": round(result.duration_sec, 3),
+                    "ticks": result.ticks,
+                    "samples": result.sample_count,
+                    "routes": len(result.route_totals()),
+                },
+            )
+            return result
+        except Exception:
+            PROFILER_SESSIONS_TOTAL.labels(outcome="failed").inc()
+            raise
+        finally:
+            self.active = False
+            self._route_index = {}
+            self._thread_routes.clear()
+            self._lock.release()
+
+    def _sample_loop(self, duration_sec: float, interval_sec: float, include_idle: bool) -> ProfileResult:
+        own_ident = threading.get_ident()
+        stacks: Counter = Counter()
+        ticks = 0
+        started = time.perf_counter()
+        deadline = started + duration_sec
+        next_tick = started
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            if now < next_tick:
+                time.sleep(next_tick - now)
+                continue
+            next_tick += interval_sec
+            if next_tick < now:
+                # Fell behind (GIL contention): skip missed ticks instead of bursting.
+                next_tick = now + interval_sec
+            ticks += 1
+            threads = {t.ident: t for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                route, stack = self._walk(frame)
+                if not stack:
+                    continue
+                leaf = stack[-1]
+                if not include_idle and (os.path.basename(leaf[0]), leaf[1]) in _IDLE_LEAVES:
+                    continue
+                route = route or self._thread_routes.get(ident) or _thread_label(threads.get(ident))
+                stacks[(route, stack)] += 1
+        return ProfileResult(
+            dict(stacks),
+            interval_ms=interval_sec * 1000.0,
+            duration_sec=time.perf_counter() - started,
+            ticks=ticks,
+        )
+
+    def _walk(self, frame: Any) -> Tuple[Optional[str], Tuple[Frame, ...]]:
+        index = self._route_index
+        route = None
+        out: List[Frame] = []
+        depth = 0
+        while frame is not None and depth < _MAX_STACK_DEPTH:
+            code = frame.f_code
+            if route is None:
+                route = index.get(code)
+            out.append((code.co_filename, code.co_name, code.co_firstlineno))
+            frame = frame.f_back
+            depth += 1
+        out.reverse()
+        return route, tuple(out)
+
+
+sampling_profiler = SamplingProfiler()
@@ -4,6 +4,7 @@ from typing import Any, Dict, Iterable, List, Optional
 
 from config import settings
 from infrastructure.db_manager import DatabaseManager, safe_read_clob
+from services.search_log_writer_service import search_log_writer
 from utils.logger import get_logger
 
 logger = get_logger("search_diagnostics")
@@ -292,6 +293,9 @@ def append_search_log_diagnostics(search_log_id: Optional[int], diagnostics: Dic
         return
     if not bool(getattr(settings, "SEARCH_LOG_DIAGNOSTICS_PERSIST_ENABLED", False)):
         return
+    # Still queued in the search log writer: merged into the row it is about to write.
+    if search_log_writer.annotate(search_log_id, diagnostics=diagnostics):
+        return
     try:
         with DatabaseManager.get_write_connection() as conn:
             with conn.cursor() as cursor:
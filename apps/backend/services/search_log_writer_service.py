@@ -0,0 +1,457 @@
+"""
+Background writer for TOMEHUB_SEARCH_LOGS.
+
+`SearchOrchestrator._log_search` used to open a write connection, INSERT ...
+RETURNING ID and commit inside every search, and once an hour also ran the
+retention DELETE there. With SEARCH_LOG_WRITE_BEHIND_ENABLED:
+
+- `search_log_writer.submit(...)` takes an id from a block pre-allocated from
+  the table's identity sequence (one NEXTVAL round trip per
+  SEARCH_LOG_ID_BLOCK_SIZE searches), queues the row and returns the id, so the
+  caller still gets `search_log_id` immediately.
+- A daemon thread flushes the queue with one executemany INSERT every
+  SEARCH_LOG_WRITE_BEHIND_FLUSH_MS or once SEARCH_LOG_WRITE_BEHIND_BATCH_SIZE rows
+  are waiting. The queue is bounded by SEARCH_LOG_WRITE_BEHIND_MAX_QUEUE; rows
+  over the bound are dropped and counted (analytics, never worth stalling a search).
+  Rows Oracle rejects are dropped one by one (batcherrors); a batch that fails
+  as a whole (connection lost, pool timeout) is retried once before it is dropped.
+- TIMESTAMP is left to the column default, as on the synchronous path, so it is
+  the flush time: at most one flush interval after the search.
+- `annotate()` lets the answer path attach MODEL_NAME / diagnostics to a row that
+  is still queued or in flight; they are written by the flusher right after the
+  insert. Once a row is committed it returns False and callers UPDATE as before.
+- `purge_expired_search_logs()` is the retention DELETE, run by the scheduled
+  job in the app lifespan instead of inside a request.
+
+Pre-allocated ids need migrations/phaseX_search_logs_preallocated_ids.sql (ID
+GENERATED BY DEFAULT). Without it `submit` raises SearchLogWriterUnavailable and
+the orchestrator keeps the synchronous insert.
+"""
+
+import json
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Set
+
+from config import settings
+from infrastructure.cursor_profiles import QUERY_CLASS_BULK_INSERT, profiled_cursor
+from infrastructure.db_manager import DatabaseManager
+from services.monitoring import SEARCH_LOG_WRITE_BEHIND_QUEUE_DEPTH, SEARCH_LOG_WRITE_BEHIND_ROWS_TOTAL
+from utils.logger import get_logger
+
+logger = get_logger("search_log_writer_service")
+
+_ID_RETRY_SEC = 300.0
+_INSERT_ATTEMPTS = 2
+_INSERT_RETRY_DELAY_SEC = 0.5
+_MAX_ANNOTATION_ROUNDS = 3
+_RETENTION_DELETE_BATCH = 5000
+_SEQUENCE_NAME_RE = re.compile(r"^[A-Z0-9_$#]+$")
+
+_INSERT_COLUMNS = (
+    "ID, FIREBASE_UID, SESSION_ID, QUERY_TEXT, INTENT, RRF_WEIGHTS, "
+    "TOP_RESULT_ID, TOP_RESULT_SCORE, EXECUTION_TIME_MS"
+)
+_INSERT_VALUES = ":p_id, :p_uid, :p_sid, :p_q, :p_intent, :p_w, :p_tid, :p_tscore, :p_dur"
+_INSERT_SQL = f"INSERT INTO TOMEHUB_SEARCH_LOGS ({_INSERT_COLUMNS}) VALUES ({_INSERT_VALUES})"
+_INSERT_WITH_DETAILS_SQL = (
+    f"INSERT INTO TOMEHUB_SEARCH_LOGS ({_INSERT_COLUMNS}, STRATEGY_DETAILS) VALUES ({_INSERT_VALUES}, :p_strategy)"
+)
+
+
+class SearchLogWriterUnavailable(RuntimeError):
+    """Ids cannot be pre-allocated (identity is GENERATED ALWAYS or the lookup failed)."""
+
+
+def write_behind_enabled() -> bool:
+    return bool(getattr(settings, "SEARCH_LOG_WRITE_BEHIND_ENABLED", False))
+
+
+def _persist_details() -> bool:
+    return bool(getattr(settings, "SEARCH_LOG_DIAGNOSTICS_PERSIST_ENABLED", False))
+
+
+def _session_id_int(session_id: Any) -> Optional[int]:
+    # SESSION_ID is NUMBER; UUID-like strings would raise ORA-01722.
+    try:
+        return int(session_id) if session_id is not None and str(session_id).strip().isdigit() else None
+    except Exception:
+        return None
+
+
+def search_log_binds(uid, query, intent, results, duration, session_id=None) -> Dict[str, Any]:
+    """Insert binds shared by the queued and the synchronous path (no id, no details)."""
+    top_id = results[0]['id'] if results else None
+    top_score = results[0].get('rrf_score', results[0].get('score', 0)) if results else 0
+    return {
+        "p_uid": uid,
+        "p_sid": _session_id_int(session_id),
+        "p_q": query,
+        "p_intent": intent,
+        "p_w": f"fusion:{settings.RETRIEVAL_FUSION_MODE}, vec:1.0, bm25:1.0, graph:1.0",
+        "p_tid": top_id,
+        "p_tscore": top_score,
+        "p_dur": duration * 1000,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Id blocks
+# ---------------------------------------------------------------------------
+
+class _IdAllocator:
+    def __init__(self):
+        self._ids: Deque[int] = deque()
+        self._lock = threading.Lock()
+        self._sequence: Optional[str] = None
+        self._unavailable_until = 0.0
+
+    def next_id(self) -> int:
+        with self._lock:
+            if not self._ids:
+                self._refill_locked()
+            if not self._ids:
+                raise SearchLogWriterUnavailable("no pre-allocated search log ids")
+            return self._ids.popleft()
+
+    def refill_if_low(self) -> None:
+        """Called from the flusher so request threads rarely pay for a refill."""
+        with self._lock:
+            if len(self._ids) < max(1, self._block_size() // 4):
+                self._refill_locked()
+
+    @staticmethod
+    def _block_size() -> int:
+        return int(getattr(settings, "SEARCH_LOG_ID_BLOCK_SIZE", 200))
+
+    def _refill_locked(self) -> None:
+        if time.monotonic() < self._unavailable_until:
+            return
+        try:
+            with DatabaseManager.get_write_connection() as conn:
+                with conn.cursor() as cursor:
+                    if self._sequence is None:
+                        self._sequence = _identity_sequence(cursor)
+                    cursor.execute(
+                        f"SELECT {self._sequence}.NEXTVAL FROM DUAL CONNECT BY LEVEL <= :p_n",
+                        {"p_n": self._block_size()},
+                    )
+                    self._ids.extend(int(r[0]) for r in cursor.fetchall())
+        except Exception as e:
+            self._unavailable_until = time.monotonic() + _ID_RETRY_SEC
+            logger.warning(f"Search log id pre-allocation unavailable, using synchronous inserts: {e}")
+
+
+def _identity_sequence(cursor) -> str:
+    cursor.execute(
+        """
+        SELECT SEQUENCE_NAME, GENERATION_TYPE
+        FROM USER_TAB_IDENTITIES
+        WHERE TABLE_NAME = 'TOMEHUB_SEARCH_LOGS' AND COLUMN_NAME = 'ID'
+        """
+    )
+    row = cursor.fetchone()
+    if not row:
+        raise SearchLogWriterUnavailable("TOMEHUB_SEARCH_LOGS.ID is not an identity column")
+    sequence, generation = str(row[0] or ""), str(row[1] or "")
+    if generation.upper() != "BY DEFAULT":
+        raise SearchLogWriterUnavailable(f"TOMEHUB_SEARCH_LOGS.ID is GENERATED {generation}")
+    if not _SEQUENCE_NAME_RE.match(sequence):
+        raise SearchLogWriterUnavailable(f"unexpected identity sequence name {sequence!r}")
+    return sequence
+
+
+# ---------------------------------------------------------------------------
+# Writer
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _PendingLog:
+    log_id: int
+    binds: Dict[str, Any]
+    payload: Dict[str, Any] = field(default_factory=dict)
+    model_name: Optional[str] = None
+    # Bumped by annotate(); the flusher writes again while it differs from written_version.
+    version: int = 0
+    written_version: int = -1
+
+
+class SearchLogWriter:
+    def __init__(self):
+        self._queue: Deque[_PendingLog] = deque()
+        self._by_id: Dict[int, _PendingLog] = {}
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._ids = _IdAllocator()
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def submit(
+        self,
+        uid,
+        query,
+        intent,
+        results,
+        duration,
+        session_id=None,
+        diagnostic_payload: Optional[Dict[str, Any]] = None,
+    ) -> Optional[int]:
+        """
+        Queue one search log row and return its id. Returns None when the queue is
+        full (row dropped); raises SearchLogWriterUnavailable when ids can't be allocated.
+        """
+        with self._cond:
+            if len(self._queue) >= self._max_queue():
+                SEARCH_LOG_WRITE_BEHIND_ROWS_TOTAL.labels(outcome="dropped_overflow").inc()
+                return None
+        log_id = self._ids.next_id()
+        binds = search_log_binds(uid, query, intent, results, duration, session_id)
+        entry = _PendingLog(log_id=log_id, binds=binds, payload=dict(diagnostic_payload or {}))
+        with self._cond:
+            self._queue.append(entry)
+            self._by_id[log_id] = entry
+            SEARCH_LOG_WRITE_BEHIND_QUEUE_DEPTH.set(len(self._queue))
+            if len(self._queue) >= self._batch_size():
+                self._cond.notify()
+        self._ensure_worker()
+        return log_id
+
+    def annotate(
+        self,
+        log_id: Any,
+        *,
+        model_name: Optional[str] = None,
+        diagnostics: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Attach MODEL_NAME / diagnostics to a row not yet committed. False once it is in the table."""
+        try:
+            key = int(log_id)
+        except (TypeError, ValueError):
+            return False
+        with self._cond:
+            entry = self._by_id.get(key)
+            if entry is None:
+                return False
+            if model_name is not None:
+                entry.model_name = model_name
+            if diagnostics:
+                entry.payload.update(diagnostics)
+            entry.version += 1
+            return True
+
+    def flush(self) -> int:
+        """Write everything queued now. Returns the number of rows persisted."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    break
+                written += self._write(batch)
+        return written
+
+    def stop(self, timeout: float = 10.0) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=timeout)
+        self.flush()
+        self._thread = None
+        self._stopping = False
+
+    # -- internals ---------------------------------------------------------
+
+    @staticmethod
+    def _batch_size() -> int:
+        return int(getattr(settings, "SEARCH_LOG_WRITE_BEHIND_BATCH_SIZE", 100))
+
+    @staticmethod
+    def _flush_interval_sec() -> float:
+        return int(getattr(settings, "SEARCH_LOG_WRITE_BEHIND_FLUSH_MS", 500)) / 1000.0
+
+    @staticmethod
+    def _max_queue() -> int:
+        return int(getattr(settings, "SEARCH_LOG_WRITE_BEHIND_MAX_QUEUE", 5000))
+
+    def _ensure_worker(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._cond:
+            if self._stopping or (self._thread is not None and self._thread.is_alive()):
+                return
+            self._thread = threading.Thread(target=self._run, name="search-log-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._stopping and len(self._queue) < self._batch_size():
+                    self._cond.wait(timeout=self._flush_interval_sec())
+                if self._stopping:
+                    return
+            try:
+                self.flush()
+                self._ids.refill_if_low()
+            except Exception as e:
+                logger.error(f"Search log writer flush failed: {e}")
+
+    def _take_batch(self) -> List[_PendingLog]:
+        batch: List[_PendingLog] = []
+        with self._cond:
+            while self._queue and len(batch) < self._batch_size():
+                batch.append(self._queue.popleft())
+            SEARCH_LOG_WRITE_BEHIND_QUEUE_DEPTH.set(len(self._queue))
+        return batch
+
+    def _snapshot(self, batch: List[_PendingLog]) -> List[Dict[str, Any]]:
+        rows = []
+        with self._cond:
+            for entry in batch:
+                row = {"p_id": entry.log_id, **entry.binds}
+                if _persist_details():
+                    row["p_strategy"] = json.dumps(entry.payload, ensure_ascii=False)
+                entry.written_version = entry.version
+                rows.append(row)
+        return rows
+
+    def _settle(self, batch: List[_PendingLog], *, first: bool) -> List[Dict[str, Any]]:
+        """
+        Under the lock: release rows with nothing left to write, snapshot the rest.
+        A row leaves `_by_id` only here, after its insert committed, so an
+        annotate() that returns False is always safe to follow with an UPDATE.
+        """
+        updates = []
+        with self._cond:
+            for entry in batch:
+                needs_model = first and entry.model_name is not None
+                if entry.version == entry.written_version and not needs_model:
+                    self._by_id.pop(entry.log_id, None)
+                    continue
+                entry.written_version = entry.version
+                updates.append(
+                    {
+                        "p_id": entry.log_id,
+                        "p_model": entry.model_name,
+                        "p_strategy": json.dumps(entry.payload, ensure_ascii=False),
+                    }
+                )
+        return updates
+
+    def _release(self, batch: List[_PendingLog]) -> None:
+        with self._cond:
+            for entry in batch:
+                self._by_id.pop(entry.log_id, None)
+
+    def _write(self, batch: List[_PendingLog]) -> int:
+        rows = self._snapshot(batch)
+        try:
+            for attempt in range(1, _INSERT_ATTEMPTS + 1):
+                try:
+                    with DatabaseManager.get_write_connection() as conn:
+                        with profiled_cursor(conn, QUERY_CLASS_BULK_INSERT, long_binds=("p_q", "p_strategy")) as cursor:
+                            rejected = _insert_rows(cursor, rows)
+                            conn.commit()
+                            written = [entry for offset, entry in enumerate(batch) if offset not in rejected]
+                            SEARCH_LOG_WRITE_BEHIND_ROWS_TOTAL.labels(outcome="written").inc(len(written))
+                            if rejected:
+                                SEARCH_LOG_WRITE_BEHIND_ROWS_TOTAL.labels(outcome="failed").inc(len(rejected))
+                            self._annotate_written(conn, cursor, written)
+                    return len(written)
+                except Exception as e:
+                    if attempt < _INSERT_ATTEMPTS:
+                        logger.warning(f"Search log batch of {len(batch)} failed, retrying: {e}")
+                        time.sleep(_INSERT_RETRY_DELAY_SEC)
+                        continue
+                    SEARCH_LOG_WRITE_BEHIND_ROWS_TOTAL.labels(outcome="failed").inc(len(batch))
+                    logger.warning(f"Search log batch of {len(batch)} failed and was dropped: {e}")
+            return 0
+        finally:
+            self._release(batch)
+
+    def _annotate_written(self, conn, cursor, written: List[_PendingLog]) -> None:
+        # The rows are committed at this point; a failed UPDATE must not re-run the insert.
+        try:
+            for round_no in range(_MAX_ANNOTATION_ROUNDS):
+                updates = self._settle(written, first=round_no == 0)
+                if not updates:
+                    break
+                _apply_annotations(cursor, updates)
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"Search log annotations for {len(written)} rows failed: {e}")
+
+
+def _insert_rows(cursor, rows: List[Dict[str, Any]]) -> Set[int]:
+    """Insert the batch; returns the offsets of rows Oracle rejected (the rest are inserted)."""
+    if not rows:
+        return set()
+    if "p_strategy" in rows[0]:
+        try:
+            return _executemany_reporting(cursor, _INSERT_WITH_DETAILS_SQL, rows)
+        except Exception as col_err:
+            # Backward compatible fallback when STRATEGY_DETAILS column is absent.
+            if "ORA-00904" not in str(col_err):
+                raise
+            rows = [{k: v for k, v in row.items() if k != "p_strategy"} for row in rows]
+    return _executemany_reporting(cursor, _INSERT_SQL, rows)
+
+
+def _executemany_reporting(cursor, sql: str, rows: List[Dict[str, Any]]) -> Set[int]:
+    cursor.executemany(sql, rows, batcherrors=True)
+    rejected = set()
+    for err in cursor.getbatcherrors():
+        rejected.add(int(err.offset))
+        logger.warning(f"Search log row {rows[int(err.offset)]['p_id']} rejected: {err.message}")
+    return rejected
+
+
+def _apply_annotations(cursor, updates: List[Dict[str, Any]]) -> None:
+    models = [{"p_id": u["p_id"], "p_model": u["p_model"]} for u in updates if u["p_model"] is not None]
+    statements = [("UPDATE TOMEHUB_SEARCH_LOGS SET MODEL_NAME = :p_model WHERE ID = :p_id", models)]
+    if _persist_details():
+        details = [{"p_id": u["p_id"], "p_strategy": u["p_strategy"]} for u in updates]
+        statements.append(("UPDATE TOMEHUB_SEARCH_LOGS SET STRATEGY_DETAILS = :p_strategy WHERE ID = :p_id", details))
+    for sql, rows in statements:
+        if not rows:
+            continue
+        try:
+            cursor.executemany(sql, rows)
+        except Exception as e:
+            if "ORA-00904" not in str(e):
+                raise
+
+
+def purge_expired_search_logs() -> int:
+    """Retention cleanup for the scheduled job; deletes in bounded batches. Returns rows deleted."""
+    if not bool(getattr(settings, "SEARCH_LOG_RETENTION_CLEANUP_ENABLED", False)):
+        return 0
+    deleted = 0
+    with DatabaseManager.get_write_connection() as conn:
+        with conn.cursor() as cursor:
+            while True:
+                cursor.execute(
+                    """
+                    DELETE FROM TOMEHUB_SEARCH_LOGS
+                    WHERE TIMESTAMP < (CURRENT_TIMESTAMP - NUMTODSINTERVAL(:p_days, 'DAY'))
+                      AND ROWNUM <= :p_batch
+                    """,
+                    {"p_days": int(getattr(settings, "SEARCH_LOG_RETENTION_DAYS", 90)), "p_batch": _RETENTION_DELETE_BATCH},
+                )
+                batch = int(cursor.rowcount or 0)
+                conn.commit()
+                deleted += batch
+                if batch < _RETENTION_DELETE_BATCH:
+                    break
+    return deleted
+
+
+search_log_writer = SearchLogWriter()
@@ -56,6 +56,7 @@ from utils.logger import get_logger
 logger = get_logger("search_service")
 
 
+from infrastructure.cursor_profiles import QUERY_CLASS_CANDIDATE_SCAN, QUERY_CLASS_POINT_LOOKUP, profiled_cursor
 from infrastructure.db_manager import DatabaseManager, safe_read_clob
 
 
@@ -67,6 +68,7 @@ from services.smart_search_service import (
     parse_and_clean_content,
 )
 from services.search_system.mix_policy import resolve_result_mix_policy
+from services.search_system.neighbor_cache import neighbor_cache
 
 # Import Graph Service
 from services.graph_service import get_graph_candidates, GraphRetrievalError
@@ -89,6 +91,7 @@ from services.monitoring import (
     L3_CONTEXT_REORDER_TOTAL,
 )
 from services.cache_service import get_cache, generate_cache_key
+from services.answer_cache_service import answer_cache, usage_tokens
 from services.external_kb_service import (
     get_domain_external_candidates,
     get_external_graph_candidates,
@@ -96,10 +99,12 @@ from services.external_kb_service import (
     get_lexical_support_candidates,
     maybe_refresh_external_for_explorer_async,
 )
+from services.vector_index_service import LANE_BOOK_CONTEXT, fetch_vector_ranked
 from services.search_diagnostics_service import (
     append_search_log_diagnostics,
     enrich_search_metadata,
 )
+from services.search_log_writer_service import search_log_writer
 
 
 def _apply_dynamic_source_composition_policy(
@@ -368,12 +373,17 @@ def get_book_context(book_id: str, query_text: str, firebase_uid: str) -> List[D
                             AND li.ITEM_ID = c.item_id
                             AND NVL(li.IS_DELETED, 0) = 0
                       )
-                    ORDER BY dist ASC
-                    FETCH FIRST 15 ROWS ONLY
                 """
-                
-                cursor.execute(sql, bv_vec=query_embedding, bv_book_id=book_id, bv_uid=firebase_uid)
-                rows = cursor.fetchall()
+                rows = fetch_vector_ranked(
+                    cursor,
+                    sql,
+                    {"bv_vec": query_embedding, "bv_book_id": book_id, "bv_uid": firebase_uid, "bv_limit": 15},
+                    lane=LANE_BOOK_CONTEXT,
+                    distance_expr="VECTOR_DISTANCE(c.vec_embedding, :bv_vec, COSINE)",
+                    rank_column="dist",
+                    reweighted=True,
+                    limit_bind="bv_limit",
+                )
                 
                 chunks = []
                 for row in chunks:
@@ -662,6 +672,63 @@ def _safe_int(value: Any) -> Optional[int]:
         return None
 
 
+def _parent_neighbor_sql(seed_count: int) -> str:
+    seed_rows = "\n                UNION ALL\n".join(
+        f"                SELECT {i} AS seed_ord, :p_s{i}_item AS item_id, CAST(:p_s{i}_anchor AS NUMBER) AS anchor_id, "
+        f"CAST(:p_s{i}_page AS NUMBER) AS page_num, CAST(:p_s{i}_chunk AS NUMBER) AS chunk_idx FROM DUAL"
+        for i in range(seed_count)
+    )
+    return f"""
+        WITH seeds AS (
+{seed_rows}
+        ),
+        ranked AS (
+            SELECT
+                s.seed_ord,
+                c.id,
+                c.content_chunk,
+                c.title,
+                c.content_type,
+                c.page_number,
+                c.chunk_index,
+                c.item_id,
+                ROW_NUMBER() OVER (
+                    PARTITION BY s.seed_ord
+                    ORDER BY
+                        CASE
+                            WHEN s.chunk_idx IS NOT NULL THEN ABS(NVL(c.chunk_index, s.chunk_idx) - s.chunk_idx)
+                            ELSE 9999
+                        END ASC,
+                        CASE
+                            WHEN s.page_num IS NOT NULL THEN ABS(NVL(c.page_number, s.page_num) - s.page_num)
+                            ELSE 9999
+                        END ASC,
+                        c.id ASC
+                ) AS rn
+            FROM seeds s
+            JOIN TOMEHUB_CONTENT_V2 c
+              ON c.firebase_uid = :p_uid
+             AND c.item_id = s.item_id
+            WHERE EXISTS (
+                  SELECT 1
+                  FROM TOMEHUB_LIBRARY_ITEMS li
+                  WHERE li.FIREBASE_UID = c.firebase_uid
+                    AND li.ITEM_ID = c.item_id
+                    AND NVL(li.IS_DELETED, 0) = 0
+              )
+              AND (s.anchor_id IS NULL OR c.id <> s.anchor_id)
+              AND (
+                (s.page_num IS NOT NULL AND c.page_number BETWEEN s.page_num - :p_window AND s.page_num + :p_window)
+                OR (s.chunk_idx IS NOT NULL AND c.chunk_index BETWEEN s.chunk_idx - :p_window AND s.chunk_idx + :p_window)
+              )
+        )
+        SELECT seed_ord, id, content_chunk, title, content_type, page_number, chunk_index, item_id
+        FROM ranked
+        WHERE rn <= :p_limit
+        ORDER BY seed_ord, rn
+    """
+
+
 def _fetch_parent_context_neighbors(
     firebase_uid: str,
     seeds: List[Dict[str, Any]],
@@ -670,129 +737,116 @@ def _fetch_parent_context_neighbors(
     neighbor_window: int,
     neighbor_limit: int,
 ) -> tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Neighbour chunks (+/- window by chunk_index or page) for the top seeds.
+
+    Cached neighbourhoods are reused; every remaining seed is resolved by one
+    set-based query (seeds as bound DUAL rows, ROW_NUMBER per seed) bounded by
+    timeout_ms as the connection call timeout, so context is complete for all
+    seeds or the fetch fails open as a whole.
+    """
     started = time.perf_counter()
     candidates: List[Dict[str, Any]] = []
     scanned_seeds = 0
     fetched_rows = 0
+    cache_hits = 0
     status = "skipped"
     skip_reason: Optional[str] = None
 
     seed_topk_eff = max(1, min(int(seed_topk or 3), 8))
     window_eff = max(1, min(int(neighbor_window or 1), 3))
     per_seed_limit = max(1, min(int(neighbor_limit or 2), 8))
-    deadline = started + (max(50, int(timeout_ms or 260)) / 1000.0)
+    call_timeout_ms = max(50, int(timeout_ms or 260))
 
     seed_candidates = [s for s in (seeds or []) if isinstance(s, dict)]
     if not seed_candidates:
         return [], {"status": status, "skip_reason": "no_seed_candidates", "latency_ms": 0}
 
-    dedup_ids = set()
+    # (seed, book_id, anchor_id, cache_key) for seeds that can have neighbours.
+    resolved: List[Tuple[Dict[str, Any], str, Any, Tuple[Any, ...]]] = []
+    rows_by_seed: Dict[int, List[Tuple[Any, ...]]] = {}
+    for seed in seed_candidates[:seed_topk_eff]:
+        scanned_seeds += 1
+        book_id = str(seed.get("book_id") or "").strip()
+        if not book_id:
+            continue
+        page_num = _safe_int(seed.get("page_number"))
+        chunk_idx = _safe_int(seed.get("chunk_index"))
+        if page_num is None and chunk_idx is None:
+            continue
+        anchor_id = seed.get("id")
+        cache_key = (anchor_id, page_num, chunk_idx, window_eff, per_seed_limit)
+        cached = neighbor_cache.get(firebase_uid, book_id, cache_key)
+        if cached is not None:
+            cache_hits += 1
+            rows_by_seed[len(resolved)] = cached
+        resolved.append((seed, book_id, anchor_id, cache_key))
+
+    misses = [i for i in range(len(resolved)) if i not in rows_by_seed]
     try:
-        with DatabaseManager.get_read_connection() as conn:
-            with conn.cursor() as cursor:
-                for seed in seed_candidates[:seed_topk_eff]:
-                    scanned_seeds += 1
-                    if time.perf_counter() > deadline:
-                        status = "timeout"
-                        skip_reason = "parent_timeout"
-                        break
-
-                    book_id = str(seed.get("book_id") or "").strip()
-                    if not book_id:
-                        continue
-
-                    anchor_id = seed.get("id")
-                    page_num = _safe_int(seed.get("page_number"))
-                    chunk_idx = _safe_int(seed.get("chunk_index"))
-                    if page_num is None and chunk_idx is None:
-                        continue
-
-                    page_low = page_num - window_eff if page_num is not None else None
-                    page_high = page_num + window_eff if page_num is not None else None
-                    chunk_low = chunk_idx - window_eff if chunk_idx is not None else None
-                    chunk_high = chunk_idx + window_eff if chunk_idx is not None else None
-
-                    cursor.execute(
-                        """
-                        SELECT * FROM (
-                            SELECT
-                                c.id,
-                                c.content_chunk,
-                                c.title,
-                                c.content_type,
-                                c.page_number,
-                                c.chunk_index,
-                                c.item_id
-                            FROM TOMEHUB_CONTENT_V2 c
-                            WHERE c.firebase_uid = :p_uid
-                              AND c.item_id = :p_item_id
-                              AND EXISTS (
-                                  SELECT 1
-                                  FROM TOMEHUB_LIBRARY_ITEMS li
-                                  WHERE li.FIREBASE_UID = c.firebase_uid
-                                    AND li.ITEM_ID = c.item_id
-                                    AND NVL(li.IS_DELETED, 0) = 0
-                              )
-                              AND (:p_anchor_id IS NULL OR c.id <> :p_anchor_id)
-                              AND (
-                                (:p_page_low IS NOT NULL AND c.page_number BETWEEN :p_page_low AND :p_page_high)
-                                OR (:p_chunk_low IS NOT NULL AND c.chunk_index BETWEEN :p_chunk_low AND :p_chunk_high)
-                              )
-                            ORDER BY
-                                CASE
-                                    WHEN :p_chunk IS NOT NULL THEN ABS(NVL(c.chunk_index, :p_chunk) - :p_chunk)
-                                    ELSE 9999
-                                END ASC,
-                                CASE
-                                    WHEN :p_page IS NOT NULL THEN ABS(NVL(c.page_number, :p_page) - :p_page)
-                                    ELSE 9999
-                                END ASC,
-                                c.id ASC
-                        )
-                        WHERE ROWNUM <= :p_limit
-                        """,
-                        {
-                            "p_uid": firebase_uid,
-                            "p_item_id": book_id,
-                            "p_anchor_id": anchor_id,
-                            "p_page_low": page_low,
-                            "p_page_high": page_high,
-                            "p_chunk_low": chunk_low,
-                            "p_chunk_high": chunk_high,
-                            "p_page": page_num,
-                            "p_chunk": chunk_idx,
-                            "p_limit": per_seed_limit,
-                        },
-                    )
-                    rows = cursor.fetchall() or []
-                    fetched_rows += len(rows)
-
-                    for row in rows:
-                        candidate_id = row[0]
-                        if candidate_id in dedup_ids:
-                            continue
-                        dedup_ids.add(candidate_id)
-                        candidates.append(
-                            {
-                                "id": candidate_id,
-                                "content_chunk": safe_read_clob(row[1]),
-                                "title": row[2] or seed.get("title", "Unknown"),
-                                "source_type": row[3] or seed.get("source_type", "BOOK"),
-                                "page_number": row[4] or 0,
-                                "chunk_index": row[5],
-                                "book_id": str(row[6] or book_id),
-                                "_parent_context": True,
-                                "_parent_anchor_id": anchor_id,
-                            }
-                        )
-        if candidates and status != "timeout":
+        if misses:
+            params: Dict[str, Any] = {"p_uid": firebase_uid, "p_window": window_eff, "p_limit": per_seed_limit}
+            for slot, idx in enumerate(misses):
+                seed, book_id, anchor_id, _ = resolved[idx]
+                params[f"p_s{slot}_item"] = book_id
+                params[f"p_s{slot}_anchor"] = _safe_int(anchor_id)
+                params[f"p_s{slot}_page"] = _safe_int(seed.get("page_number"))
+                params[f"p_s{slot}_chunk"] = _safe_int(seed.get("chunk_index"))
+            fetched: Dict[int, List[Tuple[Any, ...]]] = {idx: [] for idx in misses}
+            with DatabaseManager.get_read_connection() as conn:
+                previous_timeout = getattr(conn, "call_timeout", None)
+                try:
+                    if previous_timeout is not None:
+                        conn.call_timeout = call_timeout_ms
+                    with profiled_cursor(conn, QUERY_CLASS_CANDIDATE_SCAN) as cursor:
+                        cursor.execute(_parent_neighbor_sql(len(misses)), params)
+                        for row in cursor.fetchall() or []:
+                            fetched_rows += 1
+                            idx = misses[int(row[0])]
+                            fetched[idx].append(
+                                (row[1], safe_read_clob(row[2]), row[3], row[4], row[5], row[6], row[7])
+                            )
+                finally:
+                    if previous_timeout is not None:
+                        conn.call_timeout = previous_timeout
+            for idx, rows in fetched.items():
+                _, book_id, _, cache_key = resolved[idx]
+                neighbor_cache.put(firebase_uid, book_id, cache_key, rows)
+                rows_by_seed[idx] = rows
+
+        dedup_ids = set()
+        for idx, (seed, book_id, anchor_id, _) in enumerate(resolved):
+            for candidate_id, content, title, content_type, page_number, chunk_index, item_id in rows_by_seed.get(idx, []):
+                if candidate_id in dedup_ids:
+                    continue
+                dedup_ids.add(candidate_id)
+                candidates.append(
+                    {
+                        "id": candidate_id,
+                        "content_chunk": content,
+                        "title": title or seed.get("title", "Unknown"),
+                        "source_type": content_type or seed.get("source_type", "BOOK"),
+                        "page_number": page_number or 0,
+                        "chunk_index": chunk_index,
+                        "book_id": str(item_id or book_id),
+                        "_parent_context": True,
+                        "_parent_anchor_id": anchor_id,
+                    }
+                )
+        if candidates:
             status = "ok"
-        elif status != "timeout":
+        else:
             status = "skipped"
-            skip_reason = skip_reason or "no_parent_candidates"
+            skip_reason = "no_parent_candidates"
     except Exception as err:
-        status = "error"
-        skip_reason = f"parent_fetch_error:{err}"
+        candidates = []
+        text = str(err)
+        if "DPY-4024" in text or "ORA-03156" in text:
+            status = "timeout"
+            skip_reason = "parent_timeout"
+        else:
+            status = "error"
+            skip_reason = f"parent_fetch_error:{err}"
         logger.warning("Parent-context fetch failed-open: %s", err)
 
     latency_ms = int((time.perf_counter() - started) * 1000)
@@ -802,6 +856,7 @@ def _fetch_parent_context_neighbors(
         "latency_ms": latency_ms,
         "scanned_seeds": scanned_seeds,
         "fetched_rows": fetched_rows,
+        "cache_hits": cache_hits,
         "candidate_count": len(candidates),
     }
 
@@ -2129,6 +2184,91 @@ def get_rag_context(question: str, firebase_uid: str, context_book_id: str = Non
     }
 
 
+# Generation metadata replayed with a cached answer (services/answer_cache_service.py).
+_ANSWER_CACHE_META_KEYS = (
+    "model_name",
+    "model_tier",
+    "provider_name",
+    "model_fallback_applied",
+    "secondary_fallback_applied",
+    "fallback_reason",
+    "llm_generation_timeout_applied",
+    "context_budget_applied",
+    "quote_target_count",
+    "short_answer_recovery_applied",
+    "graph_bridge_attempted",
+    "graph_bridge_used",
+    "graph_bridge_timeout_triggered",
+    "graph_bridge_latency_ms",
+)
+
+
+def _answer_generation_profile() -> Dict[str, Any]:
+    """Settings that change the generated answer for the same prompt inputs."""
+    return {
+        "qwen_pilot": bool(settings.LLM_EXPLORER_QWEN_PILOT_ENABLED),
+        "primary_model": settings.LLM_EXPLORER_PRIMARY_MODEL if settings.LLM_EXPLORER_QWEN_PILOT_ENABLED else None,
+        "flash_model": get_model_for_tier(MODEL_TIER_FLASH),
+        "context_budget": bool(getattr(settings, "L3_PERF_CONTEXT_BUDGET_ENABLED", False)),
+        "output_budget": bool(getattr(settings, "L3_PERF_OUTPUT_BUDGET_ENABLED", False)),
+        "max_output_tokens": int(getattr(settings, "L3_PERF_MAX_OUTPUT_TOKENS_STANDARD", 650) or 650),
+    }
+
+
+def _context_answer_meta(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "resolved_domain_mode": ctx.get("resolved_domain_mode", DOMAIN_MODE_AUTO),
+        "domain_confidence": ctx.get("domain_confidence", 0.0),
+        "domain_reason": ctx.get("domain_reason"),
+        "provider_policy_applied": ctx.get("provider_policy_applied", {}),
+        "supplementary_search_skipped_reason": ctx.get("supplementary_search_skipped_reason"),
+        "expansion_skipped_reason": ctx.get("expansion_skipped_reason"),
+        "source_diversity_count": ctx.get("source_diversity_count", 0),
+        "source_type_diversity_count": ctx.get("source_type_diversity_count", 0),
+    }
+
+
+def _record_answer_in_search_log(meta: Dict[str, Any], model_used: Optional[str]) -> None:
+    search_log_id = meta.get("search_log_id")
+    if not search_log_id:
+        return
+    # Rows still queued in the search log writer take the model name with their insert.
+    if not search_log_writer.annotate(search_log_id, model_name=model_used):
+        try:
+            with DatabaseManager.get_write_connection() as conn:
+                with profiled_cursor(conn, QUERY_CLASS_POINT_LOOKUP) as cursor:
+                    cursor.execute(
+                        """
+                        UPDATE TOMEHUB_SEARCH_LOGS
+                        SET MODEL_NAME = :p_model
+                        WHERE ID = :p_id
+                        """,
+                        {"p_model": model_used, "p_id": search_log_id}
+                    )
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"Failed to update MODEL_NAME for search_log_id={search_log_id}: {e}")
+    _append_search_log_diagnostics(
+        search_log_id,
+        {
+            "endpoint": "/api/search",
+            **{
+                key: meta.get(key)
+                for key in (
+                    "diagnostic_trace_v1",
+                    "diagnostic_trace_line",
+                    "retrieval_failure_plane",
+                    "generation_failure_plane",
+                    "failure_plane",
+                    "freshness_plane",
+                    "search_quality_plane",
+                    "operational_plane_summary",
+                )
+            },
+        },
+    )
+
+
 def generate_answer(question: str, firebase_uid: str, context_book_id: str = None, chat_history: List[Dict] = None, session_summary: str = "", limit: Optional[int] = None, offset: int = 0, session_id: Optional[int | str] = None, resource_type: Optional[str] = None, scope_mode: str = "GLOBAL", apply_scope_policy: bool = False, compare_mode: Optional[str] = None, target_book_ids: Optional[List[str]] = None, visibility_scope: str = "default", content_type: Optional[str] = None, ingestion_type: Optional[str] = None, domain_mode: str = DOMAIN_MODE_AUTO) -> Tuple[Optional[str], Optional[List[Dict]], Dict]:
     """
     RAG generation pipeline with Memory Layer support.
@@ -2178,6 +2318,9 @@ def generate_answer(question: str, firebase_uid: str, context_book_id: str = Non
             },
         )
 
+    # Read before retrieval so an ingest during generation cannot be cached as current.
+    answer_cache_version = answer_cache.corpus_version(firebase_uid) if answer_cache.enabled else None
+
     # 1. Retrieve Context
     retrieval_phase_start = time.perf_counter()
     ctx = get_rag_context(
@@ -2214,6 +2357,51 @@ def generate_answer(question: str, firebase_uid: str, context_book_id: str = Non
     context_budget_applied = bool(
         getattr(settings, "L3_PERF_CONTEXT_BUDGET_ENABLED", False) and answer_mode != "EXPLORER"
     )
+
+    answer_cache_key = None
+    if answer_cache_version is not None:
+        prompt_history = [
+            (msg.get("role"), msg.get("content"))
+            for msg in (chat_history or [])[-settings.CHAT_PROMPT_TURNS:]
+        ]
+        answer_cache_key = answer_cache.build_key(
+            question=question,
+            answer_mode=answer_mode,
+            scope={
+                "book_id": context_book_id,
+                "resource_type": resource_type,
+                "scope_mode": scope_mode,
+                "apply_scope_policy": apply_scope_policy,
+                "compare_mode": compare_mode,
+                "target_book_ids": sorted(target_book_ids or []),
+                "visibility_scope": visibility_scope,
+                "content_type": content_type,
+                "ingestion_type": ingestion_type,
+                "domain_mode": domain_mode,
+                "limit": limit,
+                "offset": offset,
+            },
+            chunks=chunks,
+            conversation=[session_summary, prompt_history] if (session_summary or prompt_history) else None,
+            generation=_answer_generation_profile(),
+        )
+        cached = answer_cache.get(firebase_uid, answer_cache_key, answer_cache_version)
+        if cached is not None:
+            meta = ctx.get('metadata', {}) or {}
+            meta.update(cached.generation_meta)
+            meta.update(_context_answer_meta(ctx))
+            meta["answer_cache_hit"] = True
+            meta = enrich_search_metadata(
+                meta,
+                endpoint="/api/search",
+                query=question,
+                intent=ctx.get("intent"),
+                results=chunks,
+                answer=cached.answer,
+                sources=cached.sources,
+            )
+            _record_answer_in_search_log(meta, cached.generation_meta.get("model_name"))
+            return cached.answer, cached.sources, meta
     
     # 2. Build Context String
     prompt_build_phase_start = time.perf_counter()
@@ -2369,6 +2557,7 @@ def generate_answer(question: str, firebase_uid: str, context_book_id: str = Non
         except Exception:
             pass
         answer = result.text if result and result.text else "Cevap üretilemedi."
+        generation_results = [result]
 
         # Recovery guard: if Standard mode answer is underfilled, regenerate once in richer mode.
         short_answer_recovery_applied = False
@@ -2423,6 +2612,7 @@ def generate_answer(question: str, firebase_uid: str, context_book_id: str = Non
                     route_mode=route_mode,
                     allow_secondary_fallback=allow_secondary_fallback,
                 )
+                generation_results.append(recovery_result)
                 recovered = recovery_result.text if recovery_result and recovery_result.text else ""
                 if recovered.strip() and (
                     len(recovered.strip()) >= 260
@@ -2446,14 +2636,7 @@ def generate_answer(question: str, firebase_uid: str, context_book_id: str = Non
         meta["context_budget_applied"] = context_budget_applied
         meta["quote_target_count"] = quote_target_count
         meta["short_answer_recovery_applied"] = short_answer_recovery_applied
-        meta["resolved_domain_mode"] = ctx.get("resolved_domain_mode", DOMAIN_MODE_AUTO)
-        meta["domain_confidence"] = ctx.get("domain_confidence", 0.0)
-        meta["domain_reason"] = ctx.get("domain_reason")
-        meta["provider_policy_applied"] = ctx.get("provider_policy_applied", {})
-        meta["supplementary_search_skipped_reason"] = ctx.get("supplementary_search_skipped_reason")
-        meta["expansion_skipped_reason"] = ctx.get("expansion_skipped_reason")
-        meta["source_diversity_count"] = ctx.get("source_diversity_count", 0)
-        meta["source_type_diversity_count"] = ctx.get("source_type_diversity_count", 0)
+        meta.update(_context_answer_meta(ctx))
         meta["graph_bridge_attempted"] = graph_bridge_attempted
         meta["graph_bridge_used"] = graph_bridge_used
         meta["graph_bridge_timeout_triggered"] = graph_bridge_timeout_triggered
@@ -2467,41 +2650,20 @@ def generate_answer(question: str, firebase_uid: str, context_book_id: str = Non
             answer=answer,
             sources=sources,
         )
-        search_log_id = meta.get("search_log_id")
-        if search_log_id:
-            try:
-                with DatabaseManager.get_write_connection() as conn:
-                    with conn.cursor() as cursor:
-                        cursor.execute(
-                            """
-                            UPDATE TOMEHUB_SEARCH_LOGS
-                            SET MODEL_NAME = :p_model
-                            WHERE ID = :p_id
-                            """,
-                            {"p_model": result.model_used, "p_id": search_log_id}
-                        )
-                    conn.commit()
-            except Exception as e:
-                logger.warning(f"Failed to update MODEL_NAME for search_log_id={search_log_id}: {e}")
-            _append_search_log_diagnostics(
-                search_log_id,
-                {
-                    "endpoint": "/api/search",
-                    **{
-                        key: meta.get(key)
-                        for key in (
-                            "diagnostic_trace_v1",
-                            "diagnostic_trace_line",
-                            "retrieval_failure_plane",
-                            "generation_failure_plane",
-                            "failure_plane",
-                            "freshness_plane",
-                            "search_quality_plane",
-                            "operational_plane_summary",
-                        )
-                    },
-                },
-            )
+        _record_answer_in_search_log(meta, result.model_used)
+
+        if answer_cache_key is not None:
+            meta["answer_cache_hit"] = False
+            if result and result.text:
+                answer_cache.put(
+                    firebase_uid,
+                    answer_cache_key,
+                    corpus_version=answer_cache_version,
+                    answer=answer,
+                    sources=sources,
+                    generation_meta={key: meta.get(key) for key in _ANSWER_CACHE_META_KEYS},
+                    tokens=usage_tokens(*generation_results),
+                )
 
         return answer, sources, meta
     except Exception as e:
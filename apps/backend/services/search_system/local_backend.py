@@ -0,0 +1,478 @@
+"""
+Offline retrieval backend: SQLite for text lanes, NumPy for vectors.
+
+`LocalCorpus` keeps an exported slice of TOMEHUB_CONTENT_V2 /
+TOMEHUB_LIBRARY_ITEMS in SQLite (":memory:" or a file such as tomehub.db) and
+the chunk embeddings as one normalized float32 matrix. The Local* strategies
+subclass the Oracle ones so SearchOrchestrator buckets them the same way, and
+reuse their boundary checks, score formulas, PDF first-pass exclusion and
+fallback. What differs is only the storage:
+
+- exact: `instr(normalized_content, deaccented query)` instead of LIKE / Oracle Text
+- lemma: `instr(lemma_tokens, '"lemma"')` scan (the LIKE path, not postings)
+- semantic: brute-force cosine over the filtered rows, `dist / rag_weight` as in Oracle
+
+Fixtures come from scripts/export_retrieval_fixture.py (JSON, see
+`LocalCorpus.load_fixture`). `query_embeddings` in the fixture lets the
+semantic lane run without calling the embedding API.
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.text_utils import deaccent_text, get_lemmas, normalize_text
+
+from .retrieval_backend import RetrievalBackend
+from .strategies import (
+    ExactMatchStrategy,
+    LemmaMatchStrategy,
+    SemanticMatchStrategy,
+    _allow_pdf_fallback,
+    _contains_exact_term_boundary,
+    _contains_inner_substring_only,
+    _contains_lemma_stem_boundary,
+    _count_lemma_stem_hits,
+    _filter_query_lemmas,
+    _normalize_resource_type,
+    _normalize_search_surface,
+    _normalize_visibility_scope,
+    _resolve_content_type_for_surface,
+    _should_exclude_pdf_in_first_pass,
+    _strip_metadata_header,
+)
+
+FIXTURE_VERSION = 1
+
+_PDF_TYPES = ("PDF", "EPUB", "PDF_CHUNK", "BOOK_CHUNK")
+_BOOK_TYPES = ("PDF", "EPUB", "PDF_CHUNK", "BOOK", "HIGHLIGHT", "INSIGHT")
+_NOTE_TYPES = ("HIGHLIGHT", "INSIGHT")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS library_items (
+    firebase_uid TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    item_type TEXT,
+    title TEXT,
+    summary_text TEXT,
+    search_visibility TEXT,
+    personal_note_category TEXT,
+    is_deleted INTEGER DEFAULT 0,
+    PRIMARY KEY (firebase_uid, item_id)
+);
+CREATE TABLE IF NOT EXISTS content (
+    id INTEGER PRIMARY KEY,
+    firebase_uid TEXT NOT NULL,
+    item_id TEXT,
+    title TEXT,
+    content_type TEXT,
+    page_number INTEGER,
+    chunk_index INTEGER,
+    content_chunk TEXT,
+    normalized_content TEXT,
+    lemma_tokens TEXT,
+    tags_json TEXT,
+    comment_text TEXT,
+    ingestion_type TEXT,
+    ai_eligible INTEGER DEFAULT 1,
+    rag_weight REAL DEFAULT 1.0
+);
+CREATE INDEX IF NOT EXISTS idx_content_uid ON content (firebase_uid, id);
+CREATE TABLE IF NOT EXISTS content_vectors (
+    id INTEGER PRIMARY KEY,
+    vec BLOB NOT NULL
+);
+"""
+
+_CONTENT_COLUMNS = (
+    "id", "firebase_uid", "item_id", "title", "content_type", "page_number", "chunk_index",
+    "content_chunk", "normalized_content", "lemma_tokens", "tags_json", "comment_text",
+    "ingestion_type", "ai_eligible", "rag_weight",
+)
+_ITEM_COLUMNS = (
+    "firebase_uid", "item_id", "item_type", "title", "summary_text",
+    "search_visibility", "personal_note_category", "is_deleted",
+)
+
+_SELECT = """
+    SELECT c.id, c.title, c.content_type, c.page_number, c.item_id,
+           CASE WHEN c.normalized_content IS NULL OR c.normalized_content = ''
+                THEN c.content_chunk ELSE c.normalized_content END,
+           c.content_chunk, c.tags_json, l.summary_text, c.comment_text, c.rag_weight
+    FROM content c
+    LEFT JOIN library_items l ON c.item_id = l.item_id AND c.firebase_uid = l.firebase_uid
+"""
+
+
+class LocalCorpus:
+    def __init__(self, db_path: str = ":memory:"):
+        # One connection shared by the orchestrator's worker threads, serialized by the lock.
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self.query_embeddings: Dict[str, List[float]] = {}
+        self._vector_ids = np.zeros(0, dtype=np.int64)
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._load_vectors()
+
+    # -- loading -----------------------------------------------------------
+
+    @classmethod
+    def from_fixture(cls, path: str | Path, db_path: str = ":memory:") -> "LocalCorpus":
+        corpus = cls(db_path)
+        corpus.load_fixture(path)
+        return corpus
+
+    def load_fixture(self, path: str | Path) -> None:
+        """
+        {"version": 1, "library_items": [...], "content": [{..., "embedding": [...]}],
+         "query_embeddings": {"query text": [...]}}. Missing normalized_content /
+        lemma_tokens are derived the way ingestion does.
+        """
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+        if payload.get("version") != FIXTURE_VERSION:
+            raise ValueError(f"Unsupported retrieval fixture version in {path}: {payload.get('version')}")
+        self.add_library_items(payload.get("library_items") or [])
+        self.add_content(payload.get("content") or [])
+        self.query_embeddings.update(payload.get("query_embeddings") or {})
+
+    def add_library_items(self, items: Iterable[Dict[str, Any]]) -> None:
+        rows = [tuple(item.get(col) for col in _ITEM_COLUMNS) for item in items]
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO library_items ({', '.join(_ITEM_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in _ITEM_COLUMNS)})",
+                [(r[0], r[1], r[2], r[3], r[4], r[5], r[6], int(r[7] or 0)) for r in rows],
+            )
+            self._conn.commit()
+
+    def add_content(self, chunks: Iterable[Dict[str, Any]]) -> None:
+        rows = []
+        vectors = []
+        for chunk in chunks:
+            row = dict(chunk)
+            text = str(row.get("content_chunk") or "")
+            if row.get("normalized_content") is None:
+                row["normalized_content"] = normalize_text(text)
+            lemmas = row.get("lemma_tokens")
+            if lemmas is None:
+                lemmas = get_lemmas(text)
+            if not isinstance(lemmas, str):
+                lemmas = json.dumps(list(lemmas), ensure_ascii=False)
+            row["lemma_tokens"] = lemmas
+            if isinstance(row.get("tags_json"), (list, dict)):
+                row["tags_json"] = json.dumps(row["tags_json"], ensure_ascii=False)
+            row.setdefault("ai_eligible", 1)
+            row["ai_eligible"] = 1 if row["ai_eligible"] is None else int(row["ai_eligible"])
+            row["rag_weight"] = float(row.get("rag_weight") or 1.0)
+            rows.append(tuple(row.get(col) for col in _CONTENT_COLUMNS))
+            if row.get("embedding"):
+                vectors.append((int(row["id"]), np.asarray(row["embedding"], dtype=np.float32).tobytes()))
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO content ({', '.join(_CONTENT_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in _CONTENT_COLUMNS)})",
+                rows,
+            )
+            self._conn.executemany("INSERT OR REPLACE INTO content_vectors (id, vec) VALUES (?, ?)", vectors)
+            self._conn.commit()
+        self._load_vectors()
+
+    def _load_vectors(self) -> None:
+        with self._lock:
+            rows = self._conn.execute("SELECT id, vec FROM content_vectors ORDER BY id").fetchall()
+        if not rows:
+            return
+        ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+        matrix = np.vstack([np.frombuffer(r[1], dtype=np.float32) for r in rows])
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self._vector_ids, self._vectors = ids, matrix / norms
+
+    def embedding_fn(self, query: str) -> Optional[List[float]]:
+        return self.query_embeddings.get(query)
+
+    # -- reads -------------------------------------------------------------
+
+    def select(
+        self,
+        firebase_uid: str,
+        *,
+        where: str = "",
+        params: Sequence[Any] = (),
+        filters: Optional[Dict[str, Any]] = None,
+        include_pdf: bool = True,
+        order_by: str = "c.id DESC",
+        limit: Optional[int] = None,
+    ) -> List[tuple]:
+        # filters=None reads the user's rows unfiltered, like the semantic PDF backfill query.
+        clause, filter_params = ("", []) if filters is None else _filter_clause(filters, include_pdf=include_pdf)
+        sql = f"{_SELECT} WHERE c.firebase_uid = ? AND c.ai_eligible = 1 {clause} {where} ORDER BY {order_by}"
+        args: List[Any] = [firebase_uid, *filter_params, *params]
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+        with self._lock:
+            return self._conn.execute(sql, args).fetchall()
+
+    def nearest(self, rows: List[tuple], query_vec: Sequence[float], limit: int) -> List[Tuple[tuple, float]]:
+        """(row, reweighted cosine distance) for the filtered rows, nearest first."""
+        if not rows or not self._vectors.size:
+            return []
+        q = np.asarray(query_vec, dtype=np.float32)
+        q_norm = float(np.linalg.norm(q)) or 1.0
+        ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+        pos = np.searchsorted(self._vector_ids, ids)
+        pos = np.clip(pos, 0, len(self._vector_ids) - 1)
+        has_vec = self._vector_ids[pos] == ids
+        if not has_vec.any():
+            return []
+        kept = [row for row, ok in zip(rows, has_vec) if ok]
+        weights = np.asarray([float(row[10] or 1.0) for row in kept], dtype=np.float32)
+        dist = (1.0 - self._vectors[pos[has_vec]] @ (q / q_norm)) / np.maximum(weights, 0.0001)
+        order = np.lexsort((np.asarray([row[0] for row in kept]), dist))[:limit]
+        return [(kept[i], float(dist[i])) for i in order]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _filter_clause(filters: Dict[str, Any], *, include_pdf: bool) -> Tuple[str, List[Any]]:
+    """SQLite translation of the strategies' _apply_*_filter chain (c = content, l = library_items)."""
+    resource_type = filters.get("resource_type")
+    book_id = filters.get("book_id")
+    search_surface = filters.get("search_surface")
+    parts: List[str] = []
+    params: List[Any] = []
+
+    def _in(types: Sequence[str]) -> str:
+        return f"c.content_type IN ({', '.join(repr(t) for t in types)})"
+
+    rt = _normalize_resource_type(resource_type)
+    if rt == "BOOK":
+        parts.append(_in(_BOOK_TYPES))
+    elif rt == "ALL_NOTES":
+        parts.append(_in(_NOTE_TYPES))
+    elif rt == "PERSONAL_NOTE":
+        parts.append("c.content_type = 'PERSONAL_NOTE'")
+    elif rt in {"MOVIE", "SERIES"}:
+        parts.append("l.item_type = ?")
+        params.append(rt)
+    elif rt:
+        parts.append("c.content_type = ?")
+        params.append(rt)
+    bid = str(book_id or "").strip()
+    if bid:
+        parts.append("c.item_id = ?")
+        params.append(bid)
+
+    parts.append("l.item_id IS NOT NULL AND COALESCE(l.is_deleted, 0) = 0")
+    if _normalize_visibility_scope(filters.get("visibility_scope")) == "all":
+        parts.append("COALESCE(l.search_visibility, 'DEFAULT') <> 'NEVER_RETRIEVE'")
+    else:
+        parts.append("COALESCE(l.search_visibility, 'DEFAULT') = 'DEFAULT'")
+    parts.append(
+        "NOT (c.content_type = 'PERSONAL_NOTE' AND "
+        "COALESCE(UPPER(l.personal_note_category), 'PRIVATE') IN ('PRIVATE', 'DAILY', 'BOOKMARK'))"
+    )
+    ct = str(filters.get("content_type") or "").strip().upper()
+    if ct:
+        parts.append("c.content_type = ?")
+        params.append(ct)
+    it = str(filters.get("ingestion_type") or "").strip().upper()
+    if it:
+        parts.append("c.ingestion_type = ?")
+        params.append(it)
+    if _normalize_search_surface(search_surface) == "PDF_ONLY":
+        parts.append(_in(_PDF_TYPES))
+    if not include_pdf and _should_exclude_pdf_in_first_pass(resource_type, book_id, search_surface):
+        parts.append(f"NOT {_in(_PDF_TYPES)}")
+    return "".join(f" AND {p}" for p in parts), params
+
+
+def _filters(resource_type, book_id, visibility_scope, search_surface, content_type, ingestion_type) -> Dict[str, Any]:
+    return {
+        "resource_type": resource_type,
+        "book_id": book_id,
+        "visibility_scope": visibility_scope,
+        "search_surface": search_surface,
+        "content_type": _resolve_content_type_for_surface(content_type, search_surface),
+        "ingestion_type": ingestion_type,
+    }
+
+
+def _two_pass(corpus: LocalCorpus, firebase_uid: str, filters: Dict[str, Any], **select_kwargs) -> List[tuple]:
+    """First pass without PDF chunks, then the unscoped PDF-inclusive fallback, as the Oracle lanes do."""
+    rows = corpus.select(firebase_uid, filters=filters, include_pdf=False, **select_kwargs)
+    if (
+        not rows
+        and not filters.get("resource_type")
+        and not filters.get("book_id")
+        and _allow_pdf_fallback(filters.get("search_surface"))
+    ):
+        rows = corpus.select(firebase_uid, filters=filters, include_pdf=True, **select_kwargs)
+    return rows
+
+
+def _result(row: tuple, title: Any, score: float, match_type: str) -> Dict[str, Any]:
+    return {
+        'id': row[0],
+        'title': title,
+        'content_chunk': _strip_metadata_header(row[6]),
+        'source_type': row[2],
+        'page_number': row[3],
+        'tags': row[7],
+        'summary': row[8],
+        'comment': row[9],
+        'book_id': row[4],
+        'score': score,
+        'match_type': match_type,
+    }
+
+
+class LocalExactMatchStrategy(ExactMatchStrategy):
+    def __init__(self, corpus: LocalCorpus):
+        self.corpus = corpus
+
+    def search(self, query, firebase_uid, limit=1000, offset=0, resource_type=None, book_id=None,
+               visibility_scope=None, search_surface=None, content_type=None, ingestion_type=None):
+        q_deaccented = deaccent_text(query)
+        if not q_deaccented:
+            return []
+        candidate_limit = min(max(limit * 4, limit + 40), 2500)
+        rows = _two_pass(
+            self.corpus,
+            firebase_uid,
+            _filters(resource_type, book_id, visibility_scope, search_surface, content_type, ingestion_type),
+            where="AND instr(c.normalized_content, ?) > 0",
+            params=(q_deaccented,),
+            limit=candidate_limit,
+        )
+        results = []
+        for r in rows:
+            if not _contains_exact_term_boundary(r[5], q_deaccented):
+                continue
+            results.append(_result(r, r[1], 100.0, "exact_deaccented"))
+            if len(results) >= limit:
+                break
+        return results
+
+
+class LocalLemmaMatchStrategy(LemmaMatchStrategy):
+    def __init__(self, corpus: LocalCorpus):
+        self.corpus = corpus
+
+    def search(self, query, firebase_uid, limit=1000, offset=0, resource_type=None, book_id=None,
+               visibility_scope=None, search_surface=None, content_type=None, ingestion_type=None):
+        lemma_candidates = _filter_query_lemmas(get_lemmas(query))[:5]
+        if not lemma_candidates:
+            return []
+        candidate_limit = min(max(limit * 4, limit + 40), 2500)
+        where = "AND (" + " OR ".join("instr(c.lemma_tokens, ?) > 0" for _ in lemma_candidates) + ")"
+        rows = _two_pass(
+            self.corpus,
+            firebase_uid,
+            _filters(resource_type, book_id, visibility_scope, search_surface, content_type, ingestion_type),
+            where=where,
+            params=tuple(f'"{lemma}"' for lemma in lemma_candidates),
+            limit=candidate_limit,
+        )
+        results = []
+        for r in rows:
+            haystack = r[5] or ""
+            if not any(_contains_lemma_stem_boundary(haystack, lemma) for lemma in lemma_candidates):
+                continue
+            hit_count = _count_lemma_stem_hits(haystack, lemma_candidates)
+            if hit_count <= 0:
+                continue
+            title = r[1] or ""
+            if len(lemma_candidates) == 1 and hit_count == 1 and _contains_inner_substring_only(title, lemma_candidates[0]):
+                continue
+            title_boost = 4.0 if any(_contains_lemma_stem_boundary(title, lemma) for lemma in lemma_candidates) else 0.0
+            results.append(_result(r, title, min(95.0, 70.0 + (hit_count * 5.0) + title_boost), 'lemma_fuzzy'))
+            if len(results) >= limit:
+                break
+        return results
+
+
+class LocalSemanticMatchStrategy(SemanticMatchStrategy):
+    def __init__(self, corpus: LocalCorpus, embedding_service_fn):
+        super().__init__(embedding_service_fn)
+        self.corpus = corpus
+
+    def search(self, query, firebase_uid, limit=100, offset=0, intent='SYNTHESIS', resource_type=None,
+               book_id=None, visibility_scope=None, search_surface=None, content_type=None, ingestion_type=None):
+        emb = self.get_embedding(query)
+        if not emb:
+            return []
+        filters = _filters(resource_type, book_id, visibility_scope, search_surface, content_type, ingestion_type)
+
+        def run_query(custom_limit, length_filter=None, exclude_pdf=True):
+            where = ""
+            if length_filter == 'SHORT':
+                where = "AND length(c.content_chunk) < 600"
+            elif length_filter == 'LONG':
+                where = "AND length(c.content_chunk) > 600"
+            rows = self.corpus.select(firebase_uid, where=where, filters=filters, include_pdf=not exclude_pdf)
+            return self.corpus.nearest(rows, emb, custom_limit)
+
+        hits: List[Tuple[tuple, float]] = []
+        if intent == 'DIRECT' or intent == 'FOLLOW_UP':
+            sweep_limit = max(5, limit // 2)
+            hits.extend(run_query(sweep_limit))
+            hits.extend(run_query(sweep_limit, length_filter='SHORT'))
+        elif intent == 'NARRATIVE':
+            hits.extend(run_query(15))
+            hits.extend(run_query(10, length_filter='LONG'))
+        else:
+            hits.extend(run_query(limit))
+
+        core_count = len(hits)
+        pdf_backfill_limit = 0
+        if not resource_type and not book_id and _allow_pdf_fallback(search_surface):
+            if core_count == 0:
+                pdf_backfill_limit = limit
+            elif core_count < 35:
+                pdf_backfill_limit = max(1, 4 - (core_count // 10))
+        if pdf_backfill_limit > 0:
+            pdf_rows = self.corpus.select(
+                firebase_uid, where=f"AND c.content_type IN {_PDF_TYPES!r}", filters=None
+            )
+            for row, dist in self.corpus.nearest(pdf_rows, emb, pdf_backfill_limit):
+                if max(0, (1 - dist) * 100) > 45:
+                    hits.append((row, dist))
+
+        seen = set()
+        results = []
+        for row, dist in hits:
+            if row[0] in seen:
+                continue
+            seen.add(row[0])
+            results.append(_result(row, row[1], max(0, (1 - dist) * 100), 'semantic'))
+        results.sort(key=lambda x: x['score'], reverse=True)
+        return results[:limit]
+
+
+class LocalRetrievalBackend(RetrievalBackend):
+    name = "local"
+    offline = True
+
+    def __init__(self, corpus: LocalCorpus):
+        self.corpus = corpus
+
+    @classmethod
+    def from_fixture(cls, path: str | Path, db_path: str = ":memory:") -> "LocalRetrievalBackend":
+        return cls(LocalCorpus.from_fixture(path, db_path=db_path))
+
+    def build_strategies(self, embedding_fn):
+        embedding_fn = embedding_fn or self.corpus.embedding_fn
+        return [
+            LocalExactMatchStrategy(self.corpus),
+            LocalLemmaMatchStrategy(self.corpus),
+            LocalSemanticMatchStrategy(self.corpus, embedding_fn),
+        ]
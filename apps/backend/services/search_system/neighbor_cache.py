@@ -0,0 +1,116 @@
+"""
+Per-book cache of parent-context neighbourhoods.
+
+Maps (firebase_uid, book_id) -> {(anchor_id, page, chunk, window, limit): rows}
+where rows are the already-materialised neighbour tuples returned by the
+set-based neighbour query in search_service. Whole books are evicted LRU past
+PARENT_CONTEXT_CACHE_MAX_BOOKS, expire after PARENT_CONTEXT_CACHE_TTL_SEC, and
+are dropped by ingestion whenever the book's content changes.
+
+Ingestion only reaches the cache of the worker that ran it. Other workers
+re-read the user's newest TOMEHUB_CHANGE_EVENTS id at most every
+PARENT_CONTEXT_CACHE_EVENT_POLL_SEC and drop the user's books when it moved, so
+a change made elsewhere is served from cache for at most that long.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from config import settings
+
+NeighborRows = List[Tuple[Any, ...]]
+
+
+def _last_change_event_id(firebase_uid: str) -> int:
+    from services.change_event_service import fetch_change_events_since
+
+    _changes, last_event_id = fetch_change_events_since(firebase_uid=firebase_uid, since_ms=0, limit=1)
+    return int(last_event_id or 0)
+
+
+class NeighborCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._books: "OrderedDict[Tuple[str, str], Tuple[float, Dict[Hashable, NeighborRows]]]" = OrderedDict()
+        # firebase_uid -> (newest change event id, monotonic time it was read)
+        self._versions: Dict[str, Tuple[int, float]] = {}
+
+    @staticmethod
+    def _ttl_sec() -> float:
+        return float(getattr(settings, "PARENT_CONTEXT_CACHE_TTL_SEC", 300))
+
+    @staticmethod
+    def _max_books() -> int:
+        return int(getattr(settings, "PARENT_CONTEXT_CACHE_MAX_BOOKS", 512))
+
+    @staticmethod
+    def _poll_sec() -> float:
+        return float(getattr(settings, "PARENT_CONTEXT_CACHE_EVENT_POLL_SEC", 10))
+
+    def _sync_user(self, firebase_uid: str) -> None:
+        """Drop the user's books when another worker recorded a change since the last poll."""
+        now = time.monotonic()
+        with self._lock:
+            known = self._versions.get(firebase_uid)
+            if known is not None and now - known[1] < self._poll_sec():
+                return
+        version = _last_change_event_id(firebase_uid)
+        with self._lock:
+            known = self._versions.get(firebase_uid)
+            if known is not None and known[0] != version:
+                self._drop_user_locked(firebase_uid)
+            self._versions[firebase_uid] = (version, now)
+
+    def get(self, firebase_uid: str, book_id: str, key: Hashable) -> Optional[NeighborRows]:
+        if self._max_books() <= 0:
+            return None
+        self._sync_user(str(firebase_uid))
+        book_key = (str(firebase_uid), str(book_id))
+        with self._lock:
+            entry = self._books.get(book_key)
+            if entry is None:
+                return None
+            created_at, anchors = entry
+            if time.monotonic() - created_at > self._ttl_sec():
+                del self._books[book_key]
+                return None
+            self._books.move_to_end(book_key)
+            return anchors.get(key)
+
+    def put(self, firebase_uid: str, book_id: str, key: Hashable, rows: NeighborRows) -> None:
+        max_books = self._max_books()
+        if max_books <= 0:
+            return
+        book_key = (str(firebase_uid), str(book_id))
+        with self._lock:
+            entry = self._books.get(book_key)
+            if entry is None or time.monotonic() - entry[0] > self._ttl_sec():
+                entry = (time.monotonic(), {})
+                self._books[book_key] = entry
+            entry[1][key] = list(rows)
+            self._books.move_to_end(book_key)
+            while len(self._books) > max_books:
+                self._books.popitem(last=False)
+
+    def invalidate(self, firebase_uid: str, book_id: Optional[str] = None) -> None:
+        with self._lock:
+            if book_id:
+                self._books.pop((str(firebase_uid), str(book_id)), None)
+                return
+            self._drop_user_locked(str(firebase_uid))
+
+    def _drop_user_locked(self, firebase_uid: str) -> None:
+        for book_key in [k for k in self._books if k[0] == firebase_uid]:
+            del self._books[book_key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._books.clear()
+            self._versions.clear()
+
+
+neighbor_cache = NeighborCache()
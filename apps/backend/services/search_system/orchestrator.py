@@ -12,6 +12,7 @@ from .strategies import (
     SemanticMatchStrategy,
     _filter_query_lemmas,
 )
+from .retrieval_backend import OracleRetrievalBackend, RetrievalBackend
 from utils.logger import get_logger
 from .search_utils import compute_rrf
 from .reranker import rerank_candidates_fast
@@ -40,6 +41,12 @@ from services.monitoring import (
 )
 from services.query_expander import QueryExpander
 from services.cache_service import MultiLayerCache, generate_cache_key, get_cache
+from services.search_log_writer_service import (
+    SearchLogWriterUnavailable,
+    search_log_binds,
+    search_log_writer,
+    write_behind_enabled,
+)
 from .semantic_router import SemanticRouter, to_strategy_labels
 from utils.spell_checker import get_spell_checker
 from utils.text_utils import get_lemmas, deaccent_text
@@ -47,7 +54,6 @@ from config import settings
 
 logger = get_logger("search_orchestrator")
 SEMANTIC_MIX_POLICY_VERSION = "v5"
-_LAST_SEARCH_LOG_CLEANUP_TS = 0.0
 _HTML_BLOCK_TAG_RE = re.compile(r"(?i)</?(?:p|div|h[1-6]|li|ul|ol|br|table|tr|td|th)[^>]*>")
 _HTML_TAG_RE = re.compile(r"(?is)<[^>]+>")
 
@@ -109,19 +115,20 @@ class SearchOrchestrator:
     4. Policy Application (Thresholds, Gating)
     """
     
-    def __init__(self, embedding_fn=None, cache: Optional[MultiLayerCache] = None):
-        self.strategies: List[SearchStrategy] = []
+    def __init__(
+        self,
+        embedding_fn=None,
+        cache: Optional[MultiLayerCache] = None,
+        backend: Optional[RetrievalBackend] = None,
+    ):
         self.embedding_fn = embedding_fn
         self.cache = cache or get_cache()  # Use provided cache or global cache
         self.expander = QueryExpander(cache=self.cache)  # Pass cache to expander
         self.router = SemanticRouter()
         
-        # Initialize Default Strategies
-        self.strategies.append(ExactMatchStrategy())
-        self.strategies.append(LemmaMatchStrategy())
-        # Semantic strategy needs embedding function
-        if self.embedding_fn:
-            self.strategies.append(SemanticMatchStrategy(self.embedding_fn))
+        # Oracle by default; LocalRetrievalBackend serves the same lanes offline.
+        self.backend = backend or OracleRetrievalBackend()
+        self.strategies: List[SearchStrategy] = self.backend.build_strategies(self.embedding_fn)
     
     @staticmethod
     def _item_key(item: Dict[str, Any]) -> str:
@@ -643,18 +650,23 @@ class SearchOrchestrator:
             # A. Start Expansion
             expansion_variation_limit = runtime_settings["search_semantic_expansion_max_variations"]
             expansion_variation_limit = max(0, min(3, expansion_variation_limit))
-            should_run_expansion = route_flags["run_semantic"] and expansion_variation_limit > 0
+            should_run_expansion = (
+                route_flags["run_semantic"]
+                and expansion_variation_limit > 0
+                and not self.backend.offline
+            )
             expansion_future = (
                 executor.submit(self.expander.expand_query, query, expansion_variation_limit)
                 if should_run_expansion
                 else None
             )
             if expansion_future is None:
-                expansion_skipped_reason = (
-                    "semantic_lane_disabled"
-                    if not route_flags["run_semantic"]
-                    else "expansion_disabled"
-                )
+                if not route_flags["run_semantic"]:
+                    expansion_skipped_reason = "semantic_lane_disabled"
+                elif self.backend.offline:
+                    expansion_skipped_reason = "offline_backend"
+                else:
+                    expansion_skipped_reason = "expansion_disabled"
             
             # B. Run Strategies
             for strat in self.strategies:
@@ -1655,25 +1667,29 @@ class SearchOrchestrator:
         session_id: Optional[int | str] = None,
         diagnostic_payload: Optional[Dict[str, Any]] = None,
     ):
+        if self.backend.offline:
+            return None
+        if write_behind_enabled():
+            try:
+                return search_log_writer.submit(
+                    uid,
+                    query,
+                    intent,
+                    results,
+                    duration,
+                    session_id=session_id,
+                    diagnostic_payload=diagnostic_payload,
+                )
+            except SearchLogWriterUnavailable:
+                pass
         try:
             from infrastructure.db_manager import DatabaseManager
-            global _LAST_SEARCH_LOG_CLEANUP_TS
-            
-            top_id = results[0]['id'] if results else None
-            top_score = results[0].get('rrf_score', results[0].get('score', 0)) if results else 0
             
             with DatabaseManager.get_write_connection() as conn:
                 with conn.cursor() as cursor:
-                    weights_str = f"fusion:{settings.RETRIEVAL_FUSION_MODE}, vec:1.0, bm25:1.0, graph:1.0"
                     id_var = cursor.var(int)
-                    strategy_json = json.dumps(diagnostic_payload or {}, ensure_ascii=False)
-                    
-                    # Coerce session_id to int if possible to avoid ORA-01722 when UUID-like strings are passed
-                    sid_int = None
-                    try:
-                        sid_int = int(session_id) if session_id is not None and str(session_id).strip().isdigit() else None
-                    except Exception:
-                        sid_int = None
+                    params = search_log_binds(uid, query, intent, results, duration, session_id)
+                    params["id_col"] = id_var
                     
                     if bool(getattr(settings, "SEARCH_LOG_DIAGNOSTICS_PERSIST_ENABLED", False)):
                         try:
@@ -1684,18 +1700,7 @@ class SearchOrchestrator:
                                 VALUES (:p_uid, :p_sid, :p_q, :p_intent, :p_w, :p_tid, :p_tscore, :p_dur, :p_strategy)
                                 RETURNING ID INTO :id_col
                                 """,
-                                {
-                                    "p_uid": uid,
-                                    "p_sid": sid_int,
-                                    "p_q": query,
-                                    "p_intent": intent,
-                                    "p_w": weights_str,
-                                    "p_tid": top_id,
-                                    "p_tscore": top_score,
-                                    "p_dur": duration * 1000,
-                                    "p_strategy": strategy_json,
-                                    "id_col": id_var,
-                                },
+                                {**params, "p_strategy": json.dumps(diagnostic_payload or {}, ensure_ascii=False)},
                             )
                         except Exception as col_err:
                             # Backward compatible fallback when STRATEGY_DETAILS column is absent.
@@ -1708,17 +1713,7 @@ class SearchOrchestrator:
                                 VALUES (:p_uid, :p_sid, :p_q, :p_intent, :p_w, :p_tid, :p_tscore, :p_dur)
                                 RETURNING ID INTO :id_col
                                 """,
-                                {
-                                    "p_uid": uid,
-                                    "p_sid": sid_int,
-                                    "p_q": query,
-                                    "p_intent": intent,
-                                    "p_w": weights_str,
-                                    "p_tid": top_id,
-                                    "p_tscore": top_score,
-                                    "p_dur": duration * 1000,
-                                    "id_col": id_var,
-                                },
+                                params,
                             )
                     else:
                         cursor.execute(
@@ -1728,17 +1723,7 @@ class SearchOrchestrator:
                             VALUES (:p_uid, :p_sid, :p_q, :p_intent, :p_w, :p_tid, :p_tscore, :p_dur)
                             RETURNING ID INTO :id_col
                             """,
-                            {
-                                "p_uid": uid,
-                                "p_sid": sid_int,
-                                "p_q": query,
-                                "p_intent": intent,
-                                "p_w": weights_str,
-                                "p_tid": top_id,
-                                "p_tscore": top_score,
-                                "p_dur": duration * 1000,
-                                "id_col": id_var,
-                            },
+                            params,
                         )
                     
                     # id_var.getvalue() returns a list for returning into
@@ -1748,20 +1733,9 @@ class SearchOrchestrator:
                         log_id = int(vals[0])
                         
                     try:
-                        cleanup_enabled = bool(getattr(settings, "SEARCH_LOG_RETENTION_CLEANUP_ENABLED", False))
-                        if cleanup_enabled and (time.time() - _LAST_SEARCH_LOG_CLEANUP_TS) > 3600:
-                            cursor.execute(
-                                """
-                                DELETE FROM TOMEHUB_SEARCH_LOGS
-                                WHERE TIMESTAMP < (CURRENT_TIMESTAMP - NUMTODSINTERVAL(:p_days, 'DAY'))
-                                """,
-                                {"p_days": int(getattr(settings, "SEARCH_LOG_RETENTION_DAYS", 90))},
-                            )
-                            _LAST_SEARCH_LOG_CLEANUP_TS = time.time()
-                        
                         conn.commit()
                     except Exception as commit_err:
-                        logger.warning(f"Failed to commit search log or cleanup: {commit_err}")
+                        logger.warning(f"Failed to commit search log: {commit_err}")
                         # Don't raise, we want the search to proceed
                     
                     return log_id
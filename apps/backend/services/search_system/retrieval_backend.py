@@ -0,0 +1,35 @@
+"""
+Where SearchOrchestrator's lanes read from.
+
+A backend builds the exact / lemma / semantic strategies the orchestrator
+runs. The default reads Oracle; services/search_system/local_backend.py
+serves the same lanes from SQLite + NumPy for offline benchmarks and tests.
+Offline backends also turn off the parts of a search that would leave the
+process (LLM query expansion, the search-log write).
+"""
+
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional
+
+from .strategies import ExactMatchStrategy, LemmaMatchStrategy, SearchStrategy, SemanticMatchStrategy
+
+
+class RetrievalBackend(ABC):
+    name = "base"
+    # True: no network or database; the orchestrator skips expansion and search logging.
+    offline = False
+
+    @abstractmethod
+    def build_strategies(self, embedding_fn: Optional[Callable[[str], Optional[List[float]]]]) -> List[SearchStrategy]:
+        """Strategies for one search; the semantic lane is left out when embedding_fn is None."""
+
+
+class OracleRetrievalBackend(RetrievalBackend):
+    name = "oracle"
+
+    def build_strategies(self, embedding_fn):
+        strategies: List[SearchStrategy] = [ExactMatchStrategy(), LemmaMatchStrategy()]
+        # Semantic strategy needs embedding function
+        if embedding_fn:
+            strategies.append(SemanticMatchStrategy(embedding_fn))
+        return strategies
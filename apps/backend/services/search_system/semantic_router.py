@@ -4,6 +4,7 @@ import re
 from dataclasses import dataclass
 from typing import Dict, List, Set
 
+from utils.pattern_matcher import PatternFamily
 from utils.text_utils import deaccent_text
 
 
@@ -31,6 +32,9 @@ class SemanticRouter:
         r"\btam alinti\b",
     ]
     QUOTED_PHRASE_PATTERN = r'"[^"]+"'
+    _DIRECT_FAMILY = PatternFamily("direct", DIRECT_PATTERNS)
+    _QUOTED_PHRASE_RE = re.compile(QUOTED_PHRASE_PATTERN)
+    _TOKEN_RE = re.compile(r"[^\W_]+", flags=re.UNICODE)
 
     CONCEPTUAL_HINTS = {
         "nedir",
@@ -65,21 +69,21 @@ class SemanticRouter:
         q_norm = self._normalized_query(query)
         # Tokenize by words (strip punctuation) so conceptual hints still match:
         # e.g. "nedir?" -> "nedir"
-        tokens = [t for t in re.findall(r"[^\W_]+", q_norm, flags=re.UNICODE) if t]
+        tokens = [t for t in self._TOKEN_RE.findall(q_norm) if t]
         token_set: Set[str] = set(tokens)
 
         # 1. Pattern-led direct lookup style (High precision keywords)
-        for pat in self.DIRECT_PATTERNS:
-            if re.search(pat, q_norm):
-                retrieval_mode = "fast_exact"
-                return RouterDecision(
-                    mode="rule_based",
-                    selected_buckets=self.buckets_for_mode(retrieval_mode),
-                    reason=f"pattern:{pat}",
-                    retrieval_mode=retrieval_mode,
-                )
-
-        if re.search(self.QUOTED_PHRASE_PATTERN, q_raw):
+        direct_idx = self._DIRECT_FAMILY.first_index(q_norm)
+        if direct_idx is not None:
+            retrieval_mode = "fast_exact"
+            return RouterDecision(
+                mode="rule_based",
+                selected_buckets=self.buckets_for_mode(retrieval_mode),
+                reason=f"pattern:{self.DIRECT_PATTERNS[direct_idx]}",
+                retrieval_mode=retrieval_mode,
+            )
+
+        if self._QUOTED_PHRASE_RE.search(q_raw):
             retrieval_mode = "fast_exact"
             return RouterDecision(
                 mode="rule_based",
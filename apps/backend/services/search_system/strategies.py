@@ -1,10 +1,16 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 import os
 import logging
 import re
+from infrastructure.cursor_profiles import QUERY_CLASS_CANDIDATE_SCAN, profiled_cursor
 from infrastructure.db_manager import DatabaseManager, safe_read_clob
 from utils.text_utils import deaccent_text, get_lemmas, repair_common_mojibake
 from config import settings
+from services import lemma_postings_service
+from services.monitoring import SEARCH_LEMMA_LANE_TOTAL
+from services.trigram_index_service import TrigramCandidates, get_trigram_index
+from services.vector_cache_service import get_vector_cache
+from services.vector_index_service import LANE_SEMANTIC, fetch_vector_ranked
 
 logger = logging.getLogger("search_strategies")
 
@@ -361,6 +367,243 @@ def _should_exclude_pdf_in_first_pass(
         return False
     return False
 
+def _semantic_cache_content_types(
+    resource_type: Optional[str],
+    content_type: Optional[str],
+    search_surface: Optional[str],
+    exclude_pdf: bool,
+) -> tuple:
+    """(include, exclude) content types mirroring the SQL filters, for the vector cache pre-filter."""
+    include: Optional[set] = None
+
+    def _narrow(types: set) -> None:
+        nonlocal include
+        include = set(types) if include is None else include & set(types)
+
+    rt = _normalize_resource_type(resource_type)
+    if rt == "BOOK":
+        _narrow({"PDF", "EPUB", "PDF_CHUNK", "BOOK", "HIGHLIGHT", "INSIGHT"})
+    elif rt == "ALL_NOTES":
+        _narrow({"HIGHLIGHT", "INSIGHT"})
+    elif rt and rt not in {"MOVIE", "SERIES"}:
+        _narrow({rt})
+    ct = str(content_type or "").strip().upper()
+    if ct:
+        _narrow({ct})
+    if _normalize_search_surface(search_surface) == "PDF_ONLY":
+        _narrow(_PDF_LIKE_SOURCE_TYPES)
+    exclude = set(_PDF_LIKE_SOURCE_TYPES) if exclude_pdf else None
+    return (include, exclude)
+
+
+def _apply_id_in_filter(sql: str, params: Dict[str, Any], ids: List[int]) -> tuple:
+    binds = []
+    for i, row_id in enumerate(ids):
+        params[f"p_cid{i}"] = row_id
+        binds.append(f":p_cid{i}")
+    sql += f" AND c.id IN ({', '.join(binds)}) "
+    return (sql, params)
+
+
+def _late_materialization_enabled() -> bool:
+    return bool(getattr(settings, "SEARCH_LEXICAL_LATE_MATERIALIZATION", True))
+
+
+_LEXICAL_FROM = """
+    FROM TOMEHUB_CONTENT_V2 c
+    LEFT JOIN TOMEHUB_LIBRARY_ITEMS l ON c.item_id = l.item_id AND c.firebase_uid = l.firebase_uid
+    WHERE c.firebase_uid = :p_uid
+      AND c.AI_ELIGIBLE = 1
+"""
+
+# Mirrors the old `normalized_content or content_chunk`. Both are CLOBs, so with
+# late materialization on it is read in phase 2, not with the candidate scan.
+_LEXICAL_MATCH_TEXT = """
+           CASE
+               WHEN c.normalized_content IS NULL OR DBMS_LOB.GETLENGTH(c.normalized_content) = 0
+               THEN c.content_chunk
+               ELSE c.normalized_content
+           END as match_text"""
+# Phase 1 of the exact/lemma lanes: ordering and result metadata only, no LOBs.
+_LEXICAL_CANDIDATE_COLUMNS = """
+    SELECT c.id, c.title, c.content_type as source_type, c.page_number, c.item_id as book_id
+"""
+# Single pass (late materialization off): same leading columns, then match_text
+# (index 5) and the details (indices 6-9).
+_LEXICAL_FULL_COLUMNS = _LEXICAL_CANDIDATE_COLUMNS.rstrip() + "," + _LEXICAL_MATCH_TEXT + """,
+           c.content_chunk, c.tags_json as tags, l.summary_text as summary, c.comment_text as "COMMENT"
+"""
+_LEXICAL_DETAIL_IN_LIST_MAX = 900
+_LEXICAL_DETAIL_BIND_BUCKET = 50
+# Smallest phase-2 window, so a small `limit` with a strict filter does not turn
+# into one round trip per candidate.
+_LEXICAL_MATCH_WINDOW_MIN = 20
+
+
+def _lexical_select_sql(late: bool) -> str:
+    columns = _LEXICAL_CANDIDATE_COLUMNS if late else _LEXICAL_FULL_COLUMNS
+    return columns + _LEXICAL_FROM
+
+
+def _fetch_lexical_details(cursor, firebase_uid: str, ids: List[Any]) -> Dict[Any, tuple]:
+    """Phase 2: match_text/content/tags/summary/comment for a window of candidates, in one statement."""
+    if not ids:
+        return {}
+    # Pad to a bucket so the statement text (and its cached cursor) is reused across queries.
+    padded = list(ids)
+    bucket = _LEXICAL_DETAIL_BIND_BUCKET
+    padded.extend([ids[-1]] * ((-len(padded)) % bucket))
+    params: Dict[str, Any] = {"p_uid": firebase_uid}
+    groups = []
+    for start in range(0, len(padded), _LEXICAL_DETAIL_IN_LIST_MAX):
+        binds = []
+        for i, row_id in enumerate(padded[start:start + _LEXICAL_DETAIL_IN_LIST_MAX], start=start):
+            params[f"p_cid{i}"] = row_id
+            binds.append(f":p_cid{i}")
+        groups.append(f"c.id IN ({', '.join(binds)})")
+    sql = (
+        'SELECT c.id,' + _LEXICAL_MATCH_TEXT + ', c.content_chunk, c.tags_json, l.summary_text, c.comment_text'
+        + _LEXICAL_FROM
+        + f" AND ({' OR '.join(groups)}) "
+    )
+    cursor.execute(sql, params)
+    return {r[0]: tuple(safe_read_clob(v) for v in r[1:6]) for r in cursor.fetchall()}
+
+
+def _lexical_result(row: Any, title: Any, score: float, match_type: str) -> Dict[str, Any]:
+    return {
+        'id': row[0],
+        'title': title,
+        'content_chunk': None,
+        'source_type': row[2],
+        'page_number': row[3],
+        'tags': None,
+        'summary': None,
+        'comment': None,
+        'book_id': row[4],
+        'score': score,
+        'match_type': match_type,
+    }
+
+
+def _collect_lexical_results(
+    cursor,
+    firebase_uid: str,
+    rows: List[Any],
+    limit: int,
+    keep: Callable[[Any, str], Optional[Dict[str, Any]]],
+    inline: bool,
+) -> List[Dict[str, Any]]:
+    """
+    Walk candidates in order, calling `keep(row, match_text)` until `limit` results.
+
+    `inline` rows come from the single pass and carry match_text and the details.
+    Otherwise phase 2 fetches match_text with the details for windows of
+    candidates, so LOBs are read only for rows the filter actually looks at.
+    """
+    results: List[Dict[str, Any]] = []
+    if inline:
+        for r in rows:
+            res = keep(r, safe_read_clob(r[5]))
+            if res is None:
+                continue
+            _fill_lexical_details(res, tuple(safe_read_clob(v) for v in r[6:10]))
+            results.append(res)
+            if len(results) >= limit:
+                break
+        return results
+
+    pos = 0
+    while pos < len(rows) and len(results) < limit:
+        window = rows[pos:pos + max(limit - len(results), _LEXICAL_MATCH_WINDOW_MIN)]
+        pos += len(window)
+        details = _fetch_lexical_details(cursor, firebase_uid, [r[0] for r in window])
+        for r in window:
+            detail = details.get(r[0])
+            if detail is None:
+                # Deleted between the two phases.
+                continue
+            res = keep(r, detail[0])
+            if res is None:
+                continue
+            _fill_lexical_details(res, detail[1:])
+            results.append(res)
+            if len(results) >= limit:
+                break
+    return results
+
+
+def _fill_lexical_details(res: Dict[str, Any], detail: tuple) -> None:
+    content, tags, summary, note = detail
+    res['content_chunk'] = _strip_metadata_header(content)
+    res['tags'] = tags
+    res['summary'] = summary
+    res['comment'] = note
+
+
+_EXACT_ORDER_BY = """
+    ORDER BY id DESC
+    FETCH FIRST :p_candidate_limit ROWS ONLY
+"""
+
+
+def _id_in_clause(ids: List[int], offset: int) -> tuple:
+    padded = list(ids)
+    padded.extend([ids[-1]] * ((-len(padded)) % _LEXICAL_DETAIL_BIND_BUCKET))
+    params = {f"p_tid{offset + i}": row_id for i, row_id in enumerate(padded)}
+    return f"c.id IN ({', '.join(':' + key for key in params)})", params
+
+
+def _run_trigram_verified_like(
+    cursor,
+    sql: str,
+    params: Dict[str, Any],
+    candidates: TrigramCandidates,
+    candidate_limit: int,
+) -> List[Any]:
+    """
+    Run the exact lane's LIKE over trigram candidates instead of the whole corpus.
+
+    Batches walk the candidate ids in descending order and each one keeps the
+    LIKE, so rows and their order match `ORDER BY id DESC` over the full scan.
+    The first batch also covers ids above the index's max_id (rows inserted
+    since it was built). Once the batch budget is spent, the rest continues as
+    the plain scan below the last id covered.
+    """
+    batch_size = int(getattr(settings, "TRIGRAM_INDEX_VERIFY_BATCH", 500))
+    max_batches = int(getattr(settings, "TRIGRAM_INDEX_MAX_VERIFY_BATCHES", 4))
+    ids = candidates.ids
+    rows: List[Any] = []
+    for batch_no in range(max_batches):
+        start = batch_no * batch_size
+        chunk = ids[start:start + batch_size]
+        batch_params = dict(params)
+        batch_params["p_candidate_limit"] = candidate_limit - len(rows)
+        if batch_no == 0:
+            batch_params["p_trgm_max"] = candidates.max_id
+            if chunk:
+                in_clause, in_params = _id_in_clause(chunk, start)
+                batch_params.update(in_params)
+                clause = f" AND (c.id > :p_trgm_max OR {in_clause}) "
+            else:
+                clause = " AND c.id > :p_trgm_max "
+        else:
+            in_clause, in_params = _id_in_clause(chunk, start)
+            batch_params.update(in_params)
+            clause = f" AND {in_clause} "
+        cursor.execute(sql + clause + _EXACT_ORDER_BY, batch_params)
+        rows.extend(cursor.fetchall())
+        if len(rows) >= candidate_limit or start + batch_size >= len(ids):
+            return rows
+
+    scan_params = dict(params)
+    scan_params["p_candidate_limit"] = candidate_limit - len(rows)
+    scan_params["p_trgm_below"] = ids[max_batches * batch_size - 1]
+    cursor.execute(sql + " AND c.id < :p_trgm_below " + _EXACT_ORDER_BY, scan_params)
+    rows.extend(cursor.fetchall())
+    return rows
+
+
 class ExactMatchStrategy(SearchStrategy):
     """
     Strategy for exact (de-accented) matching.
@@ -380,20 +623,13 @@ class ExactMatchStrategy(SearchStrategy):
     ) -> List[Dict[str, Any]]:
         try:
             with DatabaseManager.get_read_connection() as conn:
-                with conn.cursor() as cursor:
+                with profiled_cursor(conn, QUERY_CLASS_CANDIDATE_SCAN) as cursor:
                     q_deaccented = deaccent_text(query)
                     candidate_limit = min(max(limit * 4, limit + 40), 2500)
                     effective_content_type = _resolve_content_type_for_surface(content_type, search_surface)
 
-                    base_sql = """
-                        SELECT c.id, c.content_chunk, c.title, c.content_type as source_type, c.page_number, 
-                               c.tags_json as tags, l.summary_text as summary, c.comment_text as "COMMENT",
-                               c.item_id as book_id, c.normalized_content
-                        FROM TOMEHUB_CONTENT_V2 c
-                        LEFT JOIN TOMEHUB_LIBRARY_ITEMS l ON c.item_id = l.item_id AND c.firebase_uid = l.firebase_uid
-                        WHERE c.firebase_uid = :p_uid
-                          AND c.AI_ELIGIBLE = 1
-                    """
+                    late = _late_materialization_enabled()
+                    base_sql = _lexical_select_sql(late)
 
                     base_params = {
                         "p_uid": firebase_uid,
@@ -408,6 +644,12 @@ class ExactMatchStrategy(SearchStrategy):
                         and _should_use_oracle_text_for_query(query)
                     )
                     min_rows_for_backfill = _oracle_text_min_rows_for_backfill()
+                    trigram_lookup: List[Optional[TrigramCandidates]] = []
+
+                    def _trigram_candidates() -> Optional[TrigramCandidates]:
+                        if not trigram_lookup:
+                            trigram_lookup.append(get_trigram_index().lookup(firebase_uid, q_deaccented))
+                        return trigram_lookup[0]
 
                     def _run_exact_query(include_pdf: bool, use_oracle_text: bool) -> List[Any]:
                         sql = base_sql
@@ -430,11 +672,11 @@ class ExactMatchStrategy(SearchStrategy):
                         else:
                             params["p_exact_like"] = exact_like_pattern
                             sql += " AND c.normalized_content LIKE :p_exact_like ESCAPE '\\' "
+                            trigram = _trigram_candidates()
+                            if trigram is not None:
+                                return _run_trigram_verified_like(cursor, sql, params, trigram, candidate_limit)
 
-                        sql += """
-                            ORDER BY id DESC
-                            FETCH FIRST :p_candidate_limit ROWS ONLY
-                        """
+                        sql += _EXACT_ORDER_BY
                         cursor.execute(sql, params)
                         return cursor.fetchall()
 
@@ -486,38 +728,30 @@ class ExactMatchStrategy(SearchStrategy):
                         if not rows:
                             rows = _run_exact_query(include_pdf=True, use_oracle_text=False)
                             match_mode = "exact_deaccented"
-                    
-                    results = []
-                    for r in rows:
-                        content = safe_read_clob(r[1])
-                        normalized_content = safe_read_clob(r[9])
-                        if not _contains_exact_term_boundary(normalized_content or content, q_deaccented):
-                            continue
-                        tags = safe_read_clob(r[5])
-                        summary = safe_read_clob(r[6])
-                        note = safe_read_clob(r[7])
-                        
-                        results.append({
-                            'id': r[0],
-                            'title': r[2],
-                            'content_chunk': _strip_metadata_header(content),
-                            'source_type': r[3],
-                            'page_number': r[4],
-                            'tags': tags,
-                            'summary': summary,
-                            'comment': note,
-                            'book_id': r[8],
-                            'score': 100.0,
-                            'match_type': match_mode
-                        })
-                        if len(results) >= limit:
-                            break
-                    return results
+
+                    def _keep(r: Any, match_text: str) -> Optional[Dict[str, Any]]:
+                        if not _contains_exact_term_boundary(match_text, q_deaccented):
+                            return None
+                        return _lexical_result(r, r[1], 100.0, match_mode)
+
+                    return _collect_lexical_results(cursor, firebase_uid, rows, limit, _keep, inline=not late)
 
         except Exception as e:
             logger.error(f"ExactMatchStrategy failed: {e}", exc_info=True)
             return []
 
+# Postings path of the lemma lane: the candidate columns plus the SQL tf-idf score
+# (index 5), joined from the top-k CTE instead of scanning lemma_tokens.
+_LEMMA_POSTINGS_SELECT = _LEXICAL_CANDIDATE_COLUMNS.rstrip() + """,
+           s.LEMMA_SCORE
+    FROM lemma_scores s
+    JOIN TOMEHUB_CONTENT_V2 c ON c.id = s.CONTENT_ID
+    LEFT JOIN TOMEHUB_LIBRARY_ITEMS l ON c.item_id = l.item_id AND c.firebase_uid = l.firebase_uid
+    WHERE c.firebase_uid = :p_uid
+      AND c.AI_ELIGIBLE = 1
+"""
+
+
 class LemmaMatchStrategy(SearchStrategy):
     """
     Strategy for Lemma-based matching (Fuzzy-ish).
@@ -543,18 +777,22 @@ class LemmaMatchStrategy(SearchStrategy):
             
         try:
             with DatabaseManager.get_read_connection() as conn:
-                with conn.cursor() as cursor:
-                    results = []
-                    
-                    sql = """
-                        SELECT c.id, c.content_chunk, c.title, c.content_type as source_type, c.page_number, 
-                               c.tags_json as tags, l.summary_text as summary, c.comment_text as "COMMENT",
-                               c.item_id as book_id, c.normalized_content
-                        FROM TOMEHUB_CONTENT_V2 c
-                        LEFT JOIN TOMEHUB_LIBRARY_ITEMS l ON c.item_id = l.item_id AND c.firebase_uid = l.firebase_uid
-                        WHERE c.firebase_uid = :p_uid
-                          AND c.AI_ELIGIBLE = 1
-                    """
+                with profiled_cursor(conn, QUERY_CLASS_CANDIDATE_SCAN) as cursor:
+                    if lemma_postings_service.postings_ready(cursor, firebase_uid):
+                        return self._search_postings(
+                            cursor,
+                            firebase_uid,
+                            lemma_candidates,
+                            limit,
+                            resource_type=resource_type,
+                            book_id=book_id,
+                            visibility_scope=visibility_scope,
+                            search_surface=search_surface,
+                            content_type=effective_content_type,
+                            ingestion_type=ingestion_type,
+                        )
+                    late = _late_materialization_enabled()
+                    sql = _lexical_select_sql(late)
                     candidate_limit = min(max(limit * 4, limit + 40), 2500)
                     params = {"p_uid": firebase_uid, "p_candidate_limit": candidate_limit}
                     
@@ -596,15 +834,7 @@ class LemmaMatchStrategy(SearchStrategy):
                         and _allow_pdf_fallback(search_surface)
                     ):
                         logger.info(f"LemmaMatchStrategy: No results without PDF content, trying with PDF fallback")
-                        sql_with_pdf = """
-                            SELECT c.id, c.content_chunk, c.title, c.content_type as source_type, c.page_number, 
-                                   c.tags_json as tags, l.summary_text as summary, c.comment_text as "COMMENT",
-                                   c.item_id as book_id, c.normalized_content
-                            FROM TOMEHUB_CONTENT_V2 c
-                            LEFT JOIN TOMEHUB_LIBRARY_ITEMS l ON c.item_id = l.item_id AND c.firebase_uid = l.firebase_uid
-                            WHERE c.firebase_uid = :p_uid
-                              AND c.AI_ELIGIBLE = 1
-                        """
+                        sql_with_pdf = _lexical_select_sql(late)
                         lemma_conditions_fb = []
                         for i, lemma in enumerate(lemma_candidates):
                             p_name = f"p_lemma_{i}"
@@ -624,50 +854,100 @@ class LemmaMatchStrategy(SearchStrategy):
                         """
                         cursor.execute(sql_with_pdf, params)
                         rows = cursor.fetchall()
+                    SEARCH_LEMMA_LANE_TOTAL.labels(path="like").inc()
                     
-                    for r in rows:
-                        content = safe_read_clob(r[1])
-                        normalized_content = safe_read_clob(r[9])
-                        haystack = normalized_content or content
+                    def _keep(r: Any, haystack: str) -> Optional[Dict[str, Any]]:
                         if not any(_contains_lemma_stem_boundary(haystack, lemma) for lemma in lemma_candidates):
-                            continue
+                            return None
                         hit_count = _count_lemma_stem_hits(haystack, lemma_candidates)
                         if hit_count <= 0:
-                            continue
-                        title = r[2] if isinstance(r[2], str) else safe_read_clob(r[2])
+                            return None
+                        title = r[1] if isinstance(r[1], str) else safe_read_clob(r[1])
                         if (
                             len(lemma_candidates) == 1
                             and hit_count == 1
                             and _contains_inner_substring_only(title, lemma_candidates[0])
                         ):
-                            continue
-                        tags = safe_read_clob(r[5])
-                        summary = safe_read_clob(r[6])
-                        note = safe_read_clob(r[7])
+                            return None
                         title_boost = 4.0 if any(_contains_lemma_stem_boundary(title, lemma) for lemma in lemma_candidates) else 0.0
                         score = min(95.0, 70.0 + (hit_count * 5.0) + title_boost)
-                        
-                        results.append({
-                            'id': r[0],
-                            'title': title,
-                            'content_chunk': _strip_metadata_header(content),
-                            'source_type': r[3],
-                            'page_number': r[4],
-                            'tags': tags,
-                            'summary': summary,
-                            'comment': note,
-                            'book_id': r[8],
-                            'score': score,
-                            'match_type': 'lemma_fuzzy'
-                        })
-                        if len(results) >= limit:
-                            break
-                    return results
+                        return _lexical_result(r, title, score, 'lemma_fuzzy')
+
+                    return _collect_lexical_results(cursor, firebase_uid, rows, limit, _keep, inline=not late)
 
         except Exception as e:
             logger.error(f"LemmaMatchStrategy failed: {e}", exc_info=True)
             return []
 
+    def _search_postings(
+        self,
+        cursor,
+        firebase_uid: str,
+        lemma_candidates: List[str],
+        limit: int,
+        *,
+        resource_type: Optional[str],
+        book_id: Optional[str],
+        visibility_scope: Optional[str],
+        search_surface: Optional[str],
+        content_type: Optional[str],
+        ingestion_type: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        """
+        Top-k by tf-idf over TOMEHUB_LEMMA_POSTINGS in one statement per pass.
+        Only the query lemmas' postings are read; the stem-boundary check and
+        hydration stay the same as the scan path.
+        """
+        cte, cte_params = lemma_postings_service.topk_cte(
+            lemma_candidates, lemma_postings_service.user_document_count(cursor, firebase_uid)
+        )
+        candidate_limit = min(max(limit * 4, limit + 40), 2500)
+
+        def _run(include_pdf: bool) -> List[Any]:
+            sql = cte + _LEMMA_POSTINGS_SELECT
+            params = {"p_uid": firebase_uid, "p_candidate_limit": candidate_limit, **cte_params}
+            if not include_pdf:
+                sql, params = _apply_resource_type_filter(sql, params, resource_type)
+                sql, params = _apply_book_id_filter(sql, params, book_id)
+            sql, params = _apply_active_library_item_filter(sql, params)
+            sql, params = _apply_visibility_filter(sql, params, visibility_scope)
+            sql, params = _apply_content_type_filter(sql, params, content_type)
+            sql, params = _apply_ingestion_type_filter(sql, params, ingestion_type)
+            sql, params = _apply_search_surface_filter(sql, params, search_surface)
+            if not include_pdf and _should_exclude_pdf_in_first_pass(resource_type, book_id, search_surface):
+                sql += " AND c.content_type NOT IN ('PDF', 'EPUB', 'PDF_CHUNK', 'BOOK_CHUNK') "
+            sql += """
+                ORDER BY s.LEMMA_SCORE DESC, c.id DESC
+                FETCH FIRST :p_candidate_limit ROWS ONLY
+            """
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+        rows = _run(include_pdf=False)
+        if not rows and not resource_type and not book_id and _allow_pdf_fallback(search_surface):
+            rows = _run(include_pdf=True)
+        SEARCH_LEMMA_LANE_TOTAL.labels(path="postings").inc()
+
+        top_score = max((float(r[5] or 0.0) for r in rows), default=0.0) or 1.0
+
+        def _keep(r: Any, haystack: str) -> Optional[Dict[str, Any]]:
+            hit_count = _count_lemma_stem_hits(haystack, lemma_candidates)
+            if hit_count <= 0:
+                return None
+            title = r[1] if isinstance(r[1], str) else safe_read_clob(r[1])
+            if (
+                len(lemma_candidates) == 1
+                and hit_count == 1
+                and _contains_inner_substring_only(title, lemma_candidates[0])
+            ):
+                return None
+            title_boost = 4.0 if any(_contains_lemma_stem_boundary(title, lemma) for lemma in lemma_candidates) else 0.0
+            # Same 70-95 band as the scan path, scaled by the SQL tf-idf score.
+            score = min(95.0, 70.0 + 20.0 * float(r[5] or 0.0) / top_score + title_boost)
+            return _lexical_result(r, title, score, 'lemma_fuzzy')
+
+        return _collect_lexical_results(cursor, firebase_uid, rows, limit, _keep, inline=False)
+
 class SemanticMatchStrategy(SearchStrategy):
     """
     Strategy for Vector/Semantic Search.
@@ -696,7 +976,7 @@ class SemanticMatchStrategy(SearchStrategy):
             
         try:
             with DatabaseManager.get_read_connection() as conn:
-                with conn.cursor() as cursor:
+                with profiled_cursor(conn, QUERY_CLASS_CANDIDATE_SCAN, vector_binds=("vec",)) as cursor:
                     results = []
                     
                     def run_query(custom_limit, length_filter=None, exclude_pdf=True):
@@ -721,7 +1001,8 @@ class SemanticMatchStrategy(SearchStrategy):
                         sql, params = _apply_search_surface_filter(sql, params, search_surface)
 
                         # Apply PDF exclusion filter if requested and no resource_type
-                        if exclude_pdf and _should_exclude_pdf_in_first_pass(resource_type, book_id, search_surface):
+                        exclude_pdf = exclude_pdf and _should_exclude_pdf_in_first_pass(resource_type, book_id, search_surface)
+                        if exclude_pdf:
                             sql += " AND c.content_type NOT IN ('PDF', 'EPUB', 'PDF_CHUNK', 'BOOK_CHUNK') "
 
                         if length_filter:
@@ -730,13 +1011,35 @@ class SemanticMatchStrategy(SearchStrategy):
                             elif length_filter == 'LONG':
                                 sql += " AND DBMS_LOB.GETLENGTH(c.content_chunk) > 600 "
                                 
-                        sql += """
-                            ORDER BY dist ASC
-                            FETCH FIRST :p_limit ROWS ONLY
-                        """
-                        
-                        cursor.execute(sql, params)
-                        return cursor.fetchall()
+                        # Hot users: rank in the in-process vector tier, hydrate the top ids here.
+                        include_types, exclude_types = _semantic_cache_content_types(
+                            resource_type, effective_content_type, search_surface, exclude_pdf
+                        )
+                        candidate_ids = get_vector_cache().search(
+                            firebase_uid,
+                            emb,
+                            custom_limit * int(getattr(settings, "VECTOR_CACHE_CANDIDATE_MULTIPLIER", 4)),
+                            item_id=str(book_id or "").strip() or None,
+                            include_types=include_types,
+                            exclude_types=exclude_types,
+                        )
+                        if candidate_ids is not None:
+                            if not candidate_ids:
+                                return []
+                            sql, params = _apply_id_in_filter(sql, params, candidate_ids)
+                            sql += " ORDER BY dist ASC FETCH FIRST :p_limit ROWS ONLY "
+                            cursor.execute(sql, params)
+                            return cursor.fetchall()
+
+                        return fetch_vector_ranked(
+                            cursor,
+                            sql,
+                            params,
+                            lane=LANE_SEMANTIC,
+                            distance_expr="VECTOR_DISTANCE(c.vec_embedding, :vec, COSINE)",
+                            rank_column="dist",
+                            reweighted=True,
+                        )
                     
                     rows = []
                     if intent == 'DIRECT' or intent == 'FOLLOW_UP':
@@ -780,9 +1083,15 @@ class SemanticMatchStrategy(SearchStrategy):
                                   AND c.content_type IN ('PDF', 'EPUB', 'PDF_CHUNK', 'BOOK_CHUNK')
                             """
                             p = {"p_uid": firebase_uid, "vec": emb, "p_limit": p_limit}
-                            sql += " ORDER BY dist ASC FETCH FIRST :p_limit ROWS ONLY "
-                            cursor.execute(sql, p)
-                            return cursor.fetchall()
+                            return fetch_vector_ranked(
+                                cursor,
+                                sql,
+                                p,
+                                lane=LANE_SEMANTIC,
+                                distance_expr="VECTOR_DISTANCE(c.vec_embedding, :vec, COSINE)",
+                                rank_column="dist",
+                                reweighted=True,
+                            )
                         
                         pdf_rows = run_pdf_only_query(pdf_backfill_limit)
                         for r in pdf_rows:
@@ -1,44 +1,15 @@
 from __future__ import annotations
 
-import json
-import threading
-import time
 from typing import Any, Dict, List, Optional
 from urllib import parse as urllib_parse
-from urllib import request as urllib_request
-from urllib.error import HTTPError, URLError
 
 from config import settings
+from infrastructure import http_client
 from utils.logger import get_logger
 
 logger = get_logger("tmdb_service")
 
-_CACHE_LOCK = threading.Lock()
 _CACHE_TTL_SEC = 600
-_CACHE_MAX_ENTRIES = 256
-_CACHE: Dict[str, tuple[float, Any]] = {}
-
-
-def _cache_get(key: str) -> Any:
-    now = time.time()
-    with _CACHE_LOCK:
-        hit = _CACHE.get(key)
-        if not hit:
-            return None
-        ts, payload = hit
-        if now - ts > _CACHE_TTL_SEC:
-            _CACHE.pop(key, None)
-            return None
-        return payload
-
-
-def _cache_set(key: str, payload: Any) -> None:
-    with _CACHE_LOCK:
-        if len(_CACHE) >= _CACHE_MAX_ENTRIES:
-            # Simple bounded cache eviction: drop oldest key.
-            oldest_key = min(_CACHE.items(), key=lambda kv: kv[1][0])[0]
-            _CACHE.pop(oldest_key, None)
-        _CACHE[key] = (time.time(), payload)
 
 
 def _tmdb_enabled() -> bool:
@@ -52,26 +23,21 @@ def _tmdb_request(path: str, params: Optional[Dict[str, Any]] = None) -> Dict[st
     query = dict(params or {})
     query["api_key"] = settings.TMDB_API_KEY
     url = f"{settings.TMDB_BASE_URL}{path}?{urllib_parse.urlencode(query)}"
-    cache_key = f"tmdb:{url}"
-    cached = _cache_get(cache_key)
-    if cached is not None:
-        return cached
 
-    req = urllib_request.Request(url=url, method="GET")
     timeout = float(getattr(settings, "TMDB_TIMEOUT_SEC", 8) or 8)
     max_attempts = 2
     for attempt in range(1, max_attempts + 1):
         try:
-            with urllib_request.urlopen(req, timeout=timeout) as resp:
-                payload = json.loads(resp.read().decode("utf-8"))
-                _cache_set(cache_key, payload)
-                return payload
-        except HTTPError as e:
-            body = ""
-            try:
-                body = e.read().decode("utf-8")
-            except Exception:
-                body = ""
+            return http_client.request_json(
+                "GET",
+                url,
+                provider="tmdb",
+                timeout_sec=timeout,
+                cache_ttl_sec=_CACHE_TTL_SEC,
+                negative_ttl_sec=_CACHE_TTL_SEC,
+            )
+        except http_client.HttpStatusError as e:
+            body = e.body.decode("utf-8", errors="replace")
             logger.warning(f"TMDb HTTP error {e.code} for {path}: {body[:240]}")
             if e.code == 404:
                 return {"_not_found": True}
@@ -79,7 +45,7 @@ def _tmdb_request(path: str, params: Optional[Dict[str, Any]] = None) -> Dict[st
             if attempt < max_attempts and e.code in {408, 425, 429, 500, 502, 503, 504}:
                 continue
             return {}
-        except URLError as e:
+        except http_client.HttpTransportError as e:
             logger.warning(f"TMDb URL error for {path}: {e}")
             if attempt < max_attempts:
                 continue
@@ -0,0 +1,437 @@
+"""
+In-process per-user trigram index over TOMEHUB_CONTENT_V2.normalized_content.
+
+The exact lane's legacy path is `normalized_content LIKE '%term%'`, a scan of
+every chunk the user owns. With an index loaded, the term's trigrams are
+looked up in per-user posting lists (sorted id arrays) and intersected; only
+those ids go to Oracle, which still applies the same LIKE and every scope
+filter. A chunk containing the term contains all of its trigrams, so the
+candidates are a superset of the LIKE matches and the verified rows are
+identical to the scan.
+
+- Terms shorter than 3 characters have no trigram and keep the scan.
+- Rows inserted after the index was built have larger ids; the strategy
+  includes `c.id > max_id` in its first verification batch, so new chunks
+  are found before the index catches up.
+- Loading is lazy and off the request path: the first miss starts a background
+  load. Ingestion/purge call `notify_content_changed`; other workers pick the
+  same changes up from TOMEHUB_CHANGE_EVENTS. A user with changed books falls
+  back to the scan until the background refresh has merged them. Changes that
+  arrive while a load or refresh is reading are queued for the next refresh.
+- Memory is bounded by TRIGRAM_INDEX_MAX_MB with LRU eviction of whole users;
+  users above TRIGRAM_INDEX_MAX_ROWS_PER_USER are never indexed.
+"""
+
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from config import settings
+from infrastructure.cursor_profiles import QUERY_CLASS_BULK_EXPORT, profiled_cursor
+from infrastructure.db_manager import DatabaseManager, safe_read_clob
+from services.monitoring import TRIGRAM_INDEX_BYTES, TRIGRAM_INDEX_REQUESTS_TOTAL, TRIGRAM_INDEX_USERS
+from utils.logger import get_logger
+
+logger = get_logger("trigram_index_service")
+
+GRAM = 3
+_EVENT_POLL_LIMIT = 300
+_EVENT_POLL_SKEW_MS = 5000
+# Rough per-posting-list cost of the dict slot, key string and array header.
+_POSTING_OVERHEAD_BYTES = 160
+
+
+def extract_trigrams(text: str) -> Set[str]:
+    """Distinct character trigrams of `text`, taken as-is (no case or accent folding)."""
+    if not text or len(text) < GRAM:
+        return set()
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+@dataclass(frozen=True)
+class TrigramCandidates:
+    ids: List[int]
+    max_id: int
+
+
+@dataclass(frozen=True)
+class _UserTrigrams:
+    ids: np.ndarray
+    item_ids: np.ndarray
+    postings: Dict[str, np.ndarray]
+    max_id: int
+
+    @property
+    def nbytes(self) -> int:
+        return int(
+            self.ids.nbytes
+            + self.item_ids.nbytes
+            + sum(arr.nbytes for arr in self.postings.values())
+            + len(self.postings) * _POSTING_OVERHEAD_BYTES
+        )
+
+    def __len__(self) -> int:
+        return int(self.ids.shape[0])
+
+    def candidates(self, term: str) -> Optional[np.ndarray]:
+        """Ids (descending) whose text contains every trigram of `term`; None if `term` has none."""
+        grams = extract_trigrams(term)
+        if not grams:
+            return None
+        lists = []
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if posting is None:
+                return np.empty(0, dtype=np.int64)
+            lists.append(posting)
+        lists.sort(key=len)
+        result = lists[0]
+        for posting in lists[1:]:
+            result = np.intersect1d(result, posting, assume_unique=True)
+            if not result.size:
+                break
+        return result[::-1]
+
+
+@dataclass
+class _Entry:
+    index: _UserTrigrams
+    pending_items: Set[str] = field(default_factory=set)
+    events_checked_ms: int = 0
+    last_event_id: int = 0
+
+
+def _enabled() -> bool:
+    return bool(getattr(settings, "TRIGRAM_INDEX_ENABLED", False))
+
+
+def _budget_bytes() -> int:
+    return int(getattr(settings, "TRIGRAM_INDEX_MAX_MB", 256)) * 1024 * 1024
+
+
+def _max_rows() -> int:
+    return int(getattr(settings, "TRIGRAM_INDEX_MAX_ROWS_PER_USER", 100000))
+
+
+def _build_index(rows: Iterable[Any], max_id: int) -> _UserTrigrams:
+    ids: List[int] = []
+    item_ids: List[str] = []
+    buckets: Dict[str, List[int]] = defaultdict(list)
+    for row_id, item_id, text in rows:
+        row_id = int(row_id)
+        ids.append(row_id)
+        item_ids.append(str(item_id or ""))
+        for gram in extract_trigrams(text):
+            buckets[gram].append(row_id)
+    order = np.argsort(np.asarray(ids, dtype=np.int64), kind="stable")
+    return _UserTrigrams(
+        ids=np.asarray(ids, dtype=np.int64)[order],
+        item_ids=np.asarray(item_ids, dtype=object)[order],
+        postings={gram: np.unique(np.asarray(found, dtype=np.int64)) for gram, found in buckets.items()},
+        max_id=max_id,
+    )
+
+
+def _merge_index(base: _UserTrigrams, item_ids: Set[str], fresh: _UserTrigrams) -> _UserTrigrams:
+    changed = np.isin(base.item_ids, list(item_ids))
+    removed = base.ids[changed]
+    postings: Dict[str, np.ndarray] = {}
+    for gram, posting in base.postings.items():
+        if removed.size:
+            posting = posting[~np.isin(posting, removed, assume_unique=True)]
+        added = fresh.postings.get(gram)
+        if added is not None:
+            posting = np.union1d(posting, added)
+        if posting.size:
+            postings[gram] = posting
+    for gram, added in fresh.postings.items():
+        if gram not in base.postings:
+            postings[gram] = added
+    ids = np.concatenate([base.ids[~changed], fresh.ids])
+    order = np.argsort(ids, kind="stable")
+    return _UserTrigrams(
+        ids=ids[order],
+        item_ids=np.concatenate([base.item_ids[~changed], fresh.item_ids])[order],
+        postings=postings,
+        # Rows of other books may have been inserted since the base load; they stay
+        # covered by the range check, so the boundary does not move on a merge.
+        max_id=base.max_id,
+    )
+
+
+def _fetch_rows(firebase_uid: str, item_ids: Optional[Set[str]] = None, max_rows: Optional[int] = None) -> List[Any]:
+    sql = """
+        SELECT id, item_id, normalized_content
+        FROM TOMEHUB_CONTENT_V2
+        WHERE firebase_uid = :p_uid
+          AND normalized_content IS NOT NULL
+    """
+    params: Dict[str, Any] = {"p_uid": firebase_uid}
+    if item_ids:
+        binds = []
+        for i, item_id in enumerate(sorted(item_ids)):
+            params[f"p_item{i}"] = item_id
+            binds.append(f":p_item{i}")
+        sql += f" AND item_id IN ({', '.join(binds)}) "
+    if max_rows:
+        sql += " FETCH FIRST :p_max ROWS ONLY "
+        params["p_max"] = int(max_rows)
+    with DatabaseManager.get_read_connection() as conn:
+        with profiled_cursor(conn, QUERY_CLASS_BULK_EXPORT) as cursor:
+            cursor.execute(sql, params)
+            return [(row_id, item_id, safe_read_clob(text)) for row_id, item_id, text in cursor.fetchall()]
+
+
+def _max_content_id(firebase_uid: str) -> int:
+    with DatabaseManager.get_read_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT MAX(id) FROM TOMEHUB_CONTENT_V2 WHERE firebase_uid = :p_uid", {"p_uid": firebase_uid})
+            row = cursor.fetchone()
+            return int(row[0] or 0) if row else 0
+
+
+class TrigramIndex:
+    def __init__(self):
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Set[str] = set()
+        self._oversized: Set[str] = set()
+        # Books changed while load_user is reading; None means the whole user changed.
+        self._load_changes: Dict[str, Optional[Set[str]]] = {}
+
+    # -- bookkeeping -----------------------------------------------------
+
+    def _total_bytes(self) -> int:
+        return sum(entry.index.nbytes for entry in self._entries.values())
+
+    def _publish_gauges(self) -> None:
+        TRIGRAM_INDEX_BYTES.set(self._total_bytes())
+        TRIGRAM_INDEX_USERS.set(len(self._entries))
+
+    def _store_locked(self, firebase_uid: str, entry: _Entry) -> None:
+        budget = _budget_bytes()
+        if entry.index.nbytes > budget:
+            self._entries.pop(firebase_uid, None)
+            self._oversized.add(firebase_uid)
+        else:
+            self._entries[firebase_uid] = entry
+            self._entries.move_to_end(firebase_uid)
+            while self._total_bytes() > budget and len(self._entries) > 1:
+                evicted, _ = self._entries.popitem(last=False)
+                logger.info("Trigram index evicted user", extra={"uid": evicted})
+        self._publish_gauges()
+
+    def drop(self, firebase_uid: str) -> None:
+        with self._lock:
+            self._entries.pop(firebase_uid, None)
+            self._oversized.discard(firebase_uid)
+            self._publish_gauges()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._loading.clear()
+            self._oversized.clear()
+            self._publish_gauges()
+
+    # -- loading / refresh -----------------------------------------------
+
+    def load_user(self, firebase_uid: str) -> bool:
+        max_rows = _max_rows()
+        started_ms = int(time.time() * 1000)
+        with self._lock:
+            self._load_changes[firebase_uid] = set()
+        try:
+            # Taken before the scan: anything inserted meanwhile is above max_id and
+            # is still verified by the strategy's `c.id > max_id` range.
+            max_id = _max_content_id(firebase_uid)
+            rows = _fetch_rows(firebase_uid, max_rows=max_rows + 1)
+            if len(rows) > max_rows:
+                with self._lock:
+                    self._oversized.add(firebase_uid)
+                TRIGRAM_INDEX_REQUESTS_TOTAL.labels(outcome="too_large").inc()
+                return False
+            index = _build_index(rows, max_id=max_id)
+            with self._lock:
+                changed = self._load_changes.pop(firebase_uid, set())
+                if changed is None:
+                    # The whole user changed during the scan; the next lookup reloads.
+                    return False
+                # Books changed during the scan may have been read before the change.
+                self._store_locked(
+                    firebase_uid, _Entry(index=index, pending_items=changed, events_checked_ms=started_ms)
+                )
+        finally:
+            with self._lock:
+                self._load_changes.pop(firebase_uid, None)
+        logger.info(
+            "Trigram index loaded user",
+            extra={"uid": firebase_uid, "rows": len(index), "trigrams": len(index.postings)},
+        )
+        return True
+
+    def refresh_user(self, firebase_uid: str) -> bool:
+        """Merge the books queued by change notifications into the loaded index."""
+        with self._lock:
+            entry = self._entries.get(firebase_uid)
+            if entry is None:
+                return False
+            # Swap rather than copy: a book changed again during the fetch lands in
+            # the new set and is merged by the next refresh.
+            pending, entry.pending_items = entry.pending_items, set()
+        if not pending:
+            return True
+        try:
+            fresh = _build_index(_fetch_rows(firebase_uid, item_ids=pending), max_id=entry.index.max_id)
+            merged = _merge_index(entry.index, pending, fresh)
+        except Exception:
+            with self._lock:
+                entry.pending_items.update(pending)
+            raise
+        if len(merged) > _max_rows():
+            self.drop(firebase_uid)
+            return False
+        with self._lock:
+            if self._entries.get(firebase_uid) is not entry:
+                # Dropped or reloaded meanwhile; the merge is based on a stale index.
+                return False
+            entry.index = merged
+            self._store_locked(firebase_uid, entry)
+        return True
+
+    def _run_in_background(self, firebase_uid: str, refresh: bool) -> None:
+        with self._lock:
+            if firebase_uid in self._loading:
+                return
+            self._loading.add(firebase_uid)
+
+        def _runner():
+            try:
+                if refresh:
+                    self.refresh_user(firebase_uid)
+                else:
+                    self.load_user(firebase_uid)
+            except Exception as e:
+                logger.warning(f"Trigram index load failed (non-critical): {e}", extra={"uid": firebase_uid})
+                if refresh:
+                    self.drop(firebase_uid)
+            finally:
+                with self._lock:
+                    self._loading.discard(firebase_uid)
+
+        threading.Thread(target=_runner, name="trigram-index-load", daemon=True).start()
+
+    def notify_content_changed(self, firebase_uid: str, item_id: Optional[str] = None) -> None:
+        with self._lock:
+            self._oversized.discard(firebase_uid)
+            if firebase_uid in self._load_changes:
+                changed = self._load_changes[firebase_uid]
+                if changed is not None and item_id:
+                    changed.add(str(item_id))
+                else:
+                    self._load_changes[firebase_uid] = None
+            entry = self._entries.get(firebase_uid)
+            if entry is None:
+                return
+            if not item_id:
+                self._entries.pop(firebase_uid, None)
+                self._publish_gauges()
+                return
+            entry.pending_items.add(str(item_id))
+
+    def _poll_change_events(self, firebase_uid: str, entry: _Entry) -> bool:
+        """Queue books changed by other workers. Returns False when the user must be reloaded."""
+        now_ms = int(time.time() * 1000)
+        if now_ms - entry.events_checked_ms < int(getattr(settings, "TRIGRAM_INDEX_EVENT_POLL_SEC", 30)) * 1000:
+            return True
+        from services.change_event_service import fetch_change_events_since
+
+        changes, _ = fetch_change_events_since(
+            firebase_uid=firebase_uid,
+            since_ms=max(0, entry.events_checked_ms - _EVENT_POLL_SKEW_MS),
+            limit=_EVENT_POLL_LIMIT,
+        )
+        if len(changes) >= _EVENT_POLL_LIMIT:
+            return False
+        newest = entry.last_event_id
+        with self._lock:
+            for change in changes:
+                event_id = int(change.get("event_id") or 0)
+                if event_id and event_id <= entry.last_event_id:
+                    continue
+                newest = max(newest, event_id)
+                item_id = str(change.get("item_id") or "").strip()
+                if not item_id:
+                    return False
+                entry.pending_items.add(item_id)
+            entry.events_checked_ms = now_ms
+            entry.last_event_id = newest
+        return True
+
+    # -- lookup ------------------------------------------------------------
+
+    def lookup(self, firebase_uid: str, term: str) -> Optional[TrigramCandidates]:
+        """
+        Candidate ids (descending) for a LIKE '%term%' over the user's chunks, or
+        None when the caller should run the plain scan (not loaded, stale, or a
+        term shorter than a trigram).
+        """
+        if not _enabled() or not firebase_uid:
+            return None
+        if len(term or "") < GRAM:
+            TRIGRAM_INDEX_REQUESTS_TOTAL.labels(outcome="short_term").inc()
+            return None
+        with self._lock:
+            entry = self._entries.get(firebase_uid)
+            if entry is not None:
+                self._entries.move_to_end(firebase_uid)
+            oversized = firebase_uid in self._oversized
+        if entry is None:
+            if oversized:
+                TRIGRAM_INDEX_REQUESTS_TOTAL.labels(outcome="too_large").inc()
+            else:
+                TRIGRAM_INDEX_REQUESTS_TOTAL.labels(outcome="miss").inc()
+                self._run_in_background(firebase_uid, refresh=False)
+            return None
+
+        try:
+            current = self._poll_change_events(firebase_uid, entry)
+        except Exception as e:
+            logger.warning(f"Trigram index change poll failed; using scan (non-critical): {e}")
+            current = False
+        if not current:
+            self.drop(firebase_uid)
+            TRIGRAM_INDEX_REQUESTS_TOTAL.labels(outcome="stale").inc()
+            return None
+        with self._lock:
+            has_pending = bool(entry.pending_items)
+        if has_pending:
+            self._run_in_background(firebase_uid, refresh=True)
+            TRIGRAM_INDEX_REQUESTS_TOTAL.labels(outcome="stale").inc()
+            return None
+
+        found = entry.index.candidates(term)
+        if found is None:
+            TRIGRAM_INDEX_REQUESTS_TOTAL.labels(outcome="short_term").inc()
+            return None
+        TRIGRAM_INDEX_REQUESTS_TOTAL.labels(outcome="hit").inc()
+        max_id = entry.index.max_id
+        # Ids above max_id are covered by the range check; listing them too would repeat rows.
+        return TrigramCandidates(ids=found[found <= max_id].tolist(), max_id=max_id)
+
+
+_TRIGRAM_INDEX = TrigramIndex()
+
+
+def get_trigram_index() -> TrigramIndex:
+    return _TRIGRAM_INDEX
+
+
+def notify_content_changed(firebase_uid: str, item_id: Optional[str] = None) -> None:
+    """Ingestion / purge hook: merge the book (or reload the user) before the next indexed lookup."""
+    if firebase_uid:
+        _TRIGRAM_INDEX.notify_content_changed(str(firebase_uid), item_id)
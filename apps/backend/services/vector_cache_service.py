@@ -0,0 +1,381 @@
+"""
+In-process per-user vector tier in front of Oracle vector search.
+
+For users with a loaded index, SemanticMatchStrategy ranks candidates here
+(a contiguous, L2-normalised float32 matrix of the user's AI-eligible chunk
+vectors) and only hydrates the top ids from TOMEHUB_CONTENT_V2 with one IN-list
+fetch. Cached metadata (item_id, content_type, rag_weight) pre-filters and
+weights candidates the same way the SQL does; the hydrate query still applies
+every SQL filter, so the cache can only reorder, never widen, what is returned.
+
+- Loading is lazy and off the request path: the first miss starts a background
+  load and the query falls back to Oracle.
+- Memory is bounded by VECTOR_CACHE_MAX_MB with LRU eviction of whole users;
+  users above VECTOR_CACHE_MAX_ROWS_PER_USER are never cached.
+- Ingestion/purge call `notify_content_changed`; changed books are reloaded
+  incrementally on the next lookup. Other workers pick up the same changes from
+  TOMEHUB_CHANGE_EVENTS every VECTOR_CACHE_EVENT_POLL_SEC.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from config import settings
+from infrastructure.cursor_profiles import QUERY_CLASS_BULK_EXPORT, profiled_cursor
+from infrastructure.db_manager import DatabaseManager
+from services.monitoring import VECTOR_CACHE_BYTES, VECTOR_CACHE_REQUESTS_TOTAL, VECTOR_CACHE_USERS
+from utils.logger import get_logger
+
+logger = get_logger("vector_cache_service")
+
+# Oracle: NULLIF(rag_weight, 0.0001) makes the weighted distance NULL, which sorts last.
+_NULL_WEIGHT = 0.0001
+_MAX_CANDIDATES = 900
+_EVENT_POLL_LIMIT = 300
+_EVENT_POLL_SKEW_MS = 5000
+
+
+@dataclass(frozen=True)
+class _UserIndex:
+    ids: np.ndarray
+    item_ids: np.ndarray
+    content_types: np.ndarray
+    inv_weights: np.ndarray
+    matrix: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return int(
+            self.matrix.nbytes
+            + self.ids.nbytes
+            + self.inv_weights.nbytes
+            + self.item_ids.nbytes
+            + self.content_types.nbytes
+        )
+
+    def __len__(self) -> int:
+        return int(self.ids.shape[0])
+
+
+@dataclass
+class _Entry:
+    index: _UserIndex
+    pending_items: Set[str] = field(default_factory=set)
+    events_checked_ms: int = 0
+    last_event_id: int = 0
+
+
+def _enabled() -> bool:
+    return bool(getattr(settings, "VECTOR_CACHE_ENABLED", False))
+
+
+def _budget_bytes() -> int:
+    return int(getattr(settings, "VECTOR_CACHE_MAX_MB", 512)) * 1024 * 1024
+
+
+def _max_rows() -> int:
+    return int(getattr(settings, "VECTOR_CACHE_MAX_ROWS_PER_USER", 200000))
+
+
+def _build_index(rows: Iterable[Any]) -> Optional[_UserIndex]:
+    ids: List[int] = []
+    item_ids: List[str] = []
+    content_types: List[str] = []
+    inv_weights: List[float] = []
+    vectors: List[np.ndarray] = []
+    for row_id, item_id, content_type, rag_weight, vec in rows:
+        if vec is None:
+            continue
+        ids.append(int(row_id))
+        item_ids.append(str(item_id or ""))
+        content_types.append(str(content_type or "").upper())
+        weight = float(rag_weight) if rag_weight is not None else _NULL_WEIGHT
+        inv_weights.append(0.0 if weight == _NULL_WEIGHT else 1.0 / weight)
+        vectors.append(np.asarray(vec, dtype=np.float32))
+    if not ids:
+        return None
+    matrix = np.vstack(vectors)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return _UserIndex(
+        ids=np.asarray(ids, dtype=np.int64),
+        item_ids=np.asarray(item_ids, dtype=object),
+        content_types=np.asarray(content_types, dtype=object),
+        inv_weights=np.asarray(inv_weights, dtype=np.float32),
+        matrix=np.ascontiguousarray(matrix / norms, dtype=np.float32),
+    )
+
+
+def _merge_index(base: _UserIndex, item_ids: Set[str], fresh: Optional[_UserIndex]) -> _UserIndex:
+    keep = ~np.isin(base.item_ids, list(item_ids))
+    parts = [
+        _UserIndex(
+            ids=base.ids[keep],
+            item_ids=base.item_ids[keep],
+            content_types=base.content_types[keep],
+            inv_weights=base.inv_weights[keep],
+            matrix=base.matrix[keep],
+        )
+    ]
+    if fresh is not None and len(fresh):
+        parts.append(fresh)
+    return _UserIndex(
+        ids=np.concatenate([p.ids for p in parts]),
+        item_ids=np.concatenate([p.item_ids for p in parts]),
+        content_types=np.concatenate([p.content_types for p in parts]),
+        inv_weights=np.concatenate([p.inv_weights for p in parts]),
+        matrix=np.ascontiguousarray(np.vstack([p.matrix for p in parts]), dtype=np.float32),
+    )
+
+
+def _fetch_rows(firebase_uid: str, item_ids: Optional[Set[str]] = None, max_rows: Optional[int] = None) -> List[Any]:
+    sql = """
+        SELECT id, item_id, content_type, rag_weight, vec_embedding
+        FROM TOMEHUB_CONTENT_V2
+        WHERE firebase_uid = :p_uid
+          AND AI_ELIGIBLE = 1
+          AND vec_embedding IS NOT NULL
+    """
+    params: Dict[str, Any] = {"p_uid": firebase_uid}
+    if item_ids:
+        binds = []
+        for i, item_id in enumerate(sorted(item_ids)):
+            params[f"p_item{i}"] = item_id
+            binds.append(f":p_item{i}")
+        sql += f" AND item_id IN ({', '.join(binds)}) "
+    if max_rows:
+        sql += " FETCH FIRST :p_max ROWS ONLY "
+        params["p_max"] = int(max_rows)
+    with DatabaseManager.get_read_connection() as conn:
+        with profiled_cursor(conn, QUERY_CLASS_BULK_EXPORT) as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+
+class VectorCache:
+    def __init__(self):
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Set[str] = set()
+        self._oversized: Set[str] = set()
+
+    # -- bookkeeping -----------------------------------------------------
+
+    def _total_bytes(self) -> int:
+        return sum(entry.index.nbytes for entry in self._entries.values())
+
+    def _publish_gauges(self) -> None:
+        VECTOR_CACHE_BYTES.set(self._total_bytes())
+        VECTOR_CACHE_USERS.set(len(self._entries))
+
+    def _store(self, firebase_uid: str, entry: _Entry) -> None:
+        budget = _budget_bytes()
+        with self._lock:
+            if entry.index.nbytes > budget:
+                self._entries.pop(firebase_uid, None)
+                self._oversized.add(firebase_uid)
+            else:
+                self._entries[firebase_uid] = entry
+                self._entries.move_to_end(firebase_uid)
+                while self._total_bytes() > budget and len(self._entries) > 1:
+                    evicted, _ = self._entries.popitem(last=False)
+                    logger.info("Vector cache evicted user", extra={"uid": evicted})
+            self._publish_gauges()
+
+    def drop(self, firebase_uid: str) -> None:
+        with self._lock:
+            self._entries.pop(firebase_uid, None)
+            self._oversized.discard(firebase_uid)
+            self._publish_gauges()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._loading.clear()
+            self._oversized.clear()
+            self._publish_gauges()
+
+    # -- loading / refresh -----------------------------------------------
+
+    def load_user(self, firebase_uid: str) -> bool:
+        max_rows = _max_rows()
+        started_ms = int(time.time() * 1000)
+        rows = _fetch_rows(firebase_uid, max_rows=max_rows + 1)
+        if len(rows) > max_rows:
+            with self._lock:
+                self._oversized.add(firebase_uid)
+            VECTOR_CACHE_REQUESTS_TOTAL.labels(outcome="too_large").inc()
+            return False
+        index = _build_index(rows)
+        if index is None:
+            return False
+        self._store(firebase_uid, _Entry(index=index, events_checked_ms=started_ms))
+        logger.info("Vector cache loaded user", extra={"uid": firebase_uid, "rows": len(index)})
+        return True
+
+    def _load_in_background(self, firebase_uid: str) -> None:
+        with self._lock:
+            if firebase_uid in self._loading:
+                return
+            self._loading.add(firebase_uid)
+
+        def _runner():
+            try:
+                self.load_user(firebase_uid)
+            except Exception as e:
+                logger.warning(f"Vector cache load failed (non-critical): {e}", extra={"uid": firebase_uid})
+            finally:
+                with self._lock:
+                    self._loading.discard(firebase_uid)
+
+        threading.Thread(target=_runner, name="vector-cache-load", daemon=True).start()
+
+    def notify_content_changed(self, firebase_uid: str, item_id: Optional[str] = None) -> None:
+        with self._lock:
+            self._oversized.discard(firebase_uid)
+            entry = self._entries.get(firebase_uid)
+            if entry is None:
+                return
+            if not item_id:
+                self._entries.pop(firebase_uid, None)
+                self._publish_gauges()
+                return
+            entry.pending_items.add(str(item_id))
+
+    def _poll_change_events(self, firebase_uid: str, entry: _Entry) -> bool:
+        """Queue books changed by other workers. Returns False when the user must be reloaded."""
+        now_ms = int(time.time() * 1000)
+        if now_ms - entry.events_checked_ms < int(getattr(settings, "VECTOR_CACHE_EVENT_POLL_SEC", 30)) * 1000:
+            return True
+        from services.change_event_service import fetch_change_events_since
+
+        changes, _ = fetch_change_events_since(
+            firebase_uid=firebase_uid,
+            since_ms=max(0, entry.events_checked_ms - _EVENT_POLL_SKEW_MS),
+            limit=_EVENT_POLL_LIMIT,
+        )
+        if len(changes) >= _EVENT_POLL_LIMIT:
+            return False
+        newest = entry.last_event_id
+        for change in changes:
+            event_id = int(change.get("event_id") or 0)
+            if event_id and event_id <= entry.last_event_id:
+                continue
+            newest = max(newest, event_id)
+            item_id = str(change.get("item_id") or "").strip()
+            if not item_id:
+                return False
+            entry.pending_items.add(item_id)
+        entry.events_checked_ms = now_ms
+        entry.last_event_id = newest
+        return True
+
+    def _refresh(self, firebase_uid: str, entry: _Entry) -> Optional[_Entry]:
+        if not self._poll_change_events(firebase_uid, entry):
+            self.drop(firebase_uid)
+            return None
+        with self._lock:
+            pending = set(entry.pending_items)
+        if not pending:
+            return entry
+        fresh = _build_index(_fetch_rows(firebase_uid, item_ids=pending))
+        merged = _merge_index(entry.index, pending, fresh)
+        if len(merged) > _max_rows():
+            self.drop(firebase_uid)
+            return None
+        with self._lock:
+            entry.pending_items.difference_update(pending)
+        updated = _Entry(
+            index=merged,
+            pending_items=entry.pending_items,
+            events_checked_ms=entry.events_checked_ms,
+            last_event_id=entry.last_event_id,
+        )
+        self._store(firebase_uid, updated)
+        return updated
+
+    # -- lookup ------------------------------------------------------------
+
+    def search(
+        self,
+        firebase_uid: str,
+        query_vec: Any,
+        k: int,
+        *,
+        item_id: Optional[str] = None,
+        include_types: Optional[Iterable[str]] = None,
+        exclude_types: Optional[Iterable[str]] = None,
+    ) -> Optional[List[int]]:
+        """
+        Candidate chunk ids ordered by distance / rag_weight, or None when the
+        user is not cached (a background load is started) and the caller
+        should query Oracle directly.
+        """
+        if not _enabled() or not firebase_uid or query_vec is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(firebase_uid)
+            if entry is not None:
+                self._entries.move_to_end(firebase_uid)
+            oversized = firebase_uid in self._oversized
+        if entry is None:
+            if oversized:
+                VECTOR_CACHE_REQUESTS_TOTAL.labels(outcome="too_large").inc()
+            else:
+                VECTOR_CACHE_REQUESTS_TOTAL.labels(outcome="miss").inc()
+                self._load_in_background(firebase_uid)
+            return None
+
+        try:
+            entry = self._refresh(firebase_uid, entry)
+        except Exception as e:
+            logger.warning(f"Vector cache refresh failed; using Oracle (non-critical): {e}")
+            self.drop(firebase_uid)
+            entry = None
+        if entry is None:
+            VECTOR_CACHE_REQUESTS_TOTAL.labels(outcome="stale").inc()
+            return None
+
+        index = entry.index
+        query = np.asarray(query_vec, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if norm == 0 or query.shape[0] != index.matrix.shape[1]:
+            VECTOR_CACHE_REQUESTS_TOTAL.labels(outcome="bad_query").inc()
+            return None
+
+        mask = np.ones(len(index), dtype=bool)
+        if item_id:
+            mask &= index.item_ids == str(item_id)
+        if include_types is not None:
+            mask &= np.isin(index.content_types, [str(t).upper() for t in include_types])
+        if exclude_types:
+            mask &= ~np.isin(index.content_types, [str(t).upper() for t in exclude_types])
+        positions = np.flatnonzero(mask & (index.inv_weights > 0))
+        VECTOR_CACHE_REQUESTS_TOTAL.labels(outcome="hit").inc()
+        if positions.size == 0:
+            return []
+
+        distances = 1.0 - index.matrix[positions] @ (query / norm)
+        weighted = distances * index.inv_weights[positions]
+        k = max(1, min(int(k), _MAX_CANDIDATES, positions.size))
+        top = np.argpartition(weighted, k - 1)[:k] if k < positions.size else np.arange(positions.size)
+        top = top[np.argsort(weighted[top], kind="stable")]
+        return [int(i) for i in index.ids[positions[top]]]
+
+
+_VECTOR_CACHE = VectorCache()
+
+
+def get_vector_cache() -> VectorCache:
+    return _VECTOR_CACHE
+
+
+def notify_content_changed(firebase_uid: str, item_id: Optional[str] = None) -> None:
+    """Ingestion / purge hook: reload the book (or the whole user) on next lookup."""
+    if firebase_uid:
+        _VECTOR_CACHE.notify_content_changed(str(firebase_uid), item_id)
@@ -0,0 +1,218 @@
+"""
+Approximate (ANN) vector search on TOMEHUB_CONTENT_V2.
+
+Semantic lanes rank chunks by VECTOR_DISTANCE over the neighbor-partition
+vector index IDX_CNT_VEC_V2. `apply_vector_ranking` finishes a lane's filtered
+query either as the exact `ORDER BY ... FETCH FIRST` scan or, when
+VECTOR_APPROX_ENABLED, as `FETCH APPROX FIRST ... WITH TARGET ACCURACY <n>`
+with a per-lane accuracy so the index can answer it. Lanes whose final order
+re-weights the raw distance (rag_weight) over-fetch approximate candidates in a
+subquery and apply their own order on top.
+
+Lane queries filter per user and content type, and the index is shared by all
+users, so an approximate pass can come back short for small libraries.
+`fetch_vector_ranked` runs the query and repeats it exactly when it returns
+fewer rows than requested.
+
+Index DDL (status / create / rebuild) is kept here for
+scripts/manage_content_vector_index.py and scripts/benchmark_vector_recall.py.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from config import settings
+from services.monitoring import VECTOR_APPROX_FALLBACK_TOTAL
+from utils.logger import get_logger
+
+logger = get_logger("vector_index_service")
+
+CONTENT_TABLE = "TOMEHUB_CONTENT_V2"
+CONTENT_VECTOR_INDEX = "IDX_CNT_VEC_V2"
+
+LANE_SEMANTIC = "semantic"
+LANE_FLOW = "flow"
+LANE_BOOK_CONTEXT = "book_context"
+
+_LANE_ACCURACY_SETTINGS = {
+    LANE_SEMANTIC: "VECTOR_APPROX_ACCURACY_SEMANTIC",
+    LANE_FLOW: "VECTOR_APPROX_ACCURACY_FLOW",
+    LANE_BOOK_CONTEXT: "VECTOR_APPROX_ACCURACY_BOOK_CONTEXT",
+}
+
+_CANDIDATES_BIND = "p_ann_candidates"
+
+
+def target_accuracy(lane: str) -> Optional[int]:
+    """Target accuracy for a lane, or None when approximate search is off."""
+    if lane not in _LANE_ACCURACY_SETTINGS:
+        raise ValueError(f"Unknown vector search lane: {lane}")
+    if not bool(getattr(settings, "VECTOR_APPROX_ENABLED", False)):
+        return None
+    return min(100, max(1, int(getattr(settings, _LANE_ACCURACY_SETTINGS[lane], 90))))
+
+
+def apply_vector_ranking(
+    sql: str,
+    params: Dict[str, Any],
+    *,
+    lane: str,
+    distance_expr: str,
+    rank_column: str,
+    reweighted: bool = False,
+    limit_bind: str = "p_limit",
+    offset_bind: Optional[str] = None,
+    exact: bool = False,
+    accuracy: Optional[int] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Append ORDER BY / row limiting to a filtered vector query.
+
+    `distance_expr` is the raw VECTOR_DISTANCE(...) expression the index can
+    serve; `rank_column` is the select-list alias the caller sorts on. With
+    `reweighted=True` the alias is not the raw distance, so approximate
+    candidates are over-fetched and re-sorted. `accuracy` overrides the lane
+    setting (benchmarks); `exact=True` forces the exact scan.
+    """
+    if offset_bind:
+        paging = f" OFFSET :{offset_bind} ROWS FETCH NEXT :{limit_bind} ROWS ONLY "
+    else:
+        paging = f" FETCH FIRST :{limit_bind} ROWS ONLY "
+
+    acc = None if exact else (accuracy if accuracy is not None else target_accuracy(lane))
+    if acc is None:
+        return f"{sql} ORDER BY {rank_column} ASC{paging}", params
+
+    acc = min(100, max(1, int(acc)))
+    if not reweighted and not offset_bind:
+        return (
+            f"{sql} ORDER BY {distance_expr} "
+            f"FETCH APPROX FIRST :{limit_bind} ROWS ONLY WITH TARGET ACCURACY {acc} ",
+            params,
+        )
+
+    wanted = int(params.get(limit_bind) or 0) + (int(params.get(offset_bind) or 0) if offset_bind else 0)
+    overfetch = int(getattr(settings, "VECTOR_APPROX_OVERFETCH", 3)) if reweighted else 1
+    out = dict(params)
+    out[_CANDIDATES_BIND] = max(1, wanted * max(1, overfetch))
+    wrapped = (
+        f"SELECT * FROM ({sql} ORDER BY {distance_expr} "
+        f"FETCH APPROX FIRST :{_CANDIDATES_BIND} ROWS ONLY WITH TARGET ACCURACY {acc}) "
+        f"ORDER BY {rank_column} ASC{paging}"
+    )
+    return wrapped, out
+
+
+def fetch_vector_ranked(
+    cursor,
+    sql: str,
+    params: Dict[str, Any],
+    *,
+    lane: str,
+    distance_expr: str,
+    rank_column: str,
+    reweighted: bool = False,
+    limit_bind: str = "p_limit",
+    offset_bind: Optional[str] = None,
+) -> List[Any]:
+    """
+    Run a filtered vector query ranked by `apply_vector_ranking` and return its rows.
+
+    An approximate pass that returns fewer than the requested rows is repeated
+    as the exact scan, so filtered lanes never lose rows to the index.
+    """
+    ranking = dict(
+        lane=lane,
+        distance_expr=distance_expr,
+        rank_column=rank_column,
+        reweighted=reweighted,
+        limit_bind=limit_bind,
+        offset_bind=offset_bind,
+    )
+    ranked_sql, ranked_params = apply_vector_ranking(sql, params, **ranking)
+    cursor.execute(ranked_sql, ranked_params)
+    rows = cursor.fetchall()
+    if target_accuracy(lane) is None or len(rows) >= int(params.get(limit_bind) or 0):
+        return rows
+
+    VECTOR_APPROX_FALLBACK_TOTAL.labels(lane=lane).inc()
+    exact_sql, exact_params = apply_vector_ranking(sql, params, exact=True, **ranking)
+    cursor.execute(exact_sql, exact_params)
+    return cursor.fetchall()
+
+
+def recall_at_k(exact_ids: Sequence[Any], approx_ids: Sequence[Any], k: Optional[int] = None) -> float:
+    """Share of the exact top-k that the approximate top-k also returned."""
+    k = len(exact_ids) if k is None else int(k)
+    truth = set(list(exact_ids)[:k])
+    if not truth:
+        return 1.0
+    return len(truth & set(list(approx_ids)[:k])) / float(len(truth))
+
+
+def get_content_index_status(cursor) -> Optional[Dict[str, Any]]:
+    cursor.execute(
+        """
+        SELECT index_name, index_type, status, ityp_name
+        FROM user_indexes
+        WHERE index_name = :p_name
+        """,
+        {"p_name": CONTENT_VECTOR_INDEX},
+    )
+    row = cursor.fetchone()
+    if not row:
+        return None
+    return {"index_name": row[0], "index_type": row[1], "status": row[2], "indextype": row[3]}
+
+
+def create_content_vector_index(
+    cursor,
+    *,
+    accuracy: int = 95,
+    neighbor_partitions: Optional[int] = None,
+    parallel: Optional[int] = None,
+) -> None:
+    """
+    Build IDX_CNT_VEC_V2 as a neighbor-partition (IVF) index.
+
+    IVF lives on disk and accepts DML, which suits a table written on every
+    ingest; partition centroids are trained on the rows present at build time,
+    so large imports should be followed by a rebuild.
+    """
+    ddl = (
+        f"CREATE VECTOR INDEX {CONTENT_VECTOR_INDEX} ON {CONTENT_TABLE} (VEC_EMBEDDING) "
+        f"ORGANIZATION NEIGHBOR PARTITIONS DISTANCE COSINE "
+        f"WITH TARGET ACCURACY {min(100, max(1, int(accuracy)))}"
+    )
+    if neighbor_partitions:
+        ddl += f" PARAMETERS (TYPE IVF, NEIGHBOR PARTITIONS {max(1, int(neighbor_partitions))})"
+    if parallel:
+        ddl += f" PARALLEL {max(1, int(parallel))}"
+    logger.info("Creating content vector index", extra={"ddl": ddl})
+    cursor.execute(ddl)
+
+
+def drop_content_vector_index(cursor) -> bool:
+    try:
+        cursor.execute(f"DROP INDEX {CONTENT_VECTOR_INDEX}")
+        return True
+    except Exception as e:
+        if "ORA-01418" in str(e):  # index does not exist
+            return False
+        raise
+
+
+def rebuild_content_vector_index(
+    cursor,
+    *,
+    accuracy: int = 95,
+    neighbor_partitions: Optional[int] = None,
+    parallel: Optional[int] = None,
+) -> None:
+    """Drop and recreate the index so partition centroids are retrained on current data."""
+    drop_content_vector_index(cursor)
+    create_content_vector_index(
+        cursor,
+        accuracy=accuracy,
+        neighbor_partitions=neighbor_partitions,
+        parallel=parallel,
+    )
@@ -0,0 +1,146 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from config import settings
+from services import answer_cache_service as acs
+from services import search_service
+from services.monitoring import ANSWER_CACHE_REQUESTS_TOTAL, ANSWER_CACHE_SAVED_TOKENS_TOTAL
+
+
+def _chunk(idx: int):
+    return {
+        "id": idx,
+        "title": f"Doc {idx}",
+        "content_chunk": "x" * 300,
+        "answerability_score": 90.0,
+        "epistemic_level": "A",
+        "page_number": 1,
+        "score": 0.9,
+    }
+
+
+def _ctx(chunk_ids):
+    return {
+        "chunks": [_chunk(i) for i in chunk_ids],
+        "mode": "QUOTE",
+        "confidence": 0.8,
+        "keywords": ["hayat"],
+        "network_status": "IN_NETWORK",
+        "level_counts": {"A": 1, "B": 0},
+        "metadata": {"search_log_id": None},
+    }
+
+
+_FULL_ANSWER = "## Tanım\n\n" + "hayat bir yolculuktur. " * 20 + "\n\n## Bağlam\n\n" + "kaynaklar bunu söyler. " * 20
+
+
+def _llm_result(text=_FULL_ANSWER):
+    return SimpleNamespace(
+        text=text,
+        model_used="gemini-2.5-flash",
+        model_tier="flash",
+        provider_name="gemini",
+        fallback_applied=False,
+        secondary_fallback_applied=False,
+        fallback_reason=None,
+        usage_metadata={"total_token_count": 1200},
+    )
+
+
+def _counter(metric, **labels):
+    target = metric.labels(**labels) if labels else metric
+    return target._value.get()
+
+
+class AnswerCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._orig = {
+            key: getattr(settings, key)
+            for key in ("ANSWER_CACHE_ENABLED", "ANSWER_CACHE_EVENT_POLL_SEC", "ANSWER_CACHE_TTL_SEC")
+        }
+        settings.ANSWER_CACHE_ENABLED = True
+        settings.ANSWER_CACHE_EVENT_POLL_SEC = 30
+        settings.ANSWER_CACHE_TTL_SEC = 3600
+        acs.answer_cache.clear()
+        self.latest_event_id = 7
+        events = patch.object(
+            acs,
+            "fetch_change_events_since",
+            side_effect=lambda **_kw: ([], self.latest_event_id),
+        )
+        self.mock_events = events.start()
+        self.addCleanup(events.stop)
+
+    def tearDown(self):
+        for key, value in self._orig.items():
+            setattr(settings, key, value)
+        acs.answer_cache.clear()
+
+    def _ask(self, ctx, question="Hayat nedir?", **kwargs):
+        with patch.object(search_service, "is_analytic_word_count", return_value=False), \
+                patch.object(search_service, "get_rag_context", return_value=ctx), \
+                patch.object(search_service, "build_epistemic_context", return_value=("ctx", ctx["chunks"])) as build, \
+                patch.object(search_service, "get_prompt_for_mode", return_value="prompt"), \
+                patch.object(search_service, "get_model_for_tier", return_value="gemini-2.5-flash"), \
+                patch.object(search_service, "generate_text", return_value=_llm_result()) as generate:
+            answer, sources, meta = search_service.generate_answer(question, "u1", **kwargs)
+        return answer, sources, meta, generate.call_count, build.call_count
+
+    def test_repeated_question_is_served_without_llm_call(self):
+        hits_before = _counter(ANSWER_CACHE_REQUESTS_TOTAL, outcome="hit")
+        saved_before = _counter(ANSWER_CACHE_SAVED_TOKENS_TOTAL)
+
+        answer1, sources1, meta1, llm_calls1, _ = self._ask(_ctx([1, 2]))
+        answer2, sources2, meta2, llm_calls2, builds2 = self._ask(_ctx([1, 2]), question="  HAYAT   nedir? ")
+
+        self.assertEqual(llm_calls1, 1)
+        self.assertFalse(meta1["answer_cache_hit"])
+        self.assertEqual((llm_calls2, builds2), (0, 0))
+        self.assertEqual(answer2, answer1)
+        self.assertEqual(sources2, sources1)
+        self.assertTrue(meta2["answer_cache_hit"])
+        self.assertEqual(meta2["model_name"], "gemini-2.5-flash")
+        self.assertEqual(_counter(ANSWER_CACHE_REQUESTS_TOTAL, outcome="hit") - hits_before, 1)
+        self.assertEqual(_counter(ANSWER_CACHE_SAVED_TOKENS_TOTAL) - saved_before, 1200)
+
+    def test_different_context_or_scope_misses(self):
+        self._ask(_ctx([1, 2]))
+        self.assertEqual(self._ask(_ctx([2, 1]))[3], 1)
+        self.assertEqual(self._ask(_ctx([1, 2]), context_book_id="b9")[3], 1)
+        self.assertEqual(
+            self._ask(_ctx([1, 2]), chat_history=[{"role": "user", "content": "önceki soru"}])[3], 1
+        )
+
+    def test_library_change_in_this_worker_invalidates(self):
+        self._ask(_ctx([1, 2]))
+        acs.notify_content_changed("u1", "book-1")
+        self.latest_event_id = 8
+        self.assertEqual(self._ask(_ctx([1, 2]))[3], 1)
+        self.assertEqual(self._ask(_ctx([1, 2]))[3], 0)
+
+    def test_library_change_from_another_worker_invalidates_after_poll(self):
+        self._ask(_ctx([1, 2]))
+        self.latest_event_id = 9
+        self.assertEqual(self._ask(_ctx([1, 2]))[3], 0)  # within the poll window
+
+        settings.ANSWER_CACHE_EVENT_POLL_SEC = 0
+        self.assertEqual(self._ask(_ctx([1, 2]))[3], 1)
+
+    def test_answer_generated_across_a_library_change_is_not_stored(self):
+        cache = acs.AnswerCache()
+        version = cache.corpus_version("u1")
+        cache.notify_content_changed("u1")
+        cache.put("u1", "k", corpus_version=version, answer="a", sources=[], generation_meta={})
+        self.assertEqual(len(cache), 0)
+
+    def test_disabled_cache_never_reads_change_events(self):
+        settings.ANSWER_CACHE_ENABLED = False
+        _answer, _sources, meta, llm_calls, _ = self._ask(_ctx([1]))
+        self.assertEqual(llm_calls, 1)
+        self.assertNotIn("answer_cache_hit", meta)
+        self.mock_events.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from config import settings
+from infrastructure import async_db
+from infrastructure.async_db import Fetch, run_plan, run_plan_async
+
+
+def _plan(log):
+    rows = yield Fetch("SELECT A", {"p": 1})
+    log.append(("rows", rows))
+    try:
+        yield Fetch("SELECT BROKEN")
+    except RuntimeError as e:
+        log.append(("best_effort", str(e)))
+    row = yield Fetch("SELECT ONE", one=True)
+    return {"first": rows, "one": row}
+
+
+class _SyncCursor:
+    def __init__(self):
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, sql, binds=None):
+        self.executed.append(sql)
+        if "BROKEN" in sql:
+            raise RuntimeError("ORA-00942: table or view does not exist")
+
+    def fetchall(self):
+        return [(1,), (2,)]
+
+    def fetchone(self):
+        return (9,)
+
+
+class _SyncConnection:
+    def __init__(self):
+        self.cursor_obj = _SyncCursor()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def cursor(self):
+        return self.cursor_obj
+
+
+class _AsyncCursor(_SyncCursor):
+    async def execute(self, sql, binds=None):
+        _SyncCursor.execute(self, sql, binds)
+
+    async def fetchall(self):
+        return [(1,), (2,)]
+
+    async def fetchone(self):
+        return (9,)
+
+    def close(self):
+        pass
+
+
+class _AsyncConnection:
+    def __init__(self):
+        self.cursor_obj = _AsyncCursor()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    def cursor(self):
+        return self.cursor_obj
+
+
+class QueryPlanTests(unittest.TestCase):
+    def test_sync_driver_sends_rows_and_throws_step_errors_into_the_plan(self):
+        log = []
+        conn = _SyncConnection()
+        with patch.object(async_db.DatabaseManager, "get_read_connection", return_value=conn):
+            result = run_plan(_plan(log))
+
+        self.assertEqual(result, {"first": [(1,), (2,)], "one": (9,)})
+        self.assertEqual(log[1][0], "best_effort")
+        self.assertEqual(conn.cursor_obj.executed, ["SELECT A", "SELECT BROKEN", "SELECT ONE"])
+
+    def test_plan_without_steps_does_not_acquire_a_connection(self):
+        def empty():
+            return "nothing"
+            yield  # pragma: no cover
+
+        with patch.object(async_db.DatabaseManager, "get_read_connection") as mock_conn:
+            self.assertEqual(run_plan(empty()), "nothing")
+        mock_conn.assert_not_called()
+
+    def test_async_driver_runs_on_the_async_pool_without_threads(self):
+        log = []
+        conn = _AsyncConnection()
+        with patch.object(settings, "DB_ASYNC_ENABLED", True), patch.object(
+            async_db.DatabaseManager, "async_pool_ready", return_value=True
+        ), patch.object(
+            async_db.DatabaseManager, "acquire_async_read_connection", return_value=conn
+        ), patch.object(async_db, "run_in_bulkhead") as mock_bulkhead:
+            result = asyncio.run(run_plan_async(_plan(log)))
+
+        mock_bulkhead.assert_not_called()
+        self.assertEqual(result["one"], (9,))
+        self.assertEqual(log[1], ("best_effort", "ORA-00942: table or view does not exist"))
+
+    def test_async_driver_falls_back_to_bulkhead_when_disabled(self):
+        plan = _plan([])
+        with patch.object(settings, "DB_ASYNC_ENABLED", False), patch.object(
+            async_db, "run_in_bulkhead", new=AsyncMock(return_value={"ok": True})
+        ) as mock_bulkhead:
+            result = asyncio.run(run_plan_async(plan))
+
+        self.assertEqual(result, {"ok": True})
+        mock_bulkhead.assert_awaited_once_with(async_db.WORKLOAD_DB_LIGHT, run_plan, plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
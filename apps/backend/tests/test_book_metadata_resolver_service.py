@@ -5,7 +5,7 @@ from unittest.mock import patch
 def test_fetch_google_books_retries_without_key_after_403(monkeypatch):
     monkeypatch.setattr(resolver.settings, "GOOGLE_BOOKS_API_KEY", "blocked-key")
 
-    def fake_fetch(url, *, provider, cache_key, timeout_sec, max_attempts=3, headers=None):
+    def fake_fetch(url, *, provider, timeout_sec, max_attempts=3, headers=None):
         if "key=blocked-key" in url:
             return None, 403
         return (
@@ -211,12 +211,11 @@ def test_map_openlibrary_bib_transliterates_cyrillic_author_in_latin_context():
 
 
 @patch("services.book_metadata_resolver_service.logger.warning")
-@patch("services.book_metadata_resolver_service.urllib_request.urlopen", side_effect=RuntimeError("boom"))
-def test_fetch_json_with_retry_logs_unexpected_failure(_mock_urlopen, mock_warning):
+@patch("services.book_metadata_resolver_service.http_client.request", side_effect=RuntimeError("boom"))
+def test_fetch_json_with_retry_logs_unexpected_failure(_mock_request, mock_warning):
     result = resolver._fetch_json_with_retry(
         "https://example.com/books",
         provider="google-books",
-        cache_key="cache-key",
         timeout_sec=0.01,
         max_attempts=1,
     )
@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+
+from config import settings
+from services import bulkhead_service
+
+
+class BulkheadServiceTests(unittest.TestCase):
+    def test_full_bulkhead_sheds_with_retry_after(self):
+        bulkhead = bulkhead_service.Bulkhead("test", max_workers=1, max_queue=0)
+        release = threading.Event()
+
+        async def scenario():
+            busy = asyncio.ensure_future(bulkhead.run(release.wait))
+            await asyncio.sleep(0.05)
+            try:
+                with self.assertRaises(bulkhead_service.BulkheadFullError) as ctx:
+                    await bulkhead.run(lambda: "never")
+            finally:
+                release.set()
+                await busy
+            return ctx.exception
+
+        error = asyncio.run(scenario())
+        self.assertEqual(error.status_code, 503)
+        self.assertIn("Retry-After", error.headers)
+        bulkhead.executor.shutdown(wait=True)
+
+    def test_unshed_calls_wait_for_a_worker(self):
+        bulkhead = bulkhead_service.Bulkhead("test", max_workers=1, max_queue=0)
+        release = threading.Event()
+
+        async def scenario():
+            busy = asyncio.ensure_future(bulkhead.run(release.wait))
+            await asyncio.sleep(0.05)
+            waiting = asyncio.ensure_future(bulkhead.run(lambda: "done", shed=False))
+            await asyncio.sleep(0.05)
+            release.set()
+            await busy
+            return await waiting
+
+        self.assertEqual(asyncio.run(scenario()), "done")
+        # The slot taken by the first call is returned once it finishes.
+        self.assertEqual(asyncio.run(bulkhead.run(lambda: 1)), 1)
+        bulkhead.executor.shutdown(wait=True)
+
+    def test_disabled_bulkheads_use_default_executor(self):
+        with patch.object(settings, "BULKHEAD_ENABLED", False), patch.object(
+            bulkhead_service, "get_bulkhead"
+        ) as mock_get:
+            result = asyncio.run(
+                bulkhead_service.run_in_bulkhead(bulkhead_service.WORKLOAD_LLM, lambda a, b=0: a + b, 2, b=3)
+            )
+
+        self.assertEqual(result, 5)
+        mock_get.assert_not_called()
+
+    def test_unknown_workload_is_rejected(self):
+        with self.assertRaises(ValueError):
+            bulkhead_service.get_bulkhead("gpu")
+
+
+if __name__ == "__main__":
+    unittest.main()
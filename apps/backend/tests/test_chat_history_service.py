@@ -0,0 +1,161 @@
+import json
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from config import settings
+from services import chat_history_service
+
+
+def _messages(n=4):
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"mesaj {i}", "citations": []}
+        for i in range(n)
+    ]
+
+
+class _RecordingConnection:
+    def __init__(self):
+        self.cursor_obj = MagicMock()
+        self.cursor_obj.__enter__.return_value = self.cursor_obj
+        self.commits = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def cursor(self):
+        return self.cursor_obj
+
+    def commit(self):
+        self.commits += 1
+
+
+class SessionMaintenanceTests(unittest.TestCase):
+    def _run(self, llm_result, title_row=("New Chat", False)):
+        conn = _RecordingConnection()
+        session = {
+            "summary": "",
+            "conversation_state_json": json.dumps({"active_topic": "", "turn_count": 0}),
+            "title": title_row[0],
+            "title_locked": title_row[1],
+            "messages": _messages(),
+        }
+        with patch.object(chat_history_service, "run_plan", return_value=session), patch.object(
+            chat_history_service, "write_behind_enabled", return_value=False
+        ), patch.object(
+            chat_history_service, "_conversation_state_column_available", return_value=True
+        ), patch.object(
+            chat_history_service, "get_model_for_tier", return_value="m"
+        ), patch.object(
+            chat_history_service, "generate_text", **llm_result
+        ) as mock_llm, patch.object(
+            chat_history_service.DatabaseManager, "get_write_connection", return_value=conn
+        ), patch.object(chat_history_service, "update_hot_context"):
+            chat_history_service.run_session_maintenance(11)
+        return mock_llm, conn
+
+    def test_one_llm_call_and_one_update_for_state_title_and_tags(self):
+        payload = {
+            "state": {"active_topic": "Stoacılık", "assumptions": [], "open_questions": [], "established_facts": []},
+            "title": "Stoacı etik üzerine",
+            "tags": ["#Felsefe", "Etik"],
+        }
+        mock_llm, conn = self._run({"return_value": SimpleNamespace(text=json.dumps(payload))})
+
+        mock_llm.assert_called_once()
+        conn.cursor_obj.execute.assert_called_once()
+        sql, params = conn.cursor_obj.execute.call_args.args
+        for column in ("RUNNING_SUMMARY", "CONVERSATION_STATE_JSON", "TITLE =", "TITLE_LOCKED = 1", "TAGS"):
+            self.assertIn(column, sql)
+        self.assertEqual(params["p_title"], "Stoacı etik üzerine")
+        self.assertEqual(json.loads(params["p_tags"]), ["Felsefe", "Etik"])
+        self.assertEqual(json.loads(params["p_state"])["turn_count"], 2)
+        self.assertEqual(conn.commits, 1)
+
+    def test_llm_failure_still_writes_fallback_title(self):
+        _, conn = self._run({"side_effect": RuntimeError("quota")})
+
+        sql, params = conn.cursor_obj.execute.call_args.args
+        self.assertNotIn("RUNNING_SUMMARY", sql)
+        self.assertEqual(params["p_title"], "mesaj 0")
+
+    def test_custom_title_is_locked_without_regeneration(self):
+        payload = {"state": {}, "title": "ignored", "tags": []}
+        _, conn = self._run(
+            {"return_value": SimpleNamespace(text=json.dumps(payload))}, title_row=("Kendi başlığım", False)
+        )
+
+        sql, params = conn.cursor_obj.execute.call_args.args
+        self.assertIn("TITLE_LOCKED = 1", sql)
+        self.assertNotIn("p_title", params)
+
+
+    def test_unparseable_response_is_kept_as_raw_summary(self):
+        _, conn = self._run({"return_value": SimpleNamespace(text="Konu: Stoacı etik")})
+
+        sql, params = conn.cursor_obj.execute.call_args.args
+        self.assertIn("RUNNING_SUMMARY", sql)
+        self.assertNotIn("CONVERSATION_STATE_JSON", sql)
+        self.assertEqual(params["p_summary"], "Konu: Stoacı etik")
+
+    def test_session_row_and_history_come_from_one_plan(self):
+        plan = chat_history_service._maintenance_plan(11, 20)
+        with patch.object(chat_history_service, "_conversation_state_column_available", return_value=True):
+            first = next(plan)
+        self.assertIn("TITLE_LOCKED", first.sql)
+        self.assertIn("CONVERSATION_STATE_JSON", first.sql)
+
+        second = plan.send(("ozet", "Başlık", 1, '{"turn_count": 3}'))
+        self.assertIn("TOMEHUB_CHAT_MESSAGES", second.sql)
+        with self.assertRaises(StopIteration) as stop:
+            plan.send([])
+        session = stop.exception.value
+        self.assertEqual(session["title"], "Başlık")
+        self.assertTrue(session["title_locked"])
+        self.assertEqual(chat_history_service._conversation_state_from(session)["turn_count"], 3)
+
+
+class MaintenanceDebounceTests(unittest.TestCase):
+    def test_rapid_turns_coalesce_into_one_run(self):
+        done = threading.Event()
+        calls = []
+
+        def job(session_id):
+            calls.append(session_id)
+            done.set()
+
+        debouncer = chat_history_service._SessionMaintenanceDebouncer(job)
+        with patch.object(settings, "CHAT_MAINTENANCE_DEBOUNCE_SEC", 0.1):
+            for _ in range(3):
+                debouncer.schedule(5)
+            self.assertEqual(list(debouncer.pending()), [5])
+            self.assertTrue(done.wait(timeout=3.0))
+
+        self.assertEqual(calls, [5])
+
+    def test_zero_delay_runs_inline(self):
+        job = MagicMock()
+        debouncer = chat_history_service._SessionMaintenanceDebouncer(job)
+        with patch.object(settings, "CHAT_MAINTENANCE_DEBOUNCE_SEC", 0):
+            debouncer.schedule(6)
+        job.assert_called_once_with(6)
+
+    def test_drain_runs_pending_sessions_before_their_window(self):
+        calls = []
+        debouncer = chat_history_service._SessionMaintenanceDebouncer(calls.append)
+        with patch.object(settings, "CHAT_MAINTENANCE_DEBOUNCE_SEC", 60):
+            debouncer.schedule(7)
+            debouncer.schedule(8)
+            self.assertEqual(debouncer.drain(timeout=3.0), 2)
+            debouncer.schedule(9)
+
+        self.assertEqual(sorted(calls), [7, 8, 9])
+        self.assertEqual(debouncer.pending(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,285 @@
+import unittest
+from unittest.mock import patch
+
+import oracledb
+
+from config import settings
+from services import chat_history_service
+from services import chat_session_cache_service as hot
+
+
+class _FakeCursor:
+    def __init__(self, fail_batches=0):
+        self.fail_batches = fail_batches
+        self.executemany_calls = []
+        self.input_sizes = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def setinputsizes(self, **sizes):
+        self.input_sizes.update(sizes)
+
+    def close(self):
+        pass
+
+    def executemany(self, sql, params):
+        if "INSERT" in sql and self.fail_batches and len(params) > 1:
+            self.fail_batches -= 1
+            raise RuntimeError("ORA-03113: end-of-file on communication channel")
+        self.executemany_calls.append((sql, list(params)))
+
+
+class _FakeConnection:
+    def __init__(self, cursor):
+        self.cursor_obj = cursor
+        self.commits = 0
+        self.rollbacks = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def cursor(self):
+        return self.cursor_obj
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class _FakeRedis:
+    """Just enough of redis-py for WATCH/MULTI: EXEC fails if the key changed after WATCH."""
+
+    def __init__(self):
+        self.data = {}
+        self.versions = {}
+        self.before_exec = None
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, _ttl, value):
+        self.data[key] = value.encode("utf-8") if isinstance(value, str) else value
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    def delete(self, key):
+        self.data.pop(key, None)
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    def pipeline(self):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.watched = {}
+        self.queued = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def watch(self, key):
+        self.watched[key] = self.client.versions.get(key, 0)
+
+    def unwatch(self):
+        self.watched = {}
+
+    def get(self, key):
+        return self.client.get(key)
+
+    def multi(self):
+        pass
+
+    def setex(self, key, ttl, value):
+        self.queued.append((key, ttl, value))
+
+    def execute(self):
+        hook, self.client.before_exec = self.client.before_exec, None
+        if hook:
+            hook()
+        if any(self.client.versions.get(k, 0) != v for k, v in self.watched.items()):
+            raise hot.WatchError("watched key changed")
+        for key, ttl, value in self.queued:
+            self.client.setex(key, ttl, value)
+
+
+class RedisHotContextTests(unittest.TestCase):
+    def setUp(self):
+        self.redis = _FakeRedis()
+        self._patches = [
+            patch.object(settings, "CHAT_HOT_CONTEXT_ENABLED", True),
+            patch.object(hot, "_redis", return_value=self.redis),
+        ]
+        for p in self._patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self._patches:
+            p.stop()
+
+    def test_concurrent_append_survives_summary_write(self):
+        hot.put_hot_context(5, {"summary": "", "messages": [{"role": "user", "content": "q1"}], "complete": True})
+        # The request path appends a message while the maintenance job is between GET and EXEC.
+        self.redis.before_exec = lambda: hot.update_hot_context(5, message={"role": "assistant", "content": "a1"})
+
+        self.assertTrue(hot.update_hot_context(5, summary="özet"))
+
+        ctx = hot.get_hot_context(5)
+        self.assertEqual(ctx["summary"], "özet")
+        self.assertEqual([m["content"] for m in ctx["messages"]], ["q1", "a1"])
+
+    def test_missing_context_is_not_created(self):
+        self.assertFalse(hot.update_hot_context(6, message={"role": "user", "content": "q"}))
+        self.assertNotIn(hot._key(6), self.redis.data)
+
+
+class HotContextTests(unittest.TestCase):
+    def setUp(self):
+        self._patches = [
+            patch.object(settings, "CHAT_HOT_CONTEXT_ENABLED", True),
+            patch.object(settings, "CHAT_HOT_CONTEXT_LOCAL_FALLBACK", True),
+            patch.object(settings, "CHAT_WRITE_BEHIND_ENABLED", True),
+            patch.object(settings, "CHAT_CONTEXT_LIMIT", 2),
+            patch.object(settings, "CHAT_SUMMARY_LIMIT", 3),
+            patch.object(hot, "get_cache", return_value=None),
+        ]
+        for p in self._patches:
+            p.start()
+        hot._local_store.clear()
+
+    def tearDown(self):
+        for p in self._patches:
+            p.stop()
+        hot._local_store.clear()
+
+    def test_turn_is_served_and_recorded_without_db(self):
+        hot.put_hot_context(7, {"summary": "s", "conversation_state_json": "{}", "messages": [], "complete": True})
+        with patch.object(chat_history_service.DatabaseManager, "get_read_connection") as mock_read, patch.object(
+            chat_history_service.DatabaseManager, "get_write_connection"
+        ) as mock_write, patch.object(chat_history_service.chat_write_behind, "enqueue") as mock_enqueue:
+            chat_history_service.add_message(7, "user", "q1")
+            chat_history_service.add_message(7, "assistant", "a1", [{"id": 1}])
+            chat_history_service.add_message(7, "user", "q2")
+            ctx = chat_history_service.get_session_context(7)
+            history = chat_history_service.get_session_history(7, limit=10)
+
+        mock_read.assert_not_called()
+        mock_write.assert_not_called()
+        self.assertEqual(mock_enqueue.call_count, 3)
+        self.assertEqual(ctx["summary"], "s")
+        self.assertEqual([m["content"] for m in ctx["recent_messages"]], ["a1", "q2"])
+        # The window is large enough for summary extraction and the session is known to be complete.
+        self.assertEqual([m["content"] for m in history], ["q1", "a1", "q2"])
+
+    def test_window_trims_and_marks_history_incomplete(self):
+        hot.put_hot_context(
+            8,
+            {"messages": [{"role": "user", "content": str(i)} for i in range(5)], "complete": True},
+        )
+        ctx = hot.get_hot_context(8)
+        self.assertEqual([m["content"] for m in ctx["messages"]], ["2", "3", "4"])
+        self.assertFalse(ctx["complete"])
+
+    def test_update_without_cached_context_is_a_no_op(self):
+        self.assertFalse(hot.update_hot_context(9, summary="x"))
+        self.assertIsNone(hot.get_hot_context(9))
+
+
+class WriteBehindTests(unittest.TestCase):
+    def setUp(self):
+        self._patches = [
+            patch.object(settings, "CHAT_WRITE_BEHIND_BATCH_SIZE", 50),
+            patch.object(settings, "CHAT_WRITE_BEHIND_MAX_ATTEMPTS", 2),
+        ]
+        for p in self._patches:
+            p.start()
+        self.batcher = hot.ChatWriteBehind()
+
+    def tearDown(self):
+        for p in self._patches:
+            p.stop()
+
+    def _enqueue(self, *rows):
+        with patch.object(self.batcher, "_ensure_worker"):
+            for row in rows:
+                self.batcher.enqueue(*row)
+
+    def test_flush_batches_inserts_and_touches_each_session_once(self):
+        self._enqueue((1, "user", "q", "[]"), (1, "assistant", "a", "[]"), (2, "user", "x", "[]"))
+        cursor = _FakeCursor()
+        conn = _FakeConnection(cursor)
+        with patch.object(hot.DatabaseManager, "get_write_connection", return_value=conn):
+            self.assertEqual(self.batcher.flush(), 3)
+
+        (insert_sql, insert_params), (touch_sql, touch_params) = cursor.executemany_calls
+        self.assertIn("NUMTODSINTERVAL(:p_seq", insert_sql)
+        self.assertEqual([p["p_seq"] for p in insert_params], [0, 1, 2])
+        self.assertEqual(touch_params, [{"p_sid": 1}, {"p_sid": 2}])
+        self.assertEqual(cursor.input_sizes, {"p_content": oracledb.DB_TYPE_LONG})
+        self.assertEqual(conn.commits, 1)
+        self.assertEqual(self.batcher.pending_count(), 0)
+
+    def test_failed_batch_falls_back_to_rows(self):
+        self._enqueue((1, "user", "q", "[]"), (1, "assistant", "a", "[]"))
+        cursor = _FakeCursor(fail_batches=1)
+        conn = _FakeConnection(cursor)
+        with patch.object(hot.DatabaseManager, "get_write_connection", return_value=conn):
+            self.assertEqual(self.batcher.flush(), 2)
+
+        self.assertEqual(conn.rollbacks, 1)
+        self.assertEqual(self.batcher.pending_count(), 0)
+
+    def test_failed_row_holds_back_the_rows_behind_it(self):
+        self._enqueue((1, "user", "q", "[]"), (1, "assistant", "a", "[]"), (2, "user", "x", "[]"))
+        persisted = []
+        outcomes = [RuntimeError("batch failed"), RuntimeError("ORA-03113"), None, None, None]
+
+        def _write(rows):
+            outcome = outcomes.pop(0)
+            if outcome is not None:
+                raise outcome
+            persisted.extend(row.content for row in rows)
+
+        with patch.object(hot, "_write_rows", side_effect=_write):
+            self.assertEqual(self.batcher.flush(), 0)
+            self.assertEqual(self.batcher.pending_count(), 3)
+            self.assertEqual(self.batcher.flush(ignore_backoff=False), 0)
+            self.assertEqual(self.batcher.flush(), 3)
+
+        self.assertEqual(persisted, ["q", "a", "x"])
+        self.assertEqual(self.batcher.pending_count(), 0)
+
+    def test_rows_are_requeued_then_dropped_after_max_attempts(self):
+        self._enqueue((1, "user", "q", "[]"))
+        with patch.object(hot, "_write_rows", side_effect=RuntimeError("db down")):
+            self.assertEqual(self.batcher.flush(), 0)
+            self.assertEqual(self.batcher.pending_count(), 1)
+            # Backoff holds the row for the background worker...
+            self.assertEqual(self.batcher.flush(ignore_backoff=False), 0)
+            self.assertEqual(self.batcher.pending_count(), 1)
+            # ...while an explicit flush retries it and drops it at the attempt cap.
+            self.batcher.flush()
+        self.assertEqual(self.batcher.pending_count(), 0)
+
+    def test_stop_drains_queue(self):
+        self._enqueue((3, "user", "q", "[]"))
+        with patch.object(hot, "_write_rows") as mock_write:
+            self.batcher.stop(timeout=1.0)
+        mock_write.assert_called_once()
+        self.assertEqual(self.batcher.pending_count(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,8 @@
-from services.correction_service import LinguisticCorrectionService
+import random
+from unittest.mock import patch
+
+from services.correction_service import LinguisticCorrectionService, delta_ratio
+from utils.symspell_index import SymSpellIndex
 
 
 def test_correction_service_applies_targeted_fix():
@@ -12,3 +16,44 @@ def test_correction_service_rejects_high_delta_rewrite():
     original = "~ ~ ~ ~ ~ ~ ~ ~ ~ ~"
     repaired = service.fix_text(original)
     assert repaired == original
+
+
+def test_word_repair_is_off_without_a_dictionary():
+    service = LinguisticCorrectionService()
+    assert service.fix_text("Kultur ve toplnm.") == "Kultur ve toplnm."
+
+
+def test_delta_ratio_tracks_small_edits_on_long_pages():
+    original = "Toplum ve kultur uzerine bir deneme. " * 400
+    candidate = original.replace("kultur", "kültür", 3)
+    assert 0.0 < delta_ratio(original, candidate) < 0.01
+    assert delta_ratio(original, original) == 0.0
+    assert delta_ratio("abc", "") == 1.0
+
+
+def _long_page(words=300, seed=3):
+    rng = random.Random(seed)
+    vocab = ["toplum", "kultur", "felsefe", "insan", "hayat", "anlam", "zaman", "bilgi", "ahlak", "adalet"]
+    return " ".join(rng.choice(vocab) for _ in range(words))
+
+
+def test_delta_ratio_scores_reordered_text_as_a_large_change():
+    page = _long_page()
+    words = page.split()
+    rng = random.Random(5)
+    half = rng.sample(range(len(words)), len(words) // 2)
+    shuffled = [words[i] for i in half]
+    rng.shuffle(shuffled)
+    for i, word in zip(half, shuffled):
+        words[i] = word
+    assert delta_ratio(page[:200], page[:200][::-1]) > 0.5
+    assert delta_ratio(page, " ".join(words)) > LinguisticCorrectionService.MAX_DELTA_RATIO
+    assert delta_ratio(page, " ".join(words), score_cutoff=0.22) == 1.0
+
+
+def test_correction_service_rejects_scrambled_rewrite_of_long_page():
+    service = LinguisticCorrectionService(dictionary=SymSpellIndex(max_edit_distance=1))
+    service.dictionary.add("toplum")
+    page = _long_page()
+    with patch.object(service, "_repair_word", side_effect=lambda m: m.group(0)[::-1]):
+        assert service.fix_text(page) == page
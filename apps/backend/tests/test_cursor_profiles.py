@@ -0,0 +1,106 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import oracledb
+
+from config import settings
+from infrastructure import cursor_profiles
+from infrastructure.cursor_profiles import (
+    QUERY_CLASS_BULK_EXPORT,
+    QUERY_CLASS_BULK_INSERT,
+    QUERY_CLASS_CANDIDATE_SCAN,
+    QUERY_CLASS_POINT_LOOKUP,
+    profiled_cursor,
+)
+
+
+def _connection(rows=()):
+    raw = MagicMock()
+    raw.fetchall.return_value = list(rows)
+    conn = MagicMock()
+    conn.cursor.return_value = raw
+    return conn, raw
+
+
+_PROFILES = {
+    "point_lookup": {"arraysize": 10, "prefetchrows": 2},
+    "candidate_scan": {"arraysize": 100, "prefetchrows": 101},
+    "bulk_export": {"arraysize": 1000, "prefetchrows": 1001, "cache_statement": False},
+    "bulk_insert": {"arraysize": 100, "prefetchrows": 2},
+}
+
+
+class CursorProfileTests(unittest.TestCase):
+    def setUp(self):
+        self._patches = [
+            patch.object(settings, "DB_CURSOR_PROFILES_ENABLED", True),
+            patch.object(settings, "DB_CURSOR_PROFILES", _PROFILES),
+        ]
+        for p in self._patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self._patches:
+            p.stop()
+
+    def test_class_sets_fetch_sizing_before_execute(self):
+        conn, raw = _connection()
+        with profiled_cursor(conn, QUERY_CLASS_CANDIDATE_SCAN) as cursor:
+            cursor.execute("SELECT 1 FROM DUAL", {"p_uid": "u"})
+        self.assertEqual((raw.arraysize, raw.prefetchrows), (100, 101))
+        raw.execute.assert_called_once_with("SELECT 1 FROM DUAL", {"p_uid": "u"})
+        raw.prepare.assert_not_called()
+        raw.close.assert_called_once()
+
+    def test_bulk_export_bypasses_statement_cache(self):
+        conn, raw = _connection()
+        with profiled_cursor(conn, QUERY_CLASS_BULK_EXPORT) as cursor:
+            cursor.execute("SELECT * FROM T", {})
+        raw.prepare.assert_called_once_with("SELECT * FROM T", cache_statement=False)
+        raw.execute.assert_called_once_with(None, {})
+
+    def test_long_and_vector_binds_get_input_sizes_when_bound(self):
+        conn, raw = _connection()
+        with profiled_cursor(conn, QUERY_CLASS_BULK_INSERT, long_binds=("p_content", "p_unused")) as cursor:
+            cursor.executemany("INSERT", [{"p_content": "x" * 40000, "p_sid": 1}])
+        raw.setinputsizes.assert_called_once_with(p_content=oracledb.DB_TYPE_LONG)
+
+        conn, raw = _connection()
+        with profiled_cursor(conn, QUERY_CLASS_CANDIDATE_SCAN, vector_binds=("vec",)) as cursor:
+            cursor.execute("SELECT", {"vec": [0.1], "p_uid": "u"})
+        raw.setinputsizes.assert_called_once_with(vec=oracledb.DB_TYPE_VECTOR)
+
+    def test_round_trips_and_bytes_are_exported_per_class(self):
+        rows = [(i, "abcd") for i in range(250)]
+        conn, _ = _connection(rows)
+        with patch.object(cursor_profiles, "DB_CURSOR_ROUND_TRIPS_TOTAL") as trips, patch.object(
+            cursor_profiles, "DB_CURSOR_BYTES_FETCHED_TOTAL"
+        ) as fetched, patch.object(cursor_profiles, "DB_CURSOR_ROWS_TOTAL") as counted:
+            with profiled_cursor(conn, QUERY_CLASS_CANDIDATE_SCAN) as cursor:
+                cursor.execute("SELECT", {})
+                self.assertEqual(len(cursor.fetchall()), 250)
+
+        # execute + 101 prefetched rows, then two fetches of up to 100 rows
+        trips.labels.assert_called_with(query_class="candidate_scan")
+        trips.labels.return_value.inc.assert_called_once_with(3)
+        fetched.labels.return_value.inc.assert_called_once_with(1000)
+        counted.labels.return_value.inc.assert_called_once_with(250)
+
+    def test_point_lookup_single_row_is_one_round_trip(self):
+        conn, raw = _connection()
+        raw.fetchone.return_value = (7,)
+        with profiled_cursor(conn, QUERY_CLASS_POINT_LOOKUP) as cursor:
+            cursor.execute("SELECT", {})
+            self.assertEqual(cursor.fetchone(), (7,))
+            self.assertEqual(cursor.round_trips, 1)
+
+    def test_disabled_yields_plain_cursor(self):
+        conn, raw = _connection()
+        raw.__enter__.return_value = raw
+        with patch.object(settings, "DB_CURSOR_PROFILES_ENABLED", False):
+            with profiled_cursor(conn, QUERY_CLASS_CANDIDATE_SCAN) as cursor:
+                self.assertIs(cursor, raw)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import array
+import unittest
+from unittest.mock import patch
+
+from config import settings
+from services import embedding_service
+
+
+class EmbeddingMemoTests(unittest.TestCase):
+    def setUp(self):
+        embedding_service._memo.clear()
+
+    def tearDown(self):
+        embedding_service._memo.clear()
+
+    def test_retrieval_embedding_is_reused_and_misses_share_one_batch(self):
+        with patch.object(
+            embedding_service, "_call_embedding_api", return_value=[0.1, 0.2]
+        ) as mock_single:
+            embedding_service.get_embedding("soru")
+        mock_single.assert_called_once()
+
+        with patch.object(
+            embedding_service, "batch_get_embeddings", return_value=[array.array("f", [0.3, 0.4])]
+        ) as mock_batch:
+            q_emb, a_emb = embedding_service.get_embeddings_memoized(["soru", "cevap"])
+            again = embedding_service.get_embeddings_memoized(["cevap"])
+
+        mock_batch.assert_called_once_with(["cevap"], task_type="retrieval_document")
+        self.assertAlmostEqual(q_emb[0], 0.1, places=5)
+        self.assertAlmostEqual(a_emb[0], 0.3, places=5)
+        self.assertEqual(list(again[0]), list(a_emb))
+
+    def test_memo_is_per_task_type_and_bounded(self):
+        with patch.object(settings, "EMBEDDING_MEMO_SIZE", 2), patch.object(
+            embedding_service, "_call_embedding_api", return_value=[1.0]
+        ) as mock_api:
+            embedding_service.get_embedding("a")
+            embedding_service.get_query_embedding("a")
+            embedding_service.get_embedding("b")
+            embedding_service.get_embedding("a")
+
+        self.assertEqual(mock_api.call_count, 4)
+        self.assertEqual(len(embedding_service._memo), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import time
 import unittest
 from unittest.mock import patch
 
@@ -5,6 +6,28 @@ from config import settings
 from services import external_kb_service
 
 
+class _GraphCursor:
+    def __init__(self, ids):
+        self.ids = ids
+        self.executemany_calls = []
+        self.execute_calls = []
+
+    def setinputsizes(self, **_kwargs):
+        return None
+
+    def executemany(self, sql, rows, **kwargs):
+        self.executemany_calls.append((str(sql), list(rows), kwargs))
+
+    def getbatcherrors(self):
+        return []
+
+    def execute(self, sql, params=None):
+        self.execute_calls.append((str(sql), params))
+
+    def fetchall(self):
+        return [(provider, ext_id, eid) for (provider, ext_id), eid in self.ids.items()]
+
+
 class ExternalKBServiceTests(unittest.TestCase):
     def setUp(self):
         self._saved = {
@@ -13,6 +36,9 @@ class ExternalKBServiceTests(unittest.TestCase):
             "EXTERNAL_KB_HTTP_MAX_RETRY": settings.EXTERNAL_KB_HTTP_MAX_RETRY,
             "OPENALEX_API_KEY": getattr(settings, "OPENALEX_API_KEY", ""),
             "OPENALEX_EMAIL": getattr(settings, "OPENALEX_EMAIL", ""),
+            "EXTERNAL_KB_DOMAIN_DEADLINE_MS": settings.EXTERNAL_KB_DOMAIN_DEADLINE_MS,
+            "EXTERNAL_KB_DOMAIN_PROVIDER_BUDGET_MS": settings.EXTERNAL_KB_DOMAIN_PROVIDER_BUDGET_MS,
+            "EXTERNAL_KB_DOMAIN_EARLY_RETURN_MIN_SCORE": settings.EXTERNAL_KB_DOMAIN_EARLY_RETURN_MIN_SCORE,
         }
 
     def tearDown(self):
@@ -118,7 +144,7 @@ class ExternalKBServiceTests(unittest.TestCase):
         self.assertEqual(kwargs.get("headers", {}).get("Authorization"), "Bearer test-key")
 
     @patch("services.external_kb_service.logger.warning")
-    @patch("services.external_kb_service.urllib_request.urlopen", side_effect=RuntimeError("boom"))
+    @patch("services.external_kb_service.http_client.request", side_effect=RuntimeError("boom"))
     def test_http_get_json_logs_unexpected_failure(self, _mock_urlopen, mock_warning):
         settings.EXTERNAL_KB_HTTP_MAX_RETRY = 0
 
@@ -141,6 +167,94 @@ class ExternalKBServiceTests(unittest.TestCase):
 
         self.assertEqual([row["provider"] for row in out], ["OPENALEX", "SEMANTIC_SCHOLAR", "ARXIV", "SHARE"])
 
+    def test_bulk_graph_upsert_uses_constant_round_trips(self):
+        cursor = _GraphCursor({("WIKIDATA", "Q1"): 11, ("WIKIDATA", "Q2"): 12, ("WIKIDATA", "Q3"): 13})
+        norm = {
+            "entities": [
+                {"provider": "WIKIDATA", "external_id": "Q1", "entity_type": "BOOK", "label": "Book"},
+                {"provider": "wikidata", "external_id": "Q2", "entity_type": "author", "label": "Author"},
+                {"provider": "WIKIDATA", "external_id": "Q3", "entity_type": "TOPIC", "label": "Topic"},
+                {"provider": "WIKIDATA", "external_id": "", "entity_type": "TOPIC", "label": "Broken"},
+            ],
+            "edges": [
+                {"sp": "WIKIDATA", "sid": "Q1", "dp": "WIKIDATA", "did": "Q2", "rel": "AUTHORED_BY", "weight": 0.9, "provider": "WIKIDATA"},
+                {"sp": "WIKIDATA", "sid": "Q1", "dp": "WIKIDATA", "did": "Q3", "rel": "has_topic", "weight": 0.6, "provider": "WIKIDATA"},
+                {"sp": "WIKIDATA", "sid": "Q1", "dp": "OPENALEX", "did": "W9", "rel": "SAME_AS", "provider": "WIKIDATA"},
+            ],
+        }
+
+        entity_upserts, edge_upserts = external_kb_service._upsert_graph_bulk(cursor, [norm], "book-1", "uid-1")
+
+        self.assertEqual((entity_upserts, edge_upserts), (3, 2))
+        self.assertEqual(len(cursor.executemany_calls), 2)
+        self.assertEqual(len(cursor.execute_calls), 1)
+        entity_sql, entity_rows, entity_kwargs = cursor.executemany_calls[0]
+        self.assertIn("MERGE INTO TOMEHUB_EXTERNAL_ENTITIES", entity_sql)
+        self.assertTrue(entity_kwargs.get("batcherrors"))
+        self.assertEqual([row["p_ext"] for row in entity_rows], ["Q1", "Q2", "Q3"])
+        self.assertEqual(entity_rows[1]["p_type"], "AUTHOR")
+        edge_sql, edge_rows, _ = cursor.executemany_calls[1]
+        self.assertIn("MERGE INTO TOMEHUB_EXTERNAL_EDGES", edge_sql)
+        self.assertEqual([(row["p_src"], row["p_dst"], row["p_rel"]) for row in edge_rows], [(11, 12, "AUTHORED_BY"), (11, 13, "HAS_TOPIC")])
+        self.assertEqual(edge_rows[0]["p_book"], "book-1")
+
+    def test_domain_external_candidates_drop_providers_past_deadline(self):
+        settings.EXTERNAL_KB_DOMAIN_DEADLINE_MS = 200
+
+        def _slow(*_args, **_kwargs):
+            time.sleep(1.0)
+            return [{"provider": "CROSSREF", "title": "Late", "score": 0.9}]
+
+        started = time.monotonic()
+        with patch("services.external_kb_service._search_openalex_direct", return_value=[{"provider": "OPENALEX", "title": "Fast", "score": 0.7}]), \
+             patch("services.external_kb_service._search_crossref_direct", side_effect=_slow), \
+             patch("services.external_kb_service._search_semantic_scholar_direct", side_effect=RuntimeError("down")):
+            out = external_kb_service.get_domain_external_candidates(
+                "paper",
+                "ACADEMIC",
+                limit=3,
+                active_providers=["OPENALEX", "CROSSREF", "SEMANTIC_SCHOLAR"],
+            )
+
+        self.assertLess(time.monotonic() - started, 0.9)
+        self.assertEqual([row["provider"] for row in out], ["OPENALEX"])
+
+    def test_domain_external_candidates_return_early_on_enough_strong_rows(self):
+        settings.EXTERNAL_KB_DOMAIN_EARLY_RETURN_MIN_SCORE = 0.65
+
+        def _slow(*_args, **_kwargs):
+            time.sleep(1.0)
+            return []
+
+        started = time.monotonic()
+        with patch(
+            "services.external_kb_service._search_openalex_direct",
+            return_value=[
+                {"provider": "OPENALEX", "title": "A", "score": 0.8},
+                {"provider": "OPENALEX", "title": "B", "score": 0.7},
+            ],
+        ), patch("services.external_kb_service._search_arxiv_direct", side_effect=_slow):
+            out = external_kb_service.get_domain_external_candidates(
+                "paper",
+                "ACADEMIC",
+                limit=2,
+                active_providers=["OPENALEX", "ARXIV"],
+            )
+
+        self.assertLess(time.monotonic() - started, 0.9)
+        self.assertEqual([row["title"] for row in out], ["A", "B"])
+
+    def test_http_get_json_skips_request_once_provider_budget_is_spent(self):
+        external_kb_service._PROVIDER_DEADLINE.value = time.monotonic() - 1.0
+        try:
+            with patch("services.external_kb_service.http_client.request") as mock_request:
+                result = external_kb_service._http_get_json("https://example.com/test", timeout_sec=3.0)
+        finally:
+            external_kb_service._PROVIDER_DEADLINE.value = None
+
+        self.assertIsNone(result)
+        mock_request.assert_not_called()
+
     @patch("services.external_kb_service._search_poetrydb_direct", return_value=[{"provider": "POETRYDB", "title": "Poem", "score": 0.61}])
     @patch("services.external_kb_service._search_artic_direct", return_value=[{"provider": "ART_SEARCH_API", "title": "Artwork", "score": 0.62}])
     @patch("services.external_kb_service._search_internet_archive_direct", return_value=[{"provider": "INTERNET_ARCHIVE", "title": "Archive", "score": 0.58}])
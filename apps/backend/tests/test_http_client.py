@@ -0,0 +1,132 @@
+import unittest
+from unittest.mock import patch
+
+import urllib3
+
+from config import settings
+from infrastructure import http_client
+
+
+class _FakeResp:
+    def __init__(self, status=200, data=b'{"ok": true}', headers=None):
+        self.status = status
+        self.data = data
+        self.headers = headers or {"Content-Type": "application/json; charset=utf-8"}
+
+
+class _FakePool:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        item = self.responses.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+
+class HttpClientTests(unittest.TestCase):
+    def setUp(self):
+        self._saved_cache_enabled = settings.HTTP_CLIENT_CACHE_ENABLED
+        settings.HTTP_CLIENT_CACHE_ENABLED = True
+        http_client.clear_cache()
+
+    def tearDown(self):
+        settings.HTTP_CLIENT_CACHE_ENABLED = self._saved_cache_enabled
+        http_client.clear_cache()
+
+    def test_cached_get_is_served_without_second_network_call(self):
+        pool = _FakePool([_FakeResp()])
+        with patch.object(http_client, "_pool", return_value=pool):
+            first = http_client.request("GET", "https://api.example/a", provider="t", timeout_sec=1, cache_ttl_sec=60)
+            second = http_client.request("GET", "https://api.example/a", provider="t", timeout_sec=1, cache_ttl_sec=60)
+
+        self.assertEqual(first.json(), {"ok": True})
+        self.assertFalse(first.from_cache)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(len(pool.calls), 1)
+
+    def test_post_cache_key_includes_body(self):
+        pool = _FakePool([_FakeResp(data=b'{"n": 1}'), _FakeResp(data=b'{"n": 2}')])
+        with patch.object(http_client, "_pool", return_value=pool):
+            one = http_client.request_json(
+                "POST", "https://api.example/q", provider="t", timeout_sec=1, json_body={"q": 1}, cache_ttl_sec=60
+            )
+            two = http_client.request_json(
+                "POST", "https://api.example/q", provider="t", timeout_sec=1, json_body={"q": 2}, cache_ttl_sec=60
+            )
+
+        self.assertEqual((one, two), ({"n": 1}, {"n": 2}))
+        self.assertEqual(pool.calls[0][2]["headers"]["Content-Type"], "application/json")
+
+    def test_definitive_404_is_negative_cached(self):
+        pool = _FakePool([_FakeResp(status=404, data=b"missing")])
+        with patch.object(http_client, "_pool", return_value=pool):
+            for _ in range(2):
+                with self.assertRaises(http_client.HttpStatusError) as ctx:
+                    http_client.request(
+                        "GET", "https://api.example/missing", provider="t", timeout_sec=1, negative_ttl_sec=60
+                    )
+                self.assertEqual(ctx.exception.code, 404)
+
+        self.assertEqual(len(pool.calls), 1)
+
+    def test_responses_are_not_shared_across_credentials(self):
+        pool = _FakePool([_FakeResp(data=b'{"user": "a"}'), _FakeResp(data=b'{"user": "b"}')])
+        with patch.object(http_client, "_pool", return_value=pool):
+            one = http_client.request_json(
+                "GET", "https://api.example/me", provider="t", timeout_sec=1,
+                headers={"x-auth-token": "token-a"}, cache_ttl_sec=60,
+            )
+            two = http_client.request_json(
+                "GET", "https://api.example/me", provider="t", timeout_sec=1,
+                headers={"X-Auth-Token": "token-b"}, cache_ttl_sec=60,
+            )
+
+        self.assertEqual((one, two), ({"user": "a"}, {"user": "b"}))
+        self.assertEqual(len(pool.calls), 2)
+
+    def test_auth_failures_are_not_negative_cached(self):
+        pool = _FakePool([_FakeResp(status=401), _FakeResp(status=403), _FakeResp()])
+        with patch.object(http_client, "_pool", return_value=pool):
+            for _ in range(2):
+                with self.assertRaises(http_client.HttpStatusError):
+                    http_client.request(
+                        "GET", "https://api.example/private", provider="t", timeout_sec=1, negative_ttl_sec=60
+                    )
+            ok = http_client.request(
+                "GET", "https://api.example/private", provider="t", timeout_sec=1, negative_ttl_sec=60
+            )
+
+        self.assertEqual(ok.status, 200)
+        self.assertEqual(len(pool.calls), 3)
+
+    def test_server_errors_are_not_negative_cached(self):
+        pool = _FakePool([_FakeResp(status=503), _FakeResp()])
+        with patch.object(http_client, "_pool", return_value=pool):
+            with self.assertRaises(http_client.HttpStatusError):
+                http_client.request("GET", "https://api.example/flaky", provider="t", timeout_sec=1, negative_ttl_sec=60)
+            ok = http_client.request("GET", "https://api.example/flaky", provider="t", timeout_sec=1, negative_ttl_sec=60)
+
+        self.assertEqual(ok.status, 200)
+
+    def test_transport_errors_are_wrapped_and_remembered_on_request(self):
+        pool = _FakePool([urllib3.exceptions.NewConnectionError(None, "refused")])
+        with patch.object(http_client, "_pool", return_value=pool):
+            with self.assertRaises(http_client.HttpTransportError):
+                http_client.request("GET", "https://down.example/", provider="t", timeout_sec=1)
+
+        self.assertFalse(http_client.is_negative_cached("GET", "https://down.example/"))
+        http_client.remember_failure("GET", "https://down.example/", ttl_sec=30)
+        self.assertTrue(http_client.is_negative_cached("GET", "https://down.example/"))
+
+    def test_rate_limiter_rejects_waits_longer_than_timeout(self):
+        limiter = http_client._HostRateLimiter()
+        self.assertEqual(limiter.wait_time("slow.example", 1.0), 0.0)
+        self.assertGreater(limiter.wait_time("slow.example", 1.0), 0.9)
+
+
+if __name__ == "__main__":
+    unittest.main()
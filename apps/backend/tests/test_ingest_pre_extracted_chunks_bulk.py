@@ -9,6 +9,8 @@ class _FakeCursor:
     def __init__(self):
         self.execute_calls = []
         self.executemany_calls = []
+        self.rowcount = 0
+        self._last_sql = ""
 
     def __enter__(self):
         return self
@@ -18,6 +20,12 @@ class _FakeCursor:
 
     def execute(self, sql, params=None):
         self.execute_calls.append((str(sql), params))
+        self._last_sql = str(sql)
+
+    def fetchall(self):
+        if "SELECT ID, CHUNK_INDEX, PAGE_NUMBER" in self._last_sql:
+            return [(101, 0, 1), (102, 1, 2)]
+        return []
 
     def executemany(self, sql, params, batcherrors=False, arraydmlrowcounts=False):
         self.executemany_calls.append(
@@ -71,10 +79,10 @@ class IngestPreExtractedChunksBulkTests(unittest.TestCase):
     @patch("services.ingestion_service.check_book_exists", return_value=False)
     @patch("services.ingestion_service.acquire_lock")
     @patch("services.ingestion_service.batch_get_embeddings")
-    @patch("services.ingestion_service.classify_passage_fast", return_value={"type": "BODY"})
-    @patch("services.ingestion_service.get_lemma_frequencies", return_value={"metin": 1})
-    @patch("services.ingestion_service.get_lemmas", return_value=["metin"])
-    @patch("services.ingestion_service.normalize_text", side_effect=lambda text: text.lower())
+    @patch("services.semantic_classifier.classify_passage_fast", return_value={"type": "BODY"})
+    @patch("utils.text_utils.get_lemma_positions", return_value={"metin": [2]})
+    @patch("utils.text_utils.get_lemmas", return_value=["metin"])
+    @patch("utils.text_utils.normalize_text", side_effect=lambda text: text.lower())
     @patch("services.ingestion_service.should_skip_for_ingestion", return_value=(False, {}))
     @patch("services.ingestion_service.DataCleanerService.assess_noise", return_value={"score": 0, "signals": {}})
     @patch("services.ingestion_service.DataCleanerService.strip_basic_patterns", side_effect=lambda text: text)
@@ -89,7 +97,7 @@ class IngestPreExtractedChunksBulkTests(unittest.TestCase):
         _mock_skip_audit,
         _mock_normalize,
         _mock_lemmas,
-        _mock_lemma_freqs,
+        _mock_lemma_positions,
         _mock_classify,
         mock_embeddings,
         _mock_lock,
@@ -122,14 +130,29 @@ class IngestPreExtractedChunksBulkTests(unittest.TestCase):
         self.assertTrue(result)
         self.assertEqual(fake_conn.commits, 1)
         self.assertEqual(fake_conn.rollbacks, 0)
-        self.assertEqual(len(fake_conn.cursor_obj.executemany_calls), 1)
-        call = fake_conn.cursor_obj.executemany_calls[0]
-        self.assertIn("INSERT INTO TOMEHUB_CONTENT_V2", call["sql"])
+        content_calls = [
+            c for c in fake_conn.cursor_obj.executemany_calls if "INSERT INTO TOMEHUB_CONTENT_V2" in c["sql"]
+        ]
+        self.assertEqual(len(content_calls), 1)
+        call = content_calls[0]
         self.assertEqual(len(call["params"]), 2)
+        self.assertEqual(call["params"][0]["p_token_freq"], '{"metin": 1}')
         self.assertTrue(call["batcherrors"])
         self.assertTrue(call["arraydmlrowcounts"])
         self.assertFalse(any("INSERT INTO TOMEHUB_CONTENT_V2" in sql for sql, _ in fake_conn.cursor_obj.execute_calls))
 
+        index_calls = [
+            c for c in fake_conn.cursor_obj.executemany_calls if "INSERT INTO TOMEHUB_LEMMA_INDEX" in c["sql"]
+        ]
+        self.assertEqual(len(index_calls), 1)
+        postings = index_calls[0]["params"]
+        self.assertEqual([p["p_cid"] for p in postings], [101, 102])
+        self.assertEqual({p["p_lemma"] for p in postings}, {"metin"})
+        self.assertEqual(postings[0]["p_pos"], "[2]")
+        self.assertTrue(
+            any("DELETE FROM TOMEHUB_LEMMA_INDEX" in sql for sql, _ in fake_conn.cursor_obj.execute_calls)
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -138,6 +138,17 @@ class DualAIOrchestratorTests(unittest.TestCase):
         self.assertIn("dogrudan aktarim", result["final_answer"])
         self.assertIn("HadeethEnc 3366", result["final_answer"])
 
+    def test_verify_relevance_embeds_question_and_answer_in_one_memoized_batch(self):
+        with patch.object(
+            judge_ai_service, "get_embeddings_memoized", return_value=[[1.0, 0.0], [1.0, 0.0]]
+        ) as mock_embed, patch.object(judge_ai_service, "get_embedding") as mock_single:
+            score, violations = judge_ai_service.verify_relevance("soru", "cevap", "SYNTHESIS")
+
+        mock_embed.assert_called_once_with(["soru", "cevap"])
+        mock_single.assert_not_called()
+        self.assertEqual(score, 1.0)
+        self.assertEqual(violations, [])
+
 
 if __name__ == "__main__":
     unittest.main()
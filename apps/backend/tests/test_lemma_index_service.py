@@ -0,0 +1,136 @@
+import unittest
+from unittest.mock import patch
+
+from services import analytics_service, lemma_index_service
+
+
+class _FakeCursor:
+    def __init__(self, results):
+        self.results = list(results)
+        self.execute_calls = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, sql, params=None):
+        self.execute_calls.append((str(sql), params))
+
+    def fetchall(self):
+        return self.results.pop(0) if self.results else []
+
+
+class _FakeConnection:
+    def __init__(self, cursor):
+        self.cursor_obj = cursor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def cursor(self):
+        return self.cursor_obj
+
+
+class LemmaIndexServiceTests(unittest.TestCase):
+    def test_build_postings_counts_and_caps_positions(self):
+        postings = lemma_index_service.build_postings(
+            {"Kitap": [0, 3, 9], "": [1], "okumak": [], "x" * 200: [2]}
+        )
+
+        self.assertEqual(postings, [("kitap", 3, "[0, 3, 9]")])
+
+    def test_page_distribution_returns_none_for_unindexed_book(self):
+        cursor = _FakeCursor([[]])
+        with patch.object(
+            lemma_index_service.DatabaseManager, "get_read_connection", return_value=_FakeConnection(cursor)
+        ):
+            result = lemma_index_service.get_indexed_page_distribution("uid-1", "book-1", ["kitap"])
+
+        self.assertIsNone(result)
+        self.assertEqual(len(cursor.execute_calls), 1)
+
+    def test_page_distribution_groups_by_page(self):
+        cursor = _FakeCursor([[("book-1",)], [(1, 4), (3, 2)]])
+        with patch.object(
+            lemma_index_service.DatabaseManager, "get_read_connection", return_value=_FakeConnection(cursor)
+        ):
+            result = lemma_index_service.get_indexed_page_distribution("uid-1", "book-1", ["kitap", "kitap"])
+
+        self.assertEqual(result, [{"page_number": 1, "count": 4}, {"page_number": 3, "count": 2}])
+        sql, params = cursor.execute_calls[1]
+        self.assertIn("LEMMA IN (:p_l0)", sql)
+        self.assertEqual(params["p_l0"], "kitap")
+
+    def test_indexed_counts_report_zero_for_indexed_books_without_hits(self):
+        cursor = _FakeCursor([[("book-1",), ("book-2",)], [("book-1", 7)]])
+        with patch.object(
+            lemma_index_service.DatabaseManager, "get_read_connection", return_value=_FakeConnection(cursor)
+        ):
+            counts = lemma_index_service.get_indexed_counts("uid-1", ["book-1", "book-2", "book-3"], ["kitap"])
+
+        self.assertEqual(counts, {"book-1": 7, "book-2": 0})
+
+    def test_failed_write_rolls_back_to_savepoint_and_leaves_item_unindexed(self):
+        cursor = _FakeCursor([[(11, 0, 1)]])
+        cursor.rowcount = 0
+
+        def _fail(*_args, **_kwargs):
+            raise RuntimeError("ORA-12899: value too large for column")
+
+        cursor.executemany = _fail
+        written = lemma_index_service.replace_item_lemma_index(
+            cursor,
+            firebase_uid="uid-1",
+            book_id="book-1",
+            content_type="PDF",
+            postings_by_chunk_index={0: [("kitap", 2, "[1, 4]")]},
+        )
+
+        self.assertEqual(written, 0)
+        statements = [sql.strip() for sql, _ in cursor.execute_calls]
+        self.assertTrue(statements[0].startswith("DELETE FROM TOMEHUB_LEMMA_INDEX"))
+        self.assertEqual(statements[1], "SAVEPOINT lemma_index_write")
+        self.assertEqual(statements[-1], "ROLLBACK TO SAVEPOINT lemma_index_write")
+
+    def test_build_postings_skips_lemmas_over_the_column_byte_limit(self):
+        postings = lemma_index_service.build_postings({"ş" * 70: [0], "ş" * 64: [1]})
+
+        self.assertEqual([p[0] for p in postings], ["ş" * 64])
+
+    @patch("services.analytics_service.get_cache", return_value=None)
+    @patch("services.analytics_service.get_keyword_distribution")
+    @patch("services.analytics_service.get_indexed_counts", return_value={"book-1": 0})
+    def test_count_uses_index_without_clob_fallback(self, _mock_counts, mock_distribution, _mock_cache):
+        with patch.object(analytics_service.DatabaseManager, "get_read_connection") as mock_conn:
+            count = analytics_service.count_lemma_occurrences("uid-1", "book-1", "kitap")
+
+        self.assertEqual(count, 0)
+        mock_distribution.assert_not_called()
+        mock_conn.assert_not_called()
+
+    @patch("services.analytics_service.count_lemma_occurrences")
+    @patch("services.analytics_service.get_indexed_counts", return_value={"book-1": 5, "book-2": 9})
+    def test_comparative_stats_answers_indexed_books_in_one_lookup(self, _mock_counts, mock_count):
+        cursor = _FakeCursor([[("book-1", "Birinci"), ("book-2", "Ikinci")]])
+        with patch.object(
+            analytics_service.DatabaseManager, "get_read_connection", return_value=_FakeConnection(cursor)
+        ):
+            stats = analytics_service.get_comparative_stats("uid-1", ["book-1", "book-2"], "kitap")
+
+        self.assertEqual(
+            stats,
+            [
+                {"book_id": "book-2", "title": "Ikinci", "count": 9},
+                {"book_id": "book-1", "title": "Birinci", "count": 5},
+            ],
+        )
+        mock_count.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
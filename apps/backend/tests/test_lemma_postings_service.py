@@ -0,0 +1,143 @@
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+from services import lemma_postings_service
+from services.search_system import strategies
+
+
+class _LemmaCursor:
+    """Returns canned rows per statement kind; records every statement."""
+
+    def __init__(self, postings_rows=None, scan_rows=None, details=None):
+        self.postings_rows = postings_rows or []
+        self.scan_rows = scan_rows or []
+        self.details = details or []
+        self.executed = []
+        self._result = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, dict(params or {})))
+        if "lemma_scores" in sql:
+            self._result = list(self.postings_rows)
+        elif "lemma_tokens LIKE" in sql:
+            self._result = list(self.scan_rows)
+        elif "content_chunk" in sql:
+            self._result = list(self.details)
+        else:
+            self._result = []
+
+    def fetchall(self):
+        return list(self._result)
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+def _patch_connection(cursor):
+    conn = MagicMock()
+    conn.__enter__.return_value = conn
+    return (
+        patch.object(strategies.DatabaseManager, "get_read_connection", return_value=conn),
+        patch.object(strategies, "profiled_cursor", return_value=cursor),
+    )
+
+
+class LemmaPostingsServiceTests(unittest.TestCase):
+    def setUp(self):
+        lemma_postings_service.clear_caches()
+
+    def test_postings_from_tokens_uses_token_freq_and_dedupes(self):
+        lemmas = json.dumps(["vicdan", "ahlak", "vicdan", "", "x" * 200])
+        freqs = json.dumps({"vicdan": 3, "ahlak": "bad"})
+        self.assertEqual(
+            lemma_postings_service.postings_from_tokens(lemmas, freqs),
+            [("vicdan", 3), ("ahlak", 1)],
+        )
+        self.assertEqual(lemma_postings_service.postings_from_tokens(json.dumps(["iman"])), [("iman", 1)])
+        self.assertEqual(lemma_postings_service.postings_from_tokens("not json"), [])
+
+    def test_write_content_postings_swallows_missing_table(self):
+        cursor = MagicMock()
+        cursor.executemany.side_effect = Exception("ORA-00942: table or view does not exist")
+        written = lemma_postings_service.write_content_postings(
+            cursor, firebase_uid="uid-1", content_id=7, lemmas_json=json.dumps(["vicdan"])
+        )
+        self.assertEqual(written, 0)
+        rows = cursor.executemany.call_args[0][1]
+        self.assertEqual(rows, [{"p_uid": "uid-1", "p_lemma": "vicdan", "p_cid": 7, "p_tf": 1}])
+
+    def test_write_failure_rolls_back_postings_and_fails_the_insert(self):
+        cursor = MagicMock()
+        cursor.executemany.side_effect = Exception("ORA-00001: unique constraint violated")
+        with self.assertRaises(Exception):
+            lemma_postings_service.write_content_postings(
+                cursor, firebase_uid="uid-1", content_id=7, lemmas_json=json.dumps(["vicdan"])
+            )
+        statements = [c.args[0] for c in cursor.execute.call_args_list]
+        self.assertEqual(statements, ["SAVEPOINT lemma_postings_write", "ROLLBACK TO SAVEPOINT lemma_postings_write"])
+
+    def test_lemmas_longer_than_the_column_in_bytes_are_skipped(self):
+        # 70 two-byte characters: 70 chars but 140 UTF-8 bytes.
+        lemmas = json.dumps(["ş" * 70, "ş" * 64])
+        self.assertEqual(lemma_postings_service.postings_from_tokens(lemmas), [("ş" * 64, 1)])
+
+    def test_topk_cte_binds_each_lemma(self):
+        sql, binds = lemma_postings_service.topk_cte(["vicdan", "ahlak"], 0)
+        self.assertIn("p.LEMMA IN (:p_pl0, :p_pl1)", sql)
+        self.assertIn("lemma_scores AS", sql)
+        self.assertEqual(binds, {"p_docs": 1.0, "p_pl0": "vicdan", "p_pl1": "ahlak"})
+
+    def test_lemma_lane_ranks_from_postings_when_user_is_backfilled(self):
+        cursor = _LemmaCursor(
+            postings_rows=[
+                (11, "Kitap", "HIGHLIGHT", 3, "b1", 2.0),
+                (12, "Kitap", "HIGHLIGHT", 4, "b1", 1.0),
+                (13, "Kitap", "HIGHLIGHT", 5, "b1", 0.5),
+            ],
+            details=[
+                (11, "vicdan vicdan", "c11", None, None, None),
+                (12, "vicdanlı bir", "c12", None, None, None),
+                (13, "no match here", "c13", None, None, None),
+            ],
+        )
+        p_conn, p_cursor = _patch_connection(cursor)
+        with p_conn, p_cursor, patch.object(
+            lemma_postings_service, "postings_ready", return_value=True
+        ), patch.object(lemma_postings_service, "user_document_count", return_value=100), patch.object(
+            strategies, "get_lemmas", return_value=["vicdan"]
+        ):
+            results = strategies.LemmaMatchStrategy().search("vicdan", "uid-1", limit=10)
+
+        self.assertEqual([r["id"] for r in results], [11, 12])
+        self.assertGreater(results[0]["score"], results[1]["score"])
+        self.assertEqual(results[0]["content_chunk"], "c11")
+        sqls = [sql for sql, _ in cursor.executed]
+        self.assertFalse(any("lemma_tokens LIKE" in sql for sql in sqls))
+        self.assertIn("ORDER BY s.LEMMA_SCORE DESC", sqls[0])
+        self.assertEqual(cursor.executed[0][1]["p_pl0"], "vicdan")
+
+    def test_lemma_lane_keeps_like_scan_until_backfilled(self):
+        cursor = _LemmaCursor(
+            scan_rows=[(21, "Kitap", "HIGHLIGHT", 1, "b1")],
+            details=[(21, "vicdan", "c21", None, None, None)],
+        )
+        p_conn, p_cursor = _patch_connection(cursor)
+        with p_conn, p_cursor, patch.object(
+            lemma_postings_service, "postings_ready", return_value=False
+        ), patch.object(strategies, "get_lemmas", return_value=["vicdan"]):
+            results = strategies.LemmaMatchStrategy().search("vicdan", "uid-1", limit=10)
+
+        self.assertEqual([r["id"] for r in results], [21])
+        self.assertTrue(any("lemma_tokens LIKE" in sql for sql, _ in cursor.executed))
+        self.assertFalse(any("lemma_scores" in sql for sql, _ in cursor.executed))
+
+
+if __name__ == "__main__":
+    unittest.main()
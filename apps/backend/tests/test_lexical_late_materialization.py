@@ -0,0 +1,155 @@
+import unittest
+from unittest.mock import patch
+
+from config import settings
+from services.search_system import strategies
+from services.search_system.strategies import ExactMatchStrategy, LemmaMatchStrategy
+
+
+class _FakeCursor:
+    def __init__(self, candidate_rows, detail_rows):
+        self.candidate_rows = candidate_rows
+        self.detail_rows = detail_rows
+        self.executed = []
+        self._last_sql = ""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, sql, params=None):
+        self._last_sql = sql
+        self.executed.append((sql, dict(params or {})))
+
+    def fetchall(self):
+        if "c.comment_text" in self._last_sql and "LEFT JOIN" in self._last_sql and "c.id IN" in self._last_sql:
+            requested = {v for k, v in self.executed[-1][1].items() if k.startswith("p_cid")}
+            return [row for row in self.detail_rows if row[0] in requested]
+        return list(self.candidate_rows)
+
+    def close(self):
+        pass
+
+
+class _FakeConnection:
+    def __init__(self, cursor):
+        self.cursor_obj = cursor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def cursor(self):
+        return self.cursor_obj
+
+
+# id, title, source_type, page_number, book_id
+_CANDIDATES = [
+    (3, "Book A", "HIGHLIGHT", 1, "book-a"),
+    (2, "Book A", "HIGHLIGHT", 2, "book-a"),
+    (1, "Book B", "NOTE", None, "book-b"),
+]
+# id, match_text, content_chunk, tags_json, summary_text, comment_text
+_DETAILS = [
+    (3, "vicdan ve ahlak", "Vicdan ve ahlak", '["etik"]', "ozet a", None),
+    (2, "vicdanli bir insan", "Vicdanli bir insan", None, None, None),
+    (1, "vicdan hurdur", "Vicdan hurdur", None, "ozet b", "not"),
+]
+
+
+class LexicalLateMaterializationTests(unittest.TestCase):
+    def _run(self, strategy, query, late=True, **kwargs):
+        cursor = _FakeCursor(_CANDIDATES, _DETAILS)
+        with patch.object(settings, "SEARCH_LEXICAL_LATE_MATERIALIZATION", late), \
+                patch.object(strategies.DatabaseManager, "get_read_connection", return_value=_FakeConnection(cursor)), \
+                patch.object(strategies, "_is_oracle_text_exact_enabled", return_value=False):
+            results = strategy.search(query, "uid-1", **kwargs)
+        return results, cursor
+
+    def test_exact_phase_one_selects_no_lob_columns(self):
+        results, cursor = self._run(ExactMatchStrategy(), "vicdan", limit=5)
+
+        candidate_sql = cursor.executed[0][0].split("FROM")[0]
+        self.assertNotIn("content_chunk", candidate_sql)
+        self.assertNotIn("normalized_content", candidate_sql)
+        self.assertNotIn("summary_text", candidate_sql)
+        self.assertNotIn("tags_json", candidate_sql)
+        self.assertNotIn("match_text", candidate_sql)
+
+        self.assertEqual(len(cursor.executed), 2)
+        detail_sql, detail_params = cursor.executed[1]
+        self.assertIn("match_text", detail_sql)
+        ids = {v for k, v in detail_params.items() if k.startswith("p_cid")}
+        self.assertEqual(ids, {3, 2, 1})
+        self.assertEqual(len([k for k in detail_params if k.startswith("p_cid")]) % 50, 0)
+
+        self.assertEqual([r["id"] for r in results], [3, 1])
+        self.assertEqual(results[0]["content_chunk"], "Vicdan ve ahlak")
+        self.assertEqual(results[0]["summary"], "ozet a")
+        self.assertEqual(results[1]["comment"], "not")
+        # "vicdanli" fails the boundary check on the phase-2 match_text.
+        self.assertEqual(results[1]["match_type"], "exact_deaccented")
+
+    def test_phase_two_windows_stop_once_limit_is_reached(self):
+        with patch.object(strategies, "_LEXICAL_MATCH_WINDOW_MIN", 1):
+            results, cursor = self._run(ExactMatchStrategy(), "vicdan", limit=2)
+
+        windows = [
+            {v for k, v in params.items() if k.startswith("p_cid")}
+            for _, params in cursor.executed[1:]
+        ]
+        # Window 1 reads 3 and 2 ("vicdanli" is rejected), window 2 reads only 1.
+        self.assertEqual(windows, [{3, 2}, {1}])
+        self.assertEqual([r["id"] for r in results], [3, 1])
+
+    def test_hydration_respects_limit(self):
+        with patch.object(strategies, "_LEXICAL_MATCH_WINDOW_MIN", 1):
+            results, cursor = self._run(ExactMatchStrategy(), "vicdan", limit=1)
+
+        self.assertEqual(len(cursor.executed), 2)
+        ids = {v for k, v in cursor.executed[1][1].items() if k.startswith("p_cid")}
+        self.assertEqual(ids, {3})
+        self.assertEqual([r["id"] for r in results], [3])
+
+    def test_candidates_deleted_between_phases_are_dropped(self):
+        cursor = _FakeCursor(_CANDIDATES, _DETAILS[:1])
+        with patch.object(settings, "SEARCH_LEXICAL_LATE_MATERIALIZATION", True), \
+                patch.object(strategies.DatabaseManager, "get_read_connection", return_value=_FakeConnection(cursor)), \
+                patch.object(strategies, "_is_oracle_text_exact_enabled", return_value=False):
+            results = ExactMatchStrategy().search("vicdan", "uid-1", limit=5)
+
+        self.assertEqual([r["id"] for r in results], [3])
+
+    def test_single_phase_when_flag_disabled(self):
+        full_rows = [row + detail[1:] for row, detail in zip(_CANDIDATES, _DETAILS)]
+        cursor = _FakeCursor(full_rows, [])
+        with patch.object(settings, "SEARCH_LEXICAL_LATE_MATERIALIZATION", False), \
+                patch.object(strategies.DatabaseManager, "get_read_connection", return_value=_FakeConnection(cursor)), \
+                patch.object(strategies, "_is_oracle_text_exact_enabled", return_value=False):
+            results = ExactMatchStrategy().search("vicdan", "uid-1", limit=5)
+
+        self.assertEqual(len(cursor.executed), 1)
+        self.assertIn("l.summary_text as summary", cursor.executed[0][0])
+        self.assertEqual([r["summary"] for r in results], ["ozet a", "ozet b"])
+
+    def test_lemma_lane_hydrates_scored_candidates_only(self):
+        with patch.object(strategies, "get_lemmas", return_value=["vicdan"]):
+            results, cursor = self._run(LemmaMatchStrategy(), "vicdan", limit=5)
+
+        self.assertNotIn("summary_text", cursor.executed[0][0])
+        detail_sql, detail_params = cursor.executed[-1]
+        self.assertIn("c.comment_text", detail_sql)
+        ids = {v for k, v in detail_params.items() if k.startswith("p_cid")}
+        self.assertEqual(ids, {3, 2, 1})
+        # Stem matching keeps "vicdanli" (id 2), unlike the exact lane.
+        self.assertEqual([r["id"] for r in results], [3, 2, 1])
+        self.assertTrue(all(r["content_chunk"] for r in results))
+        self.assertTrue(all(r["match_type"] == "lemma_fuzzy" for r in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from config import settings
+from services.search_system.local_backend import LocalCorpus, LocalRetrievalBackend
+from services.search_system.orchestrator import SearchOrchestrator
+from services.search_system.retrieval_backend import RetrievalBackend
+from services.search_system.strategies import ExactMatchStrategy, LemmaMatchStrategy, SemanticMatchStrategy
+
+
+_FIXTURE = {
+    "version": 1,
+    "library_items": [
+        {"firebase_uid": "u1", "item_id": "b1", "item_type": "BOOK", "title": "Devlet"},
+        {"firebase_uid": "u1", "item_id": "b2", "item_type": "BOOK", "title": "Gizli", "search_visibility": "NEVER_RETRIEVE"},
+        {"firebase_uid": "u1", "item_id": "b3", "item_type": "BOOK", "title": "Silinmis", "is_deleted": 1},
+    ],
+    "content": [
+        {"id": 1, "firebase_uid": "u1", "item_id": "b1", "title": "Devlet", "content_type": "HIGHLIGHT",
+         "content_chunk": "Adalet devletin temelidir.", "embedding": [1.0, 0.0, 0.0]},
+        {"id": 2, "firebase_uid": "u1", "item_id": "b1", "title": "Devlet", "content_type": "INSIGHT",
+         "content_chunk": "Özgürlük ve düzen arasındaki gerilim.", "embedding": [0.0, 1.0, 0.0]},
+        {"id": 3, "firebase_uid": "u1", "item_id": "b2", "title": "Gizli", "content_type": "HIGHLIGHT",
+         "content_chunk": "Adalet burada da geçiyor.", "embedding": [1.0, 0.0, 0.0]},
+        {"id": 4, "firebase_uid": "u1", "item_id": "b3", "title": "Silinmis", "content_type": "HIGHLIGHT",
+         "content_chunk": "Adalet silinmiş kitapta.", "embedding": [1.0, 0.0, 0.0]},
+        {"id": 5, "firebase_uid": "u1", "item_id": "b1", "title": "Devlet", "content_type": "PDF_CHUNK",
+         "content_chunk": "Cumhuriyet ve erdem üzerine uzun bir bölüm.", "embedding": [0.0, 0.0, 1.0]},
+    ],
+    "query_embeddings": {"adalet": [0.9, 0.1, 0.0], "cumhuriyet": [0.0, 0.0, 1.0]},
+}
+
+
+class LocalRetrievalBackendTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        path = Path(self._tmp.name) / "fixture.json"
+        path.write_text(json.dumps(_FIXTURE, ensure_ascii=False), encoding="utf-8")
+        self.backend = LocalRetrievalBackend.from_fixture(path)
+        self.exact, self.lemma, self.semantic = self.backend.build_strategies(None)
+
+    def tearDown(self):
+        self.backend.corpus.close()
+        self._tmp.cleanup()
+
+    def test_local_strategies_bucket_like_oracle_ones(self):
+        self.assertIsInstance(self.exact, ExactMatchStrategy)
+        self.assertIsInstance(self.lemma, LemmaMatchStrategy)
+        self.assertIsInstance(self.semantic, SemanticMatchStrategy)
+
+    def test_exact_lane_applies_visibility_and_deleted_filters(self):
+        results = self.exact.search("adalet", "u1")
+        self.assertEqual([r["id"] for r in results], [1])
+        self.assertEqual(results[0]["score"], 100.0)
+        self.assertEqual(results[0]["match_type"], "exact_deaccented")
+
+        all_scope = self.exact.search("adalet", "u1", visibility_scope="all")
+        self.assertEqual([r["id"] for r in all_scope], [1])
+
+    def test_pdf_chunks_follow_the_search_surface(self):
+        self.assertEqual(self.exact.search("cumhuriyet", "u1"), [])
+        self.assertEqual([r["id"] for r in self.exact.search("cumhuriyet", "u1", search_surface="PDF_ONLY")], [5])
+        self.assertEqual(self.exact.search("adalet", "u1", search_surface="PDF_ONLY"), [])
+
+    def test_lemma_lane_matches_inflected_query_and_derives_tokens_on_load(self):
+        results = self.lemma.search("devletler", "u1")
+        self.assertEqual([r["id"] for r in results], [1])
+        self.assertEqual(results[0]["match_type"], "lemma_fuzzy")
+
+        corpus = LocalCorpus()
+        corpus.add_library_items([{"firebase_uid": "u2", "item_id": "x"}])
+        corpus.add_content([{"id": 9, "firebase_uid": "u2", "item_id": "x", "content_type": "HIGHLIGHT",
+                             "content_chunk": "Devletin temeli."}])
+        row = corpus.select("u2", filters={})[0]
+        self.assertIn("devlet", row[5])
+        corpus.close()
+
+    def test_semantic_lane_ranks_by_cosine_from_fixture_embeddings(self):
+        results = self.semantic.search("adalet", "u1", limit=5)
+        self.assertEqual(results[0]["id"], 1)
+        self.assertGreater(results[0]["score"], 90.0)
+        self.assertNotIn(3, [r["id"] for r in results])
+        self.assertEqual(self.semantic.search("bilinmeyen sorgu", "u1"), [])
+
+    def test_orchestrator_runs_end_to_end_offline(self):
+        orch = SearchOrchestrator(cache=None, backend=self.backend)
+        with patch.object(settings, "SEARCH_SEMANTIC_EXPANSION_MAX_VARIATIONS", 2), patch.object(
+            orch.expander, "expand_query", side_effect=AssertionError("expansion must not run offline")
+        ):
+            results, meta = orch.search(query="adalet", firebase_uid="u1", limit=5)
+
+        self.assertEqual(results[0]["id"], 1)
+        self.assertIsNone(meta.get("search_log_id"))
+        self.assertIn(meta.get("expansion_skipped_reason"), {"offline_backend", "semantic_lane_disabled"})
+
+    def test_backends_must_implement_build_strategies(self):
+        with self.assertRaises(TypeError):
+            RetrievalBackend()
+
+
+if __name__ == "__main__":
+    unittest.main()
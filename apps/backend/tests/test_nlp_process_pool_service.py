@@ -0,0 +1,74 @@
+import json
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock, patch
+
+from services import nlp_process_pool_service as npp
+
+
+class NlpProcessPoolTests(unittest.TestCase):
+    def test_analyze_text_matches_ingest_fields(self):
+        fields = npp.analyze_text("Devletin temeli adalettir.")
+        self.assertEqual(set(fields), {"normalized", "lemmas", "lemma_freqs", "lemma_postings", "classification"})
+        self.assertIn("devlet", json.loads(fields["lemmas"]))
+        self.assertEqual(json.loads(fields["lemma_freqs"]).get("devlet"), 1)
+
+    def test_disabled_pool_analyzes_in_process(self):
+        pool = npp.NlpProcessPool(workers=0)
+        with patch.object(npp, "ProcessPoolExecutor") as executor_cls:
+            out = list(pool.analyze(["bir", "iki"]))
+        executor_cls.assert_not_called()
+        self.assertEqual(len(out), 2)
+
+    def test_batches_stream_back_in_order(self):
+        pool = npp.NlpProcessPool(workers=2, batch_size=2)
+        seen = []
+
+        def _map(fn, batches):
+            for batch in batches:
+                seen.append(list(batch))
+                yield [{"t": t} for t in batch]
+
+        executor = MagicMock()
+        executor.map.side_effect = _map
+        with patch.object(pool, "_get_executor", return_value=executor):
+            out = list(pool.analyze(["a", "b", "c", "d", "e"]))
+        self.assertEqual([r["t"] for r in out], ["a", "b", "c", "d", "e"])
+        self.assertEqual(seen, [["a", "b"], ["c", "d"], ["e"]])
+
+    def test_broken_pool_finishes_remaining_texts_in_process(self):
+        pool = npp.NlpProcessPool(workers=2, batch_size=1)
+
+        def _map(fn, batches):
+            yield [{"t": "a"}]
+            raise BrokenProcessPool("worker died")
+
+        executor = MagicMock()
+        executor.map.side_effect = _map
+        pool._executor = executor
+        with patch.object(npp, "analyze_text", side_effect=lambda t: {"t": t, "local": True}):
+            out = list(pool.analyze(["a", "b", "c"]))
+        self.assertEqual([r["t"] for r in out], ["a", "b", "c"])
+        self.assertTrue(out[1]["local"])
+        self.assertIsNone(pool._executor)
+        executor.shutdown.assert_called_once()
+
+    def test_real_worker_process_returns_same_fields(self):
+        pool = npp.NlpProcessPool(workers=1, batch_size=2)
+        texts = ["Kitapları okudum.", "Adalet mülkün temelidir.", "Gibi bir benzetme."]
+        try:
+            out = list(pool.analyze(texts))
+        finally:
+            pool.shutdown()
+        expected = [npp.analyze_text(t) for t in texts]
+        self.assertEqual(len(out), len(expected))
+        # lemmas is a serialized set, so its order is not stable across processes.
+        for got, want in zip(out, expected):
+            self.assertEqual(set(got), set(want))
+            self.assertEqual(got["normalized"], want["normalized"])
+            self.assertEqual(set(json.loads(got["lemmas"])), set(json.loads(want["lemmas"])))
+            self.assertEqual(got["classification"], want["classification"])
+
+
+if __name__ == "__main__":
+    unittest.main()
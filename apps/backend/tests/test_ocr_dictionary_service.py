@@ -0,0 +1,58 @@
+import unittest
+from unittest.mock import patch
+
+from config import settings
+from services import ocr_dictionary_service as ods
+from services.correction_service import LinguisticCorrectionService
+
+_CLEAN_ROWS = [
+    ("Kültür ve toplum arasındaki ilişki felsefenin temel sorusudur.", '{"kültür": 1, "toplum": 1, "ilişki": 1}'),
+] * 3
+
+
+class OcrDictionaryTests(unittest.TestCase):
+    def setUp(self):
+        keys = ("OCR_DICTIONARY_ENABLED", "OCR_DICTIONARY_MIN_COUNT", "OCR_DICTIONARY_MIN_WORDS")
+        self._orig = {key: getattr(settings, key) for key in keys}
+        settings.OCR_DICTIONARY_ENABLED = True
+        settings.OCR_DICTIONARY_MIN_COUNT = 3
+        settings.OCR_DICTIONARY_MIN_WORDS = 5
+        ods.ocr_dictionary_cache.clear()
+
+    def tearDown(self):
+        for key, value in self._orig.items():
+            setattr(settings, key, value)
+        ods.ocr_dictionary_cache.clear()
+
+    def test_counts_surface_tokens_and_stored_lemmas(self):
+        counts = ods.count_words([("Kültür 1923 KÜLTÜR", '{"kültür": 2, "x1": 5}'), ("İnsan", None)])
+        self.assertEqual(counts["kültür"], 4)
+        self.assertEqual(counts["insan"], 1)
+        self.assertNotIn("1923", counts)
+        self.assertNotIn("x1", counts)
+
+    def test_dictionary_is_built_once_and_repairs_ocr_words(self):
+        with patch.object(ods, "_fetch_clean_rows", return_value=_CLEAN_ROWS) as fetch:
+            first = ods.get_user_ocr_dictionary("u1")
+            second = ods.get_user_ocr_dictionary("u1")
+        self.assertIs(first, second)
+        fetch.assert_called_once()
+        self.assertIn("toplum", first)
+
+        repaired = LinguisticCorrectionService(dictionary=first).fix_text("Kultur ve toplnm arasındaki iliski.")
+        self.assertEqual(repaired, "Kültür ve toplum arasındaki ilişki.")
+
+    def test_small_vocabulary_yields_no_dictionary(self):
+        settings.OCR_DICTIONARY_MIN_WORDS = 500
+        with patch.object(ods, "_fetch_clean_rows", return_value=_CLEAN_ROWS):
+            self.assertIsNone(ods.get_user_ocr_dictionary("u1"))
+
+    def test_disabled_never_reads_the_database(self):
+        settings.OCR_DICTIONARY_ENABLED = False
+        with patch.object(ods, "_fetch_clean_rows") as fetch:
+            self.assertIsNone(ods.get_user_ocr_dictionary("u1"))
+        fetch.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
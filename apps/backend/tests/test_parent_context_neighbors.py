@@ -0,0 +1,144 @@
+import unittest
+from unittest.mock import patch
+
+from config import settings
+from services import search_service
+from services.search_system import neighbor_cache as neighbor_cache_module
+from services.search_system.neighbor_cache import NeighborCache
+
+
+class _FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, dict(params or {})))
+
+    def fetchall(self):
+        return list(self.rows)
+
+    def close(self):
+        pass
+
+
+class _FakeConnection:
+    def __init__(self, cursor):
+        self.cursor_obj = cursor
+        self.call_timeout = 0
+        self.timeouts_seen = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def cursor(self):
+        self.timeouts_seen.append(self.call_timeout)
+        return self.cursor_obj
+
+
+def _seed(content_id, book_id, chunk_index):
+    return {"id": content_id, "book_id": book_id, "chunk_index": chunk_index, "page_number": None, "title": book_id}
+
+
+# seed_ord, id, content_chunk, title, content_type, page_number, chunk_index, item_id
+_ROWS = [
+    (0, 101, "a-prev", "Book A", "PDF_CHUNK", 1, 9, "book-a"),
+    (0, 102, "a-next", "Book A", "PDF_CHUNK", 1, 11, "book-a"),
+    (1, 201, "b-next", "Book B", "PDF_CHUNK", 4, 6, "book-b"),
+]
+
+
+class ParentContextNeighborTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = NeighborCache()
+        self.event_id = 7
+        self._patches = [
+            patch.object(search_service, "neighbor_cache", self.cache),
+            patch.object(neighbor_cache_module, "_last_change_event_id", side_effect=lambda uid: self.event_id),
+        ]
+        for p in self._patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self._patches:
+            p.stop()
+
+    def _fetch(self, seeds, rows=_ROWS):
+        cursor = _FakeCursor(rows)
+        conn = _FakeConnection(cursor)
+        with patch.object(search_service.DatabaseManager, "get_read_connection", return_value=conn) as mock_conn:
+            candidates, diag = search_service._fetch_parent_context_neighbors(
+                "uid-1", seeds, timeout_ms=300, seed_topk=3, neighbor_window=1, neighbor_limit=2
+            )
+        return candidates, diag, cursor, conn, mock_conn
+
+    def test_all_seeds_resolved_in_one_round_trip(self):
+        seeds = [_seed(10, "book-a", 10), _seed(20, "book-b", 5), {"id": 30, "book_id": "", "chunk_index": 1}]
+        candidates, diag, cursor, conn, _ = self._fetch(seeds)
+
+        self.assertEqual(len(cursor.executed), 1)
+        sql, params = cursor.executed[0]
+        self.assertIn("PARTITION BY s.seed_ord", sql)
+        self.assertEqual((params["p_s0_item"], params["p_s0_chunk"]), ("book-a", 10))
+        self.assertEqual((params["p_s1_item"], params["p_s1_anchor"]), ("book-b", 20))
+        self.assertNotIn("p_s2_item", params)
+        self.assertEqual(conn.timeouts_seen, [300])
+        self.assertEqual(conn.call_timeout, 0)
+
+        self.assertEqual([c["id"] for c in candidates], [101, 102, 201])
+        self.assertEqual([c["_parent_anchor_id"] for c in candidates], [10, 10, 20])
+        self.assertEqual(diag["status"], "ok")
+        self.assertEqual(diag["fetched_rows"], 3)
+
+    def test_cached_neighbourhoods_skip_the_query(self):
+        seeds = [_seed(10, "book-a", 10), _seed(20, "book-b", 5)]
+        self._fetch(seeds)
+        candidates, diag, _, _, mock_conn = self._fetch(seeds, rows=[])
+
+        mock_conn.assert_not_called()
+        self.assertEqual(diag["cache_hits"], 2)
+        self.assertEqual([c["id"] for c in candidates], [101, 102, 201])
+
+        self.cache.invalidate("uid-1", "book-a")
+        _, diag, cursor, _, _ = self._fetch(seeds, rows=[])
+        self.assertEqual(diag["cache_hits"], 1)
+        self.assertEqual(cursor.executed[0][1]["p_s0_item"], "book-a")
+
+    def test_change_event_from_another_worker_drops_the_users_books(self):
+        seeds = [_seed(10, "book-a", 10), _seed(20, "book-b", 5)]
+        self._fetch(seeds)
+        self.event_id = 8
+        with patch.object(settings, "PARENT_CONTEXT_CACHE_EVENT_POLL_SEC", 3600):
+            _, diag, _, _, _ = self._fetch(seeds, rows=[])
+        self.assertEqual(diag["cache_hits"], 2)
+
+        with patch.object(settings, "PARENT_CONTEXT_CACHE_EVENT_POLL_SEC", 0):
+            _, diag, _, _, mock_conn = self._fetch(seeds)
+        self.assertEqual(diag["cache_hits"], 0)
+        mock_conn.assert_called_once()
+
+    def test_timeout_fails_open_as_a_whole(self):
+        cursor = _FakeCursor([])
+        with patch.object(cursor, "execute", side_effect=RuntimeError("DPY-4024: call timeout of 300 ms exceeded")):
+            with patch.object(
+                search_service.DatabaseManager, "get_read_connection", return_value=_FakeConnection(cursor)
+            ):
+                candidates, diag = search_service._fetch_parent_context_neighbors(
+                    "uid-1", [_seed(10, "book-a", 10)], 300, 3, 1, 2
+                )
+
+        self.assertEqual(candidates, [])
+        self.assertEqual(diag["status"], "timeout")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import re
+import unittest
+
+from services import domain_policy_service, epistemic_service
+from services.search_system.semantic_router import SemanticRouter
+from utils.pattern_matcher import FeatureMatcher, PatternFamily, PhraseSet
+
+
+class PatternMatcherTests(unittest.TestCase):
+    def test_family_matches_like_a_search_loop_and_reports_list_order(self):
+        patterns = [r"\bkim dedi\b", r"\bdedi\b", r"\bhangi sayfa\b"]
+        family = PatternFamily("direct", patterns)
+        for text in ("bunu kim dedi", "o dedi ki", "hangi sayfa", "hicbiri", ""):
+            self.assertEqual(family.search(text), any(re.search(p, text) for p in patterns), text)
+        # Both the first and second pattern match; the first in list order wins.
+        self.assertEqual(family.first_index("bunu kim dedi"), 0)
+        self.assertEqual(family.first_index("hangi sayfa, o dedi"), 1)
+        self.assertIsNone(family.first_index("hicbiri"))
+        self.assertFalse(PatternFamily("empty", []).search("x"))
+
+    def test_phrase_set_counts_overlapping_phrases(self):
+        phrases = PhraseSet(["Tarih", "tarihi", " ", "osmanli"])
+        self.assertEqual(phrases.count("osmanli tarihi nedir"), 3)
+        self.assertEqual(phrases.count("roman"), 0)
+        self.assertFalse(phrases.any(""))
+
+    def test_feature_matcher_names_every_family_hit(self):
+        matcher = FeatureMatcher([PatternFamily("A", [r"\bbence\b"]), PatternFamily("B", [r"\bteori\b"])])
+        self.assertEqual(matcher.hits("bence bu bir teori"), {"A", "B"})
+        self.assertEqual(matcher.hits("bence"), {"A"})
+        self.assertEqual(matcher.hits(""), set())
+
+
+class HeuristicEquivalenceTests(unittest.TestCase):
+    def test_answerability_features(self):
+        chunk = {"content_chunk": "Vicdan, insanın iç sesidir. Bence iki temel teori vardır.", "personal_comment": ""}
+        result = epistemic_service.calculate_answerability_score(chunk, ["vicdan"])
+        self.assertIn("KEYWORD_MATCH", result["features"])
+        self.assertIn("DEFINITIONAL", result["features"])
+        self.assertIn("MODALITY", result["features"])
+
+        unrelated = epistemic_service.calculate_answerability_score({"content_chunk": "Hava güzel."}, ["vicdan"])
+        self.assertNotIn("KEYWORD_MATCH", unrelated["features"])
+        self.assertNotIn("DEFINITIONAL", unrelated["features"])
+
+    def test_is_definitional_without_keyword_is_false(self):
+        self.assertFalse(epistemic_service.is_definitional("Adalet, toplumun temelidir.", "vicdan"))
+        self.assertTrue(epistemic_service.is_definitional("Adalet, toplumun temelidir.", "adalet"))
+
+    def test_token_hits_accepts_plain_iterables(self):
+        query = "osmanli tarihi ve medeniyet"
+        self.assertEqual(
+            domain_policy_service._token_hits(query, domain_policy_service._CULTURE_HISTORY_TERMS),
+            domain_policy_service._token_hits(query, domain_policy_service._CULTURE_HISTORY_PHRASES),
+        )
+
+    def test_router_reason_names_the_matched_pattern(self):
+        decision = SemanticRouter().route("Bu söz hangi sayfada, kim dedi?", intent="DIRECT")
+        self.assertEqual(decision.reason, f"pattern:{SemanticRouter.DIRECT_PATTERNS[2]}")
+        self.assertEqual(decision.selected_buckets, ["exact", "lemma"])
+
+
+if __name__ == "__main__":
+    unittest.main()
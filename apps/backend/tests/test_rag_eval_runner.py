@@ -1,12 +1,19 @@
 import tempfile
+import threading
+import time
 import unittest
+from datetime import UTC, datetime
 from pathlib import Path
 
 from rag_eval.dataset import load_golden_cases
 from rag_eval.judge import JudgeGrade, parse_judge_grade
+from rag_eval.models import GoldenCase
+from rag_eval.replay import EvalFixture, RecordingAnswerFn, RecordingJudge, ReplayAnswerFn, ReplayJudge
 from rag_eval.runner import (
     classify_case_result,
     evaluate_case_rules,
+    latency_percentiles,
+    render_json_report,
     render_markdown_report,
     run_eval_suite,
 )
@@ -31,7 +38,7 @@ class RAGEvalRunnerTests(unittest.TestCase):
             )
             mapping_path = tmp / "mapping.json"
             mapping_path.write_text(
-                '{"case_a":{"query":"What is A?","must_quote":["A"],"expected_mode":"HYBRID"}}',
+                '{"case_a":{"query":"What is A?","must_quote":["A"],"expected_mode":"HYBRID","expected_sources":["book-a"]}}',
                 encoding="utf-8",
             )
 
@@ -42,6 +49,8 @@ class RAGEvalRunnerTests(unittest.TestCase):
         self.assertEqual(mapping_cases[0].case_id, "case_a")
         self.assertEqual(mapping_cases[0].question, "What is A?")
         self.assertEqual(mapping_cases[0].must_quote, ["A"])
+        self.assertEqual(mapping_cases[0].expected_sources, ["book-a"])
+        self.assertNotIn("expected_sources", mapping_cases[0].metadata)
 
     def test_parse_judge_grade_handles_invalid_json(self):
         grade = parse_judge_grade("not-json")
@@ -128,5 +137,125 @@ class RAGEvalRunnerTests(unittest.TestCase):
         self.assertIn("| ID | Score | Faithfulness | Mode | Class | Sources | Notes |", report)
 
 
+    def test_concurrent_suite_keeps_dataset_order_and_reports_percentiles(self):
+        cases = [
+            GoldenCase(case_id=f"c{i}", question=f"Q{i}", expected_mode="QUOTE" if i % 2 else "HYBRID")
+            for i in range(8)
+        ]
+        judge = _FakeJudge({case.case_id: JudgeGrade(score=4, reasoning="ok", faithfulness="High") for case in cases})
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def _answer_fn(case, firebase_uid):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            # Later cases finish first; order must still follow the dataset.
+            time.sleep(0.005 * (8 - int(case.case_id[1:])))
+            with lock:
+                state["active"] -= 1
+            return "answer", [{"title": "Book"}], {"vector_candidates_count": 1}
+
+        results, summary = run_eval_suite(cases, "u1", judge, answer_fn=_answer_fn, concurrency=4)
+
+        self.assertEqual([item.case_id for item in results], [case.case_id for case in cases])
+        self.assertLessEqual(state["peak"], 4)
+        self.assertGreater(state["peak"], 1)
+        self.assertEqual(set(summary.latency_percentiles), {"ALL", "HYBRID", "QUOTE"})
+        self.assertEqual(summary.latency_percentiles["QUOTE"]["count"], 4)
+
+    def test_latency_percentiles_use_nearest_rank(self):
+        results, _ = run_eval_suite(
+            [GoldenCase(case_id=f"c{i}", question="Q") for i in range(1, 101)],
+            "u1",
+            _FakeJudge({f"c{i}": JudgeGrade(score=5, reasoning="ok") for i in range(1, 101)}),
+            answer_fn=lambda case, uid: ("a", [], {}),
+        )
+        for index, item in enumerate(results, start=1):
+            item.duration_sec = float(index)
+        stats = latency_percentiles(results)["UNSPECIFIED"]
+        self.assertEqual((stats["p50"], stats["p95"], stats["p99"]), (50.0, 95.0, 99.0))
+
+    def test_replay_reproduces_the_recorded_report_exactly(self):
+        cases = [GoldenCase(case_id=f"c{i}", question=f"Q{i}", expected_mode="QUOTE") for i in range(3)]
+        grades = {case.case_id: JudgeGrade(score=3 + i, reasoning="r", faithfulness="High") for i, case in enumerate(cases)}
+
+        def _live_answer(case, firebase_uid):
+            return f"answer {case.case_id}", [{"title": "Book", "score": 0.5, "seen": datetime(2026, 1, 1)}], {"status": "healthy"}
+
+        fixture = EvalFixture(recorded_at="2026-01-02T03:04:05Z")
+        recorded, recorded_summary = run_eval_suite(
+            cases, "u1", RecordingJudge(fixture, _FakeJudge(grades)), answer_fn=RecordingAnswerFn(fixture, _live_answer), concurrency=2
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = fixture.save(Path(tmpdir) / "fixture.json")
+            reports = []
+            for _ in range(2):
+                loaded = EvalFixture.load(path)
+                results, summary = run_eval_suite(
+                    cases, "u1", ReplayJudge(loaded), answer_fn=ReplayAnswerFn(loaded), concurrency=3
+                )
+                reports.append(
+                    (
+                        render_markdown_report(results, summary, dataset_name="d", generated_at=loaded.generated_at),
+                        render_json_report(results, summary),
+                    )
+                )
+
+        self.assertEqual(reports[0], reports[1])
+        self.assertEqual(reports[0][1], render_json_report(recorded, recorded_summary))
+        self.assertEqual(loaded.generated_at, datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC))
+
+
+    def test_replay_recomputes_retrieval_metrics_on_transformed_sources(self):
+        cases = [GoldenCase(case_id="c0", question="Q0", expected_sources=["book-a", "Book B"])]
+        grades = {"c0": JudgeGrade(score=5, reasoning="r", faithfulness="High")}
+
+        def _live_answer(case, firebase_uid):
+            sources = [
+                {"title": "Other", "book_id": "book-x"},
+                {"title": "A - Author", "book_id": "book-a"},
+                {"title": "Book B - Author", "book_id": "book-b"},
+            ]
+            return "answer", sources, {"status": "healthy"}
+
+        fixture = EvalFixture(recorded_at="2026-01-02T03:04:05Z")
+        recorded, recorded_summary = run_eval_suite(
+            cases, "u1", RecordingJudge(fixture, _FakeJudge(grades)), answer_fn=RecordingAnswerFn(fixture, _live_answer)
+        )
+        self.assertEqual(set(fixture.get("c0")), {"retrieval", "generation", "duration_sec"})
+        self.assertEqual(len(fixture.get("c0")["retrieval"]["sources"]), 3)
+        self.assertEqual((recorded[0].retrieval_recall, recorded[0].retrieval_reciprocal_rank), (1.0, 0.5))
+
+        def _drop_book_b(case, sources):
+            return [source for source in sources if source["book_id"] != "book-b"][::-1]
+
+        results, summary = run_eval_suite(
+            cases, "u1", ReplayJudge(fixture), answer_fn=ReplayAnswerFn(fixture, sources_transform=_drop_book_b)
+        )
+        self.assertEqual((results[0].retrieval_recall, results[0].retrieval_reciprocal_rank), (0.5, 1.0))
+        self.assertEqual(summary.retrieval, {"cases": 1, "recall": 0.5, "mrr": 1.0})
+        self.assertEqual(results[0].score, recorded[0].score)
+        self.assertIn("Expected-source recall: `50.0%`", render_markdown_report(results, summary, dataset_name="d"))
+
+    def test_version_one_fixtures_still_replay(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "v1.json"
+            path.write_text(
+                '{"version": 1, "recorded_at": "2026-01-02T03:04:05Z", "cases": {"c0": {"answer": "a",'
+                ' "sources": [{"title": "Book"}], "meta": {}, "grade": {"score": 4, "reasoning": "r"},'
+                ' "duration_sec": 1.5}}}',
+                encoding="utf-8",
+            )
+            fixture = EvalFixture.load(path)
+
+        results, _ = run_eval_suite(
+            [GoldenCase(case_id="c0", question="Q")], "u1", ReplayJudge(fixture), answer_fn=ReplayAnswerFn(fixture)
+        )
+        self.assertEqual((results[0].answer, results[0].source_count, results[0].score), ("a", 1, 4))
+        self.assertEqual(results[0].duration_sec, 1.5)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,146 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+import app as tomehub_app
+from config import settings
+from middleware.admin_middleware import require_admin
+from services import sampling_profiler_service as sps
+
+
+def _spin_in_route(stop: threading.Event):
+    while not stop.is_set():
+        sum(i * i for i in range(200))
+
+
+def _spin_unrouted(stop: threading.Event):
+    while not stop.is_set():
+        sorted(range(300), reverse=True)
+
+
+class SamplingProfilerTests(unittest.TestCase):
+    def setUp(self):
+        self.profiler = sps.SamplingProfiler()
+        self.stop = threading.Event()
+        self.threads = []
+
+    def tearDown(self):
+        self.stop.set()
+        for t in self.threads:
+            t.join(timeout=2)
+
+    def _start(self, target, name):
+        t = threading.Thread(target=target, args=(self.stop,), name=name, daemon=True)
+        t.start()
+        self.threads.append(t)
+
+    def test_samples_are_attributed_to_route_or_thread_name(self):
+        self._start(_spin_in_route, "anyio-worker-3")
+        self._start(_spin_unrouted, "bulkhead-retrieval_0")
+        index = {_spin_in_route.__code__: "POST /api/search"}
+
+        result = self.profiler.profile(0.3, interval_ms=5, route_index=index)
+
+        totals = result.route_totals()
+        self.assertGreater(totals.get("POST /api/search", 0), 0)
+        self.assertGreater(totals.get("[thread:bulkhead-retrieval]", 0), 0)
+        self.assertGreater(result.ticks, 10)
+        self.assertFalse(self.profiler.active)
+
+    def test_idle_threads_are_skipped_by_default(self):
+        self._start(lambda stop: stop.wait(), "idle-waiter")
+        result = self.profiler.profile(0.1, interval_ms=5)
+        self.assertNotIn("[thread:idle-waiter]", result.route_totals())
+
+        with_idle = self.profiler.profile(0.1, interval_ms=5, include_idle=True)
+        self.assertIn("[thread:idle-waiter]", with_idle.route_totals())
+
+    def test_bulkhead_worker_inherits_route_while_active(self):
+        self.assertIsNone(self.profiler.current_route())
+        index = {self.test_bulkhead_worker_inherits_route_while_active.__code__: "GET /api/x"}
+        started = threading.Event()
+
+        def _worker(stop):
+            with self.profiler.attribute_thread("GET /api/x"):
+                started.set()
+                _spin_unrouted(stop)
+
+        self.profiler._route_index = index
+        self.profiler.active = True
+        try:
+            self.assertEqual(self.profiler.current_route(), "GET /api/x")
+        finally:
+            self.profiler.active = False
+            self.profiler._route_index = {}
+
+        self._start(_worker, "bulkhead-llm_1")
+        started.wait(1)
+        result = self.profiler.profile(0.2, interval_ms=5)
+        self.assertIn("GET /api/x", result.route_totals())
+
+    def test_one_session_at_a_time(self):
+        holder = threading.Thread(target=self.profiler.profile, args=(0.4,), kwargs={"interval_ms": 20}, daemon=True)
+        holder.start()
+        time.sleep(0.05)
+        with self.assertRaises(sps.ProfilerBusyError):
+            self.profiler.profile(0.1)
+        holder.join(timeout=2)
+
+    def test_duration_is_capped_by_settings(self):
+        with patch.object(settings, "PROFILER_MAX_DURATION_SEC", 1):
+            started = time.perf_counter()
+            self.profiler.profile(30, interval_ms=50)
+            self.assertLess(time.perf_counter() - started, 2.0)
+
+    def test_collapsed_and_speedscope_output(self):
+        frame_a = ("/app/services/search_system/orchestrator.py", "search", 448)
+        frame_b = ("/app/utils/text_utils.py", "get_lemmas", 10)
+        result = sps.ProfileResult(
+            {("POST /api/search", (frame_a, frame_b)): 3, ("[thread:x]", (frame_a,)): 1},
+            interval_ms=10.0,
+            duration_sec=1.0,
+            ticks=100,
+        )
+        lines = result.to_collapsed().splitlines()
+        self.assertEqual(
+            lines[0], "POST /api/search;search (orchestrator.py:448);get_lemmas (text_utils.py:10) 3"
+        )
+
+        doc = result.to_speedscope()
+        self.assertEqual(len(doc["shared"]["frames"]), 2)
+        first = doc["profiles"][0]
+        self.assertEqual(first["name"], "POST /api/search")
+        self.assertEqual(first["samples"], [[0, 1]])
+        self.assertEqual(first["weights"], [30.0])
+        self.assertEqual(first["endValue"], 30.0)
+
+
+class ProfileEndpointTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(tomehub_app.app)
+
+    def setUp(self):
+        self._orig_overrides = dict(tomehub_app.app.dependency_overrides)
+        tomehub_app.app.dependency_overrides[require_admin] = lambda: "admin-1"
+
+    def tearDown(self):
+        tomehub_app.app.dependency_overrides = self._orig_overrides
+
+    def test_speedscope_download(self):
+        response = self.client.post("/api/admin/profile?duration_sec=0.2&interval_ms=5&format=speedscope")
+        self.assertEqual(response.status_code, 200, response.text)
+        self.assertIn("speedscope.json", response.headers["content-disposition"])
+        self.assertEqual(response.json()["exporter"], "tomehub-sampling-profiler")
+
+    def test_busy_and_bad_format(self):
+        self.assertEqual(self.client.post("/api/admin/profile?format=pprof").status_code, 400)
+        with patch.object(sps.sampling_profiler, "profile", side_effect=sps.ProfilerBusyError("busy")):
+            self.assertEqual(self.client.post("/api/admin/profile").status_code, 409)
+
+
+if __name__ == "__main__":
+    unittest.main()
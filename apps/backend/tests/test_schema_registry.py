@@ -0,0 +1,101 @@
+import unittest
+from unittest.mock import patch
+
+from infrastructure import schema_registry as registry_module
+
+
+class _FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = []
+        self.arraysize = 100
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, sql, params=None):
+        self.executed.append(sql)
+
+    def fetchall(self):
+        return list(self.rows)
+
+
+class _FakeConnection:
+    def __init__(self, cursor):
+        self.cursor_obj = cursor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def cursor(self):
+        return self.cursor_obj
+
+
+_ROWS = [
+    ("TOMEHUB_CONTENT_V2", "ITEM_ID"),
+    ("TOMEHUB_CONTENT_V2", "CONTENT_CHUNK"),
+    ("TOMEHUB_CHAT_SESSIONS", "CONVERSATION_STATE_JSON"),
+    ("TOMEHUB_LIBRARY_ITEMS", "RATING"),
+    ("TOMEHUB_LEMMA_INDEX", "LEMMA"),
+]
+
+
+class SchemaRegistryTests(unittest.TestCase):
+    def _loaded_registry(self, rows=_ROWS):
+        registry = registry_module.SchemaRegistry()
+        cursor = _FakeCursor(rows)
+        with patch.object(
+            registry_module.DatabaseManager, "get_read_connection", return_value=_FakeConnection(cursor)
+        ):
+            self.assertTrue(registry.refresh())
+        return registry, cursor
+
+    def test_single_query_snapshot_answers_lookups_without_db(self):
+        registry, cursor = self._loaded_registry()
+        self.assertEqual(len(cursor.executed), 1)
+
+        with patch.object(registry_module.DatabaseManager, "get_read_connection") as mock_conn:
+            self.assertTrue(registry.has_table("tomehub_content_v2"))
+            self.assertTrue(registry.has_column("TOMEHUB_CONTENT_V2", "content_chunk"))
+            self.assertFalse(registry.has_column("TOMEHUB_CONTENT_V2", "BOOK_ID"))
+            self.assertEqual(registry.columns("MISSING_TABLE"), frozenset())
+            caps = registry.capabilities
+        mock_conn.assert_not_called()
+
+        self.assertEqual(caps.content_v2_item_id_col, "ITEM_ID")
+        self.assertTrue(caps.chat_conversation_state)
+        self.assertTrue(caps.library_rating)
+        self.assertTrue(caps.lemma_index)
+        self.assertFalse(caps.memory_profile_table)
+
+    def test_failed_load_reports_nothing_and_keeps_defaults(self):
+        registry = registry_module.SchemaRegistry()
+        with patch.object(
+            registry_module.DatabaseManager, "get_read_connection", side_effect=RuntimeError("db down")
+        ) as mock_conn:
+            self.assertFalse(registry.has_table("TOMEHUB_CONTENT_V2"))
+            # Retries are spaced out rather than made on every lookup.
+            self.assertFalse(registry.has_table("TOMEHUB_CONTENT_V2"))
+            self.assertEqual(registry.capabilities.content_v2_item_id_col, "BOOK_ID")
+
+        self.assertFalse(registry.is_loaded)
+        self.assertEqual(mock_conn.call_count, 1)
+
+    def test_schema_errors_trigger_rate_limited_refresh(self):
+        registry, _ = self._loaded_registry()
+        with patch.object(registry, "refresh") as mock_refresh:
+            self.assertFalse(registry.note_error(Exception("ORA-12541: no listener")))
+            self.assertTrue(registry.note_error(Exception("ORA-00904: invalid identifier")))
+            self.assertTrue(registry.note_error(Exception("ORA-00942: table or view does not exist")))
+
+        mock_refresh.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
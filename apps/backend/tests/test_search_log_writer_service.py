@@ -0,0 +1,192 @@
+import json
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from config import settings
+from services import search_log_writer_service as slw
+
+
+class _FakeCursor:
+    def __init__(self, generation="BY DEFAULT", delete_counts=()):
+        self.generation = generation
+        self.delete_counts = list(delete_counts)
+        self.executed = []
+        self.executemany_calls = []
+        # Per-INSERT: an Exception to raise, or a list of rejected offsets.
+        self.insert_outcomes = []
+        self._batch_errors = []
+        self.rowcount = 0
+        self._next_id = 1000
+        self._result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def setinputsizes(self, **sizes):
+        pass
+
+    def close(self):
+        pass
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, dict(params or {})))
+        if "USER_TAB_IDENTITIES" in sql:
+            self._result = [("ISEQ$$_77", self.generation)]
+        elif "NEXTVAL" in sql:
+            ids = list(range(self._next_id, self._next_id + params["p_n"]))
+            self._next_id += params["p_n"]
+            self._result = [(i,) for i in ids]
+        elif sql.lstrip().startswith("DELETE"):
+            self.rowcount = self.delete_counts.pop(0) if self.delete_counts else 0
+
+    def executemany(self, sql, params, **kwargs):
+        self.executemany_calls.append((sql, list(params)))
+        self._batch_errors = []
+        if sql.startswith("INSERT") and self.insert_outcomes:
+            outcome = self.insert_outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            self._batch_errors = [SimpleNamespace(offset=i, message="ORA-12899: value too large") for i in outcome]
+
+    def getbatcherrors(self):
+        return list(self._batch_errors)
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        return list(self._result)
+
+
+class _FakeConnection:
+    def __init__(self, cursor):
+        self.cursor_obj = cursor
+        self.commits = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def cursor(self):
+        return self.cursor_obj
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+_RESULTS = [{"id": 42, "rrf_score": 0.7}]
+
+
+class SearchLogWriterTests(unittest.TestCase):
+    def setUp(self):
+        self.cursor = _FakeCursor()
+        self.conn = _FakeConnection(self.cursor)
+        self._patches = [
+            patch.object(settings, "SEARCH_LOG_WRITE_BEHIND_BATCH_SIZE", 50),
+            patch.object(settings, "SEARCH_LOG_WRITE_BEHIND_MAX_QUEUE", 3),
+            patch.object(settings, "SEARCH_LOG_ID_BLOCK_SIZE", 2),
+            patch.object(settings, "SEARCH_LOG_DIAGNOSTICS_PERSIST_ENABLED", True),
+            patch.object(slw.DatabaseManager, "get_write_connection", return_value=self.conn),
+        ]
+        for p in self._patches:
+            p.start()
+        self.writer = slw.SearchLogWriter()
+        self._worker = patch.object(self.writer, "_ensure_worker")
+        self._worker.start()
+
+    def tearDown(self):
+        self._worker.stop()
+        for p in self._patches:
+            p.stop()
+
+    def _inserts(self):
+        return [rows for sql, rows in self.cursor.executemany_calls if sql.startswith("INSERT")]
+
+    def test_ids_are_preallocated_and_rows_flushed_in_one_executemany(self):
+        ids = [self.writer.submit("uid-1", f"q{i}", "DIRECT", _RESULTS, 0.12, session_id="7") for i in range(3)]
+        self.assertEqual(ids, [1000, 1001, 1002])
+        nextval_calls = [sql for sql, _ in self.cursor.executed if "NEXTVAL" in sql]
+        self.assertEqual(len(nextval_calls), 2)
+        self.assertIn("ISEQ$$_77.NEXTVAL", nextval_calls[0])
+
+        self.assertEqual(self.writer.flush(), 3)
+        inserts = self._inserts()
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual([row["p_id"] for row in inserts[0]], ids)
+        self.assertEqual(inserts[0][0]["p_sid"], 7)
+        self.assertEqual(inserts[0][0]["p_tid"], 42)
+
+    def test_overflow_drops_the_row(self):
+        for i in range(3):
+            self.assertIsNotNone(self.writer.submit("uid-1", f"q{i}", "DIRECT", _RESULTS, 0.1))
+        self.assertIsNone(self.writer.submit("uid-1", "q3", "DIRECT", _RESULTS, 0.1))
+        self.assertEqual(self.writer.pending_count(), 3)
+
+    def test_annotations_on_queued_rows_are_written_after_the_insert(self):
+        log_id = self.writer.submit("uid-1", "q", "DIRECT", _RESULTS, 0.1, diagnostic_payload={"a": 1})
+        self.assertTrue(self.writer.annotate(log_id, model_name="m-1", diagnostics={"b": 2}))
+        self.writer.flush()
+
+        insert = self._inserts()[0][0]
+        self.assertEqual(json.loads(insert["p_strategy"]), {"a": 1, "b": 2})
+        model_updates = [rows for sql, rows in self.cursor.executemany_calls if "MODEL_NAME" in sql]
+        self.assertEqual(model_updates, [[{"p_id": log_id, "p_model": "m-1"}]])
+        # Committed rows are no longer tracked; callers fall back to their own UPDATE.
+        self.assertFalse(self.writer.annotate(log_id, model_name="m-2"))
+
+    def test_timestamp_is_left_to_the_column_default(self):
+        self.writer.submit("uid-1", "q", "DIRECT", _RESULTS, 0.1)
+        self.writer.flush()
+        sql, rows = self.cursor.executemany_calls[0]
+        self.assertNotIn("TIMESTAMP", sql)
+        self.assertNotIn("p_ts", rows[0])
+
+    def test_rejected_rows_are_dropped_without_losing_the_batch(self):
+        ids = [self.writer.submit("uid-1", f"q{i}", "DIRECT", _RESULTS, 0.1) for i in range(3)]
+        self.writer.annotate(ids[1], model_name="m-1")
+        self.writer.annotate(ids[2], model_name="m-2")
+        self.cursor.insert_outcomes = [[1]]
+
+        self.assertEqual(self.writer.flush(), 2)
+        model_updates = [rows for sql, rows in self.cursor.executemany_calls if "MODEL_NAME" in sql]
+        self.assertEqual(model_updates, [[{"p_id": ids[2], "p_model": "m-2"}]])
+
+    def test_failed_batch_is_retried_once_before_it_is_dropped(self):
+        self.writer.submit("uid-1", "q0", "DIRECT", _RESULTS, 0.1)
+        self.cursor.insert_outcomes = [Exception("DPY-4011: connection closed")]
+        with patch.object(slw.time, "sleep"):
+            self.assertEqual(self.writer.flush(), 1)
+        self.assertEqual(len(self._inserts()), 2)
+
+        self.writer.submit("uid-1", "q1", "DIRECT", _RESULTS, 0.1)
+        self.cursor.insert_outcomes = [Exception("DPY-4011"), Exception("DPY-4011")]
+        with patch.object(slw.time, "sleep"):
+            self.assertEqual(self.writer.flush(), 0)
+        self.assertEqual(self.writer.pending_count(), 0)
+
+    def test_generated_always_identity_keeps_synchronous_inserts(self):
+        self.cursor.generation = "ALWAYS"
+        with self.assertRaises(slw.SearchLogWriterUnavailable):
+            self.writer.submit("uid-1", "q", "DIRECT", _RESULTS, 0.1)
+        self.assertEqual(self.writer.pending_count(), 0)
+
+    def test_purge_deletes_in_batches(self):
+        self.cursor.delete_counts = [slw._RETENTION_DELETE_BATCH, 12]
+        with patch.object(settings, "SEARCH_LOG_RETENTION_CLEANUP_ENABLED", True):
+            self.assertEqual(slw.purge_expired_search_logs(), slw._RETENTION_DELETE_BATCH + 12)
+        deletes = [sql for sql, _ in self.cursor.executed if sql.lstrip().startswith("DELETE")]
+        self.assertEqual(len(deletes), 2)
+        self.assertEqual(self.conn.commits, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
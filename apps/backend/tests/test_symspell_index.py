@@ -0,0 +1,38 @@
+import unittest
+
+from rapidfuzz.distance import OSA
+
+from utils.symspell_index import SymSpellIndex, Suggestion
+
+
+class SymSpellIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = SymSpellIndex(max_edit_distance=2)
+        self.index.update([("kültür", 40), ("kültürü", 12), ("toplum", 30), ("felsefe", 9), ("felsefi", 3)])
+
+    def test_exact_word_returns_distance_zero(self):
+        self.assertEqual(self.index.lookup("toplum"), Suggestion("toplum", 0, 30))
+
+    def test_ocr_substitution_and_transposition(self):
+        self.assertEqual(self.index.lookup("kultur").term, "kültür")
+        self.assertEqual(self.index.lookup("tolpum"), Suggestion("toplum", 1, 30))
+
+    def test_ties_prefer_the_more_frequent_word(self):
+        self.assertEqual(self.index.lookup("felsefa").term, "felsefe")
+
+    def test_max_distance_limits_candidates(self):
+        self.assertIsNone(self.index.lookup("kultur", max_distance=1))
+        self.assertIsNone(self.index.lookup("tamamen"))
+
+    def test_matches_brute_force_on_prefix_length_words(self):
+        words = ["adalet", "adalar", "ahlak", "akıl", "anlam", "insan", "inanç", "hayat", "hayal", "zaman"]
+        index = SymSpellIndex(max_edit_distance=2)
+        index.update((w, 1) for w in words)
+        for query in ["adelet", "ahlk", "anlan", "insna", "hayta", "zman", "xyzq"]:
+            brute = sorted((OSA.distance(query, w), w) for w in words if OSA.distance(query, w) <= 2)
+            got = index.lookup(query)
+            self.assertEqual(got and (got.distance, got.term), brute[0] if brute else None, query)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+import random
+import unittest
+from unittest.mock import patch
+
+from config import settings
+from services import trigram_index_service
+from services.search_system import strategies
+
+_WORDS = ["vicdan", "ahlak", "özgürlük", "adalet", "hakikat", "bilgi", "akıl", "iman", "zaman", "varlık", "ve", "bir"]
+
+
+def _corpus(n=400, seed=11):
+    rng = random.Random(seed)
+    rows = []
+    for row_id in range(1, n + 1):
+        text = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(3, 12)))
+        rows.append((row_id, f"book-{row_id % 7}", text))
+    return rows
+
+
+class _ScanCursor:
+    """Evaluates the exact lane's verification statements against an in-memory corpus."""
+
+    def __init__(self, rows, term):
+        self.rows = rows
+        self.term = term
+        self.executed = []
+        self._result = []
+
+    def execute(self, sql, params=None):
+        params = dict(params or {})
+        self.executed.append((sql, params))
+        in_ids = {v for k, v in params.items() if k.startswith("p_tid")}
+        above = params.get("p_trgm_max")
+        below = params.get("p_trgm_below")
+
+        def visible(row_id):
+            if below is not None:
+                return row_id < below
+            if above is not None:
+                return row_id > above or row_id in in_ids
+            return row_id in in_ids
+
+        hits = [r for r in self.rows if visible(r[0]) and self.term in r[2]]
+        hits.sort(key=lambda r: r[0], reverse=True)
+        self._result = hits[: params["p_candidate_limit"]]
+
+    def fetchall(self):
+        return list(self._result)
+
+
+def _like_scan(rows, term, limit):
+    return sorted((r for r in rows if term in r[2]), key=lambda r: r[0], reverse=True)[:limit]
+
+
+class TrigramIndexServiceTests(unittest.TestCase):
+    def setUp(self):
+        self.index = trigram_index_service.TrigramIndex()
+        self._patches = [
+            patch.object(settings, "TRIGRAM_INDEX_ENABLED", True),
+            patch.object(settings, "TRIGRAM_INDEX_EVENT_POLL_SEC", 3600),
+            patch.object(settings, "TRIGRAM_INDEX_MAX_MB", 64),
+        ]
+        for p in self._patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self._patches:
+            p.stop()
+
+    def _load(self, rows, max_id=None):
+        max_id = max(r[0] for r in rows) if max_id is None else max_id
+        with patch.object(trigram_index_service, "_fetch_rows", return_value=rows), patch.object(
+            trigram_index_service, "_max_content_id", return_value=max_id
+        ):
+            self.assertTrue(self.index.load_user("uid-1"))
+
+    def test_extract_trigrams_is_case_and_accent_sensitive(self):
+        self.assertEqual(trigram_index_service.extract_trigrams("abcd"), {"abc", "bcd"})
+        self.assertEqual(trigram_index_service.extract_trigrams("ab"), set())
+        self.assertNotEqual(
+            trigram_index_service.extract_trigrams("Akıl"), trigram_index_service.extract_trigrams("akil")
+        )
+
+    def test_candidates_are_a_superset_of_substring_matches(self):
+        rows = _corpus()
+        self._load(rows)
+        for term in ["vicdan", "hak", "ve ahlak", "lük ada", "zaman bilgi", "yokluk", "ğürl"]:
+            found = self.index.lookup("uid-1", term)
+            expected = {r[0] for r in rows if term in r[2]}
+            self.assertTrue(expected <= set(found.ids), term)
+            self.assertEqual(found.ids, sorted(found.ids, reverse=True))
+
+    def test_verified_batches_match_the_like_scan(self):
+        rows = _corpus()
+        self._load(rows)
+        with patch.object(settings, "TRIGRAM_INDEX_VERIFY_BATCH", 50), patch.object(
+            settings, "TRIGRAM_INDEX_MAX_VERIFY_BATCHES", 2
+        ):
+            for term, limit in [("vicdan", 20), ("vicdan", 500), ("ve ahlak", 40), ("iman var", 500), ("yokluk", 10)]:
+                cursor = _ScanCursor(rows, term)
+                got = strategies._run_trigram_verified_like(
+                    cursor, "SELECT ...", {"p_uid": "uid-1"}, self.index.lookup("uid-1", term), limit
+                )
+                self.assertEqual(got, _like_scan(rows, term, limit), (term, limit))
+
+    def test_rows_inserted_after_the_load_are_verified_by_range(self):
+        rows = _corpus(50)
+        self._load(rows)
+        newer = rows + [(51, "book-new", "vicdan hürdür")]
+        cursor = _ScanCursor(newer, "vicdan")
+        got = strategies._run_trigram_verified_like(
+            cursor, "SELECT ...", {}, self.index.lookup("uid-1", "vicdan"), 5
+        )
+        self.assertEqual(got[0][0], 51)
+        self.assertEqual(got, _like_scan(newer, "vicdan", 5))
+        self.assertIn("c.id > :p_trgm_max", cursor.executed[0][0])
+
+    def test_short_terms_and_misses_use_the_scan(self):
+        with patch.object(self.index, "_run_in_background") as mock_bg:
+            self.assertIsNone(self.index.lookup("uid-1", "vicdan"))
+        mock_bg.assert_called_once_with("uid-1", refresh=False)
+        self._load(_corpus(20))
+        self.assertIsNone(self.index.lookup("uid-1", "ve"))
+
+    def test_changed_book_is_merged_before_the_index_is_used_again(self):
+        rows = [(1, "book-a", "vicdan ve ahlak"), (2, "book-b", "adalet"), (3, "book-b", "vicdanlı")]
+        self._load(rows)
+        self.index.notify_content_changed("uid-1", "book-b")
+        with patch.object(self.index, "_run_in_background") as mock_bg:
+            self.assertIsNone(self.index.lookup("uid-1", "vicdan"))
+        mock_bg.assert_called_once_with("uid-1", refresh=True)
+
+        fresh = [(4, "book-b", "vicdan azabı")]
+        with patch.object(trigram_index_service, "_fetch_rows", return_value=fresh) as mock_fetch:
+            self.assertTrue(self.index.refresh_user("uid-1"))
+        mock_fetch.assert_called_once_with("uid-1", item_ids={"book-b"})
+
+        found = self.index.lookup("uid-1", "vicdan")
+        # id 4 is above the load-time max_id, so it is served by the range check.
+        self.assertEqual((found.ids, found.max_id), ([1], 3))
+
+    def test_change_during_refresh_is_kept_for_the_next_refresh(self):
+        self._load([(1, "book-a", "vicdan"), (2, "book-b", "adalet")])
+        self.index.notify_content_changed("uid-1", "book-b")
+
+        def _fetch(*args, **kwargs):
+            self.index.notify_content_changed("uid-1", "book-b")
+            return [(3, "book-b", "vicdan azabı")]
+
+        with patch.object(trigram_index_service, "_fetch_rows", side_effect=_fetch):
+            self.assertTrue(self.index.refresh_user("uid-1"))
+        with patch.object(self.index, "_run_in_background") as mock_bg:
+            self.assertIsNone(self.index.lookup("uid-1", "vicdan"))
+        mock_bg.assert_called_once_with("uid-1", refresh=True)
+
+    def test_change_during_load_is_queued_or_discards_the_load(self):
+        rows = [(1, "book-a", "vicdan"), (2, "book-b", "adalet")]
+
+        def _fetch_notifying(item_id):
+            def _fetch(*args, **kwargs):
+                self.index.notify_content_changed("uid-1", item_id)
+                return rows
+            return _fetch
+
+        with patch.object(trigram_index_service, "_fetch_rows", side_effect=_fetch_notifying("book-b")), \
+                patch.object(trigram_index_service, "_max_content_id", return_value=2):
+            self.assertTrue(self.index.load_user("uid-1"))
+        with patch.object(self.index, "_run_in_background") as mock_bg:
+            self.assertIsNone(self.index.lookup("uid-1", "vicdan"))
+        mock_bg.assert_called_once_with("uid-1", refresh=True)
+
+        self.index.clear()
+        with patch.object(trigram_index_service, "_fetch_rows", side_effect=_fetch_notifying(None)), \
+                patch.object(trigram_index_service, "_max_content_id", return_value=2):
+            self.assertFalse(self.index.load_user("uid-1"))
+        with patch.object(self.index, "_run_in_background") as mock_bg:
+            self.assertIsNone(self.index.lookup("uid-1", "vicdan"))
+        mock_bg.assert_called_once_with("uid-1", refresh=False)
+
+    def test_users_over_row_cap_are_not_indexed(self):
+        with patch.object(settings, "TRIGRAM_INDEX_MAX_ROWS_PER_USER", 10), patch.object(
+            trigram_index_service, "_fetch_rows", return_value=_corpus(20)
+        ), patch.object(trigram_index_service, "_max_content_id", return_value=20):
+            self.assertFalse(self.index.load_user("uid-1"))
+        with patch.object(self.index, "_run_in_background") as mock_bg:
+            self.assertIsNone(self.index.lookup("uid-1", "vicdan"))
+        mock_bg.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
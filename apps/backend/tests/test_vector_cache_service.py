@@ -0,0 +1,100 @@
+import unittest
+from unittest.mock import patch
+
+from config import settings
+from services import vector_cache_service
+from services.search_system import strategies
+
+
+def _rows():
+    # id, item_id, content_type, rag_weight, vector
+    return [
+        (1, "book-a", "HIGHLIGHT", 1.0, [1.0, 0.0, 0.0]),
+        (2, "book-a", "PDF_CHUNK", 1.0, [0.9, 0.1, 0.0]),
+        (3, "book-b", "INSIGHT", 1.0, [0.0, 1.0, 0.0]),
+        (4, "book-b", "HIGHLIGHT", 2.0, [0.6, 0.8, 0.0]),
+    ]
+
+
+class VectorCacheServiceTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = vector_cache_service.VectorCache()
+        self._patches = [
+            patch.object(settings, "VECTOR_CACHE_ENABLED", True),
+            patch.object(settings, "VECTOR_CACHE_EVENT_POLL_SEC", 3600),
+            patch.object(settings, "VECTOR_CACHE_MAX_MB", 64),
+        ]
+        for p in self._patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self._patches:
+            p.stop()
+
+    def _load(self, rows=None):
+        with patch.object(vector_cache_service, "_fetch_rows", return_value=rows or _rows()):
+            self.assertTrue(self.cache.load_user("uid-1"))
+
+    def test_miss_starts_background_load_and_returns_none(self):
+        with patch.object(self.cache, "_load_in_background") as mock_load:
+            self.assertIsNone(self.cache.search("uid-1", [1.0, 0.0, 0.0], 5))
+        mock_load.assert_called_once_with("uid-1")
+
+    def test_search_orders_by_weighted_cosine_distance(self):
+        self._load()
+        ids = self.cache.search("uid-1", [1.0, 0.0, 0.0], 4)
+        # id 4: distance 0.4 halved by rag_weight 2.0 ranks ahead of id 3 (distance 1.0).
+        self.assertEqual(ids, [1, 2, 4, 3])
+
+    def test_metadata_filters_mirror_sql_scopes(self):
+        self._load()
+        ids = self.cache.search(
+            "uid-1",
+            [1.0, 0.0, 0.0],
+            4,
+            exclude_types={"PDF", "EPUB", "PDF_CHUNK", "BOOK_CHUNK"},
+        )
+        self.assertEqual(ids, [1, 4, 3])
+        self.assertEqual(self.cache.search("uid-1", [1.0, 0.0, 0.0], 4, item_id="book-b"), [4, 3])
+        self.assertEqual(self.cache.search("uid-1", [1.0, 0.0, 0.0], 4, include_types={"ARTICLE"}), [])
+
+    def test_change_notification_reloads_only_that_book(self):
+        self._load()
+        fresh_rows = [(5, "book-b", "HIGHLIGHT", 1.0, [1.0, 0.0, 0.0])]
+        self.cache.notify_content_changed("uid-1", "book-b")
+        with patch.object(vector_cache_service, "_fetch_rows", return_value=fresh_rows) as mock_fetch:
+            ids = self.cache.search("uid-1", [1.0, 0.0, 0.0], 5)
+
+        mock_fetch.assert_called_once_with("uid-1", item_ids={"book-b"})
+        self.assertEqual(sorted(ids), [1, 2, 5])
+
+    def test_users_over_row_cap_are_not_cached(self):
+        with patch.object(settings, "VECTOR_CACHE_MAX_ROWS_PER_USER", 3), patch.object(
+            vector_cache_service, "_fetch_rows", return_value=_rows()
+        ):
+            self.assertFalse(self.cache.load_user("uid-1"))
+        with patch.object(self.cache, "_load_in_background") as mock_load:
+            self.assertIsNone(self.cache.search("uid-1", [1.0, 0.0, 0.0], 5))
+        mock_load.assert_not_called()
+
+    def test_lru_evicts_whole_users_over_budget(self):
+        self._load()
+        budget = self.cache._entries["uid-1"].index.nbytes
+        with patch.object(vector_cache_service, "_budget_bytes", return_value=budget), patch.object(
+            vector_cache_service, "_fetch_rows", return_value=_rows()
+        ):
+            self.cache.load_user("uid-2")
+
+        self.assertEqual(list(self.cache._entries), ["uid-2"])
+
+    def test_semantic_cache_content_types_follow_strategy_scopes(self):
+        include, exclude = strategies._semantic_cache_content_types("ALL_NOTES", None, "CORE", True)
+        self.assertEqual(include, {"HIGHLIGHT", "INSIGHT"})
+        self.assertIn("PDF_CHUNK", exclude)
+        include, exclude = strategies._semantic_cache_content_types("MOVIE", None, "PDF_ONLY", False)
+        self.assertEqual(include, {"PDF", "EPUB", "PDF_CHUNK", "BOOK_CHUNK"})
+        self.assertIsNone(exclude)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+from unittest.mock import patch
+
+from config import settings
+from services import vector_index_service
+
+_DIST = "VECTOR_DISTANCE(c.vec_embedding, :vec, COSINE)"
+
+
+class _Cursor:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.executed = []
+
+    def execute(self, sql, params):
+        self.executed.append((sql, params))
+
+    def fetchall(self):
+        return self.results.pop(0)
+
+
+class VectorIndexServiceTests(unittest.TestCase):
+    def test_disabled_keeps_exact_order(self):
+        with patch.object(settings, "VECTOR_APPROX_ENABLED", False):
+            sql, params = vector_index_service.apply_vector_ranking(
+                "SELECT 1 FROM T c WHERE 1=1",
+                {"p_limit": 10},
+                lane=vector_index_service.LANE_SEMANTIC,
+                distance_expr=_DIST,
+                rank_column="dist",
+                reweighted=True,
+            )
+
+        self.assertNotIn("APPROX", sql)
+        self.assertIn("ORDER BY dist ASC FETCH FIRST :p_limit ROWS ONLY", sql)
+        self.assertEqual(params, {"p_limit": 10})
+
+    def test_raw_distance_lane_uses_approx_fetch_with_lane_accuracy(self):
+        with patch.object(settings, "VECTOR_APPROX_ENABLED", True), patch.object(
+            settings, "VECTOR_APPROX_ACCURACY_FLOW", 80
+        ):
+            sql, _ = vector_index_service.apply_vector_ranking(
+                "SELECT id FROM T WHERE 1=1",
+                {"p_limit": 5},
+                lane=vector_index_service.LANE_FLOW,
+                distance_expr=_DIST,
+                rank_column="distance",
+            )
+
+        self.assertIn(f"ORDER BY {_DIST} FETCH APPROX FIRST :p_limit ROWS ONLY WITH TARGET ACCURACY 80", sql)
+        self.assertNotIn("SELECT * FROM", sql)
+
+    def test_reweighted_lane_overfetches_then_reorders(self):
+        with patch.object(settings, "VECTOR_APPROX_ENABLED", True), patch.object(
+            settings, "VECTOR_APPROX_OVERFETCH", 3
+        ):
+            sql, params = vector_index_service.apply_vector_ranking(
+                "SELECT id, x AS dist FROM T c WHERE 1=1",
+                {"p_limit": 10, "p_offset": 5},
+                lane=vector_index_service.LANE_SEMANTIC,
+                distance_expr=_DIST,
+                rank_column="dist",
+                reweighted=True,
+                offset_bind="p_offset",
+                accuracy=70,
+            )
+
+        self.assertTrue(sql.startswith("SELECT * FROM (SELECT id, x AS dist"))
+        self.assertIn("FETCH APPROX FIRST :p_ann_candidates ROWS ONLY WITH TARGET ACCURACY 70", sql)
+        self.assertTrue(sql.rstrip().endswith("ORDER BY dist ASC OFFSET :p_offset ROWS FETCH NEXT :p_limit ROWS ONLY"))
+        self.assertEqual(params["p_ann_candidates"], 45)
+
+    def test_short_approx_result_falls_back_to_exact_scan(self):
+        cursor = _Cursor([(1,)], [(1,), (2,), (3,)])
+        with patch.object(settings, "VECTOR_APPROX_ENABLED", True):
+            rows = vector_index_service.fetch_vector_ranked(
+                cursor,
+                "SELECT id, x AS dist FROM T c WHERE c.uid = :p_uid",
+                {"p_uid": "u1", "p_limit": 3},
+                lane=vector_index_service.LANE_SEMANTIC,
+                distance_expr=_DIST,
+                rank_column="dist",
+                reweighted=True,
+            )
+
+        self.assertEqual(rows, [(1,), (2,), (3,)])
+        (approx_sql, _), (exact_sql, exact_params) = cursor.executed
+        self.assertIn("FETCH APPROX", approx_sql)
+        self.assertNotIn("APPROX", exact_sql)
+        self.assertEqual(exact_params, {"p_uid": "u1", "p_limit": 3})
+
+    def test_full_or_exact_result_runs_one_query(self):
+        for enabled, result in ((True, [(1,), (2,)]), (False, [(1,)])):
+            cursor = _Cursor(result)
+            with patch.object(settings, "VECTOR_APPROX_ENABLED", enabled):
+                rows = vector_index_service.fetch_vector_ranked(
+                    cursor,
+                    "SELECT id FROM T WHERE 1=1",
+                    {"p_limit": 2},
+                    lane=vector_index_service.LANE_FLOW,
+                    distance_expr=_DIST,
+                    rank_column="distance",
+                )
+            self.assertEqual(rows, result)
+            self.assertEqual(len(cursor.executed), 1)
+
+    def test_recall_at_k(self):
+        self.assertEqual(vector_index_service.recall_at_k([1, 2, 3, 4], [4, 2, 9, 8]), 0.5)
+        self.assertEqual(vector_index_service.recall_at_k([], [1]), 1.0)
+        self.assertEqual(vector_index_service.recall_at_k([1, 2, 3], [1, 3, 2], k=1), 1.0)
+
+    def test_unknown_lane_is_rejected(self):
+        with self.assertRaises(ValueError):
+            vector_index_service.target_accuracy("graph")
+
+
+if __name__ == "__main__":
+    unittest.main()
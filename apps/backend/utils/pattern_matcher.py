@@ -0,0 +1,68 @@
+"""
+Precompiled matchers for the rule-based heuristics (epistemic scoring, domain
+inference, retrieval routing).
+
+Each pattern family is compiled once, both as its individual regexes and as one
+alternation, so "does any pattern of this family match" is a single scan of
+already-normalised text. Per-pattern regexes are only consulted after the
+alternation hits, when a caller needs to know *which* pattern matched first in
+list order. Results are identical to looping `re.search` over the list.
+
+- PatternFamily: regex list -> bool / first matching index
+- PhraseSet:     literal phrases -> number of distinct phrases present
+- FeatureMatcher: named PatternFamily set -> hit names in one call
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+
+class PatternFamily:
+    def __init__(self, name: str, patterns: Sequence[str], flags: int = 0):
+        self.name = name
+        self.patterns: List[str] = [str(p) for p in patterns]
+        self._compiled = [re.compile(p, flags) for p in self.patterns]
+        self._combined = re.compile("|".join(f"(?:{p})" for p in self.patterns), flags) if self.patterns else None
+
+    def search(self, text: str) -> bool:
+        return bool(self._combined is not None and text and self._combined.search(text))
+
+    def first_index(self, text: str) -> Optional[int]:
+        """Index of the first pattern (in list order) that matches, or None."""
+        if not self.search(text):
+            return None
+        for idx, compiled in enumerate(self._compiled):
+            if compiled.search(text):
+                return idx
+        return None
+
+
+class PhraseSet:
+    """Literal phrases normalised once; counts how many occur as substrings."""
+
+    def __init__(self, phrases: Iterable[str], normalize: Callable[[str], str] = str.lower):
+        cleaned = {normalize(str(p or "").strip()) for p in phrases}
+        self.phrases: List[str] = sorted((p for p in cleaned if p), key=len, reverse=True)
+        self._combined = re.compile("|".join(re.escape(p) for p in self.phrases)) if self.phrases else None
+
+    def any(self, normalized_text: str) -> bool:
+        return bool(self._combined is not None and normalized_text and self._combined.search(normalized_text))
+
+    def count(self, normalized_text: str) -> int:
+        # Most texts hit nothing: one regex scan answers that; overlapping
+        # phrases (e.g. "tarih" / "tarihi") are only counted once there is a hit.
+        if not self.any(normalized_text):
+            return 0
+        return sum(1 for phrase in self.phrases if phrase in normalized_text)
+
+
+class FeatureMatcher:
+    def __init__(self, families: Iterable[PatternFamily]):
+        self.families: Dict[str, PatternFamily] = {family.name: family for family in families}
+
+    def hits(self, text: str) -> Set[str]:
+        if not text:
+            return set()
+        return {name for name, family in self.families.items() if family.search(text)}
@@ -0,0 +1,98 @@
+"""
+Symmetric-delete (SymSpell-style) dictionary for fuzzy word lookup.
+
+Every dictionary word is indexed under all strings reachable from its first
+`prefix_length` characters by up to `max_edit_distance` deletions. A lookup
+generates the same deletes for the query and only verifies the words sharing
+one of those keys, so its cost depends on the query length and edit distance,
+not on the dictionary size (unlike a rapidfuzz.process.extractOne scan).
+Candidates are verified with optimal string alignment distance (adjacent
+transpositions count as one edit, which fits OCR swaps).
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from rapidfuzz.distance import OSA
+
+
+class Suggestion(NamedTuple):
+    term: str
+    distance: int
+    count: int
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    out = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for item in frontier:
+            if len(item) <= 1:
+                continue
+            for i in range(len(item)):
+                next_frontier.add(item[:i] + item[i + 1:])
+        next_frontier -= out
+        out |= next_frontier
+        frontier = next_frontier
+    return out
+
+
+class SymSpellIndex:
+    def __init__(self, max_edit_distance: int = 2, prefix_length: int = 7):
+        self.max_edit_distance = max(0, int(max_edit_distance))
+        self.prefix_length = max(self.max_edit_distance + 1, int(prefix_length))
+        self._counts: Dict[str, int] = {}
+        self._buckets: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, word: object) -> bool:
+        return word in self._counts
+
+    def count(self, word: str) -> int:
+        return self._counts.get(word, 0)
+
+    def add(self, word: str, count: int = 1) -> None:
+        if not word or count <= 0:
+            return
+        if word in self._counts:
+            self._counts[word] += count
+            return
+        self._counts[word] = count
+        for key in _deletes(word[:self.prefix_length], self.max_edit_distance):
+            self._buckets.setdefault(key, []).append(word)
+
+    def update(self, counts: Iterable[Tuple[str, int]]) -> None:
+        for word, count in counts:
+            self.add(word, count)
+
+    def lookup(self, word: str, max_distance: Optional[int] = None) -> Optional[Suggestion]:
+        """Closest word (smallest distance, then highest count), or None beyond `max_distance`."""
+        if not word:
+            return None
+        count = self._counts.get(word)
+        if count is not None:
+            return Suggestion(word, 0, count)
+        limit = self.max_edit_distance if max_distance is None else min(int(max_distance), self.max_edit_distance)
+        if limit <= 0:
+            return None
+
+        best: Optional[Suggestion] = None
+        seen: Set[str] = set()
+        for key in _deletes(word[:self.prefix_length], limit):
+            for candidate in self._buckets.get(key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                if abs(len(candidate) - len(word)) > limit:
+                    continue
+                distance = OSA.distance(word, candidate, score_cutoff=limit)
+                if distance > limit:
+                    continue
+                suggestion = Suggestion(candidate, distance, self._counts[candidate])
+                if best is None or (distance, -suggestion.count, candidate) < (best.distance, -best.count, best.term):
+                    best = suggestion
+        return best
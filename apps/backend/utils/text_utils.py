@@ -225,12 +225,12 @@ def _fallback_lemmas(text: str) -> list[str]:
     return list(out)
 
 
-def _fallback_lemma_frequencies(text: str) -> dict[str, int]:
+def _fallback_lemma_positions(text: str) -> dict[str, list[int]]:
     canonical = normalize_canonical(text)
     if not canonical:
         return {}
-    freqs: dict[str, int] = {}
-    for raw in canonical.split():
+    positions: dict[str, list[int]] = {}
+    for pos, raw in enumerate(canonical.split()):
         token = re.sub(r"\d+", "", raw).strip()
         if len(token) < 2:
             continue
@@ -241,8 +241,12 @@ def _fallback_lemma_frequencies(text: str) -> dict[str, int]:
             lemma = deaccent_text(token)
         if len(lemma) < 3:
             continue
-        freqs[lemma] = freqs.get(lemma, 0) + 1
-    return freqs
+        positions.setdefault(lemma, []).append(pos)
+    return positions
+
+
+def _fallback_lemma_frequencies(text: str) -> dict[str, int]:
+    return {lemma: len(hits) for lemma, hits in _fallback_lemma_positions(text).items()}
 
 
 def get_lemmas(text: str) -> list[str]:
@@ -277,9 +281,10 @@ def get_lemmas(text: str) -> list[str]:
     return _fallback_lemmas(canonical)
 
 
-def get_lemma_frequencies(text: str) -> dict[str, int]:
+def get_lemma_positions(text: str) -> dict[str, list[int]]:
     """
-    Extract lemma frequencies from text using Zeyrek.
+    Map each lemma to the token positions where it occurs (Zeyrek, first parse).
+    Frequencies are the lengths of these lists; see get_lemma_frequencies.
     """
     if not text:
         return {}
@@ -287,23 +292,30 @@ def get_lemma_frequencies(text: str) -> dict[str, int]:
     if not canonical:
         return {}
     if not _analyzer:
-        return _fallback_lemma_frequencies(canonical)
+        return _fallback_lemma_positions(canonical)
 
-    freqs: dict[str, int] = {}
+    positions: dict[str, list[int]] = {}
     try:
         results = _analyzer.analyze(canonical)
-        for word_analysis in results:
+        for pos, word_analysis in enumerate(results):
             if not word_analysis:
                 continue
             parse = word_analysis[0]
             lemma = parse.lemma.lower() if parse.lemma else None
             if not lemma or lemma in ["unk", "unknown"]:
                 continue
-            freqs[lemma] = freqs.get(lemma, 0) + 1
+            positions.setdefault(lemma, []).append(pos)
     except Exception as e:
-        _LOGGER.warning("Lemma frequency extraction failed; fallback enabled: %s", e)
-        return _fallback_lemma_frequencies(canonical)
+        _LOGGER.warning("Lemma position extraction failed; fallback enabled: %s", e)
+        return _fallback_lemma_positions(canonical)
+
+    if positions:
+        return positions
+    return _fallback_lemma_positions(canonical)
 
-    if freqs:
-        return freqs
-    return _fallback_lemma_frequencies(canonical)
+
+def get_lemma_frequencies(text: str) -> dict[str, int]:
+    """
+    Extract lemma frequencies from text using Zeyrek.
+    """
+    return {lemma: len(hits) for lemma, hits in get_lemma_positions(text).items()}